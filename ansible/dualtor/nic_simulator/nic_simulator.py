@@ -17,11 +17,13 @@ import json
 import logging
 import os
 import re
+import signal
 import socket
 import sys
 import struct
 import subprocess
 import threading
+import time
 
 from concurrent import futures
 from logging.handlers import RotatingFileHandler
@@ -48,6 +50,7 @@ OVS_VERSION_PATTERN = r"ovs-vsctl \(Open vSwitch\) (.*)"
 
 # gRPC settings
 GRPC_TIMEOUT = 0.5
+GRPC_SET_DROP_TIMEOUT = 10
 GRPC_SERVER_OPTIONS = [
     ('grpc.http2.min_ping_interval_without_data_ms', 1000),
     ('grpc.http2.max_ping_strikes',  0)
@@ -75,11 +78,14 @@ def get_ip_address(ifname):
     return addr
 
 
-def run_command(cmd, check=True):
-    """Run a command."""
+def run_command(cmd, check=True, input_str=None):
+    """Run a command, input_str is written to its stdin."""
     logging.debug("COMMAND: %s", cmd)
+    if input_str is not None:
+        logging.debug("COMMAND STDIN:\n%s\n", input_str)
     result = subprocess.run(
         cmd,
+        input=input_str.encode() if input_str is not None else None,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         shell=True,
@@ -101,6 +107,7 @@ class OVSCommand(object):
     OVS_OFCTL_DEL_FLOWS_CMD = "ovs-ofctl del-flows {bridge_name}"
     OVS_OFCTL_ADD_FLOWS_CMD = "ovs-ofctl add-flow {bridge_name} {flow}"
     OVS_OFCTL_MOD_FLOWS_CMD = "ovs-ofctl --strict mod-flows {bridge_name} {flow}"
+    OVS_OFCTL_MOD_FLOWS_FROM_STDIN_CMD = "ovs-ofctl --strict mod-flows {bridge_name} -"
     OVS_OFCTL_DEL_GROUPS_CMD = "ovs-ofctl -O OpenFlow13 del-groups {bridge_name}"
     OVS_OFCTL_ADD_GROUP_CMD = "ovs-ofctl -O OpenFlow13 add-group {bridge_name} {group}"
     OVS_OFCTL_MOD_GROUP_CMD = "ovs-ofctl -O OpenFlow13 mod-group {bridge_name} {group}"
@@ -145,6 +152,12 @@ class OVSCommand(object):
     def ovs_ofctl_mod_flow(bridge_name, flow):
         return run_command(OVSCommand.OVS_OFCTL_MOD_FLOWS_CMD.format(bridge_name=bridge_name, flow=flow))
 
+    @staticmethod
+    def ovs_ofctl_mod_flows(bridge_name, flows):
+        """Modify several flows with one ovs-ofctl call."""
+        return run_command(OVSCommand.OVS_OFCTL_MOD_FLOWS_FROM_STDIN_CMD.format(bridge_name=bridge_name),
+                           input_str="".join("%s\n" % flow for flow in flows))
+
     @staticmethod
     def ovs_ofctl_add_group(bridge_name, group):
         return run_command(OVSCommand.OVS_OFCTL_ADD_GROUP_CMD.format(bridge_name=bridge_name, group=group))
@@ -414,6 +427,9 @@ class OVSBridge(object):
         "server_nic",
         "ptf_port",
         "lock",
+        "flush_lock",
+        "group_generation",
+        "flushed_group_generation",
         "flows",
         "groups",
         "upstream_ecmp_flow",
@@ -440,6 +456,10 @@ class OVSBridge(object):
         self.upper_tor_loopback3_ip = loopback_ips[1]
         self.lower_tor_loopback3_ip = loopback_ips[2]
         self.lock = threading.RLock()
+        # serialize the writes of the upstream ecmp group, see _flush_upstream_ecmp_group
+        self.flush_lock = threading.Lock()
+        self.group_generation = 0
+        self.flushed_group_generation = 0
         self.ports = None
         self.lower_tor_port = None
         self.upper_tor_port = None
@@ -629,16 +649,38 @@ class OVSBridge(object):
         self.flows.append(flow)
         return flow
 
+    def _flush_upstream_ecmp_group(self, generation):
+        """
+        Write the upstream ecmp group to OVS if its change of `generation` is not written yet.
+
+        Back-to-back state changes on the bridge are coalesced: the changes made while a write is in flight
+        are written together by the next writer, the other writers find their change written and return.
+        """
+        with self.flush_lock:
+            if self.flushed_group_generation >= generation:
+                return
+            with self.lock:
+                group = str(self.upstream_ecmp_group)
+                generation = self.group_generation
+            OVSCommand.ovs_ofctl_mod_groups(self.bridge_name, group)
+            self.flushed_group_generation = generation
+
     def set_forwarding_state(self, portids, states):
         """Set forwarding state."""
         with self.lock:
+            changed = False
             for portid, state in zip(portids, states):
                 logging.info("Set bridge %s port %s forwarding state: %s",
                              self.bridge_name, portid, ForwardingState.STATE_LABELS[state])
-                self.flap_counter[portid] += self.states_setter[portid](state)
-            OVSCommand.ovs_ofctl_mod_groups(
-                self.bridge_name, self.upstream_ecmp_group)
-            return self.query_forwarding_state(portids)
+                flapped = self.states_setter[portid](state)
+                self.flap_counter[portid] += flapped
+                changed = changed or flapped
+            if changed:
+                self.group_generation += 1
+            generation = self.group_generation
+            forwarding_state = self.query_forwarding_state(portids)
+        self._flush_upstream_ecmp_group(generation)
+        return forwarding_state
 
     def query_forwarding_state(self, portids):
         """Query forwarding state."""
@@ -652,6 +694,14 @@ class OVSBridge(object):
         """Set drop on a link."""
         logging.info("Set drop on bridge %s: portids=%s, directions=%s, recover=%s"
                      % (self.bridge_name, portids, directions, recover))
+        if not recover:
+            for direction in directions:
+                if direction not in (0, 1):
+                    raise ValueError("Invalid direction %s, please use 0 for downstream and 1 for upstream"
+                                     % (direction))
+        # the modified flows are written with one ovs-ofctl call, the upstream ecmp group once at the end
+        modified_flows = []
+        group_modified = False
         with self.lock:
             result = []
             for portid, direction in zip(portids, directions):
@@ -663,8 +713,7 @@ class OVSBridge(object):
                     # recover downstream
                     if downstream_flow.drop:
                         downstream_flow.set_drop(recover=recover)
-                        OVSCommand.ovs_ofctl_mod_flow(
-                            self.bridge_name, downstream_flow)
+                        modified_flows.append(downstream_flow)
 
                     # recover upstream
                     # recover upstream traffic from server NiC
@@ -672,116 +721,103 @@ class OVSBridge(object):
                         if self.upstream_upper_tor_nic_flow.get_drop(portid):
                             self.upstream_upper_tor_nic_flow.set_drop(
                                 portid=portid, recover=recover)
-                            OVSCommand.ovs_ofctl_mod_flow(
-                                self.bridge_name, self.upstream_upper_tor_nic_flow)
+                            modified_flows.append(self.upstream_upper_tor_nic_flow)
                     if self.upstream_lower_tor_nic_flow.get_port_enable(portid):
                         if self.upstream_lower_tor_nic_flow.get_drop(portid):
                             self.upstream_lower_tor_nic_flow.set_drop(
                                 portid=portid, recover=recover)
-                            OVSCommand.ovs_ofctl_mod_flow(
-                                self.bridge_name, self.upstream_lower_tor_nic_flow)
+                            modified_flows.append(self.upstream_lower_tor_nic_flow)
                     if self.upstream_nic_flow.get_drop(portid):
                         self.upstream_nic_flow.set_drop(
                             portid=portid, recover=recover)
-                        OVSCommand.ovs_ofctl_mod_flow(
-                            self.bridge_name, self.upstream_nic_flow)
+                        modified_flows.append(self.upstream_nic_flow)
                     # recover upstream loopback2 traffic from ptf
                     if self.upstream_loopback2_flow.get_drop(portid):
                         self.upstream_loopback2_flow.set_drop(
                             portid=portid, recover=recover)
-                        OVSCommand.ovs_ofctl_mod_flow(
-                            self.bridge_name, self.upstream_loopback2_flow)
+                        modified_flows.append(self.upstream_loopback2_flow)
                     # recover upstream upper ToR loopback3 traffic from ptf
                     if self.upstream_upper_tor_loopback3_flow.get_drop(portid):
                         self.upstream_upper_tor_loopback3_flow.set_drop(
                             portid=portid, recover=recover)
-                        OVSCommand.ovs_ofctl_mod_flow(
-                            self.bridge_name, self.upstream_upper_tor_loopback3_flow)
+                        modified_flows.append(self.upstream_upper_tor_loopback3_flow)
                     # recover upstream lower ToR loopback3 traffic from ptf
                     if self.upstream_lower_tor_loopback3_flow.get_drop(portid):
                         self.upstream_lower_tor_loopback3_flow.set_drop(
                             portid=portid, recover=recover)
-                        OVSCommand.ovs_ofctl_mod_flow(
-                            self.bridge_name, self.upstream_lower_tor_loopback3_flow)
+                        modified_flows.append(self.upstream_lower_tor_loopback3_flow)
                     # recover upstream arp traffic from ptf
                     if self.upstream_arp_flow.get_drop(portid):
                         self.upstream_arp_flow.set_drop(
                             portid=portid, recover=recover)
-                        OVSCommand.ovs_ofctl_mod_flow(
-                            self.bridge_name, self.upstream_arp_flow)
+                        modified_flows.append(self.upstream_arp_flow)
                     # recover upstream icmpv6 traffic from ptf
                     if self.upstream_icmpv6_flow.get_drop(portid):
                         self.upstream_icmpv6_flow.set_drop(
                             portid=portid, recover=recover)
-                        OVSCommand.ovs_ofctl_mod_flow(
-                            self.bridge_name, self.upstream_icmpv6_flow)
+                        modified_flows.append(self.upstream_icmpv6_flow)
 
                     forwarding_state = forwarding_state_getter()
                     if forwarding_state == ForwardingState.STANDBY:
                         forwarding_state_setter(ForwardingState.ACTIVE)
-                        OVSCommand.ovs_ofctl_mod_groups(
-                            self.bridge_name, self.upstream_ecmp_group)
+                        group_modified = True
                 else:
                     if direction == 0:
                         # downstream
                         if not downstream_flow.drop:
                             downstream_flow.set_drop()
-                            OVSCommand.ovs_ofctl_mod_flow(
-                                self.bridge_name, downstream_flow)
+                            modified_flows.append(downstream_flow)
                     elif direction == 1:
                         # upstream
                         # drop upstream traffic from server NiC
                         if self.upstream_upper_tor_nic_flow.get_port_enable(portid):
                             if not self.upstream_upper_tor_nic_flow.get_drop(portid):
                                 self.upstream_upper_tor_nic_flow.set_drop(portid)
-                                OVSCommand.ovs_ofctl_mod_flow(
-                                    self.bridge_name, self.upstream_upper_tor_nic_flow)
+                                modified_flows.append(self.upstream_upper_tor_nic_flow)
                         if self.upstream_lower_tor_nic_flow.get_port_enable(portid):
                             if not self.upstream_lower_tor_nic_flow.get_drop(portid):
                                 self.upstream_lower_tor_nic_flow.set_drop(portid)
-                                OVSCommand.ovs_ofctl_mod_flow(
-                                    self.bridge_name, self.upstream_lower_tor_nic_flow)
+                                modified_flows.append(self.upstream_lower_tor_nic_flow)
                         if not self.upstream_nic_flow.get_drop(portid):
                             self.upstream_nic_flow.set_drop(portid)
-                            OVSCommand.ovs_ofctl_mod_flow(
-                                self.bridge_name, self.upstream_nic_flow)
+                            modified_flows.append(self.upstream_nic_flow)
                         # drop upstream loopback2 traffic from ptf
                         if not self.upstream_loopback2_flow.get_drop(portid):
                             self.upstream_loopback2_flow.set_drop(portid)
-                            OVSCommand.ovs_ofctl_mod_flow(
-                                self.bridge_name, self.upstream_loopback2_flow)
+                            modified_flows.append(self.upstream_loopback2_flow)
                         # drop upstream upper ToR loopback3 traffic from ptf
                         if not self.upstream_upper_tor_loopback3_flow.get_drop(portid):
                             self.upstream_upper_tor_loopback3_flow.set_drop(portid)
-                            OVSCommand.ovs_ofctl_mod_flow(
-                                self.bridge_name, self.upstream_upper_tor_loopback3_flow)
+                            modified_flows.append(self.upstream_upper_tor_loopback3_flow)
                         # drop upstream lower ToR loopback3 traffic from ptf
                         if not self.upstream_lower_tor_loopback3_flow.get_drop(portid):
                             self.upstream_lower_tor_loopback3_flow.set_drop(portid)
-                            OVSCommand.ovs_ofctl_mod_flow(
-                                self.bridge_name, self.upstream_lower_tor_loopback3_flow)
+                            modified_flows.append(self.upstream_lower_tor_loopback3_flow)
                         # drop upstream arp traffic from ptf
                         if not self.upstream_arp_flow.get_drop(portid):
                             self.upstream_arp_flow.set_drop(portid)
-                            OVSCommand.ovs_ofctl_mod_flow(
-                                self.bridge_name, self.upstream_arp_flow)
+                            modified_flows.append(self.upstream_arp_flow)
                         # drop upstream icmpv6 traffic from ptf
                         if not self.upstream_icmpv6_flow.get_drop(portid):
                             self.upstream_icmpv6_flow.set_drop(portid)
-                            OVSCommand.ovs_ofctl_mod_flow(
-                                self.bridge_name, self.upstream_icmpv6_flow)
+                            modified_flows.append(self.upstream_icmpv6_flow)
 
                         forwarding_state = forwarding_state_getter()
                         # use set forwarding state to standby to simulator link drop
                         if forwarding_state == ForwardingState.ACTIVE:
                             forwarding_state_setter(ForwardingState.STANDBY)
-                            OVSCommand.ovs_ofctl_mod_groups(
-                                self.bridge_name, self.upstream_ecmp_group)
+                            group_modified = True
                     else:
                         raise ValueError("Invalid direction %s, please use 0 for downstream and 1 for upstream"
                                          % (direction))
                 result.append(True)
-            return result
+            if modified_flows:
+                OVSCommand.ovs_ofctl_mod_flows(self.bridge_name, list(dict.fromkeys(modified_flows)))
+            if group_modified:
+                self.group_generation += 1
+            generation = self.group_generation
+        self._flush_upstream_ecmp_group(generation)
+        return result
 
     def query_flap_counter(self, portids):
         """Query flap counter."""
@@ -958,6 +994,43 @@ class NiCServer(nic_simulator_grpc_service_pb2_grpc.DualToRActiveServicer):
             timeout=timeout, suppress_exception=suppress_exception)
 
 
+class RPCLatencyStats(object):
+    """Latency statistics of the RPCs of the management server."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def record(self, rpc_name, fan_out, latency_ms, slowest_nic_latency_ms):
+        """Record the latency of a call of an RPC to `fan_out` NiC servers."""
+        with self.lock:
+            stats = self.stats.setdefault(rpc_name, {
+                "count": 0,
+                "nic_calls": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "last_ms": 0.0,
+                "max_nic_ms": 0.0
+            })
+            stats["count"] += 1
+            stats["nic_calls"] += fan_out
+            stats["total_ms"] += latency_ms
+            stats["max_ms"] = max(stats["max_ms"], latency_ms)
+            stats["last_ms"] = latency_ms
+            stats["max_nic_ms"] = max(stats["max_nic_ms"], slowest_nic_latency_ms)
+
+    def to_dict(self):
+        with self.lock:
+            result = {}
+            for rpc_name, stats in self.stats.items():
+                result[rpc_name] = dict(stats)
+                result[rpc_name]["avg_ms"] = stats["total_ms"] / stats["count"]
+            return result
+
+    def dump(self):
+        logging.info("RPC latency statistics:\n%s", json.dumps(self.to_dict(), indent=4, sort_keys=True))
+
+
 class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServicer):
     """Management gRPC server to interact with sonic-mgmt."""
 
@@ -966,40 +1039,89 @@ class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServ
         self.binding_port = binding_port
         self.nic_servers = nic_servers
         self.client_stubs = {}
+        self.client_stubs_lock = threading.Lock()
+        self.latency_stats = RPCLatencyStats()
         self.server = None
 
     def _get_client_stub(self, nic_address):
-        if nic_address in self.client_stubs:
-            client_stub = self.client_stubs[nic_address]
-        else:
-            client_stub = nic_simulator_grpc_service_pb2_grpc.DualToRActiveStub(
-                grpc.insecure_channel(
-                    "%s:%s" % (nic_address, self.binding_port),
-                    options=GRPC_CLIENT_OPTIONS
+        with self.client_stubs_lock:
+            if nic_address in self.client_stubs:
+                client_stub = self.client_stubs[nic_address]
+            else:
+                client_stub = nic_simulator_grpc_service_pb2_grpc.DualToRActiveStub(
+                    grpc.insecure_channel(
+                        "%s:%s" % (nic_address, self.binding_port),
+                        options=GRPC_CLIENT_OPTIONS
+                    )
                 )
-            )
-            self.client_stubs[nic_address] = client_stub
-        return client_stub
+                self.client_stubs[nic_address] = client_stub
+            return client_stub
+
+    def _fan_out(self, rpc_name, nic_addresses, requests, timeout, context):
+        """
+        Call an RPC of the NiC servers concurrently, each call has its own deadline of `timeout` seconds,
+        capped by the deadline of the management call.
+
+        The latency of the call is recorded and returned to the client in the trailing metadata:
+        fan-out-latency-ms, slowest-nic and slowest-nic-latency-ms.
+
+        Returns:
+            The replies of the NiC servers in the order of nic_addresses, None if a call failed, in which case
+            the status of the management call is set to ABORTED.
+        """
+        time_remaining = context.time_remaining()
+        if time_remaining is not None:
+            timeout = max(min(timeout, time_remaining), 0)
+        start = time.monotonic()
+        nic_latencies = {}
+
+        def _record_nic_latency(nic_address, call_start):
+            def _done(_):
+                nic_latencies[nic_address] = (time.monotonic() - call_start) * 1000
+            return _done
+
+        calls = []
+        for nic_address, nic_request in zip(nic_addresses, requests):
+            call_start = time.monotonic()
+            call = getattr(self._get_client_stub(nic_address), rpc_name).future(nic_request, timeout=timeout)
+            call.add_done_callback(_record_nic_latency(nic_address, call_start))
+            calls.append((nic_address, call))
+
+        replies = []
+        error = None
+        for nic_address, call in calls:
+            try:
+                replies.append(call.result())
+            except Exception as e:
+                if error is None:
+                    error = "Error in %s to %s: %s" % (rpc_name, nic_address, repr(e))
+        latency_ms = (time.monotonic() - start) * 1000
+
+        slowest_nic, slowest_nic_latency_ms = max(nic_latencies.items(), key=lambda _: _[1], default=("", 0.0))
+        self.latency_stats.record(rpc_name, len(calls), latency_ms, slowest_nic_latency_ms)
+        logging.info("%s[mgmt]: %d NiC servers in %.3fms, slowest %s in %.3fms",
+                     rpc_name, len(calls), latency_ms, slowest_nic, slowest_nic_latency_ms)
+        context.set_trailing_metadata((
+            ("fan-out-latency-ms", "%.3f" % latency_ms),
+            ("slowest-nic", slowest_nic),
+            ("slowest-nic-latency-ms", "%.3f" % slowest_nic_latency_ms)
+        ))
+
+        if error is not None:
+            context.set_code(grpc.StatusCode.ABORTED)
+            context.set_details(error)
+            return None
+        return replies
 
     def QueryAdminForwardingPortState(self, request, context):
         nic_addresses = request.nic_addresses
         admin_requests = request.admin_requests
         logging.debug(
             "QueryAdminForwardingPortState[mgmt]: request query admin port state for %s\n", nic_addresses)
-        query_responses = []
-        for nic_address, admin_request in zip(nic_addresses, admin_requests):
-            client_stub = self._get_client_stub(nic_address)
-            try:
-                state = client_stub.QueryAdminForwardingPortState(
-                    admin_request,
-                    timeout=GRPC_TIMEOUT
-                )
-                query_responses.append(state)
-            except Exception as e:
-                context.set_code(grpc.StatusCode.ABORTED)
-                context.set_details(
-                    "Error in QueryAdminForwardingPortState to %s: %s" % (nic_address, repr(e)))
-                return nic_simulator_grpc_mgmt_service_pb2.ListOfAdminReply()
+        query_responses = self._fan_out("QueryAdminForwardingPortState", nic_addresses, admin_requests,
+                                        GRPC_TIMEOUT, context)
+        if query_responses is None:
+            return nic_simulator_grpc_mgmt_service_pb2.ListOfAdminReply()
         response = nic_simulator_grpc_mgmt_service_pb2.ListOfAdminReply(
             nic_addresses=nic_addresses,
             admin_replies=query_responses
@@ -1013,20 +1135,10 @@ class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServ
         admin_requests = request.admin_requests
         logging.debug(
             "SetAdminForwardingPortState[mgmt]: request set admin port state: %s\n", request)
-        set_responses = []
-        for nic_address, admin_request in zip(nic_addresses, admin_requests):
-            client_stub = self._get_client_stub(nic_address)
-            try:
-                state = client_stub.SetAdminForwardingPortState(
-                    admin_request,
-                    timeout=GRPC_TIMEOUT
-                )
-                set_responses.append(state)
-            except Exception as e:
-                context.set_code(grpc.StatusCode.ABORTED)
-                context.set_details(
-                    "Error in SetAdminForwardingPortState to %s: %s" % (nic_address, repr(e)))
-                return nic_simulator_grpc_mgmt_service_pb2.ListOfAdminRequest()
+        set_responses = self._fan_out("SetAdminForwardingPortState", nic_addresses, admin_requests,
+                                      GRPC_TIMEOUT, context)
+        if set_responses is None:
+            return nic_simulator_grpc_mgmt_service_pb2.ListOfAdminRequest()
         response = nic_simulator_grpc_mgmt_service_pb2.ListOfAdminReply(
             nic_addresses=nic_addresses,
             admin_replies=set_responses
@@ -1042,20 +1154,9 @@ class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServ
         nic_addresses = request.nic_addresses
         drop_requests = request.drop_requests
         logging.debug("SetDrop[mgmt]: request set drop: %s\n", request)
-        set_drop_responses = []
-        for nic_address, drop_request in zip(nic_addresses, drop_requests):
-            client_stub = self._get_client_stub(nic_address)
-            try:
-                set_drop_response = client_stub.SetDrop(
-                    drop_request,
-                    timeout=10
-                )
-                set_drop_responses.append(set_drop_response)
-            except Exception as e:
-                context.set_code(grpc.StatusCode.ABORTED)
-                context.set_details("Error in SetDrop to %s: %s" %
-                                    (nic_address, repr(e)))
-                return nic_simulator_grpc_mgmt_service_pb2.ListOfDropReply()
+        set_drop_responses = self._fan_out("SetDrop", nic_addresses, drop_requests, GRPC_SET_DROP_TIMEOUT, context)
+        if set_drop_responses is None:
+            return nic_simulator_grpc_mgmt_service_pb2.ListOfDropReply()
         response = nic_simulator_grpc_mgmt_service_pb2.ListOfDropReply(
             nic_addresses=nic_addresses,
             drop_replies=set_drop_responses
@@ -1110,20 +1211,10 @@ class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServ
         logging.debug(
             "QueryFlapCounter[mgmt]: request query port flap counter for %s\n", nic_addresses)
 
-        query_responses = []
-        for nic_address, flap_counter_request in zip(nic_addresses, flap_counter_requests):
-            client_stub = self._get_client_stub(nic_address)
-            try:
-                flap_counter_reply = client_stub.QueryFlapCounter(
-                    flap_counter_request,
-                    timeout=GRPC_TIMEOUT
-                )
-                query_responses.append(flap_counter_reply)
-            except Exception as e:
-                context.set_code(grpc.StatusCode.ABORTED)
-                context.set_details(
-                    "Error in QueryFlapCounter to %s: %s" % (nic_address, repr(e)))
-                return nic_simulator_grpc_mgmt_service_pb2.ListOfFlapCounterReply()
+        query_responses = self._fan_out("QueryFlapCounter", nic_addresses, flap_counter_requests,
+                                        GRPC_TIMEOUT, context)
+        if query_responses is None:
+            return nic_simulator_grpc_mgmt_service_pb2.ListOfFlapCounterReply()
 
         response = nic_simulator_grpc_mgmt_service_pb2.ListOfFlapCounterReply(
             nic_addresses=nic_addresses,
@@ -1139,20 +1230,10 @@ class MgmtServer(nic_simulator_grpc_mgmt_service_pb2_grpc.DualTorMgmtServiceServ
         logging.debug(
             "ResetFlapCounter[mgmt]: request reset port flap counter for %s\n", nic_addresses)
 
-        reset_responses = []
-        for nic_address, flap_counter_request in zip(nic_addresses, flap_counter_requests):
-            client_stub = self._get_client_stub(nic_address)
-            try:
-                flap_counter_reply = client_stub.ResetFlapCounter(
-                    flap_counter_request,
-                    timeout=GRPC_TIMEOUT
-                )
-                reset_responses.append(flap_counter_reply)
-            except Exception as e:
-                context.set_code(grpc.StatusCode.ABORTED)
-                context.set_details(
-                    "Error in ResetFlapCounter to %s: %s" % (nic_address, repr(e)))
-                return nic_simulator_grpc_mgmt_service_pb2.ListOfFlapCounterReply()
+        reset_responses = self._fan_out("ResetFlapCounter", nic_addresses, flap_counter_requests,
+                                        GRPC_TIMEOUT, context)
+        if reset_responses is None:
+            return nic_simulator_grpc_mgmt_service_pb2.ListOfFlapCounterReply()
 
         response = nic_simulator_grpc_mgmt_service_pb2.ListOfFlapCounterReply(
             nic_addresses=nic_addresses,
@@ -1331,6 +1412,8 @@ def main():
         raise ValueError("Invalid loopback ips: {loopback_ips}".format(loopback_ips=loopback_ips))
     nic_simulator = NiCSimulator(args.vm_set, "mgmt", args.port, loopback_ips, args.duplicate_nic_upstream)
     nic_simulator.start_nic_servers()
+    # kill -USR1 logs the latency statistics of the management RPCs
+    signal.signal(signal.SIGUSR1, lambda signum, frame: nic_simulator.mgmt_server.latency_stats.dump())
     try:
         nic_simulator.start_mgmt_server()
     except KeyboardInterrupt:
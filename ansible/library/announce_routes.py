@@ -67,6 +67,11 @@ TOR_ASN_START = 65500
 IPV4_BASE_PORT = 5000
 IPV6_BASE_PORT = 6000
 
+# Number of routes uploaded to the exabgp http api in one request of the streaming path
+ROUTE_CHUNK_SIZE = 10000
+# Max number of route sets sent to the PTF at the same time
+MAX_PARALLEL_ROUTE_SETS = 8
+
 # Describe default number of COLOs
 COLO_NUMBER = 30
 # Describe default number of M0 devices in 1 colo
@@ -137,7 +142,7 @@ def read_topo(topo_name, path):
         return {}
 
 
-def change_routes(action, ptf_ip, port, routes):
+def format_route_commands(action, routes):
     messages = []
     for prefix, nexthop, aspath in routes:
         if aspath:
@@ -146,11 +151,10 @@ def change_routes(action, ptf_ip, port, routes):
         else:
             messages.append(
                 "{} route {} next-hop {}".format(action, prefix, nexthop))
-    wait_for_http(ptf_ip, port, timeout=60)
-    url = "http://%s:%d" % (ptf_ip, port)
-    data = {"commands": ";".join(messages)}
-    # nosemgrep-next-line
-    r = requests.post(url, data=data, timeout=360, proxies={"http": None, "https": None})
+    return messages
+
+
+def check_response(r, url, data):
     if r.status_code != 200:
         raise Exception(
             "Change routes failed: url={}, data={}, r.status_code={}, r.reason={}, r.headers={}, r.text={}".format(
@@ -164,33 +168,72 @@ def change_routes(action, ptf_ip, port, routes):
         )
 
 
+def stream_routes(session, url, messages):
+    """
+    Uploads route commands as newline delimited text in chunks of ROUTE_CHUNK_SIZE commands.
+
+    Returns:
+        False if the http api has no streaming endpoint, True otherwise.
+    """
+    url = url + "/stream"
+    for start in range(0, len(messages), ROUTE_CHUNK_SIZE):
+        chunk = messages[start:start + ROUTE_CHUNK_SIZE]
+        # nosemgrep-next-line
+        r = session.post(url, data="\n".join(chunk) + "\n", timeout=360, proxies={"http": None, "https": None},
+                         headers={"Content-Type": "text/plain"})
+        if start == 0 and r.status_code in (404, 405):
+            return False
+        check_response(r, url, {"commands": chunk[0] + "\n..."})
+    return True
+
+
+def change_routes(action, ptf_ip, port, routes):
+    """
+    Announces or withdraws routes through the exabgp http api listening on the given port of the PTF.
+
+    The routes are uploaded in chunks over one HTTP session and the http api passes them to exabgp while receiving
+    them. If the http api was started by an older version of the exabgp module and has no streaming endpoint,
+    all the routes are sent in a single form field.
+    """
+    messages = format_route_commands(action, routes)
+    wait_for_http(ptf_ip, port, timeout=60)
+    url = "http://%s:%d" % (ptf_ip, port)
+    with requests.Session() as session:
+        if messages and stream_routes(session, url, messages):
+            return
+
+        data = {"commands": ";".join(messages)}
+        # nosemgrep-next-line
+        r = session.post(url, data=data, timeout=360, proxies={"http": None, "https": None})
+        check_response(r, url, data)
+
+
 def send_routes_for_each_set(args):
     routes, port, action, ptf_ip = args
     change_routes(action, ptf_ip, port, routes)
 
 
-def send_routes_in_parallel(route_set):
+def send_routes_in_parallel(route_set, max_parallel=MAX_PARALLEL_ROUTE_SETS):
     """
     Sends the given set of routes in parallel using a thread pool.
 
     Args:
         route_set (list): A list of route sets to send.
+        max_parallel (int): Max number of route sets sent at the same time.
 
     Returns:
         None
     """
-    # Create a pool of worker processes
-    pool = ThreadPool(processes=len(route_set))
+    if not route_set:
+        return
 
-    # Use the ThreadPool.map function to apply the function to each set of routes
-    results = pool.map(send_routes_for_each_set, route_set)
+    # Create a pool of worker threads, bounded to not overload the http api processes of the PTF
+    pool = ThreadPool(processes=min(len(route_set), max_parallel))
 
-    # Optionally, process the results
-    for result in results:
-        # Process individual results here
-        pass
+    # Use the ThreadPool.map function to apply the function to each set of routes
+    pool.map(send_routes_for_each_set, route_set)
 
-    # Close the pool and wait for all processes to complete
+    # Close the pool and wait for all threads to complete
     pool.close()
     pool.join()
 
@@ -1,5 +1,10 @@
 #!/usr/bin/env python
 import csv
+import hashlib
+import inspect
+import json
+import sys
+import tempfile
 
 from ansible.module_utils.basic import AnsibleModule
 import yaml
@@ -17,7 +22,6 @@ try:
     from ansible.module_utils.debug_utils import config_module_logging
 except ImportError:
     # Add parent dir for using outside Ansible
-    import sys
     sys.path.append('..')
     from module_utils.port_utils import get_port_alias_to_name_map
     from module_utils.debug_utils import config_module_logging
@@ -56,6 +60,13 @@ options:
         host/hosts/anchor information.
         required: False
 
+    use_cache:
+        Keep the graph facts of the groups in the .conn_graph_cache folder next to the csv files, and build
+        them again only when the csv files of the group change. Looking up the group of the hosts then only
+        reads the cached hostnames of the groups, and the graph facts of the matching group.
+        required: False
+        default: True
+
     Mutually exclusive options: host, hosts, anchor
 
 Ansible_facts:
@@ -112,6 +123,10 @@ EXAMPLES = '''
 
 LAB_GRAPHFILE_PATH = "files/"
 LAB_GRAPH_GROUPS_FILE = "graph_groups.yml"
+LAB_GRAPH_CACHE_DIR = ".conn_graph_cache"
+# Bump when the format of the cache changes, the changes of this module and of port_utils are found by
+# code_signature()
+LAB_GRAPH_CACHE_VERSION = 2
 
 
 class LabGraph(object):
@@ -124,7 +139,7 @@ class LabGraph(object):
         "bmc_links": "sonic_{}_bmc_links.csv",
     }
 
-    def __init__(self, path, group):
+    def __init__(self, path, group, graph_facts=None):
         self.path = path
         self.group = group
         self.csv_files = {k: os.path.join(self.path, v.format(group)) for k, v in self.SUPPORTED_CSV_FILES.items()}
@@ -133,9 +148,13 @@ class LabGraph(object):
         self._cache_port_name_to_alias = {}
 
         self.csv_facts = {}
-        self.read_csv_files()
-
         self.graph_facts = {}
+        if graph_facts is not None:
+            # Graph facts built before from the same csv files, see LabGraphCache
+            self.graph_facts = graph_facts
+            return
+
+        self.read_csv_files()
         self.csv_to_graph_facts()
 
     def read_csv_files(self):
@@ -499,13 +518,144 @@ class LabGraph(object):
         return (True, results)
 
 
-def find_graph(hostnames, part=False):
+def module_source(module):
+    """Returns the source of a module, read through its loader by its real name when the loader has one
+
+    Ansible runs the module as __main__ from the zip of the AnsiballZ payload, which inspect.getsource() cannot read
+    since the zip has no __main__ module. The loader of the zip still gives the source by the name of the module.
+    """
+    spec = getattr(module, "__spec__", None)
+    loader = getattr(module, "__loader__", None)
+    if spec is not None and hasattr(loader, "get_source"):
+        source = loader.get_source(spec.name)
+        if source:
+            return source
+    return inspect.getsource(module)
+
+
+def code_signature():
+    """Returns the hash of the source of the code building the graph facts, None if the source is not available
+
+    The graph facts depend on this module and on port_utils, which converts the port aliases of the hwskus to
+    port names. Their files are not used, they are extracted to a new temporary folder for every Ansible run.
+    """
+    digest = hashlib.sha1()
+    for module_name in (__name__, get_port_alias_to_name_map.__module__):
+        try:
+            digest.update(module_source(sys.modules[module_name]).encode("utf-8"))
+        except (IOError, OSError, TypeError, KeyError, ImportError) as e:
+            logging.debug("Source of {} not available: {}".format(module_name, repr(e)))
+            return None
+    return digest.hexdigest()
+
+
+class LabGraphCache(object):
+    """Graph facts of the groups, cached in the LAB_GRAPH_CACHE_DIR folder next to the csv files
+
+    index.json maps every group to the signature (size and mtime) of its csv files and of the code building the
+    graph facts, and to its hostnames, which is enough to find the group of hosts. <group>.json keeps the graph
+    facts of the group with the signature they were built with. Stale entries are built again from the csv files.
+    Writing the cache is best effort, a read-only folder only makes every lookup build the graph from the csv
+    files. Nothing is cached when the source of the code is not available.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, path):
+        self.path = path
+        self.cache_dir = os.path.join(path, LAB_GRAPH_CACHE_DIR)
+        self.code_signature = code_signature()
+        self.index = self._load(self.INDEX_FILE) if self.code_signature else None
+        if not self.index or self.index.get("version") != LAB_GRAPH_CACHE_VERSION:
+            self.index = {"version": LAB_GRAPH_CACHE_VERSION, "groups": {}}
+        self.index_changed = False
+        self.lab_graphs = {}
+
+    def _load(self, name):
+        try:
+            with open(os.path.join(self.cache_dir, name)) as fd:
+                return json.load(fd)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _save(self, name, data):
+        # Written to a temporary file and renamed, concurrent readers only see complete files
+        try:
+            if not os.path.isdir(self.cache_dir):
+                try:
+                    os.makedirs(self.cache_dir)
+                except OSError:
+                    if not os.path.isdir(self.cache_dir):
+                        raise
+            fd, tmp_file = tempfile.mkstemp(dir=self.cache_dir, prefix=name)
+            with os.fdopen(fd, "w") as f:
+                # json.dumps uses the C encoder, json.dump does not
+                f.write(json.dumps(data))
+            os.rename(tmp_file, os.path.join(self.cache_dir, name))
+        except (IOError, OSError) as e:
+            logging.debug("Failed to save {} in graph cache {}: {}".format(name, self.cache_dir, repr(e)))
+
+    def signature(self, group):
+        signature = {"code": self.code_signature}
+        for k, v in LabGraph.SUPPORTED_CSV_FILES.items():
+            try:
+                st = os.stat(os.path.join(self.path, v.format(group)))
+                signature[k] = [st.st_size, st.st_mtime]
+            except OSError:
+                signature[k] = None
+        return signature
+
+    def _update_index(self, group, signature, lab_graph):
+        if not self.code_signature:
+            return
+        entry = {"signature": signature, "hostnames": sorted(lab_graph.graph_facts["devices"].keys())}
+        if self.index["groups"].get(group) != entry:
+            self.index["groups"][group] = entry
+            self.index_changed = True
+
+    def get(self, group):
+        """Returns the LabGraph of the group, with the cached graph facts if they are up to date"""
+        if group in self.lab_graphs:
+            return self.lab_graphs[group]
+        signature = self.signature(group)
+        cached = self._load("{}.json".format(group)) if self.code_signature else None
+        if cached and cached.get("version") == LAB_GRAPH_CACHE_VERSION and cached.get("signature") == signature:
+            logging.debug("Using cached graph facts of group {}".format(group))
+            lab_graph = LabGraph(self.path, group, graph_facts=cached["graph_facts"])
+        else:
+            lab_graph = LabGraph(self.path, group)
+            if self.code_signature:
+                self._save("{}.json".format(group), {
+                    "version": LAB_GRAPH_CACHE_VERSION,
+                    "signature": signature,
+                    "graph_facts": lab_graph.graph_facts
+                })
+        self._update_index(group, signature, lab_graph)
+        self.lab_graphs[group] = lab_graph
+        return lab_graph
+
+    def hostnames(self, group):
+        """Returns the hostnames of the group, from the index if it is up to date"""
+        entry = self.index["groups"].get(group)
+        if entry and entry["signature"] == self.signature(group):
+            return set(entry["hostnames"])
+        return set(self.get(group).graph_facts["devices"].keys())
+
+    def save_index(self):
+        if self.index_changed:
+            self._save(self.INDEX_FILE, self.index)
+            self.index_changed = False
+
+
+def find_graph(hostnames, part=False, use_cache=False):
     """Find the graph file for the target device
 
     Args:
         hostnames (list): List of hostnames
         part (bool, optional): Select the graph file if over 80% of hosts are found in conn_graph when part is True.
                                Defaults to False.
+        use_cache (bool, optional): Find the group with the cached hostnames of the groups, and return the cached
+                                    graph facts of the group when they are up to date. Defaults to False.
 
     Returns:
         obj: Instance of LabGraph or None if no graph file is found.
@@ -514,12 +664,17 @@ def find_graph(hostnames, part=False):
     with open(graph_group_file) as fd:
         graph_groups = yaml.safe_load(fd)
 
+    cache = LabGraphCache(LAB_GRAPHFILE_PATH) if use_cache else None
     target_graph = None
     target_group = None
     for group in graph_groups:
         logging.debug("Looking at graph files of group {} for hosts {}".format(group, hostnames))
-        lab_graph = LabGraph(LAB_GRAPHFILE_PATH, group)
-        graph_hostnames = set(lab_graph.graph_facts["devices"].keys())
+        lab_graph = None
+        if cache:
+            graph_hostnames = cache.hostnames(group)
+        else:
+            lab_graph = LabGraph(LAB_GRAPHFILE_PATH, group)
+            graph_hostnames = set(lab_graph.graph_facts["devices"].keys())
         logging.debug("For graph group {}, got hostnames {}".format(group, graph_hostnames))
 
         if not part:
@@ -535,6 +690,11 @@ def find_graph(hostnames, part=False):
                 target_group = group
                 break
 
+    if cache:
+        if target_group is not None:
+            target_graph = cache.get(target_group)
+        cache.save_index()
+
     if target_graph is not None:
         logging.debug("Returning lab graph of group {} for hosts {}".format(target_group, hostnames))
 
@@ -550,6 +710,7 @@ def main():
             group=dict(required=False),
             anchor=dict(required=False, type='list'),
             ignore_errors=dict(required=False, type='bool', default=False),
+            use_cache=dict(required=False, type='bool', default=True),
         ),
         mutually_exclusive=[['host', 'hosts', 'anchor']],
         supports_check_mode=True
@@ -572,14 +733,18 @@ def main():
             global LAB_GRAPHFILE_PATH
             LAB_GRAPHFILE_PATH = m_args['filepath']
 
-        if m_args["group"]:
+        if m_args["group"] and m_args["use_cache"]:
+            cache = LabGraphCache(LAB_GRAPHFILE_PATH)
+            lab_graph = cache.get(m_args["group"])
+            cache.save_index()
+        elif m_args["group"]:
             lab_graph = LabGraph(LAB_GRAPHFILE_PATH, m_args["group"])
         else:
             # When calling passed in anchor instead of hostnames,
             # the caller is asking to return the whole graph. This
             # is needed when configuring the root fanout switch.
             target = anchor if anchor else hostnames
-            lab_graph = find_graph(target)
+            lab_graph = find_graph(target, use_cache=m_args["use_cache"])
 
         if not lab_graph:
             results = {
@@ -55,6 +55,8 @@ cli.show_server_banner = lambda *x: None
 
 app = Flask(__name__)
 
+STREAM_BLOCK_SIZE = 65536
+
 # Setup a command route to listen for prefix advertisements
 @app.route('/', methods=['POST'])
 def run_command():
@@ -67,6 +69,24 @@ def run_command():
     sys.stdout.flush()
     return "OK\\n"
 
+# Newline delimited commands in the request body, passed to exabgp while the body is being received
+@app.route('/stream', methods=['POST'])
+def run_stream():
+    count = 0
+    partial = b''
+    while True:
+        block = request.stream.read(STREAM_BLOCK_SIZE)
+        lines = (partial + block).split(b'\\n')
+        partial = lines.pop() if block else b''
+        cmds = [line.strip() for line in lines if line.strip()]
+        if cmds:
+            sys.stdout.write(b'\\n'.join(cmds).decode('utf-8') + '\\n')
+            sys.stdout.flush()
+            count += len(cmds)
+        if not block:
+            break
+    return "OK %d\\n" % count
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=sys.argv[1])
 '''
@@ -7,6 +7,7 @@ import traceback
 import logging.handlers
 import logging
 import hashlib
+import json
 import sys
 import re
 import gzip
@@ -42,6 +43,14 @@ Options:
       required: True
       Default: None
 
+    - option-name: marker_index
+      description: a marker index file written by 'loganalyzer.py --action init --marker_index'. When the
+                   start_string and the log file are found in the index, the module seeks directly to the
+                   recorded offset of the start_string and only reads the log files written after it.
+                   Otherwise it falls back to scanning all the rotated log files.
+      required: False
+      Default: None
+
 '''
 
 EXAMPLES = '''
@@ -58,6 +67,14 @@ EXAMPLES = '''
     dest: '/tmp/'
     flat: yes
 
+- name: Extract syslog entries since the LogAnalyzer start marker recorded in the marker index
+  extract_log:
+    directory: '/var/log'
+    file_prefix: 'syslog'
+    start_string: 'start-LogAnalyzer-test_bgp_fact.2023-01-01-00:00:00'
+    target_filename: '/tmp/syslog'
+    marker_index: '/tmp/loganalyzer.index'
+
 - name: Extract all sairedis.rec entries since the last reboot
   extract_log:
     directory: '/var/log/swss'
@@ -89,13 +106,15 @@ EXAMPLES = '''
 logger = logging.getLogger('ExtractLog')
 
 
+def open_log(path):
+    if 'gz' in path:
+        return gzip.open(path, mode='rt')
+    return open(path)
+
+
 def extract_lines(directory, filename, target_string):
     path = os.path.join(directory, filename)
-    file = None
-    if 'gz' in path:
-        file = gzip.open(path, mode='rt')
-    else:
-        file = open(path)
+    file = open_log(path)
     result = None
     with file:
         # This might be a gunzip file or logrotate issue, there has
@@ -216,17 +235,13 @@ def extract_latest_line_with_string(directory, filenames, start_string):
             target_lines = extracted_lines
             break
 
-    # find the latest line from traget_lines comparing by date in line
-    target = target_lines[0] if len(target_lines) > 0 else None
-    for line in target_lines:
-        if comparator(line, target) > 0:
-            target = line
-
-    if target is None:
+    if not target_lines:
         raise Exception("{} was not found in {}".format(
             start_string, directory))
 
-    return target
+    # find the latest line from traget_lines comparing by date in line,
+    # all the lines come from the same file so only the dates are compared
+    return max(target_lines, key=lambda line: convert_date(line[1], line[2]) or datetime.datetime.min)
 
 
 def calculate_files_to_copy(filenames, file_with_latest_line):
@@ -245,13 +260,7 @@ def combine_logs_and_save(directory, filenames, start_string, target_string, tar
             sz = os.path.getsize(path)
             logger.debug(
                 "extract_log combine_logs from file {} create time {}, size {}".format(path, dt, sz))
-            file = None
-            if 'gz' in path:
-                file = gzip.open(path, mode='rt')
-            else:
-                file = open(path)
-
-            with file:
+            with open_log(path) as file:
                 for line in file:
                     line_processed += 1
                     if do_copy is False:
@@ -267,10 +276,81 @@ def combine_logs_and_save(directory, filenames, start_string, target_string, tar
                 path, line_processed, line_copied))
 
 
-def extract_log(directory, prefixname, target_string, target_filename):
+def load_marker_index(marker_index, directory, prefixname, target_string):
+    """Returns the (inode, offset) recorded in @marker_index for the @target_string
+    marker in log file @prefixname, None if there is no such record"""
+    if not marker_index or not os.path.exists(marker_index):
+        return None
+
+    try:
+        with open(marker_index) as fp:
+            index = json.load(fp)
+    except ValueError:
+        logger.debug("extract_log marker index {} is corrupted".format(marker_index))
+        return None
+
+    path = os.path.realpath(os.path.join(directory, prefixname))
+    record = index.get(target_string, {}).get('files', {}).get(path)
+    if record is None:
+        return None
+
+    return record['inode'], record['offset']
+
+
+def find_file_by_inode(directory, filenames, inode):
+    for filename in filenames:
+        try:
+            if os.stat(os.path.join(directory, filename)).st_ino == inode:
+                return filename
+        except OSError:
+            continue
+
+    return None
+
+
+def extract_log_indexed(directory, filenames, target_string, target_filename, inode, offset):
+    """Copies lines starting from the latest @target_string into @target_filename in a single pass.
+    The start marker is looked for at or after @offset in the file with @inode, older log files are not read.
+    Returns False if the start marker could not be located this way"""
+    start_filename = find_file_by_inode(directory, filenames, inode)
+    if start_filename is None:
+        logger.debug("extract_log file with inode {} was rotated out".format(inode))
+        return False
+
+    found = False
+    line_copied = 0
+    with open(target_filename, 'w') as fp:
+        for filename in reversed(calculate_files_to_copy(filenames, start_filename)):
+            path = os.path.join(directory, filename)
+            with open_log(path) as file:
+                if filename == start_filename:
+                    file.seek(offset)
+                for line in file:
+                    if target_string in line and 'extract_log' not in line:
+                        # only the latest copy of the start string is used as the start tag
+                        fp.seek(0)
+                        fp.truncate()
+                        found = True
+                        line_copied = 0
+                    if found:
+                        fp.write(line)
+                        line_copied += 1
+            logger.debug("extract_log indexed from file {}, {} lines copied".format(path, line_copied))
+
+    return found
+
+
+def extract_log(directory, prefixname, target_string, target_filename, marker_index=None):
     logger.debug("extract_log for start string {}".format(
         target_string.replace("start-", "")))
     filenames = list_files(directory, prefixname)
+    record = load_marker_index(marker_index, directory, prefixname, target_string)
+    if record is not None:
+        inode, offset = record
+        logger.debug("extract_log indexed from inode {} offset {}".format(inode, offset))
+        if extract_log_indexed(directory, filenames, target_string, target_filename, inode, offset):
+            return
+        logger.debug("extract_log start string not found using index, scanning all the files")
     logger.debug("extract_log from files {}".format(filenames))
     file_with_latest_line, file_create_time, latest_line, file_size = extract_latest_line_with_string(
         directory, filenames, target_string)
@@ -293,6 +373,7 @@ def main():
             file_prefix=dict(required=True, type='str'),
             start_string=dict(required=True, type='str'),
             target_filename=dict(required=True, type='str'),
+            marker_index=dict(required=False, type='str', default=None),
         ),
         supports_check_mode=False)
 
@@ -304,7 +385,7 @@ def main():
 
     try:
         extract_log(p['directory'], p['file_prefix'],
-                    p['start_string'], p['target_filename'])
+                    p['start_string'], p['target_filename'], p['marker_index'])
     except Exception:
         tb = traceback.format_exc()
         module.fail_json(msg=tb)
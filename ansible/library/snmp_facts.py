@@ -16,6 +16,7 @@
 # along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import time
 from collections import defaultdict
 from ansible.module_utils.basic import AnsibleModule
 import six
@@ -80,6 +81,31 @@ options:
         description:
             - Encryption key, required if version is authPriv
         required: false
+    engine:
+        description:
+            - How the facts are queried. C(legacy) walks the tables one after
+              another with GETNEXT, C(bulk) walks them concurrently with GETBULK,
+              which needs SNMP version 2c or 3
+        choices: [ 'legacy', 'bulk' ]
+        default: legacy
+        required: false
+    max_repetitions:
+        description:
+            - Number of values requested per column by a GETBULK request of the bulk engine
+        default: 25
+        required: false
+    concurrency:
+        description:
+            - Number of queries the bulk engine runs at the same time
+        default: 8
+        required: false
+    tables:
+        description:
+            - Groups of facts to query, all of them by default. The facts of the
+              other groups are missing from the result
+        choices: [ 'system', 'interfaces', 'interface_counters', 'physical_entities',
+                   'sensors', 'lldp', 'pfc', 'queues', 'psu', 'cidr_route', 'memory', 'fdb' ]
+        required: false
 '''
 
 EXAMPLES = '''
@@ -96,6 +122,22 @@ EXAMPLES = '''
     username=snmp-user
     authkey=abc12345
     privkey=def6789
+
+# Gather the interface and LLDP facts only, with GETBULK
+- snmp_facts:
+    host={{ inventory_hostname }}
+    version=v2c
+    community=public
+    engine=bulk
+    tables=interfaces,lldp
+'''
+
+RETURN = '''
+snmp_walk_times:
+    description: Time taken by every query, and by all of them in total, in seconds
+    returned: always
+    type: dict
+    sample: {"interfaces": 1.52, "lldp_remote": 0.31, "total": 2.9}
 '''
 
 
@@ -107,6 +149,12 @@ try:
 except Exception:
     has_pysnmp = False
 
+try:
+    from pysnmp.hlapi import asyncore as snmp_asyncore
+    has_pysnmp_asyncore = True
+except Exception:
+    has_pysnmp_asyncore = False
+
 
 class DefineOid(object):
 
@@ -252,6 +300,156 @@ class DefineOid(object):
         self.dot1qTpFdbEntry = dp + "1.3.6.1.2.1.17.7.1.2.2.1.2"  # + .VLAN.MAC
 
 
+# Queries of the facts, in the order they are parsed: (name, group of facts, command, OIDs of DefineOid)
+SNMP_QUERIES = [
+    ('sysDescr', 'system', 'get', ['sysDescr']),
+    ('system', 'system', 'get', ['sysObjectId', 'sysUpTime', 'sysContact', 'sysName', 'sysLocation']),
+    ('interfaces', 'interfaces', 'walk', ['ifIndex', 'ifDescr', 'ifType', 'ifMtu', 'ifSpeed', 'ifPhysAddress',
+                                          'ifAdminStatus', 'ifOperStatus', 'ifHighSpeed', 'ipAdEntAddr',
+                                          'ipAdEntIfIndex', 'ipAdEntNetMask', 'ifAlias']),
+    ('interface_counters', 'interface_counters', 'walk', ['ifInDiscards', 'ifOutDiscards', 'ifInErrors',
+                                                          'ifOutErrors', 'ifHCInOctets', 'ifHCOutOctets',
+                                                          'ifInUcastPkts', 'ifOutUcastPkts']),
+    ('physical_entities', 'physical_entities', 'walk', ['entPhysDescr', 'entPhysContainedIn', 'entPhysClass',
+                                                        'entPhyParentRelPos', 'entPhysName', 'entPhysHwVer',
+                                                        'entPhysFwVer', 'entPhysSwVer', 'entPhysSerialNum',
+                                                        'entPhysMfgName', 'entPhysModelName', 'entPhysIsFRU']),
+    ('sensors', 'sensors', 'walk', ['entPhySensorType', 'entPhySensorScale', 'entPhySensorPrecision',
+                                    'entPhySensorValue', 'entPhySensorOperStatus']),
+    ('dell_cpu', 'system', 'get', ['ChStackUnitCpuUtil5sec']),
+    ('lldp_local', 'lldp', 'get', ['lldpLocChassisIdSubtype', 'lldpLocChassisId', 'lldpLocSysName',
+                                   'lldpLocSysDesc']),
+    ('lldp_local_ports', 'lldp', 'walk', ['lldpLocPortIdSubtype', 'lldpLocPortId', 'lldpLocPortDesc']),
+    ('lldp_local_management', 'lldp', 'walk', ['lldpLocManAddrLen', 'lldpLocManAddrIfSubtype',
+                                               'lldpLocManAddrIfId', 'lldpLocManAddrOID']),
+    ('lldp_remote', 'lldp', 'walk', ['lldpRemChassisIdSubtype', 'lldpRemChassisId', 'lldpRemPortIdSubtype',
+                                     'lldpRemPortId', 'lldpRemPortDesc', 'lldpRemSysName', 'lldpRemSysDesc',
+                                     'lldpRemSysCapSupported', 'lldpRemSysCapEnabled']),
+    ('lldp_remote_management', 'lldp', 'walk', ['lldpRemManAddrIfSubtype', 'lldpRemManAddrIfId',
+                                                'lldpRemManAddrOID']),
+    ('pfc', 'pfc', 'walk', ['cpfcIfRequests', 'cpfcIfIndications', 'requestsPerPriority',
+                            'indicationsPerPriority']),
+    ('queues', 'queues', 'walk', ['csqIfQosGroupStats']),
+    ('psu', 'psu', 'walk', ['cefcFRUPowerOperStatus']),
+    ('cidr_route', 'cidr_route', 'walk', ['ipCidrRouteEntry', 'ipCidrRouteStatus']),
+    ('memory', 'memory', 'get', ['sysTotalMemory', 'sysTotalFreeMemory', 'sysTotalSharedMemory',
+                                 'sysTotalBuffMemory', 'sysCachedMemory']),
+    ('swap', 'memory', 'get', ['sysTotalSwap', 'sysTotalFreeSwap']),
+    ('fdb', 'fdb', 'walk', ['dot1qTpFdbEntry'])
+]
+
+SNMP_TABLES = ['system', 'interfaces', 'interface_counters', 'physical_entities', 'sensors', 'lldp', 'pfc',
+               'queues', 'psu', 'cidr_route', 'memory', 'fdb']
+
+
+class BulkSnmpCollector(object):
+    """
+    Run the queries of the facts concurrently, with one SNMP engine.
+
+    A get query is one GET request. A walk query requests the next max_repetitions values of all its columns
+    with one GETBULK request, from the last values received, until every column has left its subtree.
+    At most concurrency queries wait for a response at the same time.
+    """
+
+    def __init__(self, auth, host, timeout, max_repetitions, concurrency):
+        self.snmp_engine = snmp_asyncore.SnmpEngine()
+        self.auth = auth
+        self.target = snmp_asyncore.UdpTransportTarget((host, 161), timeout=timeout)
+        self.context = snmp_asyncore.ContextData()
+        self.max_repetitions = max_repetitions
+        self.concurrency = concurrency
+        self.queue = []
+        self.results = {}
+        self.times = {}
+
+    def collect(self, queries):
+        """
+        Run the queries, a list of (name, command, OIDs), and return when all of them are done.
+
+        The result of a query is stored in results[name], as the (errorIndication, varBinds) of a get query
+        or the (errorIndication, varTable) of a walk query, like nextCmd and getCmd of pysnmp return them.
+        The time the query took is stored in times[name].
+        """
+        if not queries:
+            return
+        self.queue = list(queries)
+        for _ in range(self.concurrency):
+            self.start_next()
+        self.snmp_engine.transportDispatcher.runDispatcher()
+
+    def start_next(self):
+        if not self.queue:
+            return
+        name, command, oids = self.queue.pop(0)
+        query = {'name': name, 'start': time.time()}
+        if command == 'get':
+            snmp_asyncore.getCmd(self.snmp_engine, self.auth, self.target, self.context,
+                                 *[self.object_type(oid) for oid in oids],
+                                 cbFun=self.get_response, cbCtx=query, lookupMib=False)
+        else:
+            query['columns'] = [univ.ObjectIdentifier(oid) for oid in oids]
+            query['last'] = list(query['columns'])
+            query['values'] = [[] for _ in oids]
+            query['max_repetitions'] = self.max_repetitions
+            self.send_bulk(query, list(range(len(oids))))
+
+    @staticmethod
+    def object_type(oid):
+        return snmp_asyncore.ObjectType(snmp_asyncore.ObjectIdentity(oid))
+
+    def send_bulk(self, query, active):
+        query['active'] = active
+        snmp_asyncore.bulkCmd(self.snmp_engine, self.auth, self.target, self.context,
+                              0, query['max_repetitions'],
+                              *[self.object_type(query['last'][column]) for column in active],
+                              cbFun=self.bulk_response, cbCtx=query, lookupMib=False)
+
+    def get_response(self, snmpEngine, sendRequestHandle, errorIndication, errorStatus, errorIndex, varBinds,
+                     query):
+        self.finish(query, errorIndication, varBinds)
+
+    def bulk_response(self, snmpEngine, sendRequestHandle, errorIndication, errorStatus, errorIndex,
+                      varBindTable, query):
+        if errorIndication:
+            self.finish(query, errorIndication, [])
+            return
+        if errorStatus and query['max_repetitions'] > 1:
+            # Most likely tooBig, ask for fewer values
+            query['max_repetitions'] = query['max_repetitions'] // 2
+            self.send_bulk(query, query['active'])
+            return
+
+        ended = set()
+        advanced = set()
+        for varBinds in varBindTable:
+            # The last row is short if the response was truncated
+            for column, (oid, val) in zip(query['active'], varBinds):
+                if column in ended:
+                    continue
+                if isinstance(val, univ.Null) or not query['columns'][column].isPrefixOf(oid) or \
+                        oid <= query['last'][column]:
+                    ended.add(column)
+                    continue
+                query['values'][column].append((oid, val))
+                query['last'][column] = oid
+                advanced.add(column)
+
+        active = [column for column in query['active'] if column in advanced and column not in ended]
+        if active and not errorStatus:
+            self.send_bulk(query, active)
+            return
+        # Rows like the ones of nextCmd, but the columns which ended first are not padded with endOfMibView
+        columns = query['values']
+        rows = max([len(values) for values in columns] or [0])
+        varTable = [[values[row] for values in columns if row < len(values)] for row in range(rows)]
+        self.finish(query, None, varTable)
+
+    def finish(self, query, errorIndication, result):
+        self.results[query['name']] = (errorIndication, result)
+        self.times[query['name']] = time.time() - query['start']
+        self.start_next()
+
+
 def decode_hex(hexstring):
 
     if len(hexstring) < 3:
@@ -355,6 +553,10 @@ def main():
             is_dell=dict(required=False, default=False, type='bool'),
             is_eos=dict(required=False, default=False, type='bool'),
             include_swap=dict(required=False, default=False, type='bool'),
+            engine=dict(required=False, default='legacy', choices=['legacy', 'bulk']),
+            max_repetitions=dict(required=False, default=25, type='int'),
+            concurrency=dict(required=False, default=8, type='int'),
+            tables=dict(required=False, type='list', choices=SNMP_TABLES),
             removeplaceholder=dict(required=False)),
         required_together=(['username', 'level', 'integrity', 'authkey'], [
                            'privacy', 'privkey'],),
@@ -365,6 +567,9 @@ def main():
     if not has_pysnmp:
         module.fail_json(msg='Missing required pysnmp module (check docs)')
 
+    if m_args['engine'] == 'bulk' and not has_pysnmp_asyncore:
+        module.fail_json(msg='Missing pysnmp.hlapi.asyncore module required by the bulk engine')
+
     cmdGen = cmdgen.CommandGenerator()
 
     # Verify that we receive a community when using snmp v2
@@ -414,15 +619,55 @@ def main():
 
     results = Tree()
 
+    start = time.time()
+    snmp_walk_times = {}
+    tables = m_args['tables'] or SNMP_TABLES
+    skipped_queries = []
+    if not m_args['is_dell']:
+        skipped_queries.append('dell_cpu')
+    if m_args['is_eos']:
+        skipped_queries.extend(['memory', 'swap', 'fdb'])
+    elif not m_args['include_swap']:
+        skipped_queries.append('swap')
+    queries = dict((name, (command, oids)) for name, table, command, oids in SNMP_QUERIES
+                   if table in tables and name not in skipped_queries)
+
+    if m_args['engine'] == 'bulk':
+        collector = BulkSnmpCollector(snmp_auth, m_args['host'], m_args['timeout'],
+                                      m_args['max_repetitions'], m_args['concurrency'])
+        collector.collect([(name, command, [getattr(v, oid) for oid in oids])
+                           for name, _, command, oids in SNMP_QUERIES if name in queries])
+        snmp_walk_times.update(collector.times)
+
+    def snmp_query(name, timeout=None):
+        """
+        Return the errorIndication and the varBinds of a get query, or the varTable of a walk query.
+        Nothing is returned for the queries of the tables which are not selected.
+        """
+        if name not in queries:
+            return None, []
+        if m_args['engine'] == 'bulk':
+            return collector.results[name]
+
+        query_start = time.time()
+        command, oids = queries[name]
+        if timeout is None:
+            target = cmdgen.UdpTransportTarget((m_args['host'], 161))
+        else:
+            target = cmdgen.UdpTransportTarget((m_args['host'], 161), timeout=timeout)
+        varBinds = [cmdgen.MibVariable(getattr(p, oid),) for oid in oids]
+        if command == 'get':
+            errorIndication, errorStatus, errorIndex, result = cmdGen.getCmd(
+                snmp_auth, target, *varBinds, lookupMib=False, lexicographicMode=False)
+        else:
+            errorIndication, errorStatus, errorIndex, result = cmdGen.nextCmd(
+                snmp_auth, target, *varBinds, lookupMib=False, lexicographicMode=False)
+        snmp_walk_times[name] = time.time() - query_start
+        return errorIndication, result
+
     # Getting system description could take more than 1 second on some Dell platform
     # (e.g. S6000) when cpu utilization is high, increse timeout to tolerate the delay.
-    errorIndication, errorStatus, errorIndex, varBinds = cmdGen.getCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget(
-            (m_args['host'], 161), timeout=m_args['timeout']),
-        cmdgen.MibVariable(p.sysDescr,),
-        lookupMib=False,
-    )
+    errorIndication, varBinds = snmp_query('sysDescr', timeout=m_args['timeout'])
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) +
@@ -434,16 +679,7 @@ def main():
         if current_oid == v.sysDescr:
             results['ansible_sysdescr'] = decode_hex(current_val)
 
-    errorIndication, errorStatus, errorIndex, varBinds = cmdGen.getCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.sysObjectId,),
-        cmdgen.MibVariable(p.sysUpTime,),
-        cmdgen.MibVariable(p.sysContact,),
-        cmdgen.MibVariable(p.sysName,),
-        cmdgen.MibVariable(p.sysLocation,),
-        lookupMib=False, lexicographicMode=False
-    )
+    errorIndication, varBinds = snmp_query('system')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) +
@@ -463,24 +699,7 @@ def main():
         elif current_oid == v.sysLocation:
             results['ansible_syslocation'] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.ifIndex,),
-        cmdgen.MibVariable(p.ifDescr,),
-        cmdgen.MibVariable(p.ifType,),
-        cmdgen.MibVariable(p.ifMtu,),
-        cmdgen.MibVariable(p.ifSpeed,),
-        cmdgen.MibVariable(p.ifPhysAddress,),
-        cmdgen.MibVariable(p.ifAdminStatus,),
-        cmdgen.MibVariable(p.ifOperStatus,),
-        cmdgen.MibVariable(p.ifHighSpeed,),
-        cmdgen.MibVariable(p.ipAdEntAddr,),
-        cmdgen.MibVariable(p.ipAdEntIfIndex,),
-        cmdgen.MibVariable(p.ipAdEntNetMask,),
-        cmdgen.MibVariable(p.ifAlias,),
-        lookupMib=False, lexicographicMode=False
-    )
+    errorIndication, varTable = snmp_query('interfaces')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) +
@@ -543,19 +762,7 @@ def main():
                 ifIndex = int(current_oid.rsplit('.', 1)[-1])
                 results['snmp_interfaces'][ifIndex]['description'] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.ifInDiscards,),
-        cmdgen.MibVariable(p.ifOutDiscards,),
-        cmdgen.MibVariable(p.ifInErrors,),
-        cmdgen.MibVariable(p.ifOutErrors,),
-        cmdgen.MibVariable(p.ifHCInOctets,),
-        cmdgen.MibVariable(p.ifHCOutOctets,),
-        cmdgen.MibVariable(p.ifInUcastPkts,),
-        cmdgen.MibVariable(p.ifOutUcastPkts,),
-        lookupMib=False, lexicographicMode=False
-    )
+    errorIndication, varTable = snmp_query('interface_counters')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) +
@@ -590,23 +797,7 @@ def main():
                 ifIndex = int(current_oid.rsplit('.', 1)[-1])
                 results['snmp_interfaces'][ifIndex]['ifOutUcastPkts'] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.entPhysDescr,),
-        cmdgen.MibVariable(p.entPhysContainedIn, ),
-        cmdgen.MibVariable(p.entPhysClass,),
-        cmdgen.MibVariable(p.entPhyParentRelPos, ),
-        cmdgen.MibVariable(p.entPhysName,),
-        cmdgen.MibVariable(p.entPhysHwVer,),
-        cmdgen.MibVariable(p.entPhysFwVer,),
-        cmdgen.MibVariable(p.entPhysSwVer,),
-        cmdgen.MibVariable(p.entPhysSerialNum,),
-        cmdgen.MibVariable(p.entPhysMfgName,),
-        cmdgen.MibVariable(p.entPhysModelName,),
-        cmdgen.MibVariable(p.entPhysIsFRU, ),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('physical_entities')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) + ' querying physical table')
@@ -656,16 +847,7 @@ def main():
                 results['snmp_physical_entities'][entity_oid]['entPhysIsFRU'] = int(
                     current_val)
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.entPhySensorType,),
-        cmdgen.MibVariable(p.entPhySensorScale,),
-        cmdgen.MibVariable(p.entPhySensorPrecision,),
-        cmdgen.MibVariable(p.entPhySensorValue,),
-        cmdgen.MibVariable(p.entPhySensorOperStatus,),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('sensors')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) + ' querying physical table')
@@ -711,12 +893,7 @@ def main():
     results['ansible_all_ipv4_addresses'] = all_ipv4_addresses
 
     if m_args['is_dell']:
-        errorIndication, errorStatus, errorIndex, varBinds = cmdGen.getCmd(
-            snmp_auth,
-            cmdgen.UdpTransportTarget((m_args['host'], 161)),
-            cmdgen.MibVariable(p.ChStackUnitCpuUtil5sec,),
-            lookupMib=False, lexicographicMode=False
-        )
+        errorIndication, varBinds = snmp_query('dell_cpu')
 
         if errorIndication:
             module.fail_json(msg=str(errorIndication) +
@@ -729,15 +906,7 @@ def main():
                 results['ansible_ChStackUnitCpuUtil5sec'] = decode_type(
                     module, current_oid, val)
 
-    errorIndication, errorStatus, errorIndex, varBinds = cmdGen.getCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.lldpLocChassisIdSubtype,),
-        cmdgen.MibVariable(p.lldpLocChassisId,),
-        cmdgen.MibVariable(p.lldpLocSysName,),
-        cmdgen.MibVariable(p.lldpLocSysDesc,),
-        lookupMib=False,
-    )
+    errorIndication, varBinds = snmp_query('lldp_local')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) +
@@ -755,14 +924,7 @@ def main():
         elif current_oid == v.lldpLocSysDesc:
             results['snmp_lldp']['lldpLocSysDesc'] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.lldpLocPortIdSubtype,),
-        cmdgen.MibVariable(p.lldpLocPortId,),
-        cmdgen.MibVariable(p.lldpLocPortDesc,),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('lldp_local_ports')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) +
@@ -782,15 +944,7 @@ def main():
                 ifIndex = int(current_oid.rsplit('.', 1)[-1])
                 results['snmp_interfaces'][ifIndex]['lldpLocPortDesc'] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.lldpLocManAddrLen,),
-        cmdgen.MibVariable(p.lldpLocManAddrIfSubtype,),
-        cmdgen.MibVariable(p.lldpLocManAddrIfId,),
-        cmdgen.MibVariable(p.lldpLocManAddrOID,),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('lldp_local_management')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) +
@@ -809,20 +963,7 @@ def main():
             if v.lldpLocManAddrOID in current_oid:
                 results['snmp_lldp']['lldpLocManAddrOID'] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.lldpRemChassisIdSubtype,),
-        cmdgen.MibVariable(p.lldpRemChassisId,),
-        cmdgen.MibVariable(p.lldpRemPortIdSubtype,),
-        cmdgen.MibVariable(p.lldpRemPortId,),
-        cmdgen.MibVariable(p.lldpRemPortDesc,),
-        cmdgen.MibVariable(p.lldpRemSysName,),
-        cmdgen.MibVariable(p.lldpRemSysDesc,),
-        cmdgen.MibVariable(p.lldpRemSysCapSupported,),
-        cmdgen.MibVariable(p.lldpRemSysCapEnabled,),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('lldp_remote')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) +
@@ -860,14 +1001,7 @@ def main():
                 ifIndex = int(current_oid.split('.')[12])
                 results['snmp_interfaces'][ifIndex]['lldpRemSysCapEnabled'] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.lldpRemManAddrIfSubtype,),
-        cmdgen.MibVariable(p.lldpRemManAddrIfId,),
-        cmdgen.MibVariable(p.lldpRemManAddrOID,),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('lldp_remote_management')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) +
@@ -887,15 +1021,7 @@ def main():
                 ifIndex = int(current_oid.split('.')[12])
                 results['snmp_interfaces'][ifIndex]['lldpRemManAddrOID'] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.cpfcIfRequests,),
-        cmdgen.MibVariable(p.cpfcIfIndications,),
-        cmdgen.MibVariable(p.requestsPerPriority,),
-        cmdgen.MibVariable(p.indicationsPerPriority,),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('pfc')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) + ' querying PFC counters')
@@ -919,12 +1045,7 @@ def main():
                 prio = int(current_oid.split('.')[-1])
                 results['snmp_interfaces'][ifIndex]['indicationsPerPriority'][prio] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.csqIfQosGroupStats,),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('queues')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) + ' querying QoS stats')
@@ -940,12 +1061,7 @@ def main():
                 counterId = int(current_oid.split('.')[-1])
                 results['snmp_interfaces'][ifIndex]['queues'][ifDirection][queueId][counterId] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.cefcFRUPowerOperStatus,),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('psu')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) + ' querying FRU')
@@ -958,13 +1074,7 @@ def main():
                 psuIndex = int(current_oid.split('.')[-1])
                 results['snmp_psu'][psuIndex]['operstatus'] = current_val
 
-    errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-        snmp_auth,
-        cmdgen.UdpTransportTarget((m_args['host'], 161)),
-        cmdgen.MibVariable(p.ipCidrRouteEntry,),
-        cmdgen.MibVariable(p.ipCidrRouteStatus,),
-        lookupMib=False,
-    )
+    errorIndication, varTable = snmp_query('cidr_route')
 
     if errorIndication:
         module.fail_json(msg=str(errorIndication) + ' querying CidrRouteTable')
@@ -982,16 +1092,7 @@ def main():
                 results['snmp_cidr_route'][next_hop]['status'] = current_val
 
     if not m_args['is_eos']:
-        errorIndication, errorStatus, errorIndex, varBinds = cmdGen.getCmd(
-            snmp_auth,
-            cmdgen.UdpTransportTarget((m_args['host'], 161)),
-            cmdgen.MibVariable(p.sysTotalMemory,),
-            cmdgen.MibVariable(p.sysTotalFreeMemory,),
-            cmdgen.MibVariable(p.sysTotalSharedMemory,),
-            cmdgen.MibVariable(p.sysTotalBuffMemory,),
-            cmdgen.MibVariable(p.sysCachedMemory,),
-            lookupMib=False, lexicographicMode=False
-        )
+        errorIndication, varBinds = snmp_query('memory')
 
         if errorIndication:
             module.fail_json(msg=str(errorIndication) +
@@ -1016,13 +1117,7 @@ def main():
                     module, current_oid, val)
 
         if m_args['include_swap']:
-            errorIndication, errorStatus, errorIndex, varBinds = cmdGen.getCmd(
-                snmp_auth,
-                cmdgen.UdpTransportTarget((m_args['host'], 161)),
-                cmdgen.MibVariable(p.sysTotalSwap,),
-                cmdgen.MibVariable(p.sysTotalFreeSwap,),
-                lookupMib=False, lexicographicMode=False
-            )
+            errorIndication, varBinds = snmp_query('swap')
 
             if errorIndication:
                 module.fail_json(msg=str(errorIndication) +
@@ -1037,12 +1132,7 @@ def main():
                     results['ansible_sysTotalFreeSwap'] = decode_type(
                         module, current_oid, val)
 
-        errorIndication, errorStatus, errorIndex, varTable = cmdGen.nextCmd(
-            snmp_auth,
-            cmdgen.UdpTransportTarget((m_args['host'], 161)),
-            cmdgen.MibVariable(p.dot1qTpFdbEntry,),
-            lookupMib=False,
-        )
+        errorIndication, varTable = snmp_query('fdb')
 
         if errorIndication:
             module.fail_json(msg=str(errorIndication) + ' querying FdbTable')
@@ -1064,7 +1154,8 @@ def main():
                     key = items[0] + '.' + mac_str
                     results['snmp_fdb'][key] = current_val
 
-    module.exit_json(ansible_facts=results)
+    snmp_walk_times['total'] = time.time() - start
+    module.exit_json(ansible_facts=results, snmp_walk_times=snmp_walk_times)
 
 
 main()
@@ -1,7 +1,7 @@
 import re
 import six
 
-from ipaddress import ip_address, ip_network
+from ipaddress import ip_address
 from lpm import LpmDict
 
 # These subnets are excluded from FIB test
@@ -47,27 +47,33 @@ class Fib():
     # Initialize FIB with FIB file
     def __init__(self, file_path):
         self._ipv4_lpm_dict = LpmDict()
-        for ip in EXCLUDE_IPV4_PREFIXES:
-            self._ipv4_lpm_dict[ip] = self.NextHop()
+        self._ipv4_lpm_dict.update((ip, self.NextHop()) for ip in EXCLUDE_IPV4_PREFIXES)
 
         self._ipv6_lpm_dict = LpmDict(ipv4=False)
-        for ip in EXCLUDE_IPV6_PREFIXES:
-            self._ipv6_lpm_dict[ip] = self.NextHop()
+        self._ipv6_lpm_dict.update((ip, self.NextHop()) for ip in EXCLUDE_IPV6_PREFIXES)
 
         # filter out empty lines and lines starting with '#'
         pattern = re.compile("^#.*$|^[ \t]*$")
 
+        ipv4_routes = []
+        ipv6_routes = []
+        # Routes usually share a few next hops, parse each of them once
+        next_hops = {}
         with open(file_path, 'r') as f:
-            for line in f.readlines():
+            for line in f:
                 if pattern.match(line):
                     continue
-                entry = line.split(' ', 1)
-                prefix = ip_network(six.text_type(entry[0]))
-                next_hop = self.NextHop(entry[1])
-                if prefix.version == 4:
-                    self._ipv4_lpm_dict[str(prefix)] = next_hop
-                elif prefix.version == 6:
-                    self._ipv6_lpm_dict[str(prefix)] = next_hop
+                prefix, next_hop_str = line.rstrip('\n').split(' ', 1)
+                next_hop = next_hops.get(next_hop_str)
+                if next_hop is None:
+                    next_hop = next_hops[next_hop_str] = self.NextHop(next_hop_str)
+                if ':' in prefix:
+                    ipv6_routes.append((prefix, next_hop))
+                else:
+                    ipv4_routes.append((prefix, next_hop))
+
+        self._ipv4_lpm_dict.update(ipv4_routes)
+        self._ipv6_lpm_dict.update(ipv6_routes)
 
     def __getitem__(self, ip):
         ip = ip_address(six.text_type(ip))
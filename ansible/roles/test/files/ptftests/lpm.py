@@ -1,23 +1,30 @@
+import binascii
+import bisect
 import random
-import six
+import socket
 
-from ipaddress import ip_address, ip_network
-from SubnetTree import SubnetTree
+from ipaddress import IPv4Address, IPv6Address
 
 '''
 LpmDict is a class used in FIB test for LPM and IP segmentation.
 
-This class contains a class variable SubnetTree() _subnet_tree to solve the
-LPM search functionality, which is achieved using Patricia tree. In order to
-have IP segmentation functionality: segment the whole IP space into different
-segments from start to end according to the prefixes (networks) it reads.
+This class keeps the prefixes as integers to solve the LPM search
+functionality: one dictionary per prefix length, keyed by the network bits of
+the prefixes. A lookup probes the prefix lengths in use from the longest to
+the shortest. In order to have IP segmentation functionality: segment the
+whole IP space into different segments from start to end according to the
+prefixes (networks) it reads.
 
 Initially, the whole IP space contains only one range. After inserting
 prefixes, the IP space is segmented into multiple ranges. The ranges()
 function returns all ranges in the LpmDict with a list of IpIntervals. The
 sub-class IpInterval then could be used to get the first/last/random IP within
 this range. It could also check the length of the range and if an IP is within
-this range.
+this range. The boundaries of the ranges are integers too, they are sorted
+once when ranges() is called first and kept sorted by later updates.
+
+Use update() to bulk load many prefixes, for example all the routes of a FIB
+file.
 
 To achieve the LPM functionality, use the LpmDict as a dictionary and use
 [] operator to get the corresponding value using the key (IP).
@@ -55,60 +62,137 @@ class LpmDict():
 
     def __init__(self, ipv4=True):
         self._ipv4 = ipv4
+        if ipv4:
+            self._family = socket.AF_INET
+            self._address_class = IPv4Address
+            self._bits = 32
+        else:
+            self._family = socket.AF_INET6
+            self._address_class = IPv6Address
+            self._bits = 128
+        self._max_ip = (1 << self._bits) - 1
+        # (network, prefix length) of the prefixes other than the default route
         self._prefix_set = set()
-        self._subnet_tree = SubnetTree()
+        # prefix length -> {network >> host bits: value}
+        self._routes = {}
+        # prefix lengths in self._routes, longest first
+        self._prefix_lens = []
         # 0.0.0.0 is a non-routable meta-address that needs to be skipped
-        self._boundaries = {ip_address(u'0.0.0.0'): 1} if ipv4 else {
-            ip_address(u'::'): 1}
+        self._boundaries = {0: 1}
+        # sorted keys of self._boundaries, None until ranges() is called
+        self._sorted_boundaries = None
+
+    def _parse_ip(self, ip):
+        try:
+            return int(binascii.hexlify(socket.inet_pton(self._family, ip)), 16)
+        except (socket.error, TypeError):
+            raise ValueError('{} does not appear to be an IPv{} address'.format(ip, 4 if self._ipv4 else 6))
+
+    def _parse_prefix(self, key):
+        key = str(key)
+        ip, _, prefixlen = key.partition('/')
+        network = self._parse_ip(ip)
+        if prefixlen:
+            if not prefixlen.isdigit() or int(prefixlen) > self._bits:
+                raise ValueError('{} is not a valid prefix'.format(key))
+            prefixlen = int(prefixlen)
+        else:
+            prefixlen = self._bits
+        if network & (self._max_ip >> prefixlen):
+            raise ValueError('{} has host bits set'.format(key))
+        return network, prefixlen
+
+    def _add_boundary(self, boundary):
+        count = self._boundaries.get(boundary, 0)
+        self._boundaries[boundary] = count + 1
+        if not count and self._sorted_boundaries is not None:
+            bisect.insort(self._sorted_boundaries, boundary)
+
+    def _remove_boundary(self, boundary):
+        self._boundaries[boundary] -= 1
+        if not self._boundaries[boundary]:
+            del self._boundaries[boundary]
+            if self._sorted_boundaries is not None:
+                del self._sorted_boundaries[bisect.bisect_left(self._sorted_boundaries, boundary)]
+
+    def _insert(self, network, prefixlen, value):
+        # add the current prefix to self._prefix_set only when it is not the default route and it is not a duplicate
+        if prefixlen and (network, prefixlen) not in self._prefix_set:
+            self._add_boundary(network)
+            last_ip = network | (self._max_ip >> prefixlen)
+            if last_ip != self._max_ip:
+                self._add_boundary(last_ip + 1)
+            self._prefix_set.add((network, prefixlen))
+
+        routes = self._routes.get(prefixlen)
+        if routes is None:
+            routes = self._routes[prefixlen] = {}
+            self._prefix_lens = sorted(self._routes, reverse=True)
+        routes[network >> (self._bits - prefixlen)] = value
 
     def __setitem__(self, key, value):
-        prefix = ip_network(six.text_type(key))
-        # add the current key to self._prefix_set only when it is not the default route and it is not a duplicate key
-        if prefix.prefixlen and key not in self._prefix_set:
-            boundary = prefix[0]
-            self._boundaries[boundary] = self._boundaries.get(boundary, 0) + 1
-            if prefix[-1] != ip_address(u'255.255.255.255') \
-                    and prefix[-1] != ip_address(u'ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff'):
-                next_boundary = prefix[-1] + 1
-                self._boundaries[next_boundary] = self._boundaries.get(
-                    next_boundary, 0) + 1
-            self._prefix_set.add(key)
-        self._subnet_tree.__setitem__(key, value)
+        network, prefixlen = self._parse_prefix(key)
+        self._insert(network, prefixlen, value)
+
+    def update(self, items):
+        """Bulk load prefixes.
+
+        Args:
+            items: Iterable of (prefix, value) pairs.
+        """
+        # Adding boundaries one by one to the sorted list is slower than sorting them again in ranges()
+        self._sorted_boundaries = None
+        for key, value in items:
+            network, prefixlen = self._parse_prefix(key)
+            self._insert(network, prefixlen, value)
 
     def __getitem__(self, key):
-        return self._subnet_tree[key]
+        key = str(key)
+        if '/' in key:
+            network, max_prefixlen = self._parse_prefix(key)
+        else:
+            network, max_prefixlen = self._parse_ip(key), self._bits
+        for prefixlen in self._prefix_lens:
+            if prefixlen > max_prefixlen:
+                continue
+            routes = self._routes[prefixlen]
+            host_bits = self._bits - prefixlen
+            if network >> host_bits in routes:
+                return routes[network >> host_bits]
+        raise KeyError(key)
 
     def __delitem__(self, key):
-        if '/0' not in key:
-            prefix = ip_network(six.text_type(key))
-            boundary = prefix[0]
-            next_boundary = prefix[-1] + 1
-            self._boundaries[boundary] = self._boundaries.get(boundary) - 1
-            if not self._boundaries[boundary]:
-                del self._boundaries[boundary]
-            self._boundaries[next_boundary] = self._boundaries.get(
-                next_boundary) - 1
-            if not self._boundaries[next_boundary]:
-                del self._boundaries[next_boundary]
-            self._prefix_set.remove(key)
-        self._subnet_tree.__delitem__(key)
+        network, prefixlen = self._parse_prefix(key)
+        routes = self._routes.get(prefixlen, {})
+        del routes[network >> (self._bits - prefixlen)]
+        if not routes:
+            del self._routes[prefixlen]
+            self._prefix_lens = sorted(self._routes, reverse=True)
+
+        if prefixlen:
+            self._remove_boundary(network)
+            last_ip = network | (self._max_ip >> prefixlen)
+            if last_ip != self._max_ip:
+                self._remove_boundary(last_ip + 1)
+            self._prefix_set.remove((network, prefixlen))
 
     def ranges(self):
-        sorted_boundaries = sorted(self._boundaries.keys())
+        if self._sorted_boundaries is None:
+            self._sorted_boundaries = sorted(self._boundaries)
+        sorted_boundaries = self._sorted_boundaries
+        address = self._address_class
         ranges = []
         for index, boundary in enumerate(sorted_boundaries):
             if index != len(sorted_boundaries) - 1:
-                interval = self.IpInterval(
-                    sorted_boundaries[index], sorted_boundaries[index + 1] - 1)
+                interval = self.IpInterval(address(boundary), address(sorted_boundaries[index + 1] - 1))
             else:
-                if self._ipv4:
-                    interval = self.IpInterval(
-                        sorted_boundaries[index], ip_address(u'255.255.255.255'))
-                else:
-                    interval = self.IpInterval(sorted_boundaries[index], ip_address(
-                        u'ffff:ffff:ffff:ffff:ffff:ffff:ffff:ffff'))
+                interval = self.IpInterval(address(boundary), address(self._max_ip))
             ranges.append(interval)
         return ranges
 
     def contains(self, key):
-        return key in self._subnet_tree
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
@@ -0,0 +1,101 @@
+'''
+Description:    Benchmark of loading a FIB file into fib.Fib and of LPM lookups, compared to SubnetTree.
+
+Usage:          python lpm_benchmark.py --ipv4-routes 200000 --ipv6-routes 200000 --lookups 100000
+
+                The SubnetTree part is skipped when the SubnetTree module is not installed.
+'''
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from ipaddress import IPv4Address, IPv6Address
+
+import fib
+
+try:
+    from SubnetTree import SubnetTree
+except ImportError:
+    SubnetTree = None
+
+
+def generate_routes(ipv4_routes, ipv6_routes, seed):
+    rand = random.Random(seed)
+    next_hops = ['[{}]'.format(' '.join(str(rand.randint(0, 63)) for _ in range(rand.randint(1, 4))))
+                 for _ in range(64)]
+    routes = {}
+    while len(routes) < ipv4_routes:
+        prefixlen = rand.choice([24, 24, 24, 25, 26, 32])
+        network = rand.randint(0x0b000000, 0xdfffffff) >> (32 - prefixlen) << (32 - prefixlen)
+        routes['{}/{}'.format(IPv4Address(network), prefixlen)] = rand.choice(next_hops)
+    while len(routes) < ipv4_routes + ipv6_routes:
+        prefixlen = rand.choice([64, 64, 64, 96, 120, 128])
+        network = rand.randint(0x20000000, 0x3fffffff) << 96 | rand.getrandbits(96)
+        network = network >> (128 - prefixlen) << (128 - prefixlen)
+        routes['{}/{}'.format(IPv6Address(network), prefixlen)] = rand.choice(next_hops)
+    return routes
+
+
+def generate_lookups(routes, count, seed):
+    rand = random.Random(seed)
+    prefixes = list(routes)
+    ips = []
+    for _ in range(count):
+        network, prefixlen = rand.choice(prefixes).split('/')
+        if ':' in network:
+            ip = int(IPv6Address(network)) + rand.randint(0, (1 << (128 - int(prefixlen))) - 1)
+            ips.append(str(IPv6Address(ip)))
+        else:
+            ip = int(IPv4Address(network)) + rand.randint(0, (1 << (32 - int(prefixlen))) - 1)
+            ips.append(str(IPv4Address(ip)))
+    return ips
+
+
+def measure(title, func):
+    start = time.time()
+    result = func()
+    print('{:<40} {:8.3f}s'.format(title, time.time() - start))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of FIB loading and LPM lookups')
+    parser.add_argument('--ipv4-routes', type=int, default=200000)
+    parser.add_argument('--ipv6-routes', type=int, default=200000)
+    parser.add_argument('--lookups', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    routes = generate_routes(args.ipv4_routes, args.ipv6_routes, args.seed)
+    ips = generate_lookups(routes, args.lookups, args.seed)
+
+    fd, fib_file = tempfile.mkstemp(suffix='.txt')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            for prefix, next_hop in routes.items():
+                f.write('{} {}\n'.format(prefix, next_hop))
+
+        dut_fib = measure('Fib load', lambda: fib.Fib(fib_file))
+        measure('Fib lookup', lambda: [dut_fib[ip] for ip in ips])
+        measure('Fib ipv4_ranges + ipv6_ranges', lambda: (dut_fib.ipv4_ranges(), dut_fib.ipv6_ranges()))
+    finally:
+        os.remove(fib_file)
+
+    if SubnetTree is None:
+        print('SubnetTree is not installed, skipping the comparison')
+        return
+
+    def load_subnet_tree():
+        tree = SubnetTree()
+        for prefix, next_hop in routes.items():
+            tree[prefix] = fib.Fib.NextHop(next_hop)
+        return tree
+
+    tree = measure('SubnetTree load', load_subnet_tree)
+    measure('SubnetTree lookup', lambda: [tree[ip] for ip in ips])
+
+
+if __name__ == '__main__':
+    main()
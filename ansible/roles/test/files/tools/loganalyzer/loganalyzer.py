@@ -29,6 +29,7 @@ import re
 import os
 import os.path
 import csv
+import json
 import time
 import logging
 import logging.handlers
@@ -42,6 +43,8 @@ tokenizer = ','
 comment_key = '#'
 system_log_file = '/var/log/syslog'
 re_rsyslog_pid = re.compile(r"PID:\s+(\d+)")
+# -- Number of start markers kept in the marker index file
+max_marker_index_entries = 16
 
 # -- List of ERROR codes to be returned by AnsibleLogAnalyzer
 err_duplicate_start_marker = -1
@@ -58,6 +61,42 @@ err_start_ignore_marker = -8
 # will not be picked up by the analyzer.
 MAX_LOG_MESSAGE_LENGTH = 1000
 
+# -- Size of the blocks used to read log files backwards
+# Log files are analyzed from the end marker back to the start marker. Reading them
+# in blocks of READ_BLOCK_SIZE bytes keeps memory usage flat regardless of the file size.
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def reverse_readlines(log_file, block_size=READ_BLOCK_SIZE):
+    '''
+    @summary: Generator yielding the lines of a file in reverse order.
+
+    The file is read from its end in blocks of block_size bytes, so only the
+    current block and the partial line spanning two blocks are kept in memory.
+    Lines are returned like file.readlines() does, with the trailing newline.
+
+    @param log_file: File object opened in binary mode.
+    @param block_size: Size in bytes of the blocks read from the file.
+    '''
+    log_file.seek(0, os.SEEK_END)
+    position = log_file.tell()
+    # Part of a line which started in a block that was not read yet
+    partial_line = b''
+    # The last line of a file has no newline, all the other lines have one
+    newline = b''
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        log_file.seek(position)
+        lines = (log_file.read(read_size) + partial_line).split(b'\n')
+        partial_line = lines[0]
+        for line in reversed(lines[1:]):
+            if line or newline:
+                yield (line + newline).decode('utf-8', 'replace')
+            newline = b'\n'
+    if partial_line or newline:
+        yield (partial_line + newline).decode('utf-8', 'replace')
+
 
 class AnsibleLogAnalyzer:
     '''
@@ -207,6 +246,48 @@ class AnsibleLogAnalyzer:
         syslogger.info('\n')
         self.flush_rsyslogd()
 
+    def save_marker_index(self, log_file_list, marker, marker_index):
+        '''
+        @summary: Record where the marker is going to be written in each log file.
+
+        The inode and the current size of each log file are stored in the marker index file,
+        under the marker string. The marker is appended to the log files, so it will be found
+        at or after the recorded offset of the file with the recorded inode, even if the file
+        is rotated in the meantime. The extract_log module uses this to seek directly to the
+        marker instead of scanning all the rotated log files.
+
+        @param log_file_list : List of file paths, to be applied with marker.
+        @param marker:         Marker to be placed into log files.
+        @param marker_index:   Path to the marker index file.
+        '''
+        index = {}
+        if os.path.exists(marker_index):
+            try:
+                with open(marker_index, 'r') as fp:
+                    index = json.load(fp)
+            except ValueError:
+                self.print_diagnostic_message(
+                    'Marker index {} is corrupted, recreating it'.format(marker_index))
+
+        log_files = {}
+        for log_file in log_file_list + [system_log_file]:
+            try:
+                stat = os.stat(log_file)
+            except OSError:
+                continue
+            log_files[os.path.realpath(log_file)] = {'inode': stat.st_ino, 'offset': stat.st_size}
+
+        # Keep only the latest entries, the markers are looked up shortly after being placed
+        index.pop(marker, None)
+        entries = sorted(index.items(), key=lambda item: item[1]['time'])
+        index = dict(entries[-(max_marker_index_entries - 1):])
+        index[marker] = {'time': time.time(), 'files': log_files}
+
+        self.print_diagnostic_message(
+            'marker index:{}, marker {}, files {}'.format(marker_index, marker, log_files))
+        with open(marker_index, 'w') as fp:
+            json.dump(index, fp)
+
     def wait_for_marker(self, marker, timeout=120, polling_interval=10):
         '''
         @summary: Wait the marker to appear in the /var/log/syslog file
@@ -432,6 +513,33 @@ class AnsibleLogAnalyzer:
 
         @return: List of strings match search criteria.
         '''
+        matching_lines = []
+        expected_lines = []
+        for is_expected, line in self.iter_analyze_file(log_file_path, match_messages_regex, ignore_messages_regex,
+                                                        expect_messages_regex,
+                                                        maximum_log_length=maximum_log_length):
+            if is_expected:
+                expected_lines.append(line)
+            else:
+                matching_lines.append(line)
+
+        return matching_lines, expected_lines
+    # ---------------------------------------------------------------------
+
+    def iter_analyze_file(self, log_file_path, match_messages_regex, ignore_messages_regex, expect_messages_regex,
+                          maximum_log_length=None, block_size=READ_BLOCK_SIZE):
+        '''
+        @summary: Generator version of analyze_file(). The log file is walked
+                  backwards from the end marker to the start marker in blocks of
+                  block_size bytes, so the file is never loaded into memory as a
+                  whole and reading stops as soon as the start marker is found.
+
+        @param block_size: Size in bytes of the blocks read from the log file.
+
+        @return: Yields (is_expected, line) tuples, starting from the newest line.
+            is_expected is True for lines matching expect_messages_regex and
+            False for lines matching the match/ignore criteria.
+        '''
 
         self.print_diagnostic_message('analyzing file: %s' % log_file_path)
 
@@ -440,86 +548,92 @@ class AnsibleLogAnalyzer:
         check_marker = self.require_marker_check(log_file_path)
         in_analysis_range = not check_marker
         stdin_as_input = self.is_filename_stdin(log_file_path)
-        matching_lines = []
-        expected_lines = []
         found_start_marker = False
         found_end_marker = False
         if stdin_as_input:
-            log_file = sys.stdin
+            # stdin is not seekable, it can only be consumed as a whole
+            log_file = None
+            rev_lines = reversed(sys.stdin.readlines())
         else:
-            log_file = open(log_file_path, 'r')
+            log_file = open(log_file_path, 'rb')
+            rev_lines = reverse_readlines(log_file, block_size)
 
         start_marker = self.create_start_marker()
         end_marker = self.create_end_marker()
 
+        if maximum_log_length is None:
+            maximum_log_length = MAX_LOG_MESSAGE_LENGTH
+
         ignore_marker_run_ids = []
-        for rev_line in reversed(log_file.readlines()):
-            if stdin_as_input:
-                in_analysis_range = True
-            else:
-                if end_marker in rev_line:
-                    self.print_diagnostic_message(
-                        'found end marker: %s' % end_marker)
-                    if (found_end_marker):
-                        print('ERROR: duplicate end marker found')
-                        sys.exit(err_duplicate_end_marker)
-                    found_end_marker = True
-                    in_analysis_range = True
-                    continue
-                elif self.end_ignore_marker_prefix in rev_line:
-                    marker_run_id = rev_line.split(
-                        self.end_ignore_marker_prefix)[1]
-                    ignore_marker_run_ids.append(marker_run_id)
-                    self.print_diagnostic_message('found end ignore marker: %s'
-                                                  % rev_line[rev_line.index(self.end_ignore_marker_prefix):])
-                    if not in_analysis_range:
-                        print('ERROR: duplicate end ignore marker found')
-                        sys.exit(err_end_ignore_marker)
-                    in_analysis_range = False
-                    continue
-
-                elif self.start_ignore_marker_prefix in rev_line:
-                    marker_run_id = ignore_marker_run_ids.pop()
-                    self.print_diagnostic_message('found start ignore marker: %s'
-                                                  % rev_line[rev_line.index(self.start_ignore_marker_prefix):])
-                    if in_analysis_range or marker_run_id not in rev_line:
-                        print('ERROR: unexpected start ignore marker found')
-                        sys.exit(err_start_ignore_marker)
+        try:
+            for rev_line in rev_lines:
+                if stdin_as_input:
                     in_analysis_range = True
-                    continue
-
-            if not stdin_as_input:
-                if rev_line.find(start_marker) != -1 and 'extract_log' not in rev_line:
-                    self.print_diagnostic_message(
-                        'found start marker: %s' % start_marker)
-                    if (found_start_marker):
-                        print('ERROR: duplicate start marker found')
-                        sys.exit(err_duplicate_start_marker)
-                    found_start_marker = True
-
-                    if (not in_analysis_range):
-                        print(
-                            ('ERROR: found start marker:%s without corresponding end marker' % rev_line))
-                        sys.exit(err_no_end_marker)
-                    in_analysis_range = False
-                    break
-
-            if in_analysis_range:
-                # Skip long logs in sairedis recording since most likely
-                # they are bulk set operations for non-default routes
-                # without much insight while they are time consuming to analyze
-                # In advanced_reboot test, we need to analyze the bulk operations for mac learning
-                # So we need to allow long lines
-                if maximum_log_length is None:
-                    maximum_log_length = MAX_LOG_MESSAGE_LENGTH
-                if not check_marker and len(rev_line) > maximum_log_length:
-                    continue
-
-                if self.line_is_expected(rev_line, expect_messages_regex):
-                    expected_lines.append(rev_line)
-
-                elif self.line_matches(rev_line, match_messages_regex, ignore_messages_regex):
-                    matching_lines.append(rev_line)
+                else:
+                    if end_marker in rev_line:
+                        self.print_diagnostic_message(
+                            'found end marker: %s' % end_marker)
+                        if (found_end_marker):
+                            print('ERROR: duplicate end marker found')
+                            sys.exit(err_duplicate_end_marker)
+                        found_end_marker = True
+                        in_analysis_range = True
+                        continue
+                    elif self.end_ignore_marker_prefix in rev_line:
+                        marker_run_id = rev_line.split(
+                            self.end_ignore_marker_prefix)[1]
+                        ignore_marker_run_ids.append(marker_run_id)
+                        self.print_diagnostic_message('found end ignore marker: %s'
+                                                      % rev_line[rev_line.index(self.end_ignore_marker_prefix):])
+                        if not in_analysis_range:
+                            print('ERROR: duplicate end ignore marker found')
+                            sys.exit(err_end_ignore_marker)
+                        in_analysis_range = False
+                        continue
+
+                    elif self.start_ignore_marker_prefix in rev_line:
+                        marker_run_id = ignore_marker_run_ids.pop()
+                        self.print_diagnostic_message('found start ignore marker: %s'
+                                                      % rev_line[rev_line.index(self.start_ignore_marker_prefix):])
+                        if in_analysis_range or marker_run_id not in rev_line:
+                            print('ERROR: unexpected start ignore marker found')
+                            sys.exit(err_start_ignore_marker)
+                        in_analysis_range = True
+                        continue
+
+                if not stdin_as_input:
+                    if rev_line.find(start_marker) != -1 and 'extract_log' not in rev_line:
+                        self.print_diagnostic_message(
+                            'found start marker: %s' % start_marker)
+                        if (found_start_marker):
+                            print('ERROR: duplicate start marker found')
+                            sys.exit(err_duplicate_start_marker)
+                        found_start_marker = True
+
+                        if (not in_analysis_range):
+                            print(
+                                ('ERROR: found start marker:%s without corresponding end marker' % rev_line))
+                            sys.exit(err_no_end_marker)
+                        in_analysis_range = False
+                        break
+
+                if in_analysis_range:
+                    # Skip long logs in sairedis recording since most likely
+                    # they are bulk set operations for non-default routes
+                    # without much insight while they are time consuming to analyze
+                    # In advanced_reboot test, we need to analyze the bulk operations for mac learning
+                    # So we need to allow long lines
+                    if not check_marker and len(rev_line) > maximum_log_length:
+                        continue
+
+                    if self.line_is_expected(rev_line, expect_messages_regex):
+                        yield True, rev_line
+
+                    elif self.line_matches(rev_line, match_messages_regex, ignore_messages_regex):
+                        yield False, rev_line
+        finally:
+            if log_file is not None:
+                log_file.close()
 
         # care about the markers only if input is not stdin or no need to check start marker
         if not stdin_as_input and check_marker:
@@ -530,8 +644,6 @@ class AnsibleLogAnalyzer:
             if (not found_end_marker):
                 print('ERROR: end marker was not found')
                 sys.exit(err_no_end_marker)
-
-        return matching_lines, expected_lines
     # ---------------------------------------------------------------------
 
     def analyze_file_list(self, log_file_list, match_messages_regex, ignore_messages_regex, expect_messages_regex,
@@ -600,6 +712,8 @@ def usage():
     print('                                 All the strings from these files will be expected to present')
     print('                                 in one of specified log files during the analysis. Must be present')
     print('                                 when action == analyze.')
+    print('--marker_index path              Path to the marker index file. When action == init, the position of')
+    print('                                 the start marker in the log files is recorded in this file.')
 
 # ---------------------------------------------------------------------
 
@@ -764,13 +878,14 @@ def main(argv):
     match_files_in = None
     ignore_files_in = None
     expect_files_in = None
+    marker_index = None
     verbose = False
 
     try:
         opts, args = getopt.getopt(argv, "a:r:s:l:o:m:i:e:vh",
                                    ["action=", "run_id=", "start_marker=", "logs=",
                                     "out_dir=", "match_files_in=", "ignore_files_in=",
-                                    "expect_files_in=", "verbose", "help"])
+                                    "expect_files_in=", "marker_index=", "verbose", "help"])
 
     except getopt.GetoptError:
         print("Invalid option specified")
@@ -806,6 +921,9 @@ def main(argv):
         elif (opt in ("-e", "--expect_files_in")):
             expect_files_in = arg
 
+        elif (opt == "--marker_index"):
+            marker_index = arg
+
         elif (opt in ("-v", "--verbose")):
             verbose = True
 
@@ -820,6 +938,8 @@ def main(argv):
 
     result = {}
     if action == "init":
+        if marker_index:
+            analyzer.save_marker_index(log_file_list, analyzer.create_start_marker(), marker_index)
         analyzer.place_marker(log_file_list, analyzer.create_start_marker())
         return 0
     elif action == "analyze":
@@ -7,6 +7,8 @@ import re
 import subprocess
 import shlex
 import sys
+import tempfile
+import threading
 import time
 import traceback
 import logging
@@ -14,6 +16,8 @@ import docker
 import ipaddress
 import six
 
+from multiprocessing.pool import ThreadPool
+
 from ansible.module_utils.basic import AnsibleModule
 
 try:
@@ -78,6 +82,8 @@ Parameters:
     - duts_mgmt_port: duts mgmt port
     - duts_name: duts names
     - fp_mtu: MTU for FP ports
+    - batch_mode: program the bridges, the front panel ports and the injected ports of the PTF docker with one
+      ovs-vsctl transaction, one flow file per bridge and 'ip -batch' files instead of one command per operation
 '''
 
 EXAMPLES = '''
@@ -148,6 +154,8 @@ ROOT_BACK_BR_TEMPLATE = 'br-b-%s'
 PTF_FP_IFACE_TEMPLATE = 'eth%d'
 OVS_INTERCONNECTION_BRIDGE_TEMPLATE = 'bic-%s-%s'
 RETRIES = 10
+# number of bridges whose flows are replaced concurrently in batch mode
+BATCH_MODE_WORKERS = 8
 # name of interface must be less than or equal to 15 bytes.
 MAX_INTF_LEN = 15
 
@@ -211,14 +219,64 @@ def adaptive_temporary_interface(vm_set_name, interface_name, reserved_space=0):
     return t_int_if
 
 
+class CommandRecorder(object):
+    """Record the commands run by VMTopology.cmd, to count the forks and time a topology bring-up.
+
+    Set an instance as VMTopology.cmd_recorder to start recording. With dry_run, the commands are not executed,
+    responder(cmdline, grep_cmd) is called instead and returns the (ret_code, stdout, stderr) of the command.
+    """
+
+    def __init__(self, dry_run=False, responder=None):
+        self.dry_run = dry_run
+        self.responder = responder
+        self.commands = []
+        self.forks = 0
+        self.elapsed = 0.0
+        self.lock = threading.Lock()
+
+    def respond(self, cmdline, grep_cmd):
+        if self.responder is None:
+            return 0, '', ''
+        return self.responder(cmdline, grep_cmd)
+
+    def record(self, cmdline, grep_cmd, ret_code, elapsed):
+        with self.lock:
+            self.commands.append({
+                'cmd': cmdline,
+                'grep_cmd': grep_cmd,
+                'ret_code': ret_code,
+                'elapsed': elapsed
+            })
+            self.forks += 2 if grep_cmd else 1
+            self.elapsed += elapsed
+
+    def summary(self):
+        """Return the number of commands and forks, the time spent in commands and the commands per program."""
+        with self.lock:
+            programs = {}
+            for command in self.commands:
+                program = shlex.split(command['cmd'])[0]
+                programs[program] = programs.get(program, 0) + 1
+            return {
+                'commands': len(self.commands),
+                'forks': self.forks,
+                'elapsed': round(self.elapsed, 3),
+                'programs': programs
+            }
+
+
 class VMTopology(object):
 
-    def __init__(self, vm_names, vm_properties, fp_mtu, max_fp_num, topo):
+    # CommandRecorder recording the commands run by cmd(), if any
+    cmd_recorder = None
+
+    def __init__(self, vm_names, vm_properties, fp_mtu, max_fp_num, topo, batch_mode=False):
         self.vm_names = vm_names
         self.vm_properties = vm_properties
         self.fp_mtu = fp_mtu
         self.max_fp_num = max_fp_num
         self.topo = topo
+        self.batch_mode = batch_mode
         self._host_interfaces = None
         self._disabled_host_interfaces = None
         self._host_interfaces_active_active = None
@@ -394,6 +452,16 @@ class VMTopology(object):
                                 default_gw=mgmt_gw, default_gw_v6=mgmt_gw_v6)
 
     def create_bridges(self):
+        if self.batch_mode:
+            bridge_names = []
+            for vm in self.vm_names:
+                for fp_num in range(self.max_fp_num):
+                    bridge_names.append(adaptive_name(OVS_FP_BRIDGE_TEMPLATE, vm, fp_num))
+            if self.topo and 'DUT' in self.topo and 'vs_chassis' in self.topo['DUT']:
+                bridge_names.extend([VS_CHASSIS_INBAND_BRIDGE_NAME, VS_CHASSIS_MIDPLANE_BRIDGE_NAME])
+            self.create_ovs_bridges(bridge_names, self.fp_mtu)
+            return
+
         for vm in self.vm_names:
             for fp_num in range(self.max_fp_num):
                 fp_br_name = adaptive_name(OVS_FP_BRIDGE_TEMPLATE, vm, fp_num)
@@ -415,6 +483,21 @@ class VMTopology(object):
 
         VMTopology.cmd('ifconfig %s up' % bridge_name)
 
+    def create_ovs_bridges(self, bridge_names, mtu):
+        """Create the ovs bridges with one ovs-vsctl transaction and bring them up with one ip batch."""
+        if not bridge_names:
+            return
+        logging.info('=== Create bridges %s with mtu %d ===' %
+                     (', '.join(bridge_names), mtu))
+        VMTopology.ovs_vsctl_transaction(['--may-exist add-br %s' % bridge_name for bridge_name in bridge_names])
+
+        ip_cmds = []
+        for bridge_name in bridge_names:
+            if mtu != DEFAULT_MTU:
+                ip_cmds.append('link set dev %s mtu %d' % (bridge_name, mtu))
+            ip_cmds.append('link set %s up' % bridge_name)
+        VMTopology.ip_batch(ip_cmds)
+
     def destroy_bridges(self):
         for vm in self.vm_names:
             for fp_num in range(self.max_fp_num):
@@ -450,6 +533,10 @@ class VMTopology(object):
             PTF (int_if) ----------- injected port (ext_if)
 
         """
+        if self.batch_mode:
+            self.add_injected_fp_ports_to_docker_batched()
+            return
+
         for vm, vlans in self.injected_fp_ports.items():
             for vlan in vlans:
                 (_, _, ptf_index) = VMTopology.parse_vm_vlan_port(vlan)
@@ -473,6 +560,87 @@ class VMTopology(object):
                 else:
                     self.add_veth_if_to_docker(ext_if, int_if)
 
+    def add_injected_fp_ports_to_docker_batched(self):
+        """
+        add injected front panel ports to docker like add_injected_fp_ports_to_docker, the links of the host and
+        of the docker are read once and the changes are applied with one ip batch on the host and one in the docker
+
+        The ports of the backend VMs which need a vlan sub interface are added one by one.
+        """
+        veth_ifs = []
+        for vm, vlans in self.injected_fp_ports.items():
+            properties = self.vm_properties.get(vm, {})
+            create_vlan_subintf = properties.get('device_type') in (
+                BACKEND_TOR_TYPE, BACKEND_LEAF_TYPE)
+            for vlan in vlans:
+                (_, _, ptf_index) = VMTopology.parse_vm_vlan_port(vlan)
+                ext_if = adaptive_name(
+                    INJECTED_INTERFACES_TEMPLATE, self.vm_set_name, ptf_index)
+                int_if = PTF_FP_IFACE_TEMPLATE % ptf_index
+                if create_vlan_subintf:
+                    self.add_veth_if_to_docker(
+                        ext_if, int_if,
+                        create_vlan_subintf=create_vlan_subintf,
+                        sub_interface_separator=properties.get(
+                            'sub_interface_separator', SUB_INTERFACE_SEPARATOR),
+                        sub_interface_vlan_id=properties.get(
+                            'sub_interface_vlan_id', SUB_INTERFACE_VLAN_ID)
+                    )
+                else:
+                    veth_ifs.append((ext_if, int_if))
+
+        if veth_ifs:
+            self.add_veth_ifs_to_docker(veth_ifs)
+
+    def add_veth_ifs_to_docker(self, veth_ifs):
+        """Create vethernet devices (ext_if, int_if) and put the int_if into the ptf docker, like
+        add_veth_if_to_docker for every pair of veth_ifs, with one ip batch on the host and one in the docker."""
+        logging.info('=== Create veth pairs %s, set them to PTF docker namespace ===' %
+                     ', '.join('%s/%s' % veth_if for veth_if in veth_ifs))
+        host_links = VMTopology.get_links()
+        docker_links = VMTopology.get_links(pid=self.pid)
+        host_cmds = []
+        docker_cmds = []
+        for ext_if, int_if in veth_ifs:
+            t_int_if = adaptive_temporary_interface(self.vm_set_name, int_if)
+
+            if t_int_if in host_links:
+                host_cmds.append("link del dev %s" % t_int_if)
+                # The peer of a deleted veth is deleted as well
+                peer = host_links.pop(t_int_if)
+                if peer is not None:
+                    host_links.pop(peer, None)
+
+            if ext_if not in host_links:
+                host_cmds.append("link add %s type veth peer name %s" % (ext_if, t_int_if))
+                host_links[ext_if] = t_int_if
+                host_links[t_int_if] = ext_if
+
+            if self.fp_mtu != DEFAULT_MTU:
+                host_cmds.append("link set dev %s mtu %d" % (ext_if, self.fp_mtu))
+                if t_int_if in host_links:
+                    host_cmds.append("link set dev %s mtu %d" % (t_int_if, self.fp_mtu))
+                elif t_int_if in docker_links:
+                    docker_cmds.append("link set dev %s mtu %d" % (t_int_if, self.fp_mtu))
+                elif int_if in docker_links:
+                    docker_cmds.append("link set dev %s mtu %d" % (int_if, self.fp_mtu))
+
+            host_cmds.append("link set %s up" % ext_if)
+
+            if t_int_if in host_links and t_int_if not in docker_links and int_if not in docker_links:
+                host_cmds.append("link set dev %s netns %s" % (t_int_if, self.pid))
+                host_links.pop(t_int_if)
+                docker_links[t_int_if] = None
+
+            if t_int_if in docker_links and int_if not in docker_links:
+                docker_cmds.append("link set dev %s name %s" % (t_int_if, int_if))
+                docker_links[int_if] = docker_links.pop(t_int_if)
+
+            docker_cmds.append("link set %s up" % int_if)
+
+        VMTopology.ip_batch(host_cmds)
+        VMTopology.ip_batch(docker_cmds, pid=self.pid)
+
     def add_mgmt_port_to_docker(self, mgmt_bridge, mgmt_ip, mgmt_gw,
                                 mgmt_ipv6_addr=None, mgmt_gw_v6=None, extra_mgmt_ip_addr=None,
                                 api_server_pid=None):
@@ -842,6 +1010,23 @@ class VMTopology(object):
                             +----------------------+
 
         """
+        fp_port_bindings = self.get_fp_port_bindings()
+        if self.batch_mode:
+            self.bind_ovs_ports_batched(fp_port_bindings, disconnect_vm)
+        else:
+            for br_name, dut_iface, injected_iface, vm_iface in fp_port_bindings:
+                self.bind_ovs_ports(br_name, dut_iface, injected_iface, vm_iface, disconnect_vm)
+
+        if self.topo and 'DUT' in self.topo and 'vs_chassis' in self.topo['DUT']:
+            # We have a KVM based virtaul chassis, bind the midplane and inband ports
+            self.bind_vs_dut_ports(
+                VS_CHASSIS_INBAND_BRIDGE_NAME, self.topo['DUT']['vs_chassis']['inband_port'])
+            self.bind_vs_dut_ports(
+                VS_CHASSIS_MIDPLANE_BRIDGE_NAME, self.topo['DUT']['vs_chassis']['midplane_port'])
+
+    def get_fp_port_bindings(self):
+        """Return the (br_name, dut_iface, injected_iface, vm_iface) of the front panel ports of the VMs."""
+        fp_port_bindings = []
         for attr in self.VMs.values():
             for idx, vlan in enumerate(attr['vlans']):
                 br_name = adaptive_name(
@@ -853,15 +1038,9 @@ class VMTopology(object):
                     INJECTED_INTERFACES_TEMPLATE, self.vm_set_name, ptf_index)
                 if len(self.duts_fp_ports[self.duts_name[dut_index]]) == 0:
                     continue
-                self.bind_ovs_ports(br_name, self.duts_fp_ports[self.duts_name[dut_index]][str(
-                    vlan_index)], injected_iface, vm_iface, disconnect_vm)
-
-        if self.topo and 'DUT' in self.topo and 'vs_chassis' in self.topo['DUT']:
-            # We have a KVM based virtaul chassis, bind the midplane and inband ports
-            self.bind_vs_dut_ports(
-                VS_CHASSIS_INBAND_BRIDGE_NAME, self.topo['DUT']['vs_chassis']['inband_port'])
-            self.bind_vs_dut_ports(
-                VS_CHASSIS_MIDPLANE_BRIDGE_NAME, self.topo['DUT']['vs_chassis']['midplane_port'])
+                fp_port_bindings.append((br_name, self.duts_fp_ports[self.duts_name[dut_index]][str(
+                    vlan_index)], injected_iface, vm_iface))
+        return fp_port_bindings
 
     def unbind_fp_ports(self):
         logging.info("=== unbind front panel ports ===")
@@ -971,58 +1150,101 @@ class VMTopology(object):
         # clear old bindings
         VMTopology.cmd('ovs-ofctl del-flows %s' % br_name)
 
+        for flow in VMTopology.get_fp_flows(dut_iface_id, injected_iface_id, vm_iface_id, disconnect_vm):
+            VMTopology.cmd("ovs-ofctl add-flow %s %s" % (br_name, flow))
+
+    def bind_ovs_ports_batched(self, fp_port_bindings, disconnect_vm=False):
+        """
+        bind dut/injected/vm ports of several ovs bridges like bind_ovs_ports, the ports of all the bridges are
+        moved with one ovs-vsctl transaction, then the flows of every bridge are replaced at once from a flow file,
+        the bridges being programmed concurrently
+
+        Args:
+            fp_port_bindings (list): (br_name, dut_iface, injected_iface, vm_iface) of the bridges.
+            disconnect_vm (bool, optional): Drop the packets from the VMs. Defaults to False.
+        """
+        if not fp_port_bindings:
+            return
+
+        port_to_bridge = VMTopology.get_ovs_port_to_bridge()
+        ops = []
+        for br_name, dut_iface, injected_iface, _ in fp_port_bindings:
+            for port in (injected_iface, dut_iface):
+                br = port_to_bridge.get(port)
+                if br is not None and br != br_name:
+                    ops.append('del-port %s %s' % (br, port))
+                if br != br_name:
+                    ops.append('add-port %s %s' % (br_name, port))
+        VMTopology.ovs_vsctl_transaction(ops)
+
+        ofports = VMTopology.get_ovs_ofports(
+            [iface for binding in fp_port_bindings for iface in binding[1:]])
+
+        def replace_flows(fp_port_binding):
+            br_name, dut_iface, injected_iface, vm_iface = fp_port_binding
+            flows = VMTopology.get_fp_flows(ofports[dut_iface], ofports[injected_iface], ofports[vm_iface],
+                                            disconnect_vm)
+            VMTopology.replace_ovs_flows(br_name, flows)
+
+        VMTopology.run_concurrently(replace_flows, fp_port_bindings)
+
+    @staticmethod
+    def get_fp_flows(dut_iface_id, injected_iface_id, vm_iface_id, disconnect_vm=False):
+        """Return the flows of an ovs bridge of a front panel port, see bind_ovs_ports."""
+        flows = []
         if disconnect_vm:
             # Drop packets from VM
-            VMTopology.cmd(
-                "ovs-ofctl add-flow %s table=0,in_port=%s,action=drop" % (br_name, vm_iface_id))
+            flows.append("table=0,in_port=%s,action=drop" % vm_iface_id)
         else:
             # Add flow from a VM to an external iface
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" %
-                           (br_name, vm_iface_id, dut_iface_id))
+            flows.append("table=0,in_port=%s,action=output:%s" %
+                         (vm_iface_id, dut_iface_id))
 
         if disconnect_vm:
             # Add flow from external iface to ptf container
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" %
-                           (br_name, dut_iface_id, injected_iface_id))
+            flows.append("table=0,in_port=%s,action=output:%s" %
+                         (dut_iface_id, injected_iface_id))
         else:
             # Add flow from external iface to a VM and a ptf container
             # Allow BGP, IPinIP, fragmented packets, ICMP, SNMP packets and layer2 packets from DUT to neighbors
             # Block other traffic from DUT to EOS for EOS's stability,
             # Allow all traffic from DUT to PTF.
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,tcp,in_port=%s,tp_src=179,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,tcp,in_port=%s,tp_dst=179,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,tcp6,in_port=%s,tp_src=179,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,tcp6,in_port=%s,tp_dst=179,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=10,ip,in_port=%s,nw_proto=4,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,ip,in_port=%s,nw_frag=yes,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,ipv6,in_port=%s,nw_frag=yes,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,icmp,in_port=%s,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,icmp6,in_port=%s,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,udp,in_port=%s,udp_src=161,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,udp,in_port=%s,udp_src=53,action=output:%s" %
-                           (br_name, dut_iface_id, vm_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=8,udp6,in_port=%s,udp_src=161,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=5,ip,in_port=%s,action=output:%s" %
-                           (br_name, dut_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=5,ipv6,in_port=%s,action=output:%s" %
-                           (br_name, dut_iface_id, injected_iface_id))
-            VMTopology.cmd("ovs-ofctl add-flow %s table=0,priority=3,in_port=%s,action=output:%s,%s" %
-                           (br_name, dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,tcp,in_port=%s,tp_src=179,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,tcp,in_port=%s,tp_dst=179,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,tcp6,in_port=%s,tp_src=179,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,tcp6,in_port=%s,tp_dst=179,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=10,ip,in_port=%s,nw_proto=4,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,ip,in_port=%s,nw_frag=yes,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,ipv6,in_port=%s,nw_frag=yes,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,icmp,in_port=%s,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,icmp6,in_port=%s,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,udp,in_port=%s,udp_src=161,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=8,udp,in_port=%s,udp_src=53,action=output:%s" %
+                         (dut_iface_id, vm_iface_id))
+            flows.append("table=0,priority=8,udp6,in_port=%s,udp_src=161,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
+            flows.append("table=0,priority=5,ip,in_port=%s,action=output:%s" %
+                         (dut_iface_id, injected_iface_id))
+            flows.append("table=0,priority=5,ipv6,in_port=%s,action=output:%s" %
+                         (dut_iface_id, injected_iface_id))
+            flows.append("table=0,priority=3,in_port=%s,action=output:%s,%s" %
+                         (dut_iface_id, vm_iface_id, injected_iface_id))
 
         # Add flow from a ptf container to an external iface
-        VMTopology.cmd("ovs-ofctl add-flow %s table=0,in_port=%s,action=output:%s" %
-                       (br_name, injected_iface_id, dut_iface_id))
+        flows.append("table=0,in_port=%s,action=output:%s" %
+                     (injected_iface_id, dut_iface_id))
+
+        return flows
 
     def unbind_ovs_ports(self, br_name, vm_port):
         """unbind all ports except the vm port from an ovs bridge"""
@@ -1447,32 +1669,40 @@ class VMTopology(object):
 
         cmdline_ori = cmdline
         grep_cmd_ori = grep_cmd
+        recorder = VMTopology.cmd_recorder
         for attempt in range(retry):
             logging.debug('*** CMD: %s, grep: %s, attempt: %d' %
                           (cmdline, grep_cmd, attempt+1))
-            if split_cmd:
-                cmdline = shlex.split(cmdline_ori)
-            process = subprocess.Popen(
-                cmdline,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                shell=shell)
-            if grep_cmd:
+            start = time.time()
+            if recorder is not None and recorder.dry_run:
+                ret_code, out, err = recorder.respond(cmdline_ori, grep_cmd_ori)
+                recorder.record(cmdline_ori, grep_cmd_ori, ret_code, time.time() - start)
+            else:
                 if split_cmd:
-                    grep_cmd = shlex.split(grep_cmd_ori)
-                process_grep = subprocess.Popen(
-                    grep_cmd,
-                    stdin=process.stdout,
+                    cmdline = shlex.split(cmdline_ori)
+                process = subprocess.Popen(
+                    cmdline,
+                    stdin=subprocess.PIPE,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     shell=shell)
-                out, err = process_grep.communicate()
-                ret_code = process_grep.returncode
-            else:
-                out, err = process.communicate()
-                ret_code = process.returncode
-            out, err = out.decode('utf-8'), err.decode('utf-8')
+                if grep_cmd:
+                    if split_cmd:
+                        grep_cmd = shlex.split(grep_cmd_ori)
+                    process_grep = subprocess.Popen(
+                        grep_cmd,
+                        stdin=process.stdout,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        shell=shell)
+                    out, err = process_grep.communicate()
+                    ret_code = process_grep.returncode
+                else:
+                    out, err = process.communicate()
+                    ret_code = process.returncode
+                out, err = out.decode('utf-8'), err.decode('utf-8')
+                if recorder is not None:
+                    recorder.record(cmdline_ori, grep_cmd_ori, ret_code, time.time() - start)
 
             msg = {
                 'cmd': cmdline,
@@ -1546,6 +1776,112 @@ class VMTopology(object):
         # Flow reaches here when vlan_iface not present in result
         raise Exception("Can't find vlan_iface_id")
 
+    @staticmethod
+    def list_ovs_table(table, columns):
+        """Return the rows of an OVSDB table as dictionaries of the columns, values are in OVSDB json format."""
+        out = VMTopology.cmd('ovs-vsctl --format=json --columns=%s list %s' % (','.join(columns), table))
+        data = json.loads(out)
+        return [dict(zip(data['headings'], row)) for row in data['data']]
+
+    @staticmethod
+    def get_ovs_port_to_bridge():
+        """Return the bridge of every ovs port, with two ovs-vsctl commands for all the bridges."""
+        port_names = {}
+        for row in VMTopology.list_ovs_table('Port', ['_uuid', 'name']):
+            port_names[row['_uuid'][1]] = row['name']
+
+        port_to_bridge = {}
+        for row in VMTopology.list_ovs_table('Bridge', ['name', 'ports']):
+            # A set column is ["set", [atoms]], unless it has exactly one atom
+            ports = row['ports'][1] if row['ports'][0] == 'set' else [row['ports']]
+            for _, port_uuid in ports:
+                if port_uuid in port_names:
+                    port_to_bridge[port_names[port_uuid]] = row['name']
+        return port_to_bridge
+
+    @staticmethod
+    def get_ovs_ofports(ifaces):
+        """Return the openflow port number of every ovs interface, like get_ovs_port_bindings for all the bridges.
+
+        Args:
+            ifaces (list): Interfaces which must have a port number, retry until they all have one.
+        """
+        for retries in range(RETRIES):
+            result = {}
+            for row in VMTopology.list_ovs_table('Interface', ['name', 'ofport']):
+                # ofport is an empty set until it is assigned and -1 if the interface could not be added
+                if isinstance(row['ofport'], int) and row['ofport'] > 0:
+                    result[row['name']] = str(row['ofport'])
+            missing = [iface for iface in ifaces if iface not in result]
+            if not missing:
+                return result
+            time.sleep(2*retries+1)
+        raise Exception("Can't find ofport of interfaces %s" % ', '.join(missing))
+
+    @staticmethod
+    def ovs_vsctl_transaction(ops):
+        """Run the ovs-vsctl operations in one transaction."""
+        if not ops:
+            return ''
+        return VMTopology.cmd('ovs-vsctl ' + ' '.join('-- ' + op for op in ops))
+
+    @staticmethod
+    def replace_ovs_flows(bridge, flows):
+        """Replace all the flows of an ovs bridge with the flows, from a flow file."""
+        with tempfile.NamedTemporaryFile(mode='w', prefix='vmtopology_flows_', delete=False) as flow_file:
+            flow_file.write('\n'.join(flows) + '\n')
+        logging.debug('*** FLOWS of %s:\n%s' % (bridge, '\n'.join(flows)))
+        try:
+            return VMTopology.cmd('ovs-ofctl replace-flows %s %s' % (bridge, flow_file.name))
+        finally:
+            os.remove(flow_file.name)
+
+    @staticmethod
+    def ip_batch(ip_cmds, pid=None):
+        """Run the ip commands with one 'ip -batch', on host or in the network namespace of pid."""
+        if not ip_cmds:
+            return ''
+        with tempfile.NamedTemporaryFile(mode='w', prefix='vmtopology_ip_', delete=False) as batch_file:
+            batch_file.write('\n'.join(ip_cmds) + '\n')
+        logging.debug('*** IP BATCH:\n%s' % '\n'.join(ip_cmds))
+        try:
+            if pid is not None:
+                return VMTopology.cmd('nsenter -t %s -n ip -batch %s' % (pid, batch_file.name))
+            return VMTopology.cmd('ip -batch %s' % batch_file.name)
+        finally:
+            os.remove(batch_file.name)
+
+    @staticmethod
+    def get_links(pid=None):
+        """Return the links on host or in the network namespace of pid, with their peer if it is in the same
+        namespace, e.g. {'eth0': None, 'veth0': 'veth1', 'veth1': 'veth0'}."""
+        if pid is not None:
+            out = VMTopology.cmd('nsenter -t %s -n ip -o link show' % pid)
+        else:
+            out = VMTopology.cmd('ip -o link show')
+        links = {}
+        for line in out.splitlines():
+            matched = re.match(r'^\d+:\s+([^:@\s]+)(?:@([^:\s]+))?:', line)
+            if matched:
+                links[matched.group(1)] = matched.group(2)
+        # The peer of a link in another namespace is shown as 'if<index>'
+        for name, peer in links.items():
+            if peer not in links:
+                links[name] = None
+        return links
+
+    @staticmethod
+    def run_concurrently(func, items):
+        """Call func on every item with a pool of BATCH_MODE_WORKERS threads, return the results in order."""
+        if not items:
+            return []
+        pool = ThreadPool(min(BATCH_MODE_WORKERS, len(items)))
+        try:
+            return pool.map(func, items)
+        finally:
+            pool.close()
+            pool.join()
+
     @staticmethod
     def get_pid(ptf_name):
         cli = docker.from_env()
@@ -1747,7 +2083,8 @@ def main():
             fp_mtu=dict(required=False, type='int', default=DEFAULT_MTU),
             max_fp_num=dict(required=False, type='int',
                             default=NUM_FP_VLANS_PER_FP),
-            netns_mgmt_ip_addr=dict(required=False, type='str', default=None)
+            netns_mgmt_ip_addr=dict(required=False, type='str', default=None),
+            batch_mode=dict(required=False, type='bool', default=False)
         ),
         supports_check_mode=False)
 
@@ -1757,6 +2094,7 @@ def main():
     fp_mtu = module.params['fp_mtu']
     max_fp_num = module.params['max_fp_num']
     vm_properties = module.params['vm_properties']
+    batch_mode = module.params['batch_mode']
 
     config_module_logging(construct_log_filename(cmd, vm_set_name))
 
@@ -1766,7 +2104,7 @@ def main():
     try:
 
         topo = module.params['topo']
-        net = VMTopology(vm_names, vm_properties, fp_mtu, max_fp_num, topo)
+        net = VMTopology(vm_names, vm_properties, fp_mtu, max_fp_num, topo, batch_mode)
 
         if cmd == 'create':
             net.create_bridges()
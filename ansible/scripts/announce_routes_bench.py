@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Time the announcement of routes by the announce_routes module to the exabgp http api, streamed in chunks and sent
+in a single form field like before the /stream endpoint.
+
+The http api of the PTF is replaced by a local http server with the same two endpoints, which writes the commands
+to /dev/null instead of exabgp. The server of the form mode has no /stream endpoint, so change_routes falls back to
+the form field like with an http api started by an older exabgp module. Both servers must receive the same commands:
+
+    python3 ansible/scripts/announce_routes_bench.py --routes 100000
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import ansible.module_utils
+
+ANSIBLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+ansible.module_utils.__path__.append(os.path.join(ANSIBLE_DIR, 'module_utils'))
+sys.path.insert(0, os.path.join(ANSIBLE_DIR, 'library'))
+
+import announce_routes   # noqa: E402
+
+STREAM_BLOCK_SIZE = 65536
+
+
+class HttpApiHandler(BaseHTTPRequestHandler):
+    """Endpoints of the http_api.py of the exabgp module, the commands are counted and written to /dev/null"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, code, text):
+        body = text.encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def received(self, cmds):
+        self.server.sink.write('\n'.join(cmds) + '\n')
+        self.server.sink.flush()
+        with self.server.lock:
+            self.server.commands.extend(cmds)
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        if self.path == '/stream':
+            if not self.server.streaming:
+                self.rfile.read(length)
+                self.reply(404, 'Not Found\n')
+                return
+            count = 0
+            partial = b''
+            while True:
+                block = self.rfile.read(min(STREAM_BLOCK_SIZE, length))
+                length -= len(block)
+                lines = (partial + block).split(b'\n')
+                partial = lines.pop() if block else b''
+                cmds = [line.strip().decode('utf-8') for line in lines if line.strip()]
+                if cmds:
+                    self.received(cmds)
+                    count += len(cmds)
+                if not block:
+                    break
+            self.reply(200, 'OK %d\n' % count)
+        else:
+            form = parse_qs(self.rfile.read(length).decode('utf-8'))
+            self.received(form['commands'][0].split(';'))
+            self.reply(200, 'OK\n')
+
+
+def start_http_api(streaming):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), HttpApiHandler)
+    server.streaming = streaming
+    server.commands = []
+    server.lock = threading.Lock()
+    server.sink = open(os.devnull, 'w')
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def generate_routes(count):
+    routes = []
+    for index in range(count):
+        prefix = '{}.{}.{}.0/24'.format(100 + index // 65536, (index // 256) % 256, index % 256)
+        routes.append((prefix, '10.0.0.57', '64600 65534 6666 6667'))
+    return routes
+
+
+def announce(routes, streaming):
+    server = start_http_api(streaming)
+    try:
+        start = time.time()
+        announce_routes.change_routes('announce', '127.0.0.1', server.server_address[1], routes)
+        return server.commands, round(time.time() - start, 3)
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.sink.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the announcement of routes to the exabgp http api')
+    parser.add_argument('--routes', type=int, default=100000, help='Number of routes announced')
+    args = parser.parse_args()
+
+    routes = generate_routes(args.routes)
+    expected = announce_routes.format_route_commands('announce', routes)
+    report = {'routes': args.routes, 'chunk_size': announce_routes.ROUTE_CHUNK_SIZE}
+    for mode, streaming in (('stream', True), ('form', False)):
+        commands, report[mode] = announce(routes, streaming)
+        if commands != expected:
+            raise RuntimeError('Commands received in {} mode differ from the announced routes'.format(mode))
+    print(json.dumps(report, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Time the lookup of the connection graph of hosts by the conn_graph_facts module, with and without the graph cache.
+
+A synthetic lab is generated in a temporary folder: --groups groups, each with --duts SONiC DUTs whose --ports ports
+are connected by port alias to fanout switches, plus their console, PDU and BMC links. The hosts of the last group are
+then looked up like the module does, building every group from the csv files, then with a cold and a warm cache.
+The facts returned by all the modes are checked to be the same:
+
+    python3 ansible/scripts/conn_graph_facts_bench.py --groups 20 --duts 50 --ports 32
+
+With --ansible, the hosts are also looked up by running the module with the ansible command, through AnsiballZ like
+the fixtures and playbooks do. The cache must be written by the first run and used by the second one.
+"""
+import argparse
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import ansible.module_utils
+
+ANSIBLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# conn_graph_facts imports the module_utils of sonic-mgmt as ansible.module_utils
+ansible.module_utils.__path__.append(os.path.join(ANSIBLE_DIR, 'module_utils'))
+sys.path.insert(0, os.path.join(ANSIBLE_DIR, 'library'))
+
+import conn_graph_facts   # noqa: E402
+
+# Port aliases of this hwsku are known by port_utils without a SONiC host
+DUT_HWSKU = 'Force10-S6000'
+FANOUT_PORTS = 64
+
+
+def write_csv(path, fields, rows):
+    with open(path, 'w') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def generate_group(path, group, duts, ports):
+    devices = []
+    links = []
+    console_links = []
+    pdu_links = []
+    bmc_links = []
+    fanouts = (duts * ports + FANOUT_PORTS - 1) // FANOUT_PORTS
+    for fanout in range(fanouts):
+        devices.append({'Hostname': '{}-fanout-{}'.format(group, fanout), 'HwSku': 'Arista-7260QX-64',
+                        'ManagementIp': '10.{}.{}.{}/24'.format(len(group), fanout // 250, fanout % 250 + 1),
+                        'Type': 'FanoutLeaf', 'Protocol': '', 'Os': 'eos'})
+    for pdu in ('pdu', 'console', 'management'):
+        devices.append({'Hostname': '{}-{}'.format(group, pdu), 'HwSku': 'Sentry', 'ManagementIp': '10.0.0.1/24',
+                        'Type': 'Pdu' if pdu == 'pdu' else 'ConsoleServer', 'Protocol': 'snmp', 'Os': ''})
+    for dut in range(duts):
+        hostname = '{}-dut-{}'.format(group, dut)
+        devices.append({'Hostname': hostname, 'HwSku': DUT_HWSKU, 'Type': 'DevSonic', 'Protocol': '',
+                        'ManagementIp': '10.255.{}.{}/23'.format(dut // 250, dut % 250 + 1), 'Os': 'sonic'})
+        for port in range(ports):
+            index = dut * ports + port
+            links.append({'StartDevice': hostname, 'StartPort': 'fortyGigE0/{}'.format(port * 4),
+                          'EndDevice': '{}-fanout-{}'.format(group, index // FANOUT_PORTS),
+                          'EndPort': 'Ethernet{}'.format(index % FANOUT_PORTS + 1), 'BandWidth': '40000',
+                          'VlanID': str(100 + index), 'VlanMode': 'Access'})
+        console_links.append({'StartDevice': '{}-console'.format(group), 'StartPort': str(dut), 'EndDevice': hostname,
+                              'Console_type': 'ssh', 'Proxy': 'root', 'BaudRate': '9600'})
+        for psu in ('PSU1', 'PSU2'):
+            pdu_links.append({'StartDevice': '{}-pdu'.format(group), 'StartPort': str(len(pdu_links)),
+                              'EndDevice': hostname, 'EndPort': psu, 'EndFeed': ''})
+        bmc_links.append({'StartDevice': '{}-management'.format(group), 'StartPort': 'Ethernet{}'.format(dut),
+                          'BmcIp': '192.168.0.1/23', 'EndDevice': hostname, 'EndPort': 'iDRAC'})
+
+    files = conn_graph_facts.LabGraph.SUPPORTED_CSV_FILES
+    write_csv(os.path.join(path, files['devices'].format(group)),
+              ['Hostname', 'ManagementIp', 'HwSku', 'Type', 'Protocol', 'Os'], devices)
+    write_csv(os.path.join(path, files['links'].format(group)),
+              ['StartDevice', 'StartPort', 'EndDevice', 'EndPort', 'BandWidth', 'VlanID', 'VlanMode'], links)
+    write_csv(os.path.join(path, files['console_links'].format(group)),
+              ['StartDevice', 'StartPort', 'EndDevice', 'Console_type', 'Proxy', 'BaudRate'], console_links)
+    write_csv(os.path.join(path, files['pdu_links'].format(group)),
+              ['StartDevice', 'StartPort', 'EndDevice', 'EndPort', 'EndFeed'], pdu_links)
+    write_csv(os.path.join(path, files['bmc_links'].format(group)),
+              ['StartDevice', 'StartPort', 'BmcIp', 'EndDevice', 'EndPort'], bmc_links)
+
+
+def lookup(hostnames, use_cache):
+    start = time.time()
+    lab_graph = conn_graph_facts.find_graph(hostnames, use_cache=use_cache)
+    succeed, results = lab_graph.build_results(hostnames)
+    if not succeed:
+        raise RuntimeError(results)
+    # Compare the facts like ansible returns them
+    return json.loads(json.dumps(results)), round(time.time() - start, 3)
+
+
+def ansible_lookup(ansible, path, hostnames):
+    env = dict(os.environ,
+               ANSIBLE_LIBRARY=os.path.join(ANSIBLE_DIR, 'library'),
+               ANSIBLE_MODULE_UTILS=os.path.join(ANSIBLE_DIR, 'module_utils'),
+               ANSIBLE_STDOUT_CALLBACK='json',
+               ANSIBLE_LOAD_CALLBACK_PLUGINS='1')
+    module_args = json.dumps({'hosts': hostnames, 'filepath': path})
+    start = time.time()
+    output = subprocess.check_output([ansible, 'localhost', '-i', 'localhost,', '-c', 'local',
+                                      '-e', 'ansible_python_interpreter={}'.format(sys.executable),
+                                      '-m', 'conn_graph_facts', '-a', module_args], env=env)
+    duration = round(time.time() - start, 3)
+    result = json.loads(output)['plays'][0]['tasks'][0]['hosts']['localhost']
+    if result.get('failed'):
+        raise RuntimeError('conn_graph_facts failed: {}'.format(result.get('msg')))
+    return result['ansible_facts'], duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the lookups of conn_graph_facts with and without cache')
+    parser.add_argument('--groups', type=int, default=20, help='Number of graph groups')
+    parser.add_argument('--duts', type=int, default=50, help='Number of DUTs per group')
+    parser.add_argument('--ports', type=int, default=32, help='Number of links per DUT')
+    parser.add_argument('--hosts', type=int, default=2, help='Number of DUTs of the last group looked up')
+    parser.add_argument('--ansible', nargs='?', const='ansible', help='Also run the module with this ansible command')
+    args = parser.parse_args()
+
+    path = tempfile.mkdtemp()
+    try:
+        groups = ['group{}'.format(index) for index in range(args.groups)]
+        with open(os.path.join(path, conn_graph_facts.LAB_GRAPH_GROUPS_FILE), 'w') as f:
+            f.write(''.join('- {}\n'.format(group) for group in groups))
+        for group in groups:
+            generate_group(path, group, args.duts, args.ports)
+        conn_graph_facts.LAB_GRAPHFILE_PATH = path
+        hostnames = ['{}-dut-{}'.format(groups[-1], index) for index in range(args.hosts)]
+
+        report = {}
+        expected, report['csv'] = lookup(hostnames, False)
+        for mode in ('cold_cache', 'warm_cache'):
+            results, report[mode] = lookup(hostnames, True)
+            if results != expected:
+                raise RuntimeError('Facts with {} differ from the facts built from the csv files'.format(mode))
+        # A change of a csv file of the group makes it built again
+        os.utime(os.path.join(path, conn_graph_facts.LabGraph.SUPPORTED_CSV_FILES['links'].format(groups[-1])),
+                 (time.time() + 10, time.time() + 10))
+        results, report['csv_changed'] = lookup(hostnames, True)
+        if results != expected:
+            raise RuntimeError('Facts after the csv change differ from the facts built from the csv files')
+
+        if args.ansible:
+            cache_file = os.path.join(path, conn_graph_facts.LAB_GRAPH_CACHE_DIR, '{}.json'.format(groups[-1]))
+            os.remove(cache_file)
+            for mode in ('ansible_cold_cache', 'ansible_warm_cache'):
+                results, report[mode] = ansible_lookup(args.ansible, path, hostnames)
+                if results != expected:
+                    raise RuntimeError('Facts with {} differ from the facts built from the csv files'.format(mode))
+                if not os.path.exists(cache_file):
+                    raise RuntimeError('Graph facts not cached when the module runs through AnsiballZ')
+
+        report['links'] = args.groups * args.duts * args.ports
+        print(json.dumps(report, indent=2, sort_keys=True))
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
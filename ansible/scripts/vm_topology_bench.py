@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Count the forks and time the bring-up of a front panel topology by the vm_topology module, one command per
+operation and in batch mode.
+
+The bench creates the bridges of the VMs, the VM taps and the DUT front panel ports, then adds the injected ports
+to a PTF network namespace and binds the front panel ports, recording every command run by VMTopology.cmd.
+
+Against the local OVS (needs root, Open vSwitch, ansible and the docker python package), the PTF docker is
+replaced by a process in its own network namespace and everything is removed at the end:
+
+    sudo python3 ansible/scripts/vm_topology_bench.py --vms 32 --ports 4
+
+With --dry-run, the commands are not executed but answered by an in-memory model of the host, which is enough to
+count the forks of both modes without root:
+
+    python3 ansible/scripts/vm_topology_bench.py --vms 32 --ports 4 --dry-run
+"""
+import argparse
+import json
+import logging
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+import ansible.module_utils
+
+ANSIBLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# vm_topology imports the module_utils of sonic-mgmt as ansible.module_utils
+ansible.module_utils.__path__.append(os.path.join(ANSIBLE_DIR, 'module_utils'))
+sys.path.insert(0, os.path.join(ANSIBLE_DIR, 'roles', 'vm_set', 'library'))
+
+from vm_topology import VMTopology, CommandRecorder   # noqa: E402
+
+VM_SET_NAME = 'bench'
+DUT_NAME = 'bench-dut'
+DUT_IFACE_TEMPLATE = 'bdut-%d'
+DUT_PEER_TEMPLATE = 'bdutp-%d'
+DRY_RUN_PID = 4242
+
+
+class FakeHost(object):
+    """In-memory model of the links and the OVS bridges of a host, answering the commands of VMTopology.cmd."""
+
+    def __init__(self):
+        # links[namespace][name] = peer, namespace None is the host
+        self.links = {None: {}}
+        self.bridges = {}
+        self.ofports = {}
+        self.next_ofport = 1
+
+    def respond(self, cmdline, grep_cmd):
+        args = shlex.split(cmdline)
+        pid = None
+        if args[:2] == ['nsenter', '-t']:
+            pid = int(args[2])
+            args = args[4:]
+        try:
+            if args[0] == 'ip':
+                return 0, self.ip(args[1:], pid), ''
+            if args[0] == 'ifconfig':
+                return self.ifconfig(args[1:], pid)
+            if args[0] == 'ovs-vsctl':
+                return self.ovs_vsctl(args[1:])
+            if args[0] == 'ovs-ofctl':
+                return 0, self.ovs_ofctl(args[1:]), ''
+        except (KeyError, ValueError) as e:
+            return 1, '', repr(e)
+        return 1, '', 'unsupported command %s' % cmdline
+
+    def ns_links(self, pid):
+        return self.links.setdefault(pid, {})
+
+    def ifconfig(self, args, pid):
+        if args[0] == '-a':
+            return (0, '', '') if args[1] in self.ns_links(pid) else (1, '', 'Device not found')
+        if args[0] not in self.ns_links(pid):
+            return 1, '', 'Device not found'
+        return 0, '', ''
+
+    def ip(self, args, pid):
+        if args[0] == '-batch':
+            with open(args[1]) as batch_file:
+                for line in batch_file:
+                    if line.strip():
+                        self.ip(shlex.split(line), pid)
+            return ''
+        if args[:2] == ['-o', 'link']:
+            return ''.join('%d: %s%s: <UP> mtu 1500\n' % (index, name, '@' + peer if peer else '')
+                           for index, (name, peer) in enumerate(sorted(self.ns_links(pid).items()), 1))
+        if args[0] != 'link':
+            return ''
+        links = self.ns_links(pid)
+        op, args = args[1], args[2:]
+        if op == 'add':
+            if args[0] in links:
+                raise ValueError('File exists')
+            peer = args[args.index('name') + 1]
+            links[args[0]] = peer
+            links[peer] = args[0]
+        elif op == 'del':
+            # Deleting a veth deletes its peer, wherever it is
+            links.pop(args[1])
+            for ns_links in self.links.values():
+                for name, peer in list(ns_links.items()):
+                    if peer == args[1]:
+                        ns_links.pop(name)
+        elif op == 'set':
+            name = args[1] if args[0] == 'dev' else args[0]
+            if name not in links:
+                raise KeyError(name)
+            if 'netns' in args:
+                target = int(args[args.index('netns') + 1])
+                self.ns_links(target)[name] = links.pop(name)
+            elif 'name' in args:
+                new_name = args[args.index('name') + 1]
+                links[new_name] = links.pop(name)
+        return ''
+
+    def ovs_vsctl(self, args):
+        if args and args[0].startswith('--format'):
+            return 0, self.ovs_list(args), ''
+        if '--' not in args:
+            args = ['--'] + args
+        out = []
+        ops = []
+        for arg in args:
+            if arg == '--':
+                ops.append([])
+            else:
+                ops[-1].append(arg)
+        for op in ops:
+            options = [arg for arg in op if arg.startswith('--')]
+            op = [arg for arg in op if not arg.startswith('--')]
+            if op[0] == 'add-br':
+                if op[1] not in self.bridges:
+                    self.bridges[op[1]] = set()
+                    self.links[None][op[1]] = None
+            elif op[0] == 'del-br':
+                if op[1] in self.bridges or '--if-exists' not in options:
+                    del self.bridges[op[1]]
+                    self.links[None].pop(op[1])
+            elif op[0] == 'add-port':
+                if op[2] in self.port_to_bridge():
+                    if '--may-exist' in options:
+                        continue
+                    return 1, '', 'port %s already exists' % op[2]
+                self.bridges[op[1]].add(op[2])
+                self.ofports[op[2]] = self.next_ofport
+                self.next_ofport += 1
+                if op[2] not in self.links[None]:
+                    # internal port
+                    self.links[None][op[2]] = None
+            elif op[0] == 'del-port':
+                self.bridges[op[1]].remove(op[2])
+            elif op[0] == 'list-ports':
+                out.extend(sorted(self.bridges[op[1]]))
+            elif op[0] == 'port-to-br':
+                bridge = self.port_to_bridge().get(op[1])
+                if bridge is None:
+                    return 1, '', 'no port named %s' % op[1]
+                out.append(bridge)
+        return 0, ''.join(line + '\n' for line in out), ''
+
+    def ovs_ofctl(self, args):
+        if args[0] != 'show':
+            return ''
+        return ''.join(' %d(%s): addr:00:00:00:00:00:00\n' % (self.ofports[port], port)
+                       for port in sorted(self.bridges[args[1]]))
+
+    def port_to_bridge(self):
+        return dict((port, bridge) for bridge, ports in self.bridges.items() for port in ports)
+
+    def ovs_list(self, args):
+        columns = args[1].split('=')[1].split(',')
+        table = args[3]
+        if table == 'Port':
+            data = [[['uuid', 'port-' + port], port] for port in self.port_to_bridge()]
+        elif table == 'Bridge':
+            data = [[bridge, ['set', [['uuid', 'port-' + port] for port in sorted(ports)]]]
+                    for bridge, ports in self.bridges.items()]
+        else:
+            data = [[port, self.ofports[port]] for port in self.port_to_bridge()]
+        return json.dumps({'headings': columns, 'data': data})
+
+
+def build_topo(vms, ports):
+    topo = {'VMs': {}}
+    for vm_index in range(vms):
+        topo['VMs']['ARISTA%02dT1' % (vm_index + 1)] = {
+            'vm_offset': vm_index,
+            'vlans': [vm_index * ports + port for port in range(ports)]
+        }
+    return topo
+
+
+def setup(vm_names, ports, dut_ifaces):
+    """Create what the kickstart of the VMs and the DUT would have created: the VM taps and the DUT ports."""
+    ops = []
+    for vm_name in vm_names:
+        for port in range(ports):
+            tap = '%s-t%d' % (vm_name, port)
+            ops.append('add-port br-%s-%d %s' % (vm_name, port, tap))
+            ops.append('set Interface %s type=internal' % tap)
+    VMTopology.ovs_vsctl_transaction(ops)
+    VMTopology.ip_batch(['link add %s type veth peer name %s' % (dut_iface, DUT_PEER_TEMPLATE % index)
+                         for index, dut_iface in enumerate(dut_ifaces)])
+
+
+def teardown(net, vm_names, dut_ifaces):
+    net.unbind_fp_ports()
+    net.remove_injected_fp_ports_from_docker()
+    net.destroy_bridges()
+    for dut_iface in dut_ifaces:
+        if VMTopology.intf_exists(dut_iface):
+            VMTopology.cmd('ip link del dev %s' % dut_iface)
+
+
+def new_recorder(dry_run, responder):
+    return CommandRecorder(dry_run=True, responder=responder) if dry_run else None
+
+
+def run_phase(name, func, dry_run, responder, results):
+    VMTopology.cmd_recorder = CommandRecorder(dry_run=dry_run, responder=responder)
+    start = time.time()
+    try:
+        func()
+    finally:
+        summary = VMTopology.cmd_recorder.summary()
+        summary['wall_time'] = round(time.time() - start, 3)
+        results[name] = summary
+        VMTopology.cmd_recorder = new_recorder(dry_run, responder)
+
+
+def bench(mode, args):
+    batch_mode = mode == 'batch'
+    vm_names = ['VMB%04d' % index for index in range(args.vms)]
+    dut_ifaces = [DUT_IFACE_TEMPLATE % index for index in range(args.vms * args.ports)]
+    topo = build_topo(args.vms, args.ports)
+    net = VMTopology(vm_names, {}, args.mtu, args.ports, topo, batch_mode=batch_mode)
+
+    fake_host = FakeHost() if args.dry_run else None
+    responder = fake_host.respond if fake_host else None
+    VMTopology.cmd_recorder = new_recorder(args.dry_run, responder)
+
+    ptf = None
+    if args.dry_run:
+        pid = DRY_RUN_PID
+    else:
+        # Stand-in for the PTF docker: a process in its own network namespace
+        ptf = subprocess.Popen(['unshare', '--net', 'sleep', 'infinity'])
+        time.sleep(0.5)
+        pid = ptf.pid
+
+    results = {}
+    try:
+        run_phase('create_bridges', net.create_bridges, args.dry_run, responder, results)
+        setup(vm_names, args.ports, dut_ifaces)
+        net.init(VM_SET_NAME, vm_names[0], {DUT_NAME: dict((str(index), dut_iface)
+                 for index, dut_iface in enumerate(dut_ifaces))}, [DUT_NAME], ptf_exists=False, check_bridge=False)
+        net.pid = pid
+        run_phase('add_injected_fp_ports_to_docker', net.add_injected_fp_ports_to_docker, args.dry_run,
+                  responder, results)
+        run_phase('bind_fp_ports', net.bind_fp_ports, args.dry_run, responder, results)
+        if not args.dry_run:
+            run_phase('teardown', lambda: teardown(net, vm_names, dut_ifaces), False, None, results)
+    finally:
+        VMTopology.cmd_recorder = None
+        if ptf is not None:
+            ptf.kill()
+            ptf.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Count the forks and time the bring-up of vm_topology')
+    parser.add_argument('--vms', type=int, default=8, help='Number of VMs')
+    parser.add_argument('--ports', type=int, default=4, help='Number of front panel ports per VM')
+    parser.add_argument('--mtu', type=int, default=9216, help='MTU of the front panel ports')
+    parser.add_argument('--mode', choices=['legacy', 'batch', 'both'], default='both')
+    parser.add_argument('--dry-run', action='store_true', help='Answer the commands with an in-memory host')
+    parser.add_argument('--verbose', action='store_true', help='Log the commands')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    if not args.dry_run and os.geteuid() != 0:
+        parser.error('run as root, or with --dry-run')
+    if len('br-VMB%04d-%d' % (args.vms, args.ports)) > 15:
+        parser.error('too many VMs or ports for the interface names')
+
+    modes = ['legacy', 'batch'] if args.mode == 'both' else [args.mode]
+    report = {}
+    for mode in modes:
+        report[mode] = bench(mode, args)
+        for phase, summary in report[mode].items():
+            print('%-7s %-32s commands=%-6d forks=%-6d cmd_time=%-8.3f wall_time=%.3f' % (
+                mode, phase, summary['commands'], summary['forks'], summary['elapsed'], summary['wall_time']))
+    print(json.dumps(report, indent=2, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -82,6 +82,7 @@ defaults = {
     "SPYTEST_SYSLOG_ANALYSIS": "1",
     "SPYTEST_USE_NO_MORE": "0",
     "SPYTEST_PRESERVE_GNMI_CERT": "1",
+    "SPYTEST_GNMI_INPROC": "0",
     "SPYTEST_CMD_FAIL_RESULT_SUPPORT": "1",
     "SPYTEST_USE_FULL_NODEID": "0",
     "SPYTEST_BATCH_DEFAULT_BUCKET": "1",
@@ -3209,6 +3209,7 @@ class WorkArea(object):
             stats.tc_cmd_time = utils.time_format(stats.tc_cmd_time, True)
             stats.helper_cmd_time = utils.time_format(stats.helper_cmd_time, True)
             stats.tg_cmd_time = utils.time_format(stats.tg_cmd_time, True)
+            stats.tmpl_parse_time = utils.time_format(stats.tmpl_parse_time, True)
             ofh.write("\nRESULT = {}".format(res))
             ofh.write("\nDESCRIPTION = {}".format(desc))
             ofh.write("\nTOTAL Test Time = {}".format(time_taken))
@@ -3219,6 +3220,10 @@ class WorkArea(object):
             ofh.write("\nTOTAL TG Time = {}".format(stats.tg_cmd_time))
             ofh.write("\nTOTAL PROMPT NFOUND = {}".format(stats.pnfound))
             ofh.write("\nTOTAL TECH SUPPORT = {}".format(stats.ts_files))
+            ofh.write("\nTOTAL TEMPLATE PARSE Time = {}".format(stats.tmpl_parse_time))
+            for tmpl, [count, parse_time] in sorted(stats.tmpl_parses.items()):
+                parse_time = utils.time_format(parse_time, True)
+                ofh.write("\nTEMPLATE PARSE: {} COUNT: {} TIME: {}".format(tmpl, count, parse_time))
             for [start_time, thid, ctype, dut, cmd, ctime] in stats.cmds:
                 start_msg = "\n{} {}".format(get_timestamp(this=start_time), thid)
                 if ctype == "CMD":
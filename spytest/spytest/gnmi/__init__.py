@@ -5,6 +5,7 @@ import json
 import pprint
 
 from spytest.dicts import SpyTestDict
+from spytest import env
 from spytest.gnmi.wrapper import _gnmi_get, _gnmi_set, gnmiCreateJsonFile, gnmiCreateProtoFile
 
 
@@ -18,10 +19,12 @@ class gNMI(object):
         self.timeout = 10
         self.ip = None
         self.inSecure = True
+        self.inproc = bool(env.get("SPYTEST_GNMI_INPROC", "0") != "0")
+        self.client = None
 
     def configure(self, ip=None, port=8080, targetName=None, username='admin',
                   password=None, ca=None, cert=None, inSecure=True, noTls=False,
-                  timeout=10, params=None):
+                  timeout=10, params=None, inproc=None):
         self.target_name = targetName
         self.username = username
         self.password = password
@@ -32,6 +35,9 @@ class gNMI(object):
         self.timeout = timeout
         self.defTimeout = timeout
         self.params = params
+        self.client = None
+        if inproc is not None:
+            self.inproc = inproc
 
         if ip:
             self.reinit(ip, port=port)
@@ -41,8 +47,44 @@ class gNMI(object):
         self.ip = ip.decode('utf-8') if isinstance(ip, bytes) else str(ip)
         self.port = int(port)
         self.target_addr = "{}:{}".format(self.ip, self.port)
+        self.client = None
         return self
 
+    def _get_client(self):
+        # the channel of the target is shared by all the clients of the process
+        if not self.client:
+            from spytest.gnmi.client import GnmiClient
+            self.client = GnmiClient(self.target_addr, username=self.username, password=self.password,
+                                     ca=self.ca, insecure=self.inSecure, notls=self.noTls,
+                                     target_name=self.target_name, timeout=self.defTimeout)
+        return self.client
+
+    def _use_inproc(self, params, encoding):
+        # options of the gnmi_get/gnmi_set binaries and the PROTO/ANY encodings still need the binaries
+        return self.inproc and not params and encoding in [None, 'JSON_IETF']
+
+    def _inproc_call(self, func, *args, **kwargs):
+        import grpc
+        try:
+            return func(*args, **kwargs)
+        except grpc.RpcError as exp:
+            return {"ok": False, 'errorCode': exp.code().value[0], 'message': exp.details()}
+
+    def _inproc_get(self, path):
+        retval = self._get_client().get_json(path, timeout=self.timeout)
+        return {"ok": True, "return": json.dumps(retval, ensure_ascii=False)}
+
+    def _inproc_set(self, path, action, data):
+        client = self._get_client()
+        if action.lower() == 'delete':
+            results = client.set(delete=[path], timeout=self.timeout)
+        elif action.lower() == 'replace':
+            results = client.set(replace=[(path, data)], timeout=self.timeout)
+        else:
+            # gNMI has no create operation, it is sent as an update
+            results = client.set(update=[(path, data)], timeout=self.timeout)
+        return {"ok": True, "return": "", "operation": results[0][0] if results else ""}
+
     def _compose_params(self, action, path, *args):
         param = [action, path]
         if self.target_addr:
@@ -77,6 +119,8 @@ class gNMI(object):
             print("WARNING:: " + str(msg))
 
     def _json(self, retval=''):
+        if isinstance(retval, (list, dict)):
+            return retval
         try:
             return json.loads(retval) if retval else ''
         except Exception as exp:
@@ -96,9 +140,9 @@ class gNMI(object):
         return resp
 
     def get(self, path, params='', encoding=None):
-        from apis.gnmi.gnmi_utils import SanitizePathPayload
         path_change = False
         if encoding:
+            from apis.gnmi.gnmi_utils import SanitizePathPayload
             attr = path.split("/")[-1]
             new_path = SanitizePathPayload(path)
             if new_path != path:
@@ -110,7 +154,10 @@ class gNMI(object):
             param.extend(params.split())
         self._log("GNMI [GET]: {}".format(path))
         try:
-            ret_val = _gnmi_get(param, display=False, encoding=encoding)
+            if self._use_inproc(params, encoding):
+                ret_val = self._inproc_call(self._inproc_get, path)
+            else:
+                ret_val = _gnmi_get(param, display=False, encoding=encoding)
 
             if path_change and "return" in ret_val:
                 output = json.loads(ret_val["return"])
@@ -134,6 +181,12 @@ class gNMI(object):
             raise e
 
     def _set(self, path, action, params='', data={}, encoding=None):
+        if self._use_inproc(params, encoding):
+            self._log("GNMI [{}]: {}".format(action.upper(), path))
+            if data:
+                self._log("data:\n{}".format(pprint.pformat(data)))
+            ret_val = self._inproc_call(self._inproc_set, path, action, data)
+            return self._result(action.upper(), path, ret_val, data)
         data_path = None
         if data and len(data):
             if encoding == 'ANY' and action.lower() not in ['delete']:
@@ -173,6 +226,43 @@ class gNMI(object):
     def delete(self, path, params='', data={}, encoding=None):
         return self._set(path, 'delete', params=params, data=data, encoding=encoding)
 
+    def get_many(self, paths):
+        """
+        Reads the paths with a single Get RPC of the in-process client
+        :param paths: list of xpaths
+        :return: output is the list of [xpath, value] of the updates
+        """
+        self._log("GNMI [GET]: {}".format(paths))
+        ret_val = self._inproc_call(lambda: {"ok": True, "return": self._get_client().get(paths)})
+        return self._result('GET', paths, ret_val)
+
+    def set_many(self, update=None, replace=None, delete=None):
+        """
+        Applies the operations with a single Set RPC of the in-process client
+        :param update: list of (xpath, data)
+        :param replace: list of (xpath, data)
+        :param delete: list of xpaths
+        :return: output is the list of [operation, xpath] of the results
+        """
+        paths = [path for path, _ in update or []] + [path for path, _ in replace or []] + list(delete or [])
+        self._log("GNMI [SET]: {}".format(paths))
+        ret_val = self._inproc_call(lambda: {"ok": True, "return": self._get_client().set(update, replace, delete)})
+        return self._result('SET', paths, ret_val, {"update": update, "replace": replace, "delete": delete})
+
+    def poll(self, paths, polls=1, interval=0):
+        """
+        Subscribes in POLL mode with the in-process client and polls the paths, to read counters repeatedly
+        :return: output is the list of the [xpath, value] updates of the initial read and of every poll
+        """
+        self._log("GNMI [POLL]: {} polls {} interval {}".format(paths, polls, interval))
+        ret_val = self._inproc_call(lambda: {"ok": True, "return": list(self._get_client().subscribe_poll(
+            paths, polls=polls, interval=interval, timeout=self.timeout * (polls + 1) + interval * polls))})
+        return self._result('POLL', paths, ret_val)
+
+    def rpc_stats(self):
+        """Returns the latency summary of the RPCs of the in-process client"""
+        return self.client.stats.summary() if self.client else {}
+
     def send(self, path, action='', params='', data=None, encoding=None, timeout=None):
         self.timeout = timeout if timeout else self.defTimeout
         if action.lower() in ['create', 'update', 'replace', 'delete']:
@@ -0,0 +1,390 @@
+"""
+In-process gNMI client
+
+The gnmi_get/gnmi_set binaries used by wrapper.py cost a process start and a TLS
+handshake for every operation. GnmiClient talks gNMI over grpcio instead, with one
+channel per target shared by all the clients of the process, several paths per Get
+and several operations per Set. The latency of every RPC is recorded per client.
+
+Example:
+    client = GnmiClient("10.11.97.10:8080", username="admin", password="password")
+    client.get(["/openconfig-interfaces:interfaces/interface[name=Ethernet0]/config/mtu",
+                "/openconfig-interfaces:interfaces/interface[name=Ethernet4]/config/mtu"])
+    client.set(update=[("/openconfig-interfaces:interfaces/interface[name=Ethernet0]/config/mtu",
+                        {"openconfig-interfaces:mtu": 9100})])
+    for updates in client.subscribe_poll(["/openconfig-interfaces:interfaces/interface[name=Ethernet0]/state/counters"],
+                                         polls=3, interval=1):
+        print(updates)
+    print(client.stats.summary())
+"""
+
+import json
+import socket
+import ssl
+import threading
+import time
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import grpc
+
+from . import gnmi_pb2
+from . import gnmi_pb2_grpc
+
+DEFAULT_TIMEOUT = 10
+
+_channels = dict()
+_channels_lock = threading.Lock()
+
+
+def _split_xpath(xpath):
+    """Splits an xpath on the '/' which are not in a key value"""
+    elems, elem, in_key, escaped = [], "", False, False
+    for ch in xpath:
+        if escaped:
+            elem, escaped = elem + ch, False
+        elif ch == "\\":
+            elem, escaped = elem + ch, True
+        elif ch == "[":
+            elem, in_key = elem + ch, True
+        elif ch == "]":
+            elem, in_key = elem + ch, False
+        elif ch == "/" and not in_key:
+            if elem:
+                elems.append(elem)
+            elem = ""
+        else:
+            elem = elem + ch
+    if elem:
+        elems.append(elem)
+    return elems
+
+
+def _parse_elem(elem):
+    """Returns the name and the keys of an xpath element like interface[name=Ethernet0]"""
+    if "[" not in elem:
+        return elem, {}
+    name, rest = elem.split("[", 1)
+    keys, key, value, in_value, escaped = dict(), "", "", False, False
+    for ch in rest:
+        if escaped:
+            value, escaped = value + ch, False
+        elif ch == "\\" and in_value:
+            escaped = True
+        elif ch == "=" and not in_value:
+            in_value = True
+        elif ch == "]" and in_value:
+            keys[key], key, value, in_value = value, "", "", False
+        elif ch == "[" and not in_value:
+            continue
+        elif in_value:
+            value = value + ch
+        else:
+            key = key + ch
+    return name, keys
+
+
+def xpath_to_path(xpath, origin=None):
+    """Converts an xpath string to a gnmi Path"""
+    path = gnmi_pb2.Path(origin=origin) if origin else gnmi_pb2.Path()
+    for elem in _split_xpath(xpath or ""):
+        name, keys = _parse_elem(elem)
+        path.elem.add(name=name, key=keys)
+    return path
+
+
+def path_to_xpath(path, prefix=None):
+    """Converts a gnmi Path, relative to the prefix if any, to an xpath string"""
+    elems = list(prefix.elem) if prefix else []
+    elems.extend(path.elem)
+    xpath = ""
+    for elem in elems:
+        xpath += "/" + elem.name
+        for key in sorted(elem.key):
+            value = elem.key[key].replace("\\", "\\\\").replace("]", "\\]")
+            xpath += "[{}={}]".format(key, value)
+    return xpath or "/"
+
+
+def decode_value(typed_value):
+    """Returns the python value of a gnmi TypedValue"""
+    kind = typed_value.WhichOneof("value")
+    if kind in ["json_ietf_val", "json_val"]:
+        data = getattr(typed_value, kind)
+        return json.loads(data.decode("utf-8")) if data else None
+    if kind == "leaflist_val":
+        return [decode_value(elem) for elem in typed_value.leaflist_val.element]
+    if kind == "decimal_val":
+        return typed_value.decimal_val.digits / (10.0 ** typed_value.decimal_val.precision)
+    if kind is None:
+        return None
+    return getattr(typed_value, kind)
+
+
+def encode_value(value, encoding="JSON_IETF"):
+    """Returns the gnmi TypedValue of a python value, as JSON unless it is already a TypedValue"""
+    if isinstance(value, gnmi_pb2.TypedValue):
+        return value
+    data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+    if encoding == "JSON":
+        return gnmi_pb2.TypedValue(json_val=data)
+    return gnmi_pb2.TypedValue(json_ietf_val=data)
+
+
+def _server_certificate(host, port, timeout):
+    """Fetches the certificate of the target and its common name, to trust it like -insecure does"""
+    from cryptography import x509
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.x509.oid import NameOID
+    sock = socket.create_connection((host, port), timeout=timeout)
+    try:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        with context.wrap_socket(sock, server_hostname=host) as tls_sock:
+            der = tls_sock.getpeercert(True)
+    finally:
+        sock.close()
+    cert = x509.load_der_x509_certificate(der, default_backend())
+    names = cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)
+    return ssl.DER_cert_to_PEM_cert(der).encode("ascii"), names[0].value if names else None
+
+
+def _read_file(path):
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+def get_channel(target, notls=False, insecure=True, ca=None, cert=None, key=None, target_name=None,
+                timeout=DEFAULT_TIMEOUT):
+    """Returns the channel to the target, created on the first call for these settings"""
+    cache_key = (target, notls, insecure, ca, cert, key, target_name)
+    with _channels_lock:
+        channel = _channels.get(cache_key)
+        if channel is not None:
+            return channel
+        options = [("grpc.max_receive_message_length", -1)]
+        if notls:
+            channel = grpc.insecure_channel(target, options=options)
+        else:
+            root_cert = _read_file(ca) if ca else None
+            if not root_cert and insecure:
+                host, port = target.rsplit(":", 1)
+                root_cert, common_name = _server_certificate(host.strip("[]"), int(port), timeout)
+                target_name = target_name or common_name
+            if target_name:
+                options.append(("grpc.ssl_target_name_override", target_name))
+            credentials = grpc.ssl_channel_credentials(
+                root_certificates=root_cert, private_key=_read_file(key) if key else None,
+                certificate_chain=_read_file(cert) if cert else None)
+            channel = grpc.secure_channel(target, credentials, options=options)
+        _channels[cache_key] = channel
+        return channel
+
+
+def close_channels(target=None):
+    """Closes the cached channels, of the target only if given"""
+    with _channels_lock:
+        for cache_key in list(_channels):
+            if target is None or cache_key[0] == target:
+                _channels.pop(cache_key).close()
+
+
+class RpcStats(object):
+    """Latency in seconds of the RPCs, per RPC name"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = dict()
+        self.errors = dict()
+
+    def add(self, rpc, latency, error=False):
+        with self.lock:
+            self.latencies.setdefault(rpc, []).append(latency)
+            if error:
+                self.errors[rpc] = self.errors.get(rpc, 0) + 1
+
+    def clear(self):
+        with self.lock:
+            self.latencies.clear()
+            self.errors.clear()
+
+    def summary(self):
+        """Returns count, errors and min/avg/p95/max latency in milliseconds per RPC name"""
+        retval = dict()
+        with self.lock:
+            for rpc, latencies in self.latencies.items():
+                ordered = sorted(latencies)
+                retval[rpc] = {
+                    "count": len(ordered),
+                    "errors": self.errors.get(rpc, 0),
+                    "min": round(ordered[0] * 1000, 3),
+                    "avg": round(sum(ordered) * 1000 / len(ordered), 3),
+                    "p95": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 3),
+                    "max": round(ordered[-1] * 1000, 3),
+                }
+        return retval
+
+
+class GnmiClient(object):
+
+    def __init__(self, target, username=None, password=None, ca=None, cert=None, key=None,
+                 insecure=True, notls=False, target_name=None, timeout=DEFAULT_TIMEOUT):
+        self.target = target
+        self.timeout = timeout
+        self.metadata = []
+        if username:
+            self.metadata.append(("username", username))
+        if password:
+            self.metadata.append(("password", password))
+        self.channel = get_channel(target, notls, insecure, ca, cert, key, target_name, timeout)
+        self.stub = gnmi_pb2_grpc.gNMIStub(self.channel)
+        self.stats = RpcStats()
+
+    def _call(self, rpc, request, timeout=None):
+        start = time.time()
+        try:
+            response = getattr(self.stub, rpc)(request, timeout=timeout or self.timeout, metadata=self.metadata)
+        except grpc.RpcError:
+            self.stats.add(rpc, time.time() - start, True)
+            raise
+        self.stats.add(rpc, time.time() - start)
+        return response
+
+    @staticmethod
+    def _updates(notifications):
+        """Returns the (xpath, value) of the updates of the notifications, and the deleted xpaths as (xpath, None)"""
+        retval = []
+        for notification in notifications:
+            for update in notification.update:
+                retval.append((path_to_xpath(update.path, notification.prefix), decode_value(update.val)))
+            for path in notification.delete:
+                retval.append((path_to_xpath(path, notification.prefix), None))
+        return retval
+
+    def capabilities(self, timeout=None):
+        return self._call("Capabilities", gnmi_pb2.CapabilityRequest(), timeout)
+
+    def get(self, paths, prefix=None, encoding="JSON_IETF", data_type="ALL", timeout=None):
+        """
+        Reads all the paths with a single Get RPC
+        :param paths: xpath or list of xpaths
+        :return: list of (xpath, value) of the updates, in the order of the response
+        """
+        if not isinstance(paths, (list, tuple)):
+            paths = [paths]
+        request = gnmi_pb2.GetRequest(path=[xpath_to_path(path) for path in paths],
+                                      encoding=gnmi_pb2.Encoding.Value(encoding),
+                                      type=gnmi_pb2.GetRequest.DataType.Value(data_type))
+        if prefix:
+            request.prefix.CopyFrom(xpath_to_path(prefix))
+        response = self._call("Get", request, timeout)
+        return self._updates(response.notification)
+
+    def get_json(self, paths, prefix=None, encoding="JSON_IETF", timeout=None):
+        """Reads the paths with a single Get RPC, and merges the JSON values like gnmi_get -output does"""
+        retval = dict()
+        for _, value in self.get(paths, prefix, encoding, timeout=timeout):
+            if isinstance(value, dict):
+                retval.update(value)
+        return retval
+
+    def set(self, update=None, replace=None, delete=None, prefix=None, encoding="JSON_IETF", timeout=None):
+        """
+        Applies all the operations with a single Set RPC
+        :param update: list of (xpath, value)
+        :param replace: list of (xpath, value)
+        :param delete: list of xpaths
+        :return: list of (operation, xpath) of the results, operation being UPDATE, REPLACE or DELETE
+        """
+        request = gnmi_pb2.SetRequest(
+            delete=[xpath_to_path(path) for path in delete or []],
+            replace=[gnmi_pb2.Update(path=xpath_to_path(path), val=encode_value(value, encoding))
+                     for path, value in replace or []],
+            update=[gnmi_pb2.Update(path=xpath_to_path(path), val=encode_value(value, encoding))
+                    for path, value in update or []])
+        if prefix:
+            request.prefix.CopyFrom(xpath_to_path(prefix))
+        response = self._call("Set", request, timeout)
+        return [(gnmi_pb2.UpdateResult.Operation.Name(result.op), path_to_xpath(result.path, response.prefix))
+                for result in response.response]
+
+    def _subscribe(self, paths, mode, prefix, encoding, timeout):
+        requests = queue.Queue()
+        subscriptions = gnmi_pb2.SubscriptionList(
+            subscription=[gnmi_pb2.Subscription(path=xpath_to_path(path)) for path in paths],
+            mode=mode, encoding=gnmi_pb2.Encoding.Value(encoding))
+        if prefix:
+            subscriptions.prefix.CopyFrom(xpath_to_path(prefix))
+        requests.put(gnmi_pb2.SubscribeRequest(subscribe=subscriptions))
+
+        def request_iterator():
+            while True:
+                request = requests.get()
+                if request is None:
+                    return
+                yield request
+
+        responses = self.stub.Subscribe(request_iterator(), timeout=timeout, metadata=self.metadata)
+        return requests, responses
+
+    @staticmethod
+    def _read_until_sync(responses):
+        notifications = []
+        for response in responses:
+            if response.sync_response:
+                return notifications, True
+            if response.HasField("update"):
+                notifications.append(response.update)
+        return notifications, False
+
+    def subscribe_once(self, paths, prefix=None, encoding="JSON_IETF", timeout=None):
+        """Subscribes in ONCE mode, returns the (xpath, value) of the updates sent until the sync response"""
+        if not isinstance(paths, (list, tuple)):
+            paths = [paths]
+        start = time.time()
+        requests, responses = self._subscribe(paths, gnmi_pb2.SubscriptionList.ONCE, prefix, encoding,
+                                              timeout or self.timeout)
+        try:
+            notifications, _ = self._read_until_sync(responses)
+        except grpc.RpcError:
+            self.stats.add("Subscribe.once", time.time() - start, True)
+            raise
+        finally:
+            requests.put(None)
+            responses.cancel()
+        self.stats.add("Subscribe.once", time.time() - start)
+        return self._updates(notifications)
+
+    def subscribe_poll(self, paths, polls=1, interval=0, prefix=None, encoding="JSON_IETF", timeout=None):
+        """
+        Subscribes in POLL mode on a single stream and polls the paths, for reading counters repeatedly
+        :param polls: number of polls after the initial updates
+        :param interval: seconds between the polls
+        :return: generator of the list of (xpath, value) of the initial updates, then of every poll
+        """
+        if not isinstance(paths, (list, tuple)):
+            paths = [paths]
+        requests, responses = self._subscribe(paths, gnmi_pb2.SubscriptionList.POLL, prefix, encoding, timeout)
+        try:
+            for index in range(polls + 1):
+                if index:
+                    if interval:
+                        time.sleep(interval)
+                    requests.put(gnmi_pb2.SubscribeRequest(poll=gnmi_pb2.Poll()))
+                start = time.time()
+                try:
+                    notifications, synced = self._read_until_sync(responses)
+                except grpc.RpcError:
+                    self.stats.add("Subscribe.poll", time.time() - start, True)
+                    raise
+                self.stats.add("Subscribe.poll", time.time() - start)
+                yield self._updates(notifications)
+                if not synced:
+                    break
+        finally:
+            requests.put(None)
+            responses.cancel()
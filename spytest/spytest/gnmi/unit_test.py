@@ -0,0 +1,239 @@
+#!/bin/sh
+
+''':'
+exec $(dirname $0)/../../bin/python "$0" "$@"
+'''
+
+import sys
+import time
+import threading
+from concurrent import futures
+
+import grpc
+
+from spytest.gnmi import gNMI
+from spytest.gnmi import gnmi_pb2
+from spytest.gnmi import gnmi_pb2_grpc
+from spytest.gnmi.client import GnmiClient, get_channel, close_channels
+from spytest.gnmi.client import xpath_to_path, path_to_xpath, decode_value, encode_value
+
+MTU_PATH = "/openconfig-interfaces:interfaces/interface[name=Ethernet{}]/config/mtu"
+COUNTERS_PATH = "/openconfig-interfaces:interfaces/interface[name=Ethernet0]/state/counters"
+
+
+class GnmiStandIn(gnmi_pb2_grpc.gNMIServicer):
+    """
+    gNMI target keeping JSON values per xpath, the values which are callables are
+    evaluated on every read, with the number of polls received so far
+    """
+
+    def __init__(self, username=None, password=None):
+        self.lock = threading.Lock()
+        self.data = dict()
+        self.polls = 0
+        self.requests = dict()
+        self.credentials = [("username", username), ("password", password)] if username else None
+
+    def _check(self, rpc, context):
+        with self.lock:
+            self.requests[rpc] = self.requests.get(rpc, 0) + 1
+        if self.credentials:
+            metadata = dict(context.invocation_metadata())
+            if [(name, metadata.get(name)) for name, _ in self.credentials] != self.credentials:
+                context.abort(grpc.StatusCode.UNAUTHENTICATED, "invalid username or password")
+
+    def _read(self, path, prefix):
+        xpath = path_to_xpath(path, prefix)
+        with self.lock:
+            if xpath not in self.data:
+                return None
+            value = self.data[xpath]
+            return value(self.polls) if callable(value) else value
+
+    def _notification(self, paths, prefix, context):
+        notification = gnmi_pb2.Notification(timestamp=int(time.time() * 1e9), prefix=prefix)
+        for path in paths:
+            value = self._read(path, prefix)
+            if value is None:
+                context.abort(grpc.StatusCode.NOT_FOUND, "{} not found".format(path_to_xpath(path, prefix)))
+            notification.update.add(path=path, val=encode_value(value))
+        return notification
+
+    def Capabilities(self, request, context):
+        self._check("Capabilities", context)
+        return gnmi_pb2.CapabilityResponse(supported_encodings=[gnmi_pb2.JSON_IETF], gNMI_version="0.8.0")
+
+    def Get(self, request, context):
+        self._check("Get", context)
+        return gnmi_pb2.GetResponse(notification=[self._notification(request.path, request.prefix, context)])
+
+    def Set(self, request, context):
+        self._check("Set", context)
+        response = gnmi_pb2.SetResponse(prefix=request.prefix, timestamp=int(time.time() * 1e9))
+        with self.lock:
+            for path in request.delete:
+                self.data.pop(path_to_xpath(path, request.prefix), None)
+                response.response.add(path=path, op=gnmi_pb2.UpdateResult.DELETE)
+            for update in request.replace:
+                self.data[path_to_xpath(update.path, request.prefix)] = decode_value(update.val)
+                response.response.add(path=update.path, op=gnmi_pb2.UpdateResult.REPLACE)
+            for update in request.update:
+                self.data[path_to_xpath(update.path, request.prefix)] = decode_value(update.val)
+                response.response.add(path=update.path, op=gnmi_pb2.UpdateResult.UPDATE)
+        return response
+
+    def Subscribe(self, request_iterator, context):
+        self._check("Subscribe", context)
+        subscribe = next(request_iterator).subscribe
+        paths = [subscription.path for subscription in subscribe.subscription]
+        yield gnmi_pb2.SubscribeResponse(update=self._notification(paths, subscribe.prefix, context))
+        yield gnmi_pb2.SubscribeResponse(sync_response=True)
+        if subscribe.mode != gnmi_pb2.SubscriptionList.POLL:
+            return
+        for request in request_iterator:
+            if not request.HasField("poll"):
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT, "only poll requests are expected")
+            with self.lock:
+                self.polls += 1
+            yield gnmi_pb2.SubscribeResponse(update=self._notification(paths, subscribe.prefix, context))
+            yield gnmi_pb2.SubscribeResponse(sync_response=True)
+
+
+def start_stand_in(username=None, password=None):
+    servicer = GnmiStandIn(username, password)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    gnmi_pb2_grpc.add_gNMIServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    server.start()
+    return server, servicer, "127.0.0.1:{}".format(port)
+
+
+def test_xpath():
+    for xpath in ["/openconfig-interfaces:interfaces/interface[name=Ethernet0]/config/mtu",
+                  "/sonic-port:sonic-port/PORT/PORT_LIST[ifname=Eth1/1]/admin_status",
+                  "/openconfig-acl:acl/acl-sets/acl-set[name=MyACL4][type=ACL_IPV4]/acl-entries",
+                  "/a/b[key=x\\]y]/c"]:
+        path = xpath_to_path(xpath)
+        assert path_to_xpath(path) == xpath, path_to_xpath(path)
+    path = xpath_to_path("/sonic-port:sonic-port/PORT/PORT_LIST[ifname=Eth1/1]/admin_status")
+    assert [elem.name for elem in path.elem] == ["sonic-port:sonic-port", "PORT", "PORT_LIST", "admin_status"]
+    assert dict(path.elem[2].key) == {"ifname": "Eth1/1"}
+    assert decode_value(encode_value({"openconfig-interfaces:mtu": 9100})) == {"openconfig-interfaces:mtu": 9100}
+    assert decode_value(gnmi_pb2.TypedValue(uint_val=10)) == 10
+
+
+def test_get_set():
+    server, servicer, target = start_stand_in("admin", "password")
+    try:
+        client = GnmiClient(target, username="admin", password="password", notls=True)
+        updates = [(MTU_PATH.format(index), {"openconfig-interfaces:mtu": 9000 + index}) for index in range(8)]
+        results = client.set(update=updates[:4], replace=updates[4:])
+        assert [op for op, _ in results] == ["REPLACE"] * 4 + ["UPDATE"] * 4, results
+        assert client.get([path for path, _ in updates]) == updates
+        assert servicer.requests == {"Set": 1, "Get": 1}, servicer.requests
+
+        assert client.set(delete=[MTU_PATH.format(0)]) == [("DELETE", MTU_PATH.format(0))]
+        try:
+            client.get(MTU_PATH.format(0))
+            assert False, "deleted path is still there"
+        except grpc.RpcError as exp:
+            assert exp.code() == grpc.StatusCode.NOT_FOUND, exp
+        assert client.get_json([MTU_PATH.format(1)]) == {"openconfig-interfaces:mtu": 9001}
+
+        try:
+            GnmiClient(target, username="admin", password="wrong", notls=True).get(MTU_PATH.format(1))
+            assert False, "wrong password accepted"
+        except grpc.RpcError as exp:
+            assert exp.code() == grpc.StatusCode.UNAUTHENTICATED, exp
+    finally:
+        server.stop(None)
+        close_channels(target)
+
+
+def test_channel_reuse():
+    server, _, target = start_stand_in()
+    try:
+        channel = get_channel(target, notls=True)
+        assert GnmiClient(target, notls=True).channel is channel
+        assert GnmiClient(target, notls=True).channel is channel
+        close_channels(target)
+        assert get_channel(target, notls=True) is not channel
+    finally:
+        server.stop(None)
+        close_channels(target)
+
+
+def test_subscribe():
+    server, servicer, target = start_stand_in()
+    try:
+        servicer.data[COUNTERS_PATH] = lambda polls: {"openconfig-interfaces:counters": {"in-pkts": polls * 100}}
+        client = GnmiClient(target, notls=True)
+        values = [updates[0][1]["openconfig-interfaces:counters"]["in-pkts"]
+                  for updates in client.subscribe_poll(COUNTERS_PATH, polls=3)]
+        assert values == [0, 100, 200, 300], values
+        assert servicer.requests == {"Subscribe": 1}, servicer.requests
+        updates = client.subscribe_once([COUNTERS_PATH])
+        assert updates[0][1]["openconfig-interfaces:counters"]["in-pkts"] == 300, updates
+        stats = client.stats.summary()
+        assert stats["Subscribe.poll"]["count"] == 4 and stats["Subscribe.once"]["count"] == 1, stats
+    finally:
+        server.stop(None)
+        close_channels(target)
+
+
+def test_gnmi_class():
+    server, servicer, target = start_stand_in("admin", "password")
+    try:
+        host, port = target.split(":")
+        dut = gNMI().configure(ip=host, port=port, username="admin", password="password", noTls=True, inproc=True)
+        data = {"openconfig-interfaces:mtu": 9100}
+        resp = dut.send(MTU_PATH.format(0), action="replace", data=data)
+        assert resp.status and resp.output == "" and resp.operation == "REPLACE", resp
+        resp = dut.send(MTU_PATH.format(0))
+        assert resp.status and resp.output == data, resp
+        resp = dut.send(MTU_PATH.format(0), action="delete")
+        assert resp.status, resp
+        resp = dut.send(MTU_PATH.format(0))
+        assert not resp.status and resp.output["errorCode"] == grpc.StatusCode.NOT_FOUND.value[0], resp
+
+        resp = dut.set_many(update=[(MTU_PATH.format(1), data), (MTU_PATH.format(2), data)])
+        assert resp.status and len(resp.output) == 2, resp
+        resp = dut.get_many([MTU_PATH.format(1), MTU_PATH.format(2)])
+        assert resp.status and resp.output == [(MTU_PATH.format(1), data), (MTU_PATH.format(2), data)], resp
+        stats = dut.rpc_stats()
+        assert stats["Get"]["count"] == 3 and stats["Get"]["errors"] == 1 and stats["Set"]["count"] == 3, stats
+    finally:
+        server.stop(None)
+        close_channels(target)
+
+
+def test_latency(count=1000):
+    server, servicer, target = start_stand_in()
+    try:
+        client = GnmiClient(target, notls=True)
+        paths = [MTU_PATH.format(index) for index in range(32)]
+        client.set(update=[(path, {"openconfig-interfaces:mtu": 9100}) for path in paths])
+        start = time.time()
+        for index in range(count):
+            client.get(paths[index % len(paths)])
+        single = time.time() - start
+        start = time.time()
+        for _ in range(count // len(paths)):
+            client.get(paths)
+        batched = time.time() - start
+        print("{} paths one per Get: {:.3f}s, {} per Get: {:.3f}s".format(count, single, len(paths), batched))
+        print(client.stats.summary())
+    finally:
+        server.stop(None)
+        close_channels(target)
+
+
+if __name__ == '__main__':
+    test_xpath()
+    test_get_set()
+    test_channel_reuse()
+    test_subscribe()
+    test_gnmi_class()
+    if len(sys.argv) > 1 and sys.argv[1] == "latency":
+        test_latency()
+    print("PASS")
@@ -22,6 +22,8 @@ class Profile(object):
         self.cmds = []
         self.profile_ids = dict()
         self.canbe_parallel = []
+        self.tmpl_parse_time = 0
+        self.tmpl_parses = dict()
 
     def __init__(self):
         self.init()
@@ -79,6 +81,11 @@ class Profile(object):
         self.ts_files = self.ts_files + 1
         self.cmds.append([start_time, thid, "TECH_SUPPORT", None, cmd, ""])
 
+    def tmpl_parse(self, tmpl, parse_time):
+        [count, total] = self.tmpl_parses.get(tmpl, [0, 0])
+        self.tmpl_parses[tmpl] = [count + 1, total + parse_time]
+        self.tmpl_parse_time = self.tmpl_parse_time + parse_time
+
     def get_stats(self):
         stats = SpyTestDict()
         stats.tg_total_wait = self.tg_total_wait
@@ -93,6 +100,8 @@ class Profile(object):
         stats.canbe_parallel = self.canbe_parallel
         stats.pnfound = self.pnfound
         stats.ts_files = self.ts_files
+        stats.tmpl_parse_time = self.tmpl_parse_time
+        stats.tmpl_parses = self.tmpl_parses
         return stats
 
 
@@ -125,3 +134,7 @@ def prompt_nfound(cmd):
 
 def tech_support(cmd):
     return obj.tech_support(cmd)
+
+
+def tmpl_parse(tmpl, parse_time):
+    return obj.tmpl_parse(tmpl, parse_time)
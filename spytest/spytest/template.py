@@ -2,6 +2,8 @@ import sys
 import os
 import re
 import json
+import time
+import threading
 from collections import OrderedDict
 
 bundled_parser = os.getenv("SPYTEST_TEXTFSM_USE_BUNDLED_PARSER")
@@ -16,8 +18,54 @@ except Exception:
     from textfsm import clitable
 
 from spytest import env  # noqa: E402
+from spytest import profile  # noqa: E402
 import utilities.common as utils  # noqa: E402
 
+# compiled TextFSM objects shared by all Template instances
+# {template path: [template mtime, [TextFSM objects not in use]]}
+fsm_cache = dict()
+fsm_cache_lock = threading.Lock()
+
+
+def _fsm_get(tmpl_path):
+    mtime = os.path.getmtime(tmpl_path)
+    with fsm_cache_lock:
+        entry = fsm_cache.get(tmpl_path)
+        if entry is None or entry[0] != mtime:
+            entry = [mtime, []]
+            fsm_cache[tmpl_path] = entry
+        if entry[1]:
+            return mtime, entry[1].pop()
+    with open(tmpl_path, "r") as tmpl_fp:
+        return mtime, textfsm.TextFSM(tmpl_fp)
+
+
+def _fsm_put(tmpl_path, mtime, fsm):
+    with fsm_cache_lock:
+        entry = fsm_cache.get(tmpl_path)
+        if entry is not None and entry[0] == mtime:
+            entry[1].append(fsm)
+
+
+def parse_text(tmpl_path, data, tmpl=None):
+    """
+    Parse the data with cached compiled TextFSM of the template.
+    The FSM is compiled again when the template file is modified.
+    @tmpl_path template file path
+    @data text to parse
+    @tmpl template name used in parse statistics, defaults to tmpl_path
+    """
+    start_time = time.time()
+    mtime, fsm = _fsm_get(tmpl_path)
+    try:
+        fsm.Reset()
+        rows = fsm.ParseText(data)
+        header = fsm.header
+    finally:
+        _fsm_put(tmpl_path, mtime, fsm)
+    profile.tmpl_parse(tmpl or tmpl_path, (time.time() - start_time) * 1000)
+    return header, rows
+
 
 class Template(object):
 
@@ -41,23 +89,38 @@ class Template(object):
             self.cli_tables[index] = clitable.CliTable(index, self.root)
         self.platform = platform
         self.cli = cli
+        # {command: [template, cli table, templates to parse with]}
+        self.cmd_cache = dict()
 
-    # find the template given command
-    def get_tmpl(self, cmd):
+    # find the template, table and templates to parse given command
+    def lookup(self, cmd):
+        if cmd in self.cmd_cache:
+            return self.cmd_cache[cmd]
+        tmpl_file, table, templates = None, None, None
         attrs = dict(Command=cmd)
         for cli_table in self.cli_tables.values():
             row_idx = cli_table.index.GetRowMatch(attrs)
             if row_idx != 0:
-                return cli_table.index.index[row_idx]['Template']
-        return None
+                tmpl_file = cli_table.index.index[row_idx]['Template']
+                table = cli_table
+                break
+        if table:
+            if self.platform:
+                attrs["Platform"] = self.platform
+            if self.cli:
+                attrs["cli"] = self.cli
+            row_idx = table.index.GetRowMatch(attrs)
+            if row_idx != 0:
+                templates = table.index.index[row_idx]['Template']
+        self.cmd_cache[cmd] = [tmpl_file, table, templates]
+        return self.cmd_cache[cmd]
+
+    # find the template given command
+    def get_tmpl(self, cmd):
+        return self.lookup(cmd)[0]
 
     def get_table(self, cmd):
-        attrs = dict(Command=cmd)
-        for cli_table in self.cli_tables.values():
-            row_idx = cli_table.index.GetRowMatch(attrs)
-            if row_idx != 0:
-                return cli_table
-        return None
+        return self.lookup(cmd)[1]
 
     # retrieve template and sample file given the command
     def read_sample(self, cmd):
@@ -84,22 +147,26 @@ class Template(object):
 
     # find template the given command and apply on given data
     def apply(self, output, cmd):
-        attrs = dict(Command=cmd)
-        if self.platform:
-            attrs["Platform"] = self.platform
-        if self.cli:
-            attrs["cli"] = self.cli
-
-        tmpl_file = self.get_tmpl(cmd)
+        tmpl_file, cli_table, templates = self.lookup(cmd)
         if not tmpl_file:
             raise ValueError('Unknown command "%s"' % (cmd))
 
-        cli_table = self.get_table(cmd)
         if not cli_table:
             raise ValueError('Unable to parse command "%s"' % (cmd))
 
-        cli_table.ParseCmd(output, attrs)
+        if not templates:
+            raise clitable.CliTableError('No template found for command: "%s"' % (cmd))
+
+        if ":" not in templates:
+            tmpl_path = os.path.join(self.root, templates)
+            header, rows = parse_text(tmpl_path, output, templates)
+            return [tmpl_file, self.result(header, rows)]
+
+        # multiple templates are merged on the key values by CliTable
+        start_time = time.time()
+        cli_table.ParseCmd(output, templates=templates)
         objs = self.result(cli_table.header, cli_table)
+        profile.tmpl_parse(templates, (time.time() - start_time) * 1000)
         return [tmpl_file, objs]
 
     def result(self, header, rows):
@@ -160,12 +227,9 @@ class Template(object):
     # apply the given template on given data
     def apply_textfsm(self, tmpl_file, data):
         tmpl_file2 = os.path.join(self.root, tmpl_file)
-        tmpl_fp = open(tmpl_file2, "r")
-        re_table = textfsm.TextFSM(tmpl_fp)
-        out = re_table.ParseText(data)
-        tmpl_fp.close()
-        objs = self.result(re_table.header, out)
-        return re_table.header, objs
+        header, out = parse_text(tmpl_file2, data, tmpl_file)
+        objs = self.result(header, out)
+        return header, objs
 
 
 if __name__ == "__main__":
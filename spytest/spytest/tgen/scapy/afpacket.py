@@ -1,5 +1,5 @@
 """
-AF_PACKET receive support
+AF_PACKET receive and batched send support
 
 When VLAN offload is enabled on the NIC Linux will not deliver the VLAN tag
 in the data returned by recv. Instead, it delivers the VLAN TCI in a control
@@ -50,6 +50,13 @@ class struct_msghdr(Structure):
     ]
 
 
+class struct_mmsghdr(Structure):
+    _fields_ = [
+        ("msg_hdr", struct_msghdr),
+        ("msg_len", c_uint),
+    ]
+
+
 class struct_cmsghdr(Structure):
     _fields_ = [
         ("cmsg_len", c_size_t),
@@ -75,6 +82,12 @@ recvmsg = libc.recvmsg
 recvmsg.argtypes = [c_int, POINTER(struct_msghdr), c_int]
 recvmsg.retype = c_int
 
+# sendmmsg is not available in very old libc versions
+sendmmsg = getattr(libc, "sendmmsg", None)
+if sendmmsg is not None:
+    sendmmsg.argtypes = [c_int, POINTER(struct_mmsghdr), c_uint, c_int]
+    sendmmsg.restype = c_int
+
 
 def enable_auxdata(sk):
     """
@@ -131,3 +144,35 @@ def recv(sk, bufsize):
         return buf.raw[:12] + tag + buf.raw[12:rv]
     else:
         return buf.raw[:rv]
+
+
+def send_batch(sk, frames):
+    """
+    Send frames on an AF_PACKET socket bound to an interface
+    @sk Socket
+    @frames List of frames, each one a bytes object
+    """
+    if sendmmsg is None:
+        for frame in frames:
+            sk.send(frame)
+        return len(frames)
+
+    count = len(frames)
+    bufs = [create_string_buffer(frame, len(frame)) for frame in frames]
+    iovs = (struct_iovec * count)()
+    msgs = (struct_mmsghdr * count)()
+    for i, buf in enumerate(bufs):
+        iovs[i].iov_base = cast(buf, c_void_p)
+        iovs[i].iov_len = len(frames[i])
+        msgs[i].msg_hdr.msg_iov = pointer(iovs[i])
+        msgs[i].msg_hdr.msg_iovlen = 1
+
+    sent = 0
+    while sent < count:
+        rv = sendmmsg(sk.fileno(), cast(byref(msgs, sent * sizeof(struct_mmsghdr)), POINTER(struct_mmsghdr)),
+                      count - sent, 0)
+        if rv <= 0:
+            msg = "sendmmsg failed: rv=%d errno=%d" % (rv, get_errno())
+            raise RuntimeError(msg)
+        sent = sent + rv
+    return sent
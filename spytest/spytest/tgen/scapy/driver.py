@@ -410,21 +410,28 @@ class ScapyDriver(object):
                 self.pwa_wait(pwa)
                 try:
                     send_start_time = self.utils.clock()
-                    pkt = self.send_packet(pwa, pwa.stream.stream_id)
-                    bytesSent = len(pkt)
+                    if pwa.template:
+                        # frames are built while sending the batch
+                        pwa_next, frames, ipg = self.send_batch(pwa, pwa.stream.stream_id)
+                        framesCount = len(frames)
+                        bytesSent = sum([len(frame) for frame in frames])
+                    else:
+                        pkt = self.send_packet(pwa, pwa.stream.stream_id)
+                        framesCount = 1
+                        bytesSent = len(pkt)
                     send_time = self.utils.clock() - send_start_time
 
                     # increment port counters
-                    framesSent = self.port.incrStat('framesSent')
+                    framesSent = self.port.incrStat('framesSent', framesCount)
                     self.port.incrStat('bytesSent', bytesSent)
                     if self.dbg > 2:
                         self.logger.debug("{} framesSent: {}".format(self.iface, framesSent))
-                    pwa.stream.incrStat('framesSent')
+                    pwa.stream.incrStat('framesSent', framesCount)
                     pwa.stream.incrStat('bytesSent', bytesSent)
-                    tx_count = tx_count + 1
+                    tx_count = tx_count + framesCount
 
                     # increment stream counters
-                    stream_tx = self.stream_pkts[pwa.stream.stream_id] + 1
+                    stream_tx = self.stream_pkts[pwa.stream.stream_id] + framesCount
                     self.stream_pkts[pwa.stream.stream_id] = stream_tx
                     if self.dbg > 2 or (self.dbg > 1 and stream_tx % 100 == 99):
                         self.logger.debug("{}/{} framesSent: {}".format(self.iface,
@@ -433,14 +440,17 @@ class ScapyDriver(object):
                     self.logger.log_exception(e, traceback.format_exc())
                     pwa.stream.enable2 = False
                 else:
-                    build_start_time = self.utils.clock()
-                    pwa_next = self.packet.build_next(pwa)
+                    build_time = 0
+                    if not pwa.template:
+                        build_start_time = self.utils.clock()
+                        pwa_next = self.packet.build_next(pwa)
+                        build_time = self.utils.clock() - build_start_time
                     if not pwa_next:
                         pwa.stream.enable2 = False
                         self.logger.debug("{} {} Completed Stream {}".format(func, self.iface, pwa.stream.stream_id))
                         continue
-                    build_time = self.utils.clock() - build_start_time
-                    ipg = self.packet.build_ipg(pwa_next)
+                    if not pwa.template:
+                        ipg = self.packet.build_ipg(pwa_next)
                     pwa_next.tx_time = self.utils.clock() + ipg - build_time - send_time
                     pwa_next_list.append(pwa_next)
             pwa_list = pwa_next_list
@@ -468,6 +478,9 @@ class ScapyDriver(object):
     def send_packet(self, pwa, stream_name):
         return self.packet.send_packet(pwa, self.iface, stream_name, pwa.left)
 
+    def send_batch(self, pwa, stream_name):
+        return self.packet.send_batch(pwa, self.iface, stream_name)
+
     def createInterface(self, intf):
         return self.packet.if_create(intf)
 
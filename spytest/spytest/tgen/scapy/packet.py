@@ -31,6 +31,8 @@ from interface import PacketInterface
 from bgp_exabgp import ExaBgp
 from dot1x import Dot1x
 from dhcps import Dhcps
+from tx_template import PacketTemplate
+from tx_template import TemplateField
 
 try:
     print("SCAPY VERSION = {}".format(Conf().version))
@@ -41,6 +43,10 @@ except Exception:
 # dbg > 2 --- recv/send packet summary
 # dbg > 3 --- recv/send packet hex
 
+# frames due within this many seconds are sent together in template mode
+TX_BATCH_WINDOW = 0.005
+TX_BATCH_MAX = 64
+
 stale_list_ignore = [
     "debug",
     "port_handle",
@@ -151,6 +157,10 @@ class ScapyPacket(object):
         self.rx_sock = None
         self.tx_sock = None
         self.tx_sock_failed = False
+        self.tx_batch_sock = None
+        self.tx_batch_sock_failed = False
+        self.tx_template = bool(os.getenv("SPYTEST_SCAPY_TX_TEMPLATE", "0") != "0")
+        self.logger.info("tx_template = {}".format(self.tx_template))
         self.finished = False
         self.mtu = 9194
         self.use_bridge = bool(os.getenv("SPYTEST_SCAPY_USE_BRIDGE", "1") != "0")
@@ -264,6 +274,8 @@ class ScapyPacket(object):
         self.rx_sock = self.close_sock(self.rx_sock)
         self.tx_sock = self.close_sock(self.tx_sock)
         self.tx_sock_failed = False
+        self.tx_batch_sock = self.close_sock(self.tx_batch_sock)
+        self.tx_batch_sock_failed = False
         self.init_bridge(self.iface)
         self.finished = False
 
@@ -413,7 +425,7 @@ class ScapyPacket(object):
         if hex:
             self.logger.debug(hexdump(pkt, dump=True))
 
-    def send_packet(self, pwa, iface, stream_name, left):
+    def build_frame(self, pwa):
         if pwa.padding:
             strpkt = self.utils.tobytes(pwa.pkt / pwa.padding)
         else:
@@ -427,6 +439,10 @@ class ScapyPacket(object):
                 sid = binascii.unhexlify(sid)
                 strpkt = strpkt[:-len(sid)] + sid
 
+        return strpkt
+
+    def send_packet(self, pwa, iface, stream_name, left):
+        strpkt = self.build_frame(pwa)
         try:
             crc1 = '{:08x}'.format(socket.htonl(zlib.crc32(strpkt) & 0xFFFFFFFF))
             crc = binascii.unhexlify(crc1)
@@ -436,6 +452,57 @@ class ScapyPacket(object):
         self.sendp(Ether(bstr), bstr, iface, stream_name, left)
         return bstr
 
+    def send_frames(self, frames, iface, stream_name, left):
+        self.stats_lock.acquire()
+        self.tx_count = self.tx_count + len(frames)
+        self.stats_lock.release()
+        self.trace_stats()
+
+        if self.dbg > 2 or (self.dbg > 1 and left != 0):
+            msg = "send_frames:{}:{} len:{} count:{} batch:{}".format
+            self.logger.debug(msg(iface, stream_name, len(frames[0]), self.tx_count, len(frames)))
+
+        if self.dry:
+            return
+
+        if not self.tx_batch_sock and not self.tx_batch_sock_failed:
+            try:
+                self.tx_batch_sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, 0)
+                self.tx_batch_sock.bind((iface, 0))
+            except Exception as exp:
+                self.tx_batch_sock = self.close_sock(self.tx_batch_sock)
+                self.tx_batch_sock_failed = True
+                self.error("Failed to create batch socket {} {}".format(iface, exp))
+
+        if self.tx_batch_sock:
+            try:
+                afpacket.send_batch(self.tx_batch_sock, frames)
+                return
+            except Exception as exp:
+                self.logger.error("Failed to send batch {}".format(self.expmsg(frames[0], iface, exp, "sendmmsg")))
+
+        # send one by one using the normal method
+        for data in frames:
+            self.send(data, iface)
+
+    def send_batch(self, pwa, iface, stream_name):
+        """
+        Send the frames of a stream with template which are due in the next TX_BATCH_WINDOW.
+        Returns the next packet work area (None when the stream is completed),
+        the frames sent and the time to wait until the next frame is due.
+        """
+        frames, ipg, pwa_next = [], 0, pwa
+        while True:
+            frames.append(pwa.template.render())
+            pwa_next = self.build_next(pwa)
+            if not pwa_next:
+                break
+            ipg = ipg + self.build_ipg(pwa_next)
+            if ipg > TX_BATCH_WINDOW or len(frames) >= TX_BATCH_MAX:
+                break
+        self.send_frames(frames, iface, stream_name, pwa.left)
+        return pwa_next, frames, ipg
+
     def check(self, pkt):
         pkt.do_build()
         if self.dbg > 3:
@@ -916,8 +983,135 @@ class ScapyPacket(object):
         pwa.frame_size_step = frame_size_step
         self.add_padding(pwa, True)
 
+        pwa.template = None
+        if self.tx_template:
+            pwa.template = self.compile_template(pwa)
+
         return pwa
 
+    def template_field(self, name, offset, size, mode, value, step, count, values=None, mask=None):
+        if mode in ["fixed"]:
+            return None
+        if mode in ["list"] and values:
+            return TemplateField(name, offset, size, mode, values[0], values=values)
+        if mode in ["increment", "decrement", "incr", "decr"]:
+            mode = "increment" if mode in ["increment", "incr"] else "decrement"
+            return TemplateField(name, offset, size, mode, value, step=step, count=count, mask=mask)
+        raise ValueError("unsupported {} mode {}".format(name, mode))
+
+    def compile_template(self, pwa):
+        """
+        Render the stream once into a PacketTemplate.
+        Returns None when the frames of the stream need to be built by scapy.
+        """
+        if pwa.length_mode != "fixed" or self.dbg > 3:
+            return None
+
+        kws, pkt = pwa.stream.kws, pwa.pkt
+
+        def mac2int(mac):
+            return int(mac.replace(":", "").replace(".", ""), 16)
+
+        def ipv42int(ip):
+            return int(binascii.hexlify(socket.inet_aton(ip)), 16)
+
+        def mode_of(prop):
+            return kws.get(prop, "fixed").strip()
+
+        def offset_of(layer):
+            return len(pkt) - len(pkt[layer])
+
+        try:
+            fields = []
+
+            mac_list = [mac2int(mac) for mac in kws["mac_src"]]
+            fields.append(self.template_field("mac_src", 6, 6, mode_of("mac_src_mode"), mac_list[0],
+                                              mac2int(kws.get("mac_src_step", "00:00:00:00:00:01")),
+                                              self.utils.intval(kws, "mac_src_count", 0), mac_list))
+            mac_list = [mac2int(mac) for mac in kws["mac_dst"]]
+            fields.append(self.template_field("mac_dst", 0, 6, mode_of("mac_dst_mode"), mac_list[0],
+                                              mac2int(kws.get("mac_dst_step", "00:00:00:00:00:01")),
+                                              self.utils.intval(kws, "mac_dst_count", 0), mac_list))
+
+            if ARP in pkt:
+                offset = offset_of(ARP)
+                fields.append(self.template_field("arp_src_hw", offset + 8, 6, mode_of("arp_src_hw_mode"),
+                                                  mac2int(kws.get("arp_src_hw_addr", "00:00:01:00:00:02")),
+                                                  mac2int(kws.get("arp_src_hw_step", "00:00:00:00:00:01")),
+                                                  self.utils.intval(kws, "arp_src_hw_count", 0)))
+                fields.append(self.template_field("arp_dst_hw", offset + 18, 6, mode_of("arp_dst_hw_mode"),
+                                                  mac2int(kws.get("arp_dst_hw_addr", "00:00:00:00:00:00")),
+                                                  mac2int(kws.get("arp_dst_hw_step", "00:00:00:00:00:01")),
+                                                  self.utils.intval(kws, "arp_dst_hw_count", 0)))
+
+            # checksums covering the L3 addresses and the L4 ports
+            ip_checksums, l4_checksums = [], []
+            if TCP in pkt:
+                l4_checksums.append((offset_of(TCP) + 16, False))
+            elif UDP in pkt:
+                l4_checksums.append((offset_of(UDP) + 6, True))
+            elif ICMPv6ND_NA in pkt:
+                l4_checksums.append((offset_of(ICMPv6ND_NA) + 2, False))
+
+            addr_fields = []
+            if IP in pkt:
+                offset = offset_of(IP)
+                ip_checksums.append((offset + 10, False))
+                addr_fields.append(self.template_field("ip_src", offset + 12, 4, mode_of("ip_src_mode"),
+                                                       ipv42int(kws.get("ip_src_addr", "0.0.0.0")),
+                                                       ipv42int(kws.get("ip_src_step", "0.0.0.1")),
+                                                       self.utils.intval(kws, "ip_src_count", 0)))
+                addr_fields.append(self.template_field("ip_dst", offset + 16, 4, mode_of("ip_dst_mode"),
+                                                       ipv42int(kws.get("ip_dst_addr", "192.0.0.1")),
+                                                       ipv42int(kws.get("ip_dst_step", "0.0.0.1")),
+                                                       self.utils.intval(kws, "ip_dst_count", 0)))
+            if IPv6 in pkt:
+                offset = offset_of(IPv6)
+                addr_fields.append(self.template_field("ipv6_src", offset + 8, 16, mode_of("ipv6_src_mode"),
+                                                       self.utils.ipv6_ip2long(kws.get("ipv6_src_addr", "fe80:0:0:0:0:0:0:12")),
+                                                       self.utils.ipv6_ip2long(kws.get("ipv6_src_step", "::1")),
+                                                       self.utils.intval(kws, "ipv6_src_count", 0)))
+                addr_fields.append(self.template_field("ipv6_dst", offset + 24, 16, mode_of("ipv6_dst_mode"),
+                                                       self.utils.ipv6_ip2long(kws.get("ipv6_dst_addr", "fe80:0:0:0:0:0:0:22")),
+                                                       self.utils.ipv6_ip2long(kws.get("ipv6_dst_step", "::1")),
+                                                       self.utils.intval(kws, "ipv6_dst_count", 0)))
+
+            if Dot1Q in pkt:
+                fields.append(self.template_field("vlan_id", offset_of(Dot1Q), 2, mode_of("vlan_id_mode"),
+                                                  self.utils.intval(kws, "vlan_id", 0),
+                                                  self.utils.intval(kws, "vlan_id_step", 1),
+                                                  self.utils.intval(kws, "vlan_id_count", 0), mask=0x0FFF))
+
+            port_fields = []
+            for l4, layer in [("tcp", TCP), ("udp", UDP)]:
+                if layer not in pkt:
+                    continue
+                offset = offset_of(layer)
+                for index, direction in enumerate(["src", "dst"]):
+                    prefix = "{}_{}_port".format(l4, direction)
+                    port_fields.append(self.template_field(prefix, offset + 2 * index, 2, mode_of(prefix + "_mode"),
+                                                           self.utils.intval(kws, prefix, 0),
+                                                           self.utils.intval(kws, prefix + "_step", 1),
+                                                           self.utils.intval(kws, prefix + "_count", 0)))
+
+            addr_fields = [field for field in addr_fields if field]
+            port_fields = [field for field in port_fields if field]
+            fields = [field for field in fields if field] + addr_fields + port_fields
+            template = PacketTemplate(self.build_frame(pwa), fields)
+            for field in addr_fields:
+                for offset, zero_disabled in ip_checksums + l4_checksums:
+                    template.add_checksum(field, offset, zero_disabled)
+            for field in port_fields:
+                for offset, zero_disabled in l4_checksums:
+                    template.add_checksum(field, offset, zero_disabled)
+        except Exception as exp:
+            self.logger.info("stream {} is not using template: {}".format(pwa.stream.stream_id, exp))
+            return None
+
+        self.logger.debug("stream {} template fields {}".format(pwa.stream.stream_id,
+                                                                [field.name for field in template.fields]))
+        return template
+
     def add_padding(self, pwa, first):
         pwa.padding = None
         if pwa.length_mode == "random":
@@ -944,6 +1138,11 @@ class ScapyPacket(object):
 
     def build_next_dma(self, pwa):
 
+        # Patch the changing fields in place
+        if pwa.template:
+            pwa.template.advance()
+            return pwa
+
         # Change Ether SRC MAC
         mac_src_mode = pwa.stream.kws.get("mac_src_mode", "fixed").strip()
         mac_src_step = pwa.stream.kws.get("mac_src_step", "00:00:00:00:00:01")
@@ -1133,9 +1332,9 @@ class ScapyPacket(object):
             tcp_dst_port_count = self.utils.intval(pwa.stream.kws, "tcp_dst_port_count", 0)
             if tcp_dst_port_mode in ["increment", "decrement", "incr", "decr"]:
                 if tcp_dst_port_mode in ["increment", "incr"]:
-                    pwa.pkt[TCP].dport = pwa.pkt[TCP].sport + tcp_dst_port_step
+                    pwa.pkt[TCP].dport = pwa.pkt[TCP].dport + tcp_dst_port_step
                 else:
-                    pwa.pkt[TCP].dport = pwa.pkt[TCP].sport - tcp_dst_port_step
+                    pwa.pkt[TCP].dport = pwa.pkt[TCP].dport - tcp_dst_port_step
                 pwa.tcp_dst_port_count = pwa.tcp_dst_port_count + 1
                 if tcp_dst_port_count > 0 and pwa.tcp_dst_port_count >= tcp_dst_port_count:
                     pwa.pkt[TCP].dport = self.utils.intval(pwa.stream.kws, "tcp_dst_port", 0)
@@ -1167,9 +1366,9 @@ class ScapyPacket(object):
             udp_dst_port_count = self.utils.intval(pwa.stream.kws, "udp_dst_port_count", 0)
             if udp_dst_port_mode in ["increment", "decrement", "incr", "decr"]:
                 if udp_dst_port_mode in ["increment", "incr"]:
-                    pwa.pkt[UDP].dport = pwa.pkt[UDP].sport + udp_dst_port_step
+                    pwa.pkt[UDP].dport = pwa.pkt[UDP].dport + udp_dst_port_step
                 else:
-                    pwa.pkt[UDP].dport = pwa.pkt[UDP].sport - udp_dst_port_step
+                    pwa.pkt[UDP].dport = pwa.pkt[UDP].dport - udp_dst_port_step
                 pwa.udp_dst_port_count = pwa.udp_dst_port_count + 1
                 if udp_dst_port_count > 0 and pwa.udp_dst_port_count >= udp_dst_port_count:
                     pwa.pkt[UDP].dport = self.utils.intval(pwa.stream.kws, "udp_dst_port", 0)
@@ -0,0 +1,135 @@
+"""
+Precompiled packet templates for the scapy traffic generator.
+
+ScapyPacket builds every frame with scapy: build_next_dma changes the scapy layer
+fields, send_packet renders the packet, adds the CRC and parses it back for sendp.
+A PacketTemplate is rendered from the scapy packet once. The fields which change
+from one frame to the next are patched in place in a preallocated buffer, and the
+IPv4 header and L4 checksums covering them are updated incrementally (RFC 1624),
+so building a frame costs a few byte copies and a CRC.
+"""
+
+import binascii
+import struct
+import zlib
+
+
+def csum_update(csum, old, new):
+    """
+    Update an internet checksum for a change of the data it covers.
+    @csum current checksum
+    @old old bytes of the changed data, even length and aligned to 16 bits in the covered data
+    @new new bytes of the changed data
+    """
+    total = ~csum & 0xFFFF
+    for i in range(0, len(old), 2):
+        total += (~((old[i] << 8) | old[i + 1]) & 0xFFFF) + ((new[i] << 8) | new[i + 1])
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+class TemplateField(object):
+    """
+    Field of the template changing from one frame to the next.
+    """
+
+    def __init__(self, name, offset, size, mode, value, step=0, count=0, values=None, mask=None):
+        """
+        @name field name, used in logs
+        @offset offset of the field in the frame
+        @size size of the field in bytes
+        @mode increment, decrement or list
+        @value integer value of the field in the first frame, also used when count is reached
+        @step integer step for increment and decrement modes
+        @count number of frames before restarting from value, 0 to never restart
+        @values integer values for list mode
+        @mask bits of the field holding the value, other bits are kept as they are
+        """
+        self.name = name
+        self.offset = offset
+        self.size = size
+        self.mode = mode
+        self.first = value
+        self.value = value
+        self.step = step
+        self.count = count
+        self.values = values or [value]
+        self.index = 0
+        self.full_mask = (1 << (8 * size)) - 1
+        self.mask = mask if mask is not None else self.full_mask
+        # (checksum offset, zero means disabled) pairs of the checksums covering this field
+        self.checksums = []
+
+    def next_value(self):
+        if self.mode == "list":
+            self.index = self.index + 1
+            if self.index >= len(self.values):
+                self.index = 0
+            self.value = self.values[self.index]
+            return self.value
+        if self.mode in ["increment", "incr"]:
+            self.value = (self.value + self.step) & self.mask
+        else:
+            self.value = (self.value - self.step) & self.mask
+        self.index = self.index + 1
+        if self.count > 0 and self.index >= self.count:
+            self.value = self.first
+            self.index = 0
+        return self.value
+
+
+class PacketTemplate(object):
+    """
+    Frame rendered once with the fields changing between frames patched in place.
+    """
+
+    def __init__(self, frame, fields):
+        """
+        @frame bytes of the first frame without CRC
+        @fields list of TemplateField
+        """
+        self.buf = bytearray(frame)
+        self.fields = fields
+
+    def add_checksum(self, field, offset, zero_disabled=False):
+        """
+        Record a checksum covering the field.
+        @offset offset of the checksum in the frame
+        @zero_disabled the checksum is optional and disabled when zero (UDP over IPv4)
+        """
+        if zero_disabled and self.buf[offset] == 0 and self.buf[offset + 1] == 0:
+            return
+        field.checksums.append((offset, zero_disabled))
+
+    def patch(self, field, value):
+        buf = self.buf
+        start, end = field.offset, field.offset + field.size
+        old = buf[start:end]
+        if field.mask != field.full_mask:
+            value = (int(binascii.hexlify(old), 16) & ~field.mask) | (value & field.mask)
+        new = bytearray(binascii.unhexlify("{:0{}x}".format(value, 2 * field.size)))
+        if new == old:
+            return
+        buf[start:end] = new
+        for offset, zero_disabled in field.checksums:
+            csum = (buf[offset] << 8) | buf[offset + 1]
+            csum = csum_update(csum, old, new)
+            if zero_disabled and csum == 0:
+                csum = 0xFFFF
+            buf[offset] = csum >> 8
+            buf[offset + 1] = csum & 0xFF
+
+    def advance(self):
+        """
+        Move to the next frame.
+        """
+        for field in self.fields:
+            self.patch(field, field.next_value())
+
+    def render(self):
+        """
+        Get the current frame with the CRC appended.
+        """
+        frame = bytes(self.buf)
+        return frame + struct.pack("<I", zlib.crc32(frame) & 0xFFFFFFFF)
@@ -24,10 +24,10 @@ logging.getLogger("Pyro4.core").setLevel(logging.DEBUG)
 
 
 class TGScapyTest(ScapyClient):
-    def __init__(self, tg_ip=None, tg_port=8009, tg_port_list=None, dry_run=False):
+    def __init__(self, tg_ip=None, tg_port=8009, tg_port_list=None, dry_run=False, dbg_lvl=100):
         ScapyClient.__init__(self, None, tg_ip, tg_port, tg_port_list)
         # os.environ["SCAPY_TGEN_PORTMAP"] = "vde"
-        os.environ["SPYTEST_SCAPY_DBG_LVL"] = "100"
+        os.environ["SPYTEST_SCAPY_DBG_LVL"] = str(dbg_lvl)
         self.scapy_connect(dry_run)
 
     def __del__(self):
@@ -200,6 +200,37 @@ def test_track(tg):
     tg.tg_traffic_control(action='run', duration=10, stream_handle=['stream-1-0', 'stream-2-0'])
 
 
+def test_pps(ipaddr, port=8009, rate_pps=100000, duration=10, frame_size=64):
+    results = {}
+    for template in ["0", "1"]:
+        print("============= test_pps template={} ==============".format(template))
+        os.environ["SPYTEST_SCAPY_MAX_PPS"] = str(rate_pps)
+        os.environ["SPYTEST_SCAPY_TX_TEMPLATE"] = template
+        # packet tracing at higher debug levels disables the templates
+        tg = TGScapyTest(ipaddr, port, ["1/1"], dbg_lvl=1)
+        tg_ph_1 = list(tg.tg_port_handle.values())[0]
+        tg.tg_traffic_control(action="reset", port_handle=tg_ph_1)
+        tg.tg_traffic_control(action="clear_stats", port_handle=tg_ph_1)
+        tg.tg_traffic_config(mac_src='00:00:00:00:00:01', mac_dst='00:00:00:00:00:02',
+                             mac_src_mode="increment", mac_src_count=100,
+                             l3_protocol='ipv4', ip_src_addr="1.0.0.1", ip_dst_addr="2.0.0.2",
+                             ip_src_mode='increment', ip_src_count=1000,
+                             l4_protocol='udp', udp_src_port=1000, udp_src_port_mode='increment',
+                             udp_src_port_count=100, udp_dst_port=2000,
+                             rate_pps=rate_pps, mode='create', port_handle=tg_ph_1,
+                             transmit_mode='continuous', frame_size=frame_size)
+        tg.tg_traffic_control(action='run', port_handle=tg_ph_1)
+        time.sleep(duration)
+        tg.tg_traffic_control(action='stop', port_handle=tg_ph_1)
+        tx_stats = tg.tg_traffic_stats(port_handle=tg_ph_1, mode="aggregate")
+        tx_frames = int(tx_stats[tg_ph_1]["aggregate"]["tx"]["total_pkts"])
+        results[template] = tx_frames / float(duration)
+        tg.tg_disconnect()
+    for template, pps in results.items():
+        print("template={} rate={} pps={:.0f}".format(template, rate_pps, pps))
+    return results
+
+
 def test_main(ipaddr, port=8009):
     tg = TGScapyTest(ipaddr, port, ["1/1", "1/2"])
 
@@ -447,6 +478,9 @@ def test_sample(ipaddr, port=8009):
 if __name__ == '__main__':
     ipaddr = sys.argv[1] if len(sys.argv) > 1 else "10.250.0.188"
     port = sys.argv[2] if len(sys.argv) > 2 else 8009
+    if len(sys.argv) > 3 and sys.argv[3] == "pps":
+        test_pps(ipaddr, port)
+        sys.exit(0)
     test_sample(ipaddr, port)
     sys.exit(0)
     test_dot1x(ipaddr, port)
@@ -6,7 +6,8 @@ This library/script should work for any test result XML file generated by Pytest
 
 CLI Usage:
 % python3 junit_xml_parser.py -h
-usage: junit_xml_parser.py [-h] [--validate-only] [--compact] [--output-file OUTPUT_FILE] file
+usage: junit_xml_parser.py [-h] [--validate-only] [--compact] [--output-file OUTPUT_FILE]
+                           [--stream-dir STREAM_DIR] [--workers WORKERS] file
 
 Validate and convert SONiC JUnit XML files into JSON.
 
@@ -19,6 +20,10 @@ optional arguments:
 --compact, -c         Output the JSON in a compact form.
 --output-file OUTPUT_FILE, -o OUTPUT_FILE
                         A file to store the JSON output in.
+--stream-dir STREAM_DIR
+                        Parse incrementally and write the test cases to newline delimited
+                        JSON files in this directory.
+--workers WORKERS     Number of processes parsing the files with --stream-dir.
 
 Examples:
 python3 junit_xml_parser.py tests/files/sample_tr.xml
@@ -26,8 +31,10 @@ python3 junit_xml_parser.py tests/files/sample_tr.xml
 import argparse
 import glob
 import json
+import multiprocessing
 import sys
 import os
+import tempfile
 
 from collections import defaultdict
 from datetime import datetime
@@ -43,6 +50,8 @@ REPORT_LIST.append("Script Name, Total, Pass, Fail, Skip, Error, XFail, Time")
 
 MAXIMUM_XML_SIZE = 20e7  # 20MB
 MAXIMUM_SUMMARY_SIZE = 1024  # 1MB
+# Files parsed incrementally have no size limit, the test cases are written in chunks of at most this size.
+MAXIMUM_CHUNK_SIZE = 50e6  # 50MB
 
 # Fields found in the testsuite/root section of the JUnit XML file.
 TESTSUITES_TAG = "testsuites"
@@ -178,10 +187,7 @@ def validate_junit_xml_archive(directory_name, strict=False):
     roots = []
     metadata_source = None
     metadata = {}
-    doc_list = glob.glob(os.path.join(directory_name, "tr.xml"))
-    doc_list += glob.glob(os.path.join(directory_name, "*test*.xml"))
-    doc_list += glob.glob(os.path.join(directory_name, "**", "*test*.xml"), recursive=True)
-    doc_list = set(doc_list)
+    doc_list = _find_junit_xml_files(directory_name)
 
     total_size = 0
     for document in doc_list:
@@ -220,6 +226,13 @@ def validate_junit_xml_archive(directory_name, strict=False):
     return roots
 
 
+def _find_junit_xml_files(directory_name):
+    doc_list = glob.glob(os.path.join(directory_name, "tr.xml"))
+    doc_list += glob.glob(os.path.join(directory_name, "*test*.xml"))
+    doc_list += glob.glob(os.path.join(directory_name, "**", "*test*.xml"), recursive=True)
+    return set(doc_list)
+
+
 def validate_junit_xml_path(path, strict=False):
     if os.path.isfile(path):
         roots = [validate_junit_xml_file(path)]
@@ -247,6 +260,10 @@ def _validate_test_summary(root):
     else:
         raise JUnitXMLValidationError(f"Either {TESTSUITES_TAG} or {TESTSUITE_TAG} tag are not found on root element")
 
+    _validate_test_suite_attributes(testsuit_element)
+
+
+def _validate_test_suite_attributes(testsuit_element):
     for xml_field, expected_type in REQUIRED_TESTSUITE_ATTRIBUTES:
         if xml_field not in testsuit_element.keys():
             raise JUnitXMLValidationError(f"{xml_field} not found in <{TESTSUITE_TAG}> element")
@@ -330,16 +347,17 @@ def _validate_test_case_properties(root):
         print("missing testcase property: {}".format(list(missing_testcase_property)))
 
 
-def _validate_test_cases(root):
-    def _validate_test_case(test_case):
-        for attribute in REQUIRED_TESTCASE_ATTRIBUTES:
-            if attribute not in test_case.keys():
-                raise JUnitXMLValidationError(
-                    f'"{attribute}" not found in test case '
-                    f"\"{test_case.get('name', 'Name Not Found')}\""
-                )
-        _validate_test_case_properties(test_case)
+def _validate_test_case(test_case):
+    for attribute in REQUIRED_TESTCASE_ATTRIBUTES:
+        if attribute not in test_case.keys():
+            raise JUnitXMLValidationError(
+                f'"{attribute}" not found in test case '
+                f"\"{test_case.get('name', 'Name Not Found')}\""
+            )
+    _validate_test_case_properties(test_case)
 
+
+def _validate_test_cases(root):
     cases = root.findall(TESTCASE_TAG)
 
     for test_case in cases:
@@ -386,26 +404,33 @@ def _extract_test_summary(test_cases):
     test_result_summary = defaultdict(int)
     for _, cases in test_cases.items():
         for case in cases:
-            # Error may occur along with other test results, to count error separately.
-            # The result field is unique per test case, either error or failure.
-            # xfails is the counter for all kinds of xfail results (include success/failure/error/skipped)
-            test_result_summary["tests"] += 1
-            test_result_summary["failures"] += case["result"] == "failure"
-            test_result_summary["skipped"] += case["result"] == "skipped"
-            test_result_summary["errors"] += case["error"]
-            test_result_summary["time"] += float(case["time"])
-            test_result_summary["xfails"] += \
-                case["result"] == "xfail_failure" or case["result"] == \
-                "xfail_error" or case["result"] == "xfail_skipped" or case["result"] == "xfail_success"
+            _count_test_case(test_result_summary, case)
+
+    if case is None:
+        return {k: str(v) for k, v in test_result_summary.items()}
+    return _report_test_summary(test_result_summary, case['file'])
+
 
+def _count_test_case(test_result_summary, case):
+    # Error may occur along with other test results, to count error separately.
+    # The result field is unique per test case, either error or failure.
+    # xfails is the counter for all kinds of xfail results (include success/failure/error/skipped)
+    test_result_summary["tests"] += 1
+    test_result_summary["failures"] += case["result"] == "failure"
+    test_result_summary["skipped"] += case["result"] == "skipped"
+    test_result_summary["errors"] += case["error"]
+    test_result_summary["time"] += float(case["time"])
+    test_result_summary["xfails"] += \
+        case["result"] == "xfail_failure" or case["result"] == \
+        "xfail_error" or case["result"] == "xfail_skipped" or case["result"] == "xfail_success"
+
+
+def _report_test_summary(test_result_summary, name):
     test_result_summary = {k: str(v) for k, v in test_result_summary.items()}
     total = int(test_result_summary["failures"]) + int(test_result_summary["skipped"]) \
         + int(test_result_summary["errors"]) + int(test_result_summary["xfails"])
     passed = int(test_result_summary["tests"]) - int(total)
     passed = max(0, passed)
-    if case is None:
-        return test_result_summary
-    name = case['file']
     REPORT_LIST.append("{}, {}, {}, {}, {}, {}, {}, {}".
                        format(name, test_result_summary["tests"],
                               passed, test_result_summary["failures"],
@@ -449,62 +474,63 @@ def _parse_testcase_properties(root):
     return testcase_properties
 
 
-def _parse_test_cases(root):
-    test_case_results = defaultdict(list)
-
-    def _parse_test_case(test_case):
-        result = {}
+def _parse_test_case(test_case):
+    result = {}
+
+    # FIXME: This is specific to pytest, needs to be extended to support spytest.
+    test_class_tokens = test_case.get("classname").split(".")
+    feature = test_class_tokens[0]
+
+    for attribute in REQUIRED_TESTCASE_ATTRIBUTES:
+        result[attribute] = test_case.get(attribute)
+    for attribute in REQUIRED_TESTCASE_PROPERTIES:
+        testcase_properties = _parse_testcase_properties(test_case)
+        if attribute in testcase_properties:
+            result[attribute] = testcase_properties[attribute]
+
+    # NOTE: "if failure" and "if error" does not work with the ETree library.
+    failure = test_case.find("failure")
+    error = test_case.find("error")
+    skipped = test_case.find("skipped")
+
+    # Any test which marked as xfail will drop out a property to the report xml file.
+    # Add prefix "xfail_" to tests which are marked with xfail
+    properties_element = test_case.find(PROPERTIES_TAG)
+    xfail_case = ""
+    if properties_element:
+        for prop in properties_element.iterfind(PROPERTY_TAG):
+            if prop.get("name") == "xfail":
+                xfail_case = "xfail_"
+                break
+
+    # NOTE: "error" is unique in that it can occur alongside a succesful, failed, or skipped test result.
+    # Because of this, we track errors separately so that the error can be correlated with the stage it
+    # occurred.
+    # By looking into test results from past 300 days, error only occur with skipped test result.
+    #
+    # If there is *only* an error tag we note that as well, as this indicates that the framework
+    # errored out during setup or teardown.
+    if failure is not None:
+        result["result"] = "{}failure".format(xfail_case)
+        summary = failure.get("message", "")
+    elif skipped is not None:
+        result["result"] = "{}skipped".format(xfail_case)
+        summary = skipped.get("message", "")
+    elif error is not None:
+        result["result"] = "{}error".format(xfail_case)
+        summary = error.get("message", "")
+    else:
+        result["result"] = "{}success".format(xfail_case)
+        summary = ""
 
-        # FIXME: This is specific to pytest, needs to be extended to support spytest.
-        test_class_tokens = test_case.get("classname").split(".")
-        feature = test_class_tokens[0]
+    result["summary"] = summary[:min(len(summary), MAXIMUM_SUMMARY_SIZE)]
+    result["error"] = error is not None
 
-        for attribute in REQUIRED_TESTCASE_ATTRIBUTES:
-            result[attribute] = test_case.get(attribute)
-        for attribute in REQUIRED_TESTCASE_PROPERTIES:
-            testcase_properties = _parse_testcase_properties(test_case)
-            if attribute in testcase_properties:
-                result[attribute] = testcase_properties[attribute]
-
-        # NOTE: "if failure" and "if error" does not work with the ETree library.
-        failure = test_case.find("failure")
-        error = test_case.find("error")
-        skipped = test_case.find("skipped")
-
-        # Any test which marked as xfail will drop out a property to the report xml file.
-        # Add prefix "xfail_" to tests which are marked with xfail
-        properties_element = test_case.find(PROPERTIES_TAG)
-        xfail_case = ""
-        if properties_element:
-            for prop in properties_element.iterfind(PROPERTY_TAG):
-                if prop.get("name") == "xfail":
-                    xfail_case = "xfail_"
-                    break
-
-        # NOTE: "error" is unique in that it can occur alongside a succesful, failed, or skipped test result.
-        # Because of this, we track errors separately so that the error can be correlated with the stage it
-        # occurred.
-        # By looking into test results from past 300 days, error only occur with skipped test result.
-        #
-        # If there is *only* an error tag we note that as well, as this indicates that the framework
-        # errored out during setup or teardown.
-        if failure is not None:
-            result["result"] = "{}failure".format(xfail_case)
-            summary = failure.get("message", "")
-        elif skipped is not None:
-            result["result"] = "{}skipped".format(xfail_case)
-            summary = skipped.get("message", "")
-        elif error is not None:
-            result["result"] = "{}error".format(xfail_case)
-            summary = error.get("message", "")
-        else:
-            result["result"] = "{}success".format(xfail_case)
-            summary = ""
+    return feature, result
 
-        result["summary"] = summary[:min(len(summary), MAXIMUM_SUMMARY_SIZE)]
-        result["error"] = error is not None
 
-        return feature, result
+def _parse_test_cases(root):
+    test_case_results = defaultdict(list)
 
     for test_case in root.findall("testcase"):
         feature, result = _parse_test_case(test_case)
@@ -566,6 +592,212 @@ def _update_test_cases(current, update):
     return new_cases
 
 
+class _TestCaseChunkWriter:
+    """Write test cases to newline delimited JSON files of at most max_chunk_size bytes."""
+
+    def __init__(self, output_dir, prefix, max_chunk_size):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.max_chunk_size = max_chunk_size
+        self.chunks = []
+        self.file = None
+        self.size = 0
+
+    def write(self, case):
+        line = json.dumps(case) + "\n"
+        if self.file and self.size + len(line) > self.max_chunk_size:
+            self.close()
+        if not self.file:
+            fd, chunk = tempfile.mkstemp(prefix=self.prefix, suffix=".json", dir=self.output_dir)
+            self.file = os.fdopen(fd, "w")
+            self.chunks.append(chunk)
+            self.size = 0
+        self.file.write(line)
+        self.size += len(line)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def remove(self):
+        self.close()
+        for chunk in self.chunks:
+            os.remove(chunk)
+        self.chunks = []
+
+
+def _stream_junit_xml_file(document_name, output_dir, case_fields, max_chunk_size):
+    """Validate and parse a JUnit XML file incrementally, writing its test cases to chunk files.
+
+    Only the test suite element and its properties are kept in memory, each test case is dropped
+    once it is written.
+
+    Returns:
+        A dict with the test_metadata, the test_summary counters, the file name of the last test case
+        and the list of test case chunks of the document.
+    """
+    if not os.path.exists(document_name) or not os.path.isfile(document_name):
+        raise JUnitXMLValidationError("file not found")
+
+    writer = _TestCaseChunkWriter(output_dir, os.path.basename(document_name) + ".", max_chunk_size)
+    stack = []
+    root = None
+    testsuite = None
+    suite_children = 0
+    metadata = {}
+    summary = defaultdict(int)
+    name = None
+    try:
+        for event, element in ET.iterparse(document_name, events=("start", "end"), forbid_dtd=True):
+            if event == "start":
+                if root is None:
+                    root = element
+                    if root.tag not in (TESTSUITES_TAG, TESTSUITE_TAG):
+                        raise JUnitXMLValidationError(
+                            f"Either {TESTSUITES_TAG} or {TESTSUITE_TAG} tag are not found on root element")
+                if testsuite is None and element.tag == TESTSUITE_TAG and len(stack) == (root.tag == TESTSUITES_TAG):
+                    testsuite = element
+                    _validate_test_suite_attributes(testsuite)
+                stack.append(element)
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if parent is None or parent is not testsuite:
+                # Drop what is not under the test suite, the test cases keep their children until parsed
+                if parent is not None and element is not testsuite and testsuite not in stack:
+                    parent.remove(element)
+                continue
+
+            suite_children += 1
+            # The metadata and the test cases are only validated when the test suite is the root element
+            if element.tag == PROPERTIES_TAG and not metadata:
+                if testsuite is root:
+                    _validate_test_metadata(testsuite)
+                metadata = _parse_test_metadata(testsuite)
+            elif element.tag == TESTCASE_TAG:
+                if testsuite is root:
+                    _validate_test_case(element)
+                feature, case = _parse_test_case(element)
+                _count_test_case(summary, case)
+                name = case["file"]
+                case["feature"] = feature
+                case.update(case_fields)
+                writer.write(case)
+            if element.tag != PROPERTIES_TAG:
+                testsuite.remove(element)
+    except JUnitXMLValidationError:
+        writer.remove()
+        raise
+    except Exception as e:
+        writer.remove()
+        raise JUnitXMLValidationError(f"could not parse {document_name}: {e}") from e
+    writer.close()
+
+    if root is not None and root.tag == TESTSUITES_TAG and (testsuite is None or not suite_children):
+        writer.remove()
+        raise JUnitXMLValidationError(f"{TESTSUITE_TAG} tag not found")
+
+    return {
+        "test_metadata": metadata,
+        "test_summary": dict(summary),
+        "name": name,
+        "test_case_files": writer.chunks,
+    }
+
+
+def _stream_junit_xml_task(task):
+    document_name = task[0]
+    try:
+        return document_name, _stream_junit_xml_file(*task), None
+    except Exception as e:
+        return document_name, None, e
+
+
+def parse_test_result_stream(path, output_dir, on_test_case_file=None, case_fields=None, workers=None,
+                             max_chunk_size=MAXIMUM_CHUNK_SIZE, strict=False):
+    """Validate and parse a JUnit XML file or archive incrementally.
+
+    The files are parsed with iterparse by a pool of processes. There is no limit on the size of the files, the
+    test cases are written as newline delimited JSON in chunk files of at most max_chunk_size bytes instead of
+    being merged in memory.
+
+    Args:
+        path: A JUnit XML file or a directory containing JUnit XML files, like validate_junit_xml_path.
+        output_dir: The directory the chunk files are written to.
+        on_test_case_file: Called with the path of each chunk file once the file it comes from is validated.
+        case_fields: A dict of fields added to every test case, the test cases also have a "feature" field.
+        workers: The number of processes parsing the files, default is the number of CPUs.
+        max_chunk_size: The maximum size in bytes of a chunk file.
+        strict: Fail if ANY file in a given directory is not parseable.
+
+    Returns:
+        A dict containing the test_metadata and the test_summary of the test result, like parse_test_result, or
+        None if there is no valid file.
+
+    Raises:
+        JUnitXMLValidationError: if path is a file which is not valid JUnit XML, or in strict mode if any of the
+            files is not valid JUnit XML or their metadata differ.
+    """
+    if os.path.isfile(path):
+        doc_list = [path]
+        strict = True
+    elif os.path.isdir(path):
+        doc_list = sorted(_find_junit_xml_files(path))
+    else:
+        raise JUnitXMLValidationError("file not found")
+
+    tasks = [(document, output_dir, case_fields or {}, max_chunk_size) for document in doc_list]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+
+    test_result_json = defaultdict(dict)
+    metadata_source = None
+    metadata = {}
+    parsed = 0
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap_unordered(_stream_junit_xml_task, tasks) if pool else map(_stream_junit_xml_task, tasks)
+        for document, result, error in results:
+            if error is None and result["test_metadata"]:
+                root_metadata = {k: v for k, v in result["test_metadata"].items()
+                                 if k in REQUIRED_METADATA_PROPERTIES and k != "timestamp"}
+                if not metadata_source:
+                    metadata_source = document
+                    metadata = root_metadata
+                if root_metadata != metadata:
+                    for chunk in result["test_case_files"]:
+                        os.remove(chunk)
+                    error = JUnitXMLValidationError(f"{document} metadata differs from {metadata_source}\n"
+                                                    f"{document}: {root_metadata}\n"
+                                                    f"{metadata_source}: {metadata}")
+            if error is not None:
+                if strict:
+                    raise JUnitXMLValidationError(f"could not parse {document}: {error}") from error
+                print(f"could not parse {document}: {error} - skipping")
+                continue
+
+            parsed += 1
+            test_result_json["test_metadata"] = _update_test_metadata(test_result_json["test_metadata"],
+                                                                      result["test_metadata"])
+            summary = result["test_summary"]
+            if result["name"]:
+                summary = _report_test_summary(summary, result["name"])
+            test_result_json["test_summary"] = _update_test_summary(test_result_json["test_summary"],
+                                                                    {k: str(v) for k, v in summary.items()})
+            if on_test_case_file:
+                for chunk in result["test_case_files"]:
+                    on_test_case_file(chunk)
+    finally:
+        if pool:
+            pool.terminate()
+
+    if not parsed:
+        print("No XML file needs to be parsed or the file is empty.")
+        return None
+    return dict(test_result_json)
+
+
 def validate_junit_json_file(path):
     """Validate that a JSON file is a valid test report.
 
@@ -691,12 +923,27 @@ python3 junit_xml_parser.py tests/files/sample_tr.xml
         help="Load an existing test result JSON file from path_name. "
              "Will perform validation only regardless of --validate-only option.",
     )
+    parser.add_argument(
+        "--stream-dir",
+        type=str,
+        help="Parse incrementally and write the test cases to newline delimited JSON files in this directory. "
+             "The output lists these files instead of the test cases.",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Number of processes parsing the files with --stream-dir.",
+    )
 
     args = parser.parse_args()
 
     try:
         if args.json:
             validate_junit_json_file(args.file_name)
+        elif args.stream_dir:
+            test_case_files = []
+            test_result_json = parse_test_result_stream(args.file_name, args.stream_dir, test_case_files.append,
+                                                        workers=args.workers, strict=args.strict)
+            if test_result_json is not None:
+                test_result_json["test_case_files"] = test_case_files
         elif args.directory:
             roots = validate_junit_xml_archive(args.file_name, args.strict)
         else:
@@ -715,7 +962,8 @@ python3 junit_xml_parser.py tests/files/sample_tr.xml
         print(f"{args.file_name} validated succesfully!")
         sys.exit(0)
 
-    test_result_json = parse_test_result(roots)
+    if not args.stream_dir:
+        test_result_json = parse_test_result(roots)
     if test_result_json is None:
         print("XML file doesn't exist or no data in the file.")
         sys.exit(1)
@@ -197,6 +197,20 @@ class KustoConnector(ReportDBConnector):
                 This id does not have to be unique.
             report_guid: A randomly generated UUID that is used to query for a specific test run across tables.
         """
+        self.upload_report_summary(report_json, external_tracking_id, report_guid, testbed, os_version)
+        if report_json:
+            self._upload_test_cases(report_json, report_guid)
+
+    def upload_report_summary(self, report_json: Dict,
+                              external_tracking_id: str = "",
+                              report_guid: str = "",
+                              testbed: str = "",
+                              os_version: str = "") -> None:
+        """Upload a report without its test cases to the back-end data store.
+
+        Used with upload_test_cases_file when the test cases are uploaded in chunks, see upload_report for the
+        arguments.
+        """
         if not report_json:
             print(
                 "Test result file is not found or empty. We will only upload pipeline results and summary.")
@@ -208,7 +222,16 @@ class KustoConnector(ReportDBConnector):
             external_tracking_id, report_guid, testbed, os_version)
         self._upload_metadata(report_json, external_tracking_id, report_guid)
         self._upload_summary(report_json, report_guid)
-        self._upload_test_cases(report_json, report_guid)
+
+    def upload_test_cases_file(self, test_cases_file: str) -> None:
+        """Upload test cases from a file to the back-end data store.
+
+        Args:
+            test_cases_file: A file of test cases as newline delimited JSON, with their id and feature fields.
+                See junit_xml_parser.parse_test_result_stream.
+        """
+        print("Upload test case file {}".format(test_cases_file))
+        self._ingest_file(self.TEST_CASE_TABLE, test_cases_file)
 
     def upload_reachability_data(self, ping_output: List) -> None:
         ping_time = str(datetime.utcnow())
@@ -345,13 +368,6 @@ class KustoConnector(ReportDBConnector):
         self._ingest_data(self.TEST_CASE_TABLE, test_cases)
 
     def _ingest_data(self, table, data):
-        props = IngestionProperties(
-            database=self.db_name,
-            table=table,
-            data_format=self.TABLE_FORMAT_LOOKUP[table],
-            ingestion_mapping_reference=self.TABLE_MAPPING_LOOKUP[table]
-        )
-
         with tempfile.NamedTemporaryFile(mode="w+") as temp:
             if isinstance(data, list):
                 temp.writelines(
@@ -359,13 +375,23 @@ class KustoConnector(ReportDBConnector):
             else:
                 temp.write(json.dumps(data))
             temp.seek(0)
-            print("Ingest to primary cluster...")
-            self._ingestion_client.ingest_from_file(
-                temp.name, ingestion_properties=props)
-            if self._ingestion_client_backup:
-                print("Ingest to backup cluster...")
-                self._ingestion_client_backup.ingest_from_file(
-                    temp.name, ingestion_properties=props)
+            self._ingest_file(table, temp.name)
+
+    def _ingest_file(self, table, file_name):
+        props = IngestionProperties(
+            database=self.db_name,
+            table=table,
+            data_format=self.TABLE_FORMAT_LOOKUP[table],
+            ingestion_mapping_reference=self.TABLE_MAPPING_LOOKUP[table]
+        )
+
+        print("Ingest to primary cluster...")
+        self._ingestion_client.ingest_from_file(
+            file_name, ingestion_properties=props)
+        if self._ingestion_client_backup:
+            print("Ingest to backup cluster...")
+            self._ingestion_client_backup.ingest_from_file(
+                file_name, ingestion_properties=props)
 
     def _ingest_data_file(self, table, data_file):
         props = IngestionProperties(
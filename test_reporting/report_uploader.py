@@ -4,11 +4,14 @@ import sys
 import uuid
 import re
 import os
+import tempfile
 
 from junit_xml_parser import (
     validate_junit_json_file,
     validate_junit_xml_path,
-    parse_test_result
+    parse_test_result,
+    parse_test_result_stream,
+    MAXIMUM_CHUNK_SIZE
 )
 from report_data_storage import KustoConnector
 
@@ -54,6 +57,18 @@ python3 report_uploader.py tests/files/sample_tr.xml -e TRACKING_ID#22
     parser.add_argument(
         "--testbed", "-t", type=str, help="Name of testbed."
     )
+    parser.add_argument(
+        "--stream", "-s", action="store_true",
+        help="Parse the JUnit XML files incrementally and upload the test cases in chunks, "
+             "without limit on the total size of the files."
+    )
+    parser.add_argument(
+        "--workers", "-w", type=int, help="Number of processes parsing the JUnit XML files with --stream."
+    )
+    parser.add_argument(
+        "--max_chunk_size", type=int, default=int(MAXIMUM_CHUNK_SIZE),
+        help="Maximum size in bytes of a chunk of test cases uploaded with --stream."
+    )
     os_version = parser.add_mutually_exclusive_group(required=False)
     os_version.add_argument(
         "--image_url", "-i", type=str,
@@ -86,6 +101,14 @@ python3 report_uploader.py tests/files/sample_tr.xml -e TRACKING_ID#22
                 else:
                     if args.json:
                         test_result_json = validate_junit_json_file(path_name)
+                    elif args.stream:
+                        with tempfile.TemporaryDirectory() as output_dir:
+                            test_result_json = parse_test_result_stream(
+                                path_name, output_dir, kusto_db.upload_test_cases_file,
+                                case_fields={"id": report_guid}, workers=args.workers,
+                                max_chunk_size=args.max_chunk_size)
+                        kusto_db.upload_report_summary(test_result_json, tracking_id, report_guid, testbed, version)
+                        continue
                     else:
                         roots = validate_junit_xml_path(path_name)
                         test_result_json = parse_test_result(roots)
@@ -1,10 +1,12 @@
 import argparse
 from curses.ascii import isupper
+import gzip
 import json
+import multiprocessing
 
-from os import listdir
-from os.path import isfile, join, basename
-from typing import Dict, List, Tuple
+from os import cpu_count, listdir
+from os.path import isfile, join, basename, getsize
+from typing import Dict, Iterable, Iterator, List, Tuple
 from report_data_storage import KustoConnector
 import yaml
 
@@ -26,9 +28,19 @@ def _run_script() -> Dict:
     )
     parser.add_argument('--config_path', type=str,
                         help="your yaml file path\n")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of processes converting log files, "
+                             "default is the number of CPUs\n")
+    parser.add_argument('--aggregate', action='store_true',
+                        help="emit one record with a count per distinct "
+                             "api and attribute instead of one per attribute\n")
     args = parser.parse_args()
     with open(args.config_path, 'r', encoding='utf-8') as f:
         yaml_config = yaml.safe_load(f)
+    if args.workers:
+        yaml_config['workers'] = args.workers
+    if args.aggregate:
+        yaml_config['aggregate'] = True
     return yaml_config
 
 
@@ -101,6 +113,39 @@ def generate_sai_feature_from_header_files(files: List) -> List:
     return features
 
 
+# sai_path -> (features, sai_feature_file_map), the headers are the same for
+# all the devices and log files
+_sai_features_cache = {}
+
+
+def load_sai_features(sai_path: str) -> Tuple:
+    '''
+    Args:
+        sai_path: folder of the sai headers
+    Return:
+        features: set of the sai features
+        sai_feature_file_map: sai feature maps to header file
+    '''
+    if sai_path not in _sai_features_cache:
+        file_list = get_files_from_path(sai_path)
+        _sai_features_cache[sai_path] = (
+            set(generate_sai_feature_from_header_files(file_list)),
+            generate_sai_feature_file_map_from_header_files(file_list))
+    return _sai_features_cache[sai_path]
+
+
+def open_log_file(log_file: str):
+    '''
+    Args:
+        log_file: log file path, compressed with gzip if it ends with .gz
+    Return:
+        file object reading the log as text
+    '''
+    if log_file.endswith('.gz'):
+        return gzip.open(log_file, 'rt', encoding='utf-8')
+    return open(log_file, 'r', encoding='utf-8')
+
+
 def get_object_type_from_log(line: str) -> Tuple:
     '''
     Args:
@@ -240,13 +285,95 @@ def process_bulk(line: str) -> Tuple:
     return obj, obj_keys, obj_key_attrs
 
 
+def generate_log_records(config: Dict,
+                         log_file: str,
+                         features: List,
+                         sai_feature_file_map: Dict,
+                         sai_obj_feature_map: Dict,
+                         info: Dict) -> Iterator[Dict]:
+    '''read the log line by line and generate the swss items
+    Args:
+        config: swss config
+        log_file: log file path
+        features: sai features list
+        sai_feature_file_map: sai feature maps to header file
+        sai_obj_feature_map: sai obgject maps to feature
+        info: info of the one device log config
+    Return:
+        swss items as dicts, one per sai object key and attribute
+    '''
+    with open_log_file(log_file) as f:
+        for line in f:
+            line = line.rstrip()
+            if 'SAI_OBJECT_TYPE' not in line:
+                continue
+            is_bulk, op = get_sai_op(line, config['operation_map'])
+            if not op:
+                continue
+            if is_bulk:  # bulk op
+                sai_obj, sai_object_key, obj_key_attrs = process_bulk(line)
+            else:
+                sai_obj, sai_object_key = get_object_type_from_log(line)
+                obj_key_attrs = get_sai_obj_type(line)
+            # Fields shared by all the items of the line
+            sai_feature = get_sai_feature_from_sai_obj(
+                sai_obj, features, sai_obj_feature_map)
+            header_file = get_sai_header_file_from_sai_obj(
+                sai_feature, sai_feature_file_map)
+            if not sai_feature or not header_file:
+                continue
+            line_record = {
+                'log_file': log_file,
+                'log': line,
+                'sai_obj': sai_obj,
+                'log_time': get_log_time(line),
+                'sai_feature': sai_feature,
+                'header_file': header_file,
+                'sai_op': op,
+                'sai_api': get_sai_api(op, sai_obj),
+                'device': info['device'],
+                'os_version': info['os_version'],
+                'deployment_type': info['deployment_type'],
+                'deployment_subtype': info['deployment_subtype'],
+                'ngsdevice_type': config['ngsdevice_type'],
+            }
+            for obj_key, attributes in zip(sai_object_key, obj_key_attrs):
+                for attribute in attributes or [None]:
+                    record = dict(line_record)
+                    record['sai_object_key'] = obj_key
+                    record['sai_obj_attr_key'] = \
+                        attribute[0] if attribute else None
+                    record['sai_obj_attr_value'] = \
+                        attribute[1] if attribute else None
+                    yield record
+
+
+def aggregate_log_records(records: Iterable[Dict]) -> List[Dict]:
+    '''count the swss items per distinct api and attribute
+    Args:
+        records: swss items
+    Return:
+        the first swss item of each distinct sai_api and sai_obj_attr_key,
+        with the number of swss items in field count
+    '''
+    aggregated = {}
+    for record in records:
+        key = (record['sai_api'], record['sai_obj_attr_key'])
+        if key in aggregated:
+            aggregated[key]['count'] += 1
+        else:
+            record['count'] = 1
+            aggregated[key] = record
+    return list(aggregated.values())
+
+
 def convert_log_item(config: Dict,
                      log_file: str,
                      features: List,
                      sai_feature_file_map: Dict,
                      sai_obj_feature_map: Dict,
-                     info: Dict) -> None:
-    '''convert log to swss item
+                     info: Dict) -> int:
+    '''convert log to swss items, written as newline delimited json
     Args:
         config: swss config
         log_file: log file path
@@ -254,54 +381,41 @@ def convert_log_item(config: Dict,
         sai_feature_file_map: sai feature maps to header file
         sai_obj_feature_map: sai obgject maps to feature
         info: info of the one device log config
+    Return:
+        number of swss items written
     '''
-    f = open(log_file, 'r', encoding='utf-8')
     log_name = basename(log_file)
-    Lines = f.readlines()
-    items = []
-    for line in Lines:
-        line = line.rstrip()
-        if 'SAI_OBJECT_TYPE' in line:
-            is_bulk, op = get_sai_op(line, config['operation_map'])
-            if op:
-                if is_bulk:  # bulk op
-                    sai_obj, sai_object_key, obj_key_attrs = process_bulk(line)
-                else:
-                    sai_obj, sai_object_key = get_object_type_from_log(
-                        line)
-                    obj_key_attrs = get_sai_obj_type(line)
-                for obj_key, attributes in zip(sai_object_key, obj_key_attrs):
-                    if len(attributes) == 0:
-                        log_item = Swss_log_item(config,
-                                                 info,
-                                                 sai_obj,
-                                                 obj_key,
-                                                 log_file,
-                                                 line,
-                                                 features,
-                                                 sai_feature_file_map,
-                                                 sai_obj_feature_map)
-                        if log_item.sai_feature and log_item.header_file:
-                            items.append(log_item)
-                    else:
-                        for attribute in attributes:
-                            log_item = Swss_log_item(config,
-                                                     info,
-                                                     sai_obj,
-                                                     obj_key,
-                                                     log_file,
-                                                     line,
-                                                     features,
-                                                     sai_feature_file_map,
-                                                     sai_obj_feature_map,
-                                                     attribute)
-                            if log_item.sai_feature and log_item.header_file:
-                                items.append(log_item)
+    if log_name.endswith('.gz'):
+        log_name = log_name[:-len('.gz')]
     json_file = config['json_log_path'] + "/" + \
         log_name + "." + info['device'] + ".json"
+    records = generate_log_records(config, log_file, features,
+                                   sai_feature_file_map,
+                                   sai_obj_feature_map, info)
+    if config.get('aggregate'):
+        records = aggregate_log_records(records)
     print("write to file {}".format(json_file))
-    with open(json_file, 'w') as f:
-        json.dump([ob.__dict__ for ob in items], f, sort_keys=True, indent=4)
+    count = 0
+    with open(json_file, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, sort_keys=True))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def _convert_log_item_task(task: Tuple) -> Tuple:
+    '''convert a log file in a worker process
+    Args:
+        task: config, log file path, info and sai obgject maps to feature
+    Return:
+        log file path, number of swss items, sai obgject maps to feature
+    '''
+    config, log_file, info, sai_obj_feature_map = task
+    features, sai_feature_file_map = load_sai_features(config['sai_path'])
+    count = convert_log_item(config, log_file, features,
+                             sai_feature_file_map, sai_obj_feature_map, info)
+    return log_file, count, sai_obj_feature_map
 
 
 def generate_json_logs(config: Dict,
@@ -313,20 +427,32 @@ def generate_json_logs(config: Dict,
         info: info of the one device log config
         sai_obj_feature_map: sai obgject maps to feature
     '''
-    file_list = get_files_from_path(config['sai_path'])
-    sai_feature_file_map = generate_sai_feature_file_map_from_header_files(
-        file_list)
-    features = generate_sai_feature_from_header_files(file_list)
+    # The log files may be compressed, skip the json files if they are
+    # generated in the log folder
     files = get_files_from_path_and_name_pattern(
-        info['log_path'], "sairedis.rec", ".gz")
+        info['log_path'], "sairedis.rec", ".json")
+    # Largest files first, so that they do not end up last in a worker
+    files.sort(key=getsize, reverse=True)
+    tasks = [(config, f, info, sai_obj_feature_map) for f in files]
+    # Load the headers before forking, the workers inherit the cache
+    load_sai_features(config['sai_path'])
+    workers = min(config.get('workers') or cpu_count() or 1, len(files))
     file_sum = len(files)
     count = 0
-    for f in files:
-        count += 1
-        print("Generate json from file {}, {}/{}".format(f, count, file_sum))
-        convert_log_item(config, f,
-                         features, sai_feature_file_map,
-                         sai_obj_feature_map, info)
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.imap_unordered(_convert_log_item_task, tasks)
+            for f, item_sum, obj_feature_map in results:
+                count += 1
+                sai_obj_feature_map.update(obj_feature_map)
+                print("Generated {} items from file {}, {}/{}".format(
+                    item_sum, f, count, file_sum))
+    else:
+        for task in tasks:
+            count += 1
+            print("Generate json from file {}, {}/{}".format(
+                task[1], count, file_sum))
+            _convert_log_item_task(task)
 
 
 def ingest_json_logs(json_log_path: str) -> None:
@@ -348,41 +474,6 @@ def ingest_json_logs(json_log_path: str) -> None:
         print("upload to kusto", e)
 
 
-class Swss_log_item:
-
-    def __init__(self, config: Dict, info: Dict,
-                 sai_obj: str, sai_object_key: str,
-                 log_file: str, line: str, features: List,
-                 sai_feature_file_map: Dict,
-                 sai_obj_feature_map: Dict,
-                 attribute=None):
-        self.log_file = log_file
-        self.log = line
-        self.sai_obj = sai_obj
-        self.sai_object_key = sai_object_key
-        self.log_time = get_log_time(line)
-        self.sai_feature = get_sai_feature_from_sai_obj(
-            self.sai_obj, features, sai_obj_feature_map)
-        self.header_file = get_sai_header_file_from_sai_obj(
-            self.sai_feature, sai_feature_file_map)
-        _, self.sai_op = get_sai_op(line, config['operation_map'])
-        self.sai_api = get_sai_api(self.sai_op, self.sai_obj)
-        self.sai_obj_attr_key = attribute[0] if attribute else None
-        self.sai_obj_attr_value = attribute[1] if attribute else None
-        self.device = info['device']
-        self.os_version = info['os_version']
-        self.deployment_type = info['deployment_type']
-        self.deployment_subtype = info['deployment_subtype']
-        self.ngsdevice_type = config['ngsdevice_type']
-
-    def dump_to_json(self):
-        '''
-        class item dumps to json
-        '''
-        return json.dumps(self, default=lambda o: o.__dict__,
-                          sort_keys=True, indent=4)
-
-
 if __name__ == "__main__":
     '''Before run this command, need to
     1. clone the sai repo to local disk and change sai_path
@@ -1,9 +1,11 @@
 """Tests for the JUnit XML parser."""
+import json
 import os
 import pytest
 
 from test_reporting.junit_xml_parser import validate_junit_xml_stream, validate_junit_xml_file
 from test_reporting.junit_xml_parser import validate_junit_xml_archive, parse_test_result, JUnitXMLValidationError
+from test_reporting.junit_xml_parser import parse_test_result_stream
 
 
 VALID_TEST_RESULT = """<?xml version="1.0" encoding="utf-8"?>
@@ -247,6 +249,65 @@ def test_xml_file_not_found():
         validate_junit_xml_file("nonexistent.xml")
 
 
+def _read_test_case_files(test_case_files):
+    test_cases = {}
+    for test_case_file in test_case_files:
+        with open(test_case_file) as f:
+            for line in f:
+                case = json.loads(line)
+                test_cases.setdefault(case.pop("feature"), []).append(case)
+    return test_cases
+
+
+@pytest.mark.parametrize("path", [VALID_TEST_RESULT_FILE, VALID_TEST_RESULT_ARCHIVE])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_json_output_from_stream(tmpdir, path, workers):
+    test_case_files = []
+    test_result_json = parse_test_result_stream(path, str(tmpdir), test_case_files.append, workers=workers)
+
+    if os.path.isfile(path):
+        expected = parse_test_result([validate_junit_xml_file(path)])
+    else:
+        expected = parse_test_result(validate_junit_xml_archive(path))
+    assert ordered(test_result_json["test_metadata"]) == ordered(expected["test_metadata"])
+    assert ordered(test_result_json["test_summary"]) == ordered(expected["test_summary"])
+    assert ordered(_read_test_case_files(test_case_files)) == ordered(expected["test_cases"])
+
+
+def test_json_output_from_stream_chunks(tmpdir):
+    test_case_files = []
+    parse_test_result_stream(VALID_TEST_RESULT_FILE, str(tmpdir), test_case_files.append,
+                             case_fields={"id": "guid"}, max_chunk_size=1)
+
+    assert len(test_case_files) == 4
+    test_cases = _read_test_case_files(test_case_files)
+    assert all(case["id"] == "guid" for cases in test_cases.values() for case in cases)
+    test_cases = {feature: [{k: v for k, v in case.items() if k != "id"} for case in cases]
+                  for feature, cases in test_cases.items()}
+    assert ordered(test_cases) == ordered(EXPECTED_JSON_OUTPUT["test_cases"])
+
+
+@pytest.mark.parametrize(
+    "token,replacement,message",
+    [
+        ("errors", "bunnies", ".* not found in .* element"),
+        ("classname", "hehe", ".* not found in test case .*"),
+        ("</", "<", "could not parse"),
+    ],
+)
+def test_invalid_junit_xml_stream(tmpdir, token, replacement, message):
+    document = tmpdir.join("test_invalid.xml")
+    document.write(VALID_TEST_RESULT.replace(token, replacement))
+    with pytest.raises(JUnitXMLValidationError, match=message):
+        parse_test_result_stream(str(document), str(tmpdir))
+    assert tmpdir.listdir() == [document]
+
+
+def test_xml_file_not_found_stream(tmpdir):
+    with pytest.raises(JUnitXMLValidationError, match="file not found"):
+        parse_test_result_stream("nonexistent.xml", str(tmpdir))
+
+
 # credit to: https://stackoverflow.com/questions/25851183/
 def ordered(obj):
     if isinstance(obj, dict):
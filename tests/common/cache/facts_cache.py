@@ -1,13 +1,18 @@
 
 
+import hashlib
 import inspect
 import logging
 import os
 import pickle
+import re
 import shutil
+import sqlite3
 import sys
+import time
 
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from functools import wraps
 from threading import Lock
 from six import with_metaclass
 
@@ -18,7 +23,12 @@ CURRENT_PATH = os.path.realpath(__file__)
 CACHE_LOCATION = os.path.join(CURRENT_PATH, '../../../_cache')
 
 SIZE_LIMIT = 1000000000  # 1G bytes, max disk usage allowed by cache
-ENTRY_LIMIT = 1000000    # Max number of pickle files allowed in cache.
+ENTRY_LIMIT = 1000000    # Max number of zone store files allowed in cache.
+MEMORY_ENTRY_LIMIT = 1024  # Max number of facts kept in memory, least recently used facts are dropped first.
+
+ZONE_STORE_SUFFIX = '.db'
+ZONE_STORE_SCHEMA_VERSION = '1'
+ZONE_STORE_TIMEOUT = 60  # Seconds to wait for a zone store locked by another process
 
 
 class Singleton(type):
@@ -39,27 +49,145 @@ class FactsCache(with_metaclass(Singleton, object)):
 
     Used singleton design pattern. Only a single instance of this class can be initialized.
 
+    Facts of a zone are stored in a single sqlite file <cache_location>/<zone>.db. The whole zone is loaded into
+    a bounded in-memory LRU on first access. Facts cached by older versions as <cache_location>/<zone>/<key>.pickle
+    are still read and moved into the zone store. The in-memory LRU is shared by the threads of the process, it is
+    only changed with its lock held.
+
     Args:
         with_metaclass ([function]): Python 2&3 compatible function from the six library for adding metaclass.
     """
 
     NOTEXIST = object()
 
-    def __init__(self, cache_location=CACHE_LOCATION):
+    def __init__(self, cache_location=CACHE_LOCATION, memory_entry_limit=MEMORY_ENTRY_LIMIT):
         self._cache_location = os.path.abspath(cache_location)
-        self._cache = defaultdict(dict)
+        self._cache = OrderedDict()
+        self._memory_entry_limit = memory_entry_limit
+        self._loaded_zones = set()
+        self._memory_lock = Lock()
         self._write_lock = Lock()
 
+    def _zone_store(self, zone):
+        return os.path.join(self._cache_location, zone + ZONE_STORE_SUFFIX)
+
+    def _legacy_facts_file(self, zone, key):
+        return os.path.join(self._cache_location, '{}/{}.pickle'.format(zone, key))
+
+    def _connect(self, zone, create=False):
+        """Open the store of a zone.
+
+        A new connection is opened for each operation, so the cache can be used from forked processes.
+
+        Returns:
+            sqlite3.Connection: Connection to the zone store, None if the store doesn't exist and create is False.
+        """
+        store = self._zone_store(zone)
+        if not create and not os.path.exists(store):
+            return None
+        if not os.path.exists(self._cache_location):
+            logger.info('Create cache dir {}'.format(self._cache_location))
+            os.makedirs(self._cache_location)
+
+        conn = sqlite3.connect(store, timeout=ZONE_STORE_TIMEOUT)
+        conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+        conn.execute('CREATE TABLE IF NOT EXISTS facts (key TEXT PRIMARY KEY, value BLOB, updated REAL)')
+        row = conn.execute("SELECT value FROM meta WHERE name = 'schema'").fetchone()
+        if row is None or row[0] != ZONE_STORE_SCHEMA_VERSION:
+            if row is not None:
+                logger.info('Zone store "{}" has schema version {}, recreate it'.format(store, row[0]))
+            with conn:
+                conn.execute('DELETE FROM facts')
+                conn.execute('DELETE FROM meta')
+                conn.execute("INSERT INTO meta VALUES ('schema', ?)", (ZONE_STORE_SCHEMA_VERSION,))
+        return conn
+
+    def _remember(self, zone, key, value):
+        with self._memory_lock:
+            self._cache.pop((zone, key), None)
+            self._cache[(zone, key)] = value
+            while len(self._cache) > self._memory_entry_limit:
+                self._cache.popitem(last=False)
+
+    def _recall(self, zone, key):
+        """Returns the facts kept in memory and marks them as the most recently used, NOTEXIST if not in memory."""
+        with self._memory_lock:
+            value = self._cache.pop((zone, key), self.NOTEXIST)
+            if value is not self.NOTEXIST:
+                self._cache[(zone, key)] = value
+            return value
+
+    def _forget(self, zone, key=None):
+        with self._memory_lock:
+            self._loaded_zones.discard(zone)
+            for cached_zone, cached_key in list(self._cache.keys()):
+                if cached_zone == zone and (key is None or cached_key == key):
+                    del self._cache[(cached_zone, cached_key)]
+
+    def _load_zone(self, zone):
+        """Load all the facts of a zone from its store into memory."""
+        self._loaded_zones.add(zone)
+        conn = None
+        try:
+            conn = self._connect(zone)
+            if conn is None:
+                return
+            for key, value in conn.execute('SELECT key, value FROM facts'):
+                self._remember(zone, key, pickle.loads(value))
+            logger.debug('Loaded cached facts of zone "{}" from {}'.format(zone, self._zone_store(zone)))
+        except (sqlite3.Error, pickle.UnpicklingError, ValueError, EOFError) as e:
+            logger.info('Load zone store "{}" failed with exception: {}'.format(self._zone_store(zone), repr(e)))
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _read_store(self, zone, key):
+        conn = None
+        try:
+            conn = self._connect(zone)
+            if conn is None:
+                return self.NOTEXIST
+            row = conn.execute('SELECT value FROM facts WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return self.NOTEXIST
+            return pickle.loads(row[0])
+        except (sqlite3.Error, pickle.UnpicklingError, ValueError, EOFError) as e:
+            logger.info('Read "{}.{}" from zone store failed with exception: {}'.format(zone, key, repr(e)))
+            return self.NOTEXIST
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _read_legacy(self, zone, key):
+        facts_file = self._legacy_facts_file(zone, key)
+        if not os.path.exists(facts_file):
+            return self.NOTEXIST
+        try:
+            with open(facts_file, 'rb') as f:
+                value = pickle.load(f)
+        except (IOError, ValueError, EOFError, pickle.UnpicklingError) as e:
+            logger.info('Load cache file "{}" failed with exception: {}'
+                        .format(os.path.abspath(facts_file), repr(e)))
+            return self.NOTEXIST
+
+        logger.debug('Loaded cached facts "{}.{}" from {}, moving it to zone store'.format(zone, key, facts_file))
+        if self.write(zone, key, value):
+            try:
+                os.remove(facts_file)
+            except OSError:
+                pass
+        return value
+
     def _check_usage(self):
         """Check cache usage, raise exception if usage exceeds the limitations.
         """
         total_size = 0
         total_entries = 0
-        for root, _, files in os.walk(self._cache_location):
-            for f in files:
-                fp = os.path.join(root, f)
-                total_size += os.path.getsize(fp)
-                total_entries += 1
+        if os.path.exists(self._cache_location):
+            for entry in os.listdir(self._cache_location):
+                if entry.endswith(ZONE_STORE_SUFFIX):
+                    total_size += os.path.getsize(os.path.join(self._cache_location, entry))
+                    total_entries += 1
 
         if total_size > SIZE_LIMIT or total_entries > ENTRY_LIMIT:
             msg = 'Cache usage exceeds limitations. total_size={}, SIZE_LIMIT={}, total_entries={}, ENTRY_LIMIT={}' \
@@ -77,21 +205,21 @@ class FactsCache(with_metaclass(Singleton, object)):
         Returns:
             obj: Cached object, usually a dictionary.
         """
-        # Lazy load
-        if zone in self._cache and key in self._cache[zone]:
+        if zone not in self._loaded_zones:
+            self._load_zone(zone)
+
+        value = self._recall(zone, key)
+        if value is not self.NOTEXIST:
             logger.debug('Read cached facts "{}.{}"'.format(zone, key))
-            return self._cache[zone][key]
-        else:
-            facts_file = os.path.join(self._cache_location, '{}/{}.pickle'.format(zone, key))
-            try:
-                with open(facts_file, 'rb') as f:
-                    self._cache[zone][key] = pickle.load(f)
-                    logger.debug('Loaded cached facts "{}.{}" from {}'.format(zone, key, facts_file))
-                    return self._cache[zone][key]
-            except (IOError, ValueError) as e:
-                logger.info('Load cache file "{}" failed with exception: {}'
-                            .format(os.path.abspath(facts_file), repr(e)))
-                return self.NOTEXIST
+            return value
+
+        # Not in memory, either dropped from the LRU or cached by another process
+        value = self._read_store(zone, key)
+        if value is self.NOTEXIST:
+            return self._read_legacy(zone, key)
+
+        self._remember(zone, key, value)
+        return value
 
     def write(self, zone, key, value):
         """Store facts to cache.
@@ -107,21 +235,84 @@ class FactsCache(with_metaclass(Singleton, object)):
         """
         with self._write_lock:
             self._check_usage()
-            facts_file = os.path.join(self._cache_location, '{}/{}.pickle'.format(zone, key))
+            conn = None
             try:
-                cache_subfolder = os.path.join(self._cache_location, zone)
-                if not os.path.exists(cache_subfolder):
-                    logger.info('Create cache dir {}'.format(cache_subfolder))
-                    os.makedirs(cache_subfolder)
-
-                with open(facts_file, 'wb') as f:
-                    pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
-                    self._cache[zone][key] = value
-                    logger.info('Cached facts "{}.{}" to {}'.format(zone, key, facts_file))
-                    return True
-            except (IOError, ValueError) as e:
-                logger.error('Dump cache file "{}" failed with exception: {}'.format(facts_file, repr(e)))
+                data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+                conn = self._connect(zone, create=True)
+                with conn:
+                    conn.execute('INSERT OR REPLACE INTO facts VALUES (?, ?, ?)',
+                                 (key, sqlite3.Binary(data), time.time()))
+                self._remember(zone, key, value)
+                logger.info('Cached facts "{}.{}" to {}'.format(zone, key, self._zone_store(zone)))
+                return True
+            except (sqlite3.Error, IOError, OSError, ValueError, pickle.PicklingError) as e:
+                logger.error('Dump "{}.{}" to zone store failed with exception: {}'.format(zone, key, repr(e)))
                 return False
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def validate(self, zone, content):
+        """Drop cached facts of a zone if they were cached for different content.
+
+        A hash of the content, for example the OS version running on a DUT, is kept in the zone store.
+        When the hash changes, for example after a new image is installed, all the facts cached in the zone
+        are invalidated. The zones of the namespaces of the zone, "<zone>-asic<N>" with the default zone
+        getter, are dropped too since their facts depend on the same content.
+
+        Args:
+            zone (str): Zone name.
+            content (str): Content the cached facts of the zone depend on.
+
+        Returns:
+            boolean: True if the cached facts are still valid, False if they were dropped.
+        """
+        fingerprint = hashlib.sha1(str(content).encode('utf-8')).hexdigest()
+        row = None
+        with self._write_lock:
+            conn = None
+            try:
+                conn = self._connect(zone, create=True)
+                row = conn.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+                if row is not None and row[0] == fingerprint:
+                    return True
+                with conn:
+                    if row is not None:
+                        logger.info('Content of zone "{}" changed, drop its cached facts'.format(zone))
+                        conn.execute('DELETE FROM facts')
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+            except sqlite3.Error as e:
+                logger.error('Validate zone store "{}" failed with exception: {}'.format(zone, repr(e)))
+            finally:
+                if conn is not None:
+                    conn.close()
+        if row is None or row[0] != fingerprint:
+            # Facts of the namespaces cached before the zone was validated are not known to be valid either
+            for subzone in self._subzones(zone):
+                logger.info('Content of zone "{}" changed, drop the cached facts of zone "{}"'.format(zone, subzone))
+                self.cleanup(subzone)
+        if row is not None:
+            self._forget(zone)
+            return False
+        return True
+
+    def _subzones(self, zone):
+        """Returns the zones of the namespaces of a zone, "<zone>-asic<N>", having a store or legacy cached facts.
+
+        Zones of other hosts sharing the prefix of the zone, like "<zone>-2", are not included.
+        """
+        subzone_pattern = re.compile(re.escape(zone) + r'-asic\d+$')
+        with self._memory_lock:
+            subzones = set(cached_zone for cached_zone, _ in self._cache.keys() if subzone_pattern.match(cached_zone))
+        if os.path.exists(self._cache_location):
+            for entry in os.listdir(self._cache_location):
+                if entry.endswith(ZONE_STORE_SUFFIX):
+                    entry = entry[:-len(ZONE_STORE_SUFFIX)]
+                elif not os.path.isdir(os.path.join(self._cache_location, entry)):
+                    continue
+                if subzone_pattern.match(entry):
+                    subzones.add(entry)
+        return sorted(subzones)
 
     def cleanup(self, zone=None, key=None):
         """Cleanup cached files.
@@ -134,27 +325,35 @@ class FactsCache(with_metaclass(Singleton, object)):
         """
         if zone:
             if key:
-                if zone in self._cache and key in self._cache[zone]:
-                    del self._cache[zone][key]
-                    logger.debug('Removed "{}.{}" from cache.'.format(zone, key))
+                self._forget(zone, key)
+                logger.debug('Removed "{}.{}" from cache.'.format(zone, key))
+                conn = None
                 try:
-                    cache_file = os.path.join(self._cache_location, zone, '{}.pickle'.format(key))
-                    os.remove(cache_file)
-                    logger.debug('Removed cache file "{}.pickle"'.format(cache_file))
-                except OSError as e:
-                    logger.error('Cleanup cache {}.{}.pickle failed with exception: {}'.format(zone, key, repr(e)))
+                    conn = self._connect(zone)
+                    if conn is not None:
+                        with conn:
+                            conn.execute('DELETE FROM facts WHERE key = ?', (key,))
+                    if os.path.exists(self._legacy_facts_file(zone, key)):
+                        os.remove(self._legacy_facts_file(zone, key))
+                    logger.debug('Removed cached facts "{}.{}"'.format(zone, key))
+                except (sqlite3.Error, OSError) as e:
+                    logger.error('Cleanup cache {}.{} failed with exception: {}'.format(zone, key, repr(e)))
             else:
-                if zone in self._cache:
-                    del self._cache[zone]
-                    logger.debug('Removed zone "{}" from cache'.format(zone))
+                self._forget(zone)
+                logger.debug('Removed zone "{}" from cache'.format(zone))
                 try:
+                    if os.path.exists(self._zone_store(zone)):
+                        os.remove(self._zone_store(zone))
                     cache_subfolder = os.path.join(self._cache_location, zone)
-                    shutil.rmtree(cache_subfolder)
-                    logger.debug('Removed cache subfolder "{}"'.format(cache_subfolder))
+                    if os.path.exists(cache_subfolder):
+                        shutil.rmtree(cache_subfolder)
+                    logger.debug('Removed cache of zone "{}"'.format(zone))
                 except OSError as e:
-                    logger.error('Remove cache subfolder "{}" failed with exception: {}'.format(zone, repr(e)))
+                    logger.error('Remove cache of zone "{}" failed with exception: {}'.format(zone, repr(e)))
         else:
-            self._cache = defaultdict(dict)
+            with self._memory_lock:
+                self._cache = OrderedDict()
+                self._loaded_zones = set()
             try:
                 shutil.rmtree(self._cache_location)
                 logger.debug('Removed all cache files under "{}"'.format(self._cache_location))
@@ -163,6 +362,9 @@ class FactsCache(with_metaclass(Singleton, object)):
                              .format(self._cache_location, repr(e)))
 
 
+_cache_stats = defaultdict(lambda: {'hits': 0, 'misses': 0, 'read_time': 0.0, 'gather_time': 0.0})
+
+
 def _get_default_zone(function, func_args, func_kargs):
     """
         Default zone getter used for decorator cached.
@@ -195,8 +397,8 @@ def _get_default_zone(function, func_args, func_kargs):
 def cached(name, zone_getter=None, after_read=None, before_write=None):
     """Decorator for enabling cache for facts.
 
-    The cached facts are to be stored by <name>.pickle. Because the cached pickle files must be stored under subfolder
-    specified by zone, the decorate have an option to passed a zone getter function used to get zone. The zone getter
+    The cached facts are to be stored under key <name>. Because the cached facts must be stored in the store of the
+    zone, the decorate have an option to passed a zone getter function used to get zone. The zone getter
     function must have signature of '(function, func_args, func_kargs)' that 'function' is the decorated function,
     'func_args' and 'func_kargs' are the parameters passed to the decorated function at runtime.
     The zone getter function should raise an error if it fails to return a string as zone.
@@ -210,32 +412,52 @@ def cached(name, zone_getter=None, after_read=None, before_write=None):
         after_read ([function]): Hook function used to process facts after read from cache.
         before_write ([function]): Hook function used to process facts before write into cache.
     Returns:
-        [function]: Decorator function.
+        [function]: Decorator function. Hit/miss counters and time spent of the decorated function are available
+            in its attribute `cache_stats`, see `get_cache_stats`.
     """
     cache = FactsCache()
+    stats = _cache_stats[name]
 
     def decorator(target):
+        @wraps(target)
         def wrapper(*args, **kargs):
             _zone_getter = zone_getter or _get_default_zone
             zone = _zone_getter(target, args, kargs)
 
+            start = time.time()
             cached_facts = cache.read(zone, name)
             if after_read:
                 cached_facts = after_read(cached_facts, target, args, kargs)
+            stats['read_time'] += time.time() - start
             if cached_facts is not FactsCache.NOTEXIST:
+                stats['hits'] += 1
                 return cached_facts
             else:
+                stats['misses'] += 1
+                start = time.time()
                 facts = target(*args, **kargs)
+                stats['gather_time'] += time.time() - start
                 if before_write:
                     _facts = before_write(facts, target, args, kargs)
                     cache.write(zone, name, _facts)
                 else:
                     cache.write(zone, name, facts)
                 return facts
+        wrapper.cache_stats = stats
         return wrapper
     return decorator
 
 
+def get_cache_stats():
+    """Get statistics of the facts cached by decorator `cached`.
+
+    Returns:
+        dict: Name of cached facts -> dict of 'hits', 'misses', 'read_time' (seconds spent reading the cache)
+            and 'gather_time' (seconds spent in the decorated function on cache misses).
+    """
+    return {name: dict(stats) for name, stats in _cache_stats.items()}
+
+
 if __name__ == '__main__':
     cache = FactsCache()
     if len(sys.argv) == 2:
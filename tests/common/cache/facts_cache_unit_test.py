@@ -0,0 +1,186 @@
+"""
+Unit tests of the zone stores of FactsCache, they need no testbed:
+
+    python3 -m pytest --noconftest tests/common/cache/facts_cache_unit_test.py
+"""
+import os
+import pickle
+import sqlite3
+import threading
+
+import pytest
+
+from tests.common.cache import facts_cache
+from tests.common.cache.facts_cache import FactsCache, ZONE_STORE_SUFFIX
+
+
+def new_cache(path, **kwargs):
+    # FactsCache is a singleton, bypass its metaclass to get a cache of the test folder
+    return type.__call__(FactsCache, str(path), **kwargs)
+
+
+class FakeDut(object):
+
+    def __init__(self, hostname):
+        self.hostname = hostname
+        self.calls = 0
+
+    def facts(self, namespace=None):
+        self.calls += 1
+        return {"namespace": namespace, "calls": self.calls}
+
+
+def test_write_read(tmp_path):
+    cache = new_cache(tmp_path)
+    assert cache.read("vlab-01", "basic_facts") is FactsCache.NOTEXIST
+    assert cache.write("vlab-01", "basic_facts", {"hwsku": "Force10-S6000"})
+    assert cache.read("vlab-01", "basic_facts") == {"hwsku": "Force10-S6000"}
+    assert os.path.exists(os.path.join(str(tmp_path), "vlab-01" + ZONE_STORE_SUFFIX))
+
+    # Facts written by another process are read from the store
+    other = new_cache(tmp_path)
+    assert other.read("vlab-01", "basic_facts") == {"hwsku": "Force10-S6000"}
+    other.write("vlab-01", "mg_facts", {"minigraph_hostname": "vlab-01"})
+    assert cache.read("vlab-01", "mg_facts") == {"minigraph_hostname": "vlab-01"}
+
+
+def test_memory_lru(tmp_path):
+    cache = new_cache(tmp_path, memory_entry_limit=2)
+    for index in range(4):
+        cache.write("vlab-01", "facts{}".format(index), index)
+    assert list(cache._cache.keys()) == [("vlab-01", "facts2"), ("vlab-01", "facts3")]
+    # Facts dropped from memory are still in the store
+    assert cache.read("vlab-01", "facts0") == 0
+    assert list(cache._cache.keys()) == [("vlab-01", "facts3"), ("vlab-01", "facts0")]
+
+
+def test_memory_lru_threads(tmp_path):
+    cache = new_cache(tmp_path, memory_entry_limit=8)
+    for index in range(32):
+        cache.write("vlab-01", "facts{}".format(index), index)
+    errors = []
+
+    def read(offset):
+        try:
+            for index in range(500):
+                key = (index * 7 + offset) % 32
+                assert cache.read("vlab-01", "facts{}".format(key)) == key
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read, args=(offset,)) for offset in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert len(cache._cache) == 8
+
+
+def test_legacy_pickle_migrated(tmp_path):
+    os.makedirs(os.path.join(str(tmp_path), "vlab-01"))
+    legacy_file = os.path.join(str(tmp_path), "vlab-01", "basic_facts.pickle")
+    with open(legacy_file, "wb") as f:
+        pickle.dump({"hwsku": "Force10-S6000"}, f)
+
+    cache = new_cache(tmp_path)
+    assert cache.read("vlab-01", "basic_facts") == {"hwsku": "Force10-S6000"}
+    assert not os.path.exists(legacy_file)
+    assert new_cache(tmp_path).read("vlab-01", "basic_facts") == {"hwsku": "Force10-S6000"}
+
+
+def test_schema_change(tmp_path, monkeypatch):
+    new_cache(tmp_path).write("vlab-01", "basic_facts", {"hwsku": "Force10-S6000"})
+    monkeypatch.setattr(facts_cache, "ZONE_STORE_SCHEMA_VERSION", "0")
+    assert new_cache(tmp_path).read("vlab-01", "basic_facts") is FactsCache.NOTEXIST
+
+
+def test_validate(tmp_path):
+    cache = new_cache(tmp_path)
+    assert cache.validate("vlab-01", "20220531.01")
+    cache.write("vlab-01", "basic_facts", {"os_version": "20220531.01"})
+    cache.write("vlab-01-asic0", "config_facts", {"asic": 0})
+    cache.write("vlab-01-asic1", "config_facts", {"asic": 1})
+    cache.write("vlab-011", "basic_facts", {"os_version": "20220531.01"})
+
+    assert cache.validate("vlab-01", "20220531.01")
+    assert new_cache(tmp_path).read("vlab-01-asic0", "config_facts") == {"asic": 0}
+
+    # A new image drops the facts of the host and of its namespaces
+    assert not cache.validate("vlab-01", "20230531.01")
+    for zone in ("vlab-01", "vlab-01-asic0", "vlab-01-asic1"):
+        for reader in (cache, new_cache(tmp_path)):
+            assert reader.read(zone, "basic_facts") is FactsCache.NOTEXIST
+            assert reader.read(zone, "config_facts") is FactsCache.NOTEXIST
+    assert cache.read("vlab-011", "basic_facts") == {"os_version": "20220531.01"}
+
+
+def test_validate_hosts_sharing_prefix(tmp_path):
+    cache = new_cache(tmp_path)
+    cache.validate("str-dut", "20220531.01")
+    cache.write("str-dut", "basic_facts", {"os_version": "20220531.01"})
+    cache.write("str-dut-asic0", "config_facts", {"asic": 0})
+    cache.write("str-dut-2", "basic_facts", {"os_version": "20220531.01"})
+    cache.write("str-dut-2-asic0", "config_facts", {"asic": 0})
+
+    # Other DUTs whose hostname starts with the hostname of the DUT are not namespaces of it
+    assert cache._subzones("str-dut") == ["str-dut-asic0"]
+    assert not cache.validate("str-dut", "20230531.01")
+    assert cache.read("str-dut-asic0", "config_facts") is FactsCache.NOTEXIST
+    for reader in (cache, new_cache(tmp_path)):
+        assert reader.read("str-dut-2", "basic_facts") == {"os_version": "20220531.01"}
+        assert reader.read("str-dut-2-asic0", "config_facts") == {"asic": 0}
+
+
+def test_validate_unvalidated_namespaces(tmp_path):
+    cache = new_cache(tmp_path)
+    cache.write("vlab-01-asic0", "config_facts", {"asic": 0})
+    assert cache.validate("vlab-01", "20220531.01")
+    assert cache.read("vlab-01-asic0", "config_facts") is FactsCache.NOTEXIST
+
+
+def test_cleanup(tmp_path):
+    cache = new_cache(tmp_path)
+    cache.write("vlab-01", "basic_facts", 1)
+    cache.write("vlab-01", "mg_facts", 2)
+    cache.write("vlab-02", "basic_facts", 3)
+
+    cache.cleanup("vlab-01", "basic_facts")
+    assert cache.read("vlab-01", "basic_facts") is FactsCache.NOTEXIST
+    assert cache.read("vlab-01", "mg_facts") == 2
+    cache.cleanup("vlab-01")
+    assert not os.path.exists(os.path.join(str(tmp_path), "vlab-01" + ZONE_STORE_SUFFIX))
+    assert cache.read("vlab-01", "mg_facts") is FactsCache.NOTEXIST
+    cache.cleanup()
+    assert not os.path.exists(str(tmp_path))
+    assert cache.read("vlab-02", "basic_facts") is FactsCache.NOTEXIST
+
+
+def test_corrupted_store(tmp_path):
+    with open(os.path.join(str(tmp_path), "vlab-01" + ZONE_STORE_SUFFIX), "wb") as f:
+        f.write(b"not a sqlite file" * 100)
+    cache = new_cache(tmp_path)
+    assert cache.read("vlab-01", "basic_facts") is FactsCache.NOTEXIST
+    assert not cache.write("vlab-01", "basic_facts", 1)
+    with pytest.raises(sqlite3.DatabaseError):
+        sqlite3.connect(os.path.join(str(tmp_path), "vlab-01" + ZONE_STORE_SUFFIX)).execute("SELECT * FROM facts")
+
+
+def test_cached_decorator(tmp_path, monkeypatch):
+    cache = new_cache(tmp_path)
+    monkeypatch.setitem(facts_cache.Singleton._instances, FactsCache, cache)
+
+    class Dut(FakeDut):
+
+        @facts_cache.cached(name="unit_test_facts")
+        def facts(self, namespace=None):
+            return super(Dut, self).facts(namespace)
+
+    dut = Dut("vlab-01")
+    assert dut.facts() == {"namespace": None, "calls": 1}
+    assert dut.facts() == {"namespace": None, "calls": 1}
+    assert dut.facts("asic0") == {"namespace": "asic0", "calls": 2}
+    assert dut.facts("asic0") == {"namespace": "asic0", "calls": 2}
+    assert cache.read("vlab-01-asic0", "unit_test_facts") == {"namespace": "asic0", "calls": 2}
+    stats = facts_cache.get_cache_stats()["unit_test_facts"]
+    assert stats["hits"] == 2 and stats["misses"] == 2
@@ -1,9 +1,13 @@
+import ast
 import inspect
 import json
 import logging
+import time
 
+import jinja2
 from multiprocessing.pool import ThreadPool
 
+from tests.common.devices import persistent_ssh
 from tests.common.errors import RunAnsibleModuleFail
 
 logger = logging.getLogger(__name__)
@@ -38,6 +42,18 @@ class AnsibleHostBase(object):
                 return obj.decode('utf-8')
             return super().default(obj)
 
+    # Run the shell and command modules on a persistent SSH connection instead of Ansible, see persistent_ssh.
+    # Enabled by the --ssh_fast_path option.
+    ssh_fast_path = False
+    # Module arguments supported by the fast path, the calls with other arguments go through Ansible
+    SSH_FAST_PATH_MODULES = {
+        'shell': ('chdir', 'executable'),
+        'command': ('chdir', )
+    }
+    # Arguments of persistent_ssh.get_ssh_session for the host, the sessions are not shared with forked children
+    _ssh_session_args = None
+    _ssh_fast_path_disabled = False
+
     def __init__(self, ansible_adhoc, hostname, *args, **kwargs):
         if hostname == 'localhost':
             self.host = ansible_adhoc(connection='local', host_pattern=hostname)[hostname]
@@ -60,6 +76,78 @@ class AnsibleHostBase(object):
             "'%s' object has no attribute '%s'" % (self.__class__, module_name)
             )
 
+    def _get_ssh_session(self):
+        """
+        Returns the persistent SSH session of the host, None when the host is not reached over SSH.
+        """
+        if self._ssh_fast_path_disabled:
+            return None
+        if self._ssh_session_args is None:
+            self._ssh_session_args = self._get_ssh_session_args()
+            if self._ssh_session_args is None:
+                self._ssh_fast_path_disabled = True
+                return None
+        return persistent_ssh.get_ssh_session(*self._ssh_session_args)
+
+    def _get_ssh_session_args(self):
+        """
+        Returns the (ip, port, user, passwords) of the SSH connection to the host from its variables, None when the
+        host is not reached over SSH.
+        """
+        im = self.host.options['inventory_manager']
+        vm = self.host.options['variable_manager']
+        hostvars = vm.get_vars(host=im.get_host(self.hostname))
+
+        def render(value):
+            if not isinstance(value, str):
+                return value
+            return jinja2.Template(value).render(**hostvars)
+
+        connection = hostvars.get('ansible_connection', 'ssh')
+        user = render(hostvars.get('ansible_ssh_user', hostvars.get('ansible_user')))
+        if self.hostname == 'localhost' or connection in ('local', 'network_cli', 'httpapi', 'netconf') or not user:
+            return None
+        altpasswords = hostvars.get('ansible_altpasswords', [])
+        if isinstance(altpasswords, str):
+            # A template of a list is rendered to the representation of the list
+            try:
+                altpasswords = ast.literal_eval(render(altpasswords))
+            except (ValueError, SyntaxError):
+                pass
+        if not isinstance(altpasswords, list):
+            logger.warning("[{}] ansible_altpasswords is not a list, ignored".format(self.hostname))
+            altpasswords = []
+        passwords = [render(hostvars.get('ansible_ssh_pass', hostvars.get('ansible_password')))]
+        passwords += [render(p) for p in altpasswords]
+        passwords.append(render(hostvars.get('ansible_altpassword')))
+        passwords = [p for p in passwords if p]
+        port = int(render(hostvars.get('ansible_port', hostvars.get('ansible_ssh_port', 22))))
+        return self.mgmt_ip, port, user, passwords
+
+    def _run_ssh(self, module_args, complex_args):
+        """
+        Run the shell or command module on the persistent SSH session.
+
+        Returns:
+            The module result, None when the fast path cannot run the module and it has to go through Ansible.
+        """
+        supported_args = self.SSH_FAST_PATH_MODULES.get(self.module_name)
+        if supported_args is None or any(arg not in supported_args for arg in complex_args) or not module_args:
+            return None
+        try:
+            session = self._get_ssh_session()
+        except Exception as e:
+            logger.warning("[{}] SSH fast path disabled, host variables not usable: {}".format(self.hostname, repr(e)))
+            self._ssh_fast_path_disabled = True
+            return None
+        if session is None:
+            return None
+        try:
+            return persistent_ssh.run_module(session, self.module_name, module_args, complex_args)
+        except persistent_ssh.SshSessionUnavailable as e:
+            logger.warning("[{}] SSH fast path unavailable, falling back to Ansible: {}".format(self.hostname, e))
+            return None
+
     def _run(self, *module_args, **complex_args):
 
         previous_frame = inspect.currentframe().f_back
@@ -102,7 +190,14 @@ class AnsibleHostBase(object):
 
         module_args = json.loads(json.dumps(module_args, cls=AnsibleHostBase.CustomEncoder))
         complex_args = json.loads(json.dumps(complex_args, cls=AnsibleHostBase.CustomEncoder))
-        res = self.module(*module_args, **complex_args)[self.hostname]
+        start_time = time.time()
+        res = self._run_ssh(module_args, complex_args) if self.ssh_fast_path else None
+        path = "ssh"
+        if res is None:
+            # The latency of Ansible is recorded with the fast path off too, as the baseline of the ssh path
+            path = "ansible"
+            res = self.module(*module_args, **complex_args)[self.hostname]
+        persistent_ssh.record_latency(self.hostname, self.module_name, path, (time.time() - start_time) * 1000)
 
         if verbose:
             logger.debug(
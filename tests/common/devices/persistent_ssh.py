@@ -0,0 +1,321 @@
+"""
+Persistent SSH sessions for running shell and command modules without Ansible.
+
+Running a `shell` or `command` module through Ansible costs a module upload, a python start on the host and
+several JSON round trips for every call. When the fast path is enabled, AnsibleHostBase keeps one SSH connection
+per host open and runs each command on a new channel of it, so concurrent calls from several threads are
+multiplexed over the same connection. The result has the same shape as the result of the Ansible modules.
+
+The sessions are kept per process: a child forked by parallel_run shares the socket of the parent connection but
+not the thread of paramiko reading it, so it opens its own connection instead.
+
+The latency of every call is recorded in a histogram per host, module and path (ansible or ssh), so the two paths
+can be compared with get_latency_histograms() or dump_latency_histograms().
+"""
+import datetime
+import logging
+import os
+import select
+import shlex
+import socket
+import threading
+import time
+
+import paramiko
+from pytest_ansible.results import ModuleResult
+from six.moves import shlex_quote
+
+logger = logging.getLogger(__name__)
+
+# Connections used by AnsibleHostBase, ssh_sessions[(pid, ip, port, user)] = PersistentSshSession
+ssh_sessions = {}
+ssh_sessions_lock = threading.Lock()
+
+# Upper bounds in milliseconds of the buckets of the latency histograms, the last bucket has no bound
+LATENCY_BUCKETS_MS = [5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000]
+
+latency_histograms = {}
+latency_histograms_lock = threading.Lock()
+
+
+class LatencyHistogram(object):
+    """
+    @summary: Histogram of the latency of the calls of one module on one host through one path.
+    """
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms):
+        index = 0
+        while index < len(LATENCY_BUCKETS_MS) and latency_ms > LATENCY_BUCKETS_MS[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def to_dict(self):
+        labels = ["<={}ms".format(bound) for bound in LATENCY_BUCKETS_MS]
+        labels.append(">{}ms".format(LATENCY_BUCKETS_MS[-1]))
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.buckets))
+        }
+
+
+def record_latency(hostname, module_name, path, latency_ms):
+    """
+    Record the latency of a module call.
+
+    Args:
+        hostname: Host the module ran on.
+        module_name: Name of the module.
+        path: "ansible" or "ssh".
+        latency_ms: Latency of the call in milliseconds.
+    """
+    with latency_histograms_lock:
+        key = (hostname, module_name, path)
+        if key not in latency_histograms:
+            latency_histograms[key] = LatencyHistogram()
+        latency_histograms[key].record(latency_ms)
+
+
+def get_latency_histograms():
+    """
+    Returns the latency histograms as {hostname: {module_name: {path: histogram dict}}}.
+    """
+    result = {}
+    with latency_histograms_lock:
+        for (hostname, module_name, path), histogram in latency_histograms.items():
+            result.setdefault(hostname, {}).setdefault(module_name, {})[path] = histogram.to_dict()
+    return result
+
+
+def dump_latency_histograms():
+    """
+    Log the latency histograms, one line per host, module and path.
+    """
+    for hostname, modules in sorted(get_latency_histograms().items()):
+        for module_name, paths in sorted(modules.items()):
+            for path, histogram in sorted(paths.items()):
+                logger.info("[{}] {} via {}: count={}, avg={}ms, max={}ms, buckets={}".format(
+                    hostname, module_name, path, histogram["count"], histogram["avg_ms"], histogram["max_ms"],
+                    histogram["buckets"]))
+
+
+class SshSessionUnavailable(Exception):
+    """
+    Raised when the command could not be sent to the host, it is safe to run it through Ansible instead.
+    """
+    pass
+
+
+class PersistentSshSession(object):
+    """
+    @summary: SSH connection to a host kept open to run commands, one channel per command.
+    """
+
+    RECV_SIZE = 65536
+    # Seconds to wait after a failed connection before connecting again, the commands go through Ansible meanwhile
+    RETRY_INTERVAL = 300
+    # Error of sudo -n when the user has no NOPASSWD rule, the become password is only given to Ansible
+    SUDO_PASSWORD_REQUIRED = b"sudo: a password is required"
+
+    def __init__(self, ip, port, username, passwords, become=True, timeout=30):
+        """
+        Args:
+            ip: IP address of the host.
+            port: SSH port of the host.
+            username: User to log in as.
+            passwords: Candidate passwords, tried in order. Keys and the agent are used when empty.
+            become: Run the commands as root with sudo.
+            timeout: Timeout in seconds of the connection.
+        """
+        self.ip = ip
+        self.port = port
+        self.username = username
+        self.passwords = passwords
+        self.become = become and username != "root"
+        self.timeout = timeout
+        self.client = None
+        self.retry_time = 0
+        self.sudo_password_required = False
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        last_error = None
+        for password in self.passwords or [None]:
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            try:
+                client.connect(self.ip, port=self.port, username=self.username, password=password,
+                               allow_agent=password is None, look_for_keys=password is None,
+                               timeout=self.timeout)
+            except paramiko.AuthenticationException as e:
+                last_error = e
+                continue
+            transport = client.get_transport()
+            transport.set_keepalive(30)
+            # Small request and reply packets, do not wait for delayed ACKs
+            transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return client
+        raise last_error
+
+    def _transport(self):
+        with self.lock:
+            transport = self.client.get_transport() if self.client else None
+            if transport is None or not transport.is_active():
+                if time.time() < self.retry_time:
+                    raise SshSessionUnavailable("connection to {} failed recently".format(self.ip))
+                logger.debug("Opening persistent SSH connection to {}@{}:{}".format(self.username, self.ip, self.port))
+                try:
+                    self.client = self._connect()
+                except Exception:
+                    self.client = None
+                    self.retry_time = time.time() + self.RETRY_INTERVAL
+                    raise
+                transport = self.client.get_transport()
+            return transport
+
+    def close(self):
+        with self.lock:
+            if self.client:
+                self.client.close()
+                self.client = None
+
+    def exec_command(self, cmd):
+        """
+        Run a command with /bin/sh on a new channel of the connection.
+
+        Returns:
+            Tuple of (rc, stdout, stderr), stdout and stderr are bytes.
+
+        Raises:
+            SshSessionUnavailable: If the connection or the channel could not be opened, or if sudo needs a password.
+        """
+        if self.sudo_password_required:
+            raise SshSessionUnavailable("sudo on {} requires a password".format(self.ip))
+        if self.become:
+            cmd = "sudo -n -H /bin/sh -c {}".format(shlex_quote(cmd))
+        try:
+            channel = self._transport().open_session()
+        except SshSessionUnavailable:
+            raise
+        except Exception as e:
+            raise SshSessionUnavailable(repr(e))
+        try:
+            channel.exec_command(cmd)
+            stdout, stderr = [], []
+            while True:
+                if channel.recv_ready():
+                    stdout.append(channel.recv(self.RECV_SIZE))
+                elif channel.recv_stderr_ready():
+                    stderr.append(channel.recv_stderr(self.RECV_SIZE))
+                elif channel.exit_status_ready():
+                    break
+                else:
+                    select.select([channel], [], [], 1)
+            # Drain what arrived between the last read and the exit status
+            while channel.recv_ready():
+                stdout.append(channel.recv(self.RECV_SIZE))
+            while channel.recv_stderr_ready():
+                stderr.append(channel.recv_stderr(self.RECV_SIZE))
+            rc, stdout, stderr = channel.recv_exit_status(), b"".join(stdout), b"".join(stderr)
+        finally:
+            channel.close()
+        if self.become and rc == 1 and not stdout and stderr.startswith(self.SUDO_PASSWORD_REQUIRED):
+            # The command did not run, Ansible runs it with the become password of the host
+            self.sudo_password_required = True
+            raise SshSessionUnavailable("sudo on {} requires a password".format(self.ip))
+        return rc, stdout, stderr
+
+
+def get_ssh_session(ip, port, username, passwords, become=True):
+    """
+    Returns the persistent SSH session for the host, shared by all the AnsibleHostBase objects of the host in the
+    current process.
+    """
+    with ssh_sessions_lock:
+        key = (os.getpid(), ip, port, username)
+        if key not in ssh_sessions:
+            ssh_sessions[key] = PersistentSshSession(ip, port, username, passwords, become=become)
+        return ssh_sessions[key]
+
+
+def close_ssh_sessions():
+    pid = os.getpid()
+    with ssh_sessions_lock:
+        for key, session in ssh_sessions.items():
+            # Closing a connection of the parent process would disconnect it
+            if key[0] == pid:
+                session.close()
+        ssh_sessions.clear()
+
+
+def _reset_after_fork():
+    """
+    Forget the sessions of the parent process in a forked child, without closing them.
+    """
+    global ssh_sessions_lock
+    ssh_sessions_lock = threading.Lock()
+    ssh_sessions.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def run_module(session, module_name, module_args, complex_args):
+    """
+    Run a shell or command module on the persistent SSH session.
+
+    Args:
+        session: PersistentSshSession of the host.
+        module_name: "shell" or "command".
+        module_args: Positional module arguments, the command.
+        complex_args: Keyword module arguments, only chdir and executable (shell) are supported.
+
+    Returns:
+        ModuleResult with the keys of the result of the Ansible module: cmd, stdout, stderr, rc, stdout_lines,
+        stderr_lines, start, end, delta, changed, failed and msg.
+    """
+    raw_cmd = " ".join(module_args)
+    if module_name == "shell":
+        cmd = raw_cmd
+        if "executable" in complex_args:
+            cmd = "{} -c {}".format(complex_args["executable"], shlex_quote(cmd))
+        result_cmd = raw_cmd
+    else:
+        # The command module does not use a shell, run the same argv without interpretation
+        argv = shlex.split(raw_cmd)
+        cmd = " ".join(shlex_quote(arg) for arg in argv)
+        result_cmd = argv
+    if "chdir" in complex_args:
+        cmd = "cd {} && {}".format(shlex_quote(complex_args["chdir"]), cmd)
+
+    start = datetime.datetime.now()
+    rc, stdout, stderr = session.exec_command(cmd)
+    end = datetime.datetime.now()
+
+    stdout = stdout.decode("utf-8", errors="replace").rstrip("\r\n")
+    stderr = stderr.decode("utf-8", errors="replace").rstrip("\r\n")
+    return ModuleResult({
+        "cmd": result_cmd,
+        "stdout": stdout,
+        "stderr": stderr,
+        "rc": rc,
+        "stdout_lines": stdout.splitlines(),
+        "stderr_lines": stderr.splitlines(),
+        "start": str(start),
+        "end": str(end),
+        "delta": str(end - start),
+        "changed": True,
+        "failed": rc != 0,
+        "msg": "non-zero return code" if rc != 0 else ""
+    })
@@ -0,0 +1,260 @@
+"""
+Unit tests of the SSH fast path of AnsibleHostBase, they need no testbed:
+
+    python3 -m pytest --noconftest tests/common/devices/persistent_ssh_unit_test.py
+"""
+import socket
+
+import pytest
+from pytest_ansible.results import ModuleResult
+
+from tests.common.devices import persistent_ssh
+from tests.common.devices.base import AnsibleHostBase
+
+HOSTNAME = "vlab-01"
+
+
+class FakeSession(object):
+
+    def __init__(self, rc=0, stdout=b"", stderr=b"", error=None):
+        self.result = (rc, stdout, stderr)
+        self.error = error
+        self.cmds = []
+
+    def exec_command(self, cmd):
+        self.cmds.append(cmd)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class FakeChannel(object):
+
+    def __init__(self, rc, stdout, stderr):
+        self.rc = rc
+        self.stdout = [stdout] if stdout else []
+        self.stderr = [stderr] if stderr else []
+        self.cmd = None
+
+    def exec_command(self, cmd):
+        self.cmd = cmd
+
+    def recv_ready(self):
+        return bool(self.stdout)
+
+    def recv(self, size):
+        return self.stdout.pop(0)
+
+    def recv_stderr_ready(self):
+        return bool(self.stderr)
+
+    def recv_stderr(self, size):
+        return self.stderr.pop(0)
+
+    def exit_status_ready(self):
+        return True
+
+    def recv_exit_status(self):
+        return self.rc
+
+    def close(self):
+        pass
+
+
+class FakeTransport(object):
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.channels = []
+
+    def open_session(self):
+        self.channels.append(FakeChannel(*self.results.pop(0)))
+        return self.channels[-1]
+
+
+class FakeModule(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *module_args, **complex_args):
+        self.calls.append((module_args, complex_args))
+        return {HOSTNAME: ModuleResult({"rc": 0, "stdout": "from ansible", "failed": False})}
+
+
+class FakeInventoryManager(object):
+
+    def get_host(self, hostname):
+        return hostname
+
+
+class FakeVariableManager(object):
+
+    def __init__(self, hostvars):
+        self.hostvars = hostvars
+
+    def get_vars(self, host):
+        return self.hostvars
+
+
+class FakeHost(object):
+
+    def __init__(self, hostvars):
+        self.modules = {"shell": FakeModule(), "command": FakeModule(), "copy": FakeModule()}
+        self.options = {"inventory_manager": FakeInventoryManager(), "variable_manager": FakeVariableManager(hostvars)}
+
+    def has_module(self, module_name):
+        return module_name in self.modules
+
+    def __getattr__(self, module_name):
+        return self.modules[module_name]
+
+
+@pytest.fixture
+def fake_dut(monkeypatch):
+    """
+    AnsibleHostBase of a host with fake Ansible modules, the latency histograms and the sessions are reset.
+    """
+    monkeypatch.setattr(AnsibleHostBase, "ssh_fast_path", True)
+    monkeypatch.setattr(persistent_ssh, "ssh_sessions", {})
+    monkeypatch.setattr(persistent_ssh, "latency_histograms", {})
+    dut = AnsibleHostBase.__new__(AnsibleHostBase)
+    dut.hostname = HOSTNAME
+    dut.mgmt_ip = "10.250.0.101"
+    dut.host = FakeHost({
+        "ansible_user": "admin",
+        "ansible_password": "{{ secret }}",
+        "ansible_altpasswords": "{{ alt_secrets }}",
+        "secret": "password",
+        "alt_secrets": ["password1", "password2"]
+    })
+    return dut
+
+
+def test_run_module_shell():
+    session = FakeSession(rc=0, stdout=b"line1\nline2\n", stderr=b"")
+    res = persistent_ssh.run_module(session, "shell", ["echo $HOSTNAME | wc -l"], {"chdir": "/tmp dir"})
+    assert session.cmds == ["cd '/tmp dir' && echo $HOSTNAME | wc -l"]
+    assert res["cmd"] == "echo $HOSTNAME | wc -l"
+    assert res["stdout"] == "line1\nline2"
+    assert res["stdout_lines"] == ["line1", "line2"]
+    assert res["stderr"] == "" and res["stderr_lines"] == []
+    assert res["rc"] == 0 and res["changed"] and not res.is_failed and res["msg"] == ""
+    assert set(res.keys()) == {"cmd", "stdout", "stderr", "rc", "stdout_lines", "stderr_lines", "start", "end",
+                               "delta", "changed", "failed", "msg"}
+
+
+def test_run_module_shell_executable():
+    session = FakeSession()
+    persistent_ssh.run_module(session, "shell", ["echo", "$0"], {"executable": "/bin/bash"})
+    assert session.cmds == ["/bin/bash -c 'echo $0'"]
+
+
+def test_run_module_command_failure():
+    session = FakeSession(rc=2, stdout=b"", stderr=b"ls: cannot access '/x y': No such file\r\n")
+    res = persistent_ssh.run_module(session, "command", ["ls '/x y' $HOME"], {})
+    # The arguments are not interpreted by a shell
+    assert session.cmds == ["ls '/x y' '$HOME'"]
+    assert res["cmd"] == ["ls", "/x y", "$HOME"]
+    assert res["stderr_lines"] == ["ls: cannot access '/x y': No such file"]
+    assert res["rc"] == 2 and res.is_failed and res["msg"] == "non-zero return code"
+
+
+def test_connect_failure_backoff(monkeypatch):
+    session = persistent_ssh.PersistentSshSession("10.250.0.101", 22, "admin", ["password"])
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        raise socket.timeout("timed out")
+
+    monkeypatch.setattr(session, "_connect", connect)
+    for _ in range(3):
+        with pytest.raises(persistent_ssh.SshSessionUnavailable):
+            session.exec_command("true")
+    assert len(attempts) == 1
+
+    # Connect again once the retry interval is over
+    session.retry_time = 0
+    with pytest.raises(persistent_ssh.SshSessionUnavailable):
+        session.exec_command("true")
+    assert len(attempts) == 2
+
+
+def test_sudo_password_required(monkeypatch):
+    session = persistent_ssh.PersistentSshSession("10.250.0.101", 22, "admin", ["password"])
+    transport = FakeTransport((0, b"root\n", b""), (1, b"", b"sudo: a password is required\n"))
+    monkeypatch.setattr(session, "_transport", lambda: transport)
+    assert session.exec_command("whoami") == (0, b"root\n", b"")
+    assert transport.channels[0].cmd == "sudo -n -H /bin/sh -c whoami"
+
+    # The command did not run, it goes through Ansible and so do the next ones
+    with pytest.raises(persistent_ssh.SshSessionUnavailable):
+        session.exec_command("whoami")
+    with pytest.raises(persistent_ssh.SshSessionUnavailable):
+        session.exec_command("whoami")
+    assert len(transport.channels) == 2
+
+
+def test_sessions_per_process(monkeypatch):
+    monkeypatch.setattr(persistent_ssh, "ssh_sessions", {})
+    session = persistent_ssh.get_ssh_session("10.250.0.101", 22, "admin", ["password"])
+    assert persistent_ssh.get_ssh_session("10.250.0.101", 22, "admin", ["password"]) is session
+
+    monkeypatch.setattr(persistent_ssh.os, "getpid", lambda: -1)
+    assert persistent_ssh.get_ssh_session("10.250.0.101", 22, "admin", ["password"]) is not session
+    persistent_ssh._reset_after_fork()
+    assert persistent_ssh.ssh_sessions == {}
+
+
+def test_fast_path(fake_dut, monkeypatch):
+    session = FakeSession(stdout=b"from ssh\n")
+    sessions = []
+
+    def get_ssh_session(ip, port, username, passwords, become=True):
+        sessions.append((ip, port, username, passwords))
+        return session
+
+    monkeypatch.setattr(persistent_ssh, "get_ssh_session", get_ssh_session)
+    assert fake_dut.shell("hostname", verbose=False)["stdout"] == "from ssh"
+    assert fake_dut.command("hostname", chdir="/", verbose=False)["stdout"] == "from ssh"
+    assert sessions[0] == ("10.250.0.101", 22, "admin", ["password", "password1", "password2"])
+    assert not fake_dut.host.modules["shell"].calls and not fake_dut.host.modules["command"].calls
+    assert persistent_ssh.get_latency_histograms()[HOSTNAME]["shell"]["ssh"]["count"] == 1
+
+
+def test_fallback_to_ansible(fake_dut, monkeypatch):
+    session = FakeSession(error=persistent_ssh.SshSessionUnavailable("connection refused"))
+    monkeypatch.setattr(persistent_ssh, "get_ssh_session", lambda *args: session)
+
+    # Unsupported module or arguments
+    assert fake_dut.shell("hostname", creates="/tmp/x", verbose=False)["stdout"] == "from ansible"
+    assert fake_dut.copy(content="x", dest="/tmp/x", verbose=False)["stdout"] == "from ansible"
+    assert not session.cmds
+    # Unavailable session
+    assert fake_dut.shell("hostname", verbose=False)["stdout"] == "from ansible"
+    assert session.cmds == ["hostname"]
+    assert len(fake_dut.host.modules["shell"].calls) == 2
+    assert persistent_ssh.get_latency_histograms()[HOSTNAME]["shell"]["ansible"]["count"] == 2
+
+
+def test_fast_path_not_usable(fake_dut, monkeypatch):
+    fake_dut.host.options["variable_manager"].hostvars["ansible_connection"] = "network_cli"
+    monkeypatch.setattr(persistent_ssh, "get_ssh_session", lambda *args: pytest.fail("no session expected"))
+    assert fake_dut.shell("show version", verbose=False)["stdout"] == "from ansible"
+    assert fake_dut._ssh_fast_path_disabled
+
+
+def test_altpasswords_not_a_list(fake_dut):
+    fake_dut.host.options["variable_manager"].hostvars["ansible_altpasswords"] = "{{ secret }}"
+    assert fake_dut._get_ssh_session_args() == ("10.250.0.101", 22, "admin", ["password"])
+
+
+def test_fast_path_off(fake_dut, monkeypatch):
+    monkeypatch.setattr(AnsibleHostBase, "ssh_fast_path", False)
+    monkeypatch.setattr(persistent_ssh, "get_ssh_session", lambda *args: pytest.fail("no session expected"))
+    assert fake_dut.shell("hostname", verbose=False)["stdout"] == "from ansible"
+    assert fake_dut.shell("hostname", verbose=False)["stdout"] == "from ansible"
+    # The latency of Ansible is the baseline of the fast path
+    histograms = persistent_ssh.get_latency_histograms()[HOSTNAME]["shell"]
+    assert list(histograms.keys()) == ["ansible"] and histograms["ansible"]["count"] == 2
@@ -18,10 +18,11 @@ from tests.common.devices.base import AnsibleHostBase
 from tests.common.devices.constants import ACL_COUNTERS_UPDATE_INTERVAL_IN_SEC
 from tests.common.helpers.dut_utils import is_supervisor_node, is_macsec_capable_node
 from tests.common.utilities import get_host_visible_vars
-from tests.common.cache import cached
+from tests.common.cache import cached, FactsCache
 from tests.common.helpers.constants import DEFAULT_ASIC_ID, DEFAULT_NAMESPACE
 from tests.common.helpers.platform_api.chassis import is_inband_port
 from tests.common.helpers.parallel import parallel_run_threaded
+from tests.common.helpers.show_table import ShowTable, parse_column_positions
 from tests.common.errors import RunAnsibleModuleFail
 from tests.common import constants
 
@@ -82,8 +83,10 @@ class SonicHost(AnsibleHostBase):
             }
             self.host.options['variable_manager'].extra_vars.update(evars)
 
-        self._facts = self._gather_facts()
         self._os_version = self._get_os_version()
+        # Facts cached for a different image are not valid anymore
+        FactsCache().validate(self.hostname, self._os_version)
+        self._facts = self._gather_facts()
         if 'router_type' in self.facts and self.facts['router_type'] == 'spinerouter':
             self.DEFAULT_ASIC_SERVICES.append("macsec")
         feature_status = self.get_feature_status()
@@ -518,9 +521,18 @@ class SonicHost(AnsibleHostBase):
         if exit_code != 0:
             return monit_services_status
 
-        for index, service_info in enumerate(services_status_result["stdout_lines"]):
+        return self.parse_monit_services_status(services_status_result["stdout_lines"])
+
+    def parse_monit_services_status(self, stdout_lines):
+        """
+        @summary: Parse the output of command "monit status"
+        @return: A dictionary in which key is the service name and values are service status
+                 and service type.
+        """
+        monit_services_status = {}
+        for index, service_info in enumerate(stdout_lines):
             if "status" in service_info and "monitoring status" not in service_info:
-                service_type_name = services_status_result["stdout_lines"][index - 1]
+                service_type_name = stdout_lines[index - 1]
                 service_type = service_type_name.split("'")[0].strip()
                 service_name = service_type_name.split("'")[1].strip()
                 service_status = service_info[service_info.find("status") + len("status"):].strip()
@@ -610,26 +622,32 @@ class SonicHost(AnsibleHostBase):
             if service not in service_results or service_results[service]['rc'] != 0:
                 continue
 
-            service_group_process = {'groups': [], 'processes': []}
-
-            file_content = service_results[service]['stdout_lines']
-            for line in file_content:
-                line_info = line.strip().split(':')
-                if len(line_info) != 2:
-                    if '201811' in self._os_version and len(line_info) == 1:
-                        process_name = line_info[0].strip()
-                        service_group_process['processes'].append(process_name)
-                else:
-                    group_or_process = line_info[0].strip()
-                    group_process_name = line_info[1].strip()
-                    if group_or_process == 'group' and group_process_name:
-                        service_group_process['groups'].append(group_process_name)
-                    elif group_or_process == 'program' and group_process_name:
-                        service_group_process['processes'].append(group_process_name)
-            group_process_results[service] = service_group_process
+            group_process_results[service] = self.parse_critical_group_process(
+                service_results[service]['stdout_lines'])
 
         return group_process_results
 
+    def parse_critical_group_process(self, file_content):
+        """
+        Parse the content of the /etc/supervisor/critical_processes file of a service
+        and get the critical groups and processes
+        """
+        service_group_process = {'groups': [], 'processes': []}
+        for line in file_content:
+            line_info = line.strip().split(':')
+            if len(line_info) != 2:
+                if '201811' in self._os_version and len(line_info) == 1:
+                    process_name = line_info[0].strip()
+                    service_group_process['processes'].append(process_name)
+            else:
+                group_or_process = line_info[0].strip()
+                group_process_name = line_info[1].strip()
+                if group_or_process == 'group' and group_process_name:
+                    service_group_process['groups'].append(group_process_name)
+                elif group_or_process == 'program' and group_process_name:
+                    service_group_process['processes'].append(group_process_name)
+        return service_group_process
+
     def critical_processes_running(self, service):
         """
         @summary: Check whether critical processes are running for a service
@@ -1542,61 +1560,16 @@ Totals               6450                 6449
             Returns a list. Each item is a tuple with two elements. The first element is start position of a column.
             The second element is the end position of the column.
         """
-        prev = ' ',
-        positions = []
-        for pos, char in enumerate(sep_line + ' '):
-            if char == sep_char:
-                if char != prev:
-                    left = pos
-            else:
-                if char != prev:
-                    right = pos
-                    positions.append((left, right))
-            prev = char
-        return positions
-
-    def _parse_show(self, output_lines, header_len=1):
-
-        result = []
-
-        sep_line_pattern = re.compile(r"^( *-+ *)+$")
-        sep_line_found = False
-        for idx, line in enumerate(output_lines):
-            if sep_line_pattern.match(line):
-                sep_line_found = True
-                header_lines = output_lines[idx-header_len:idx]
-                sep_line = output_lines[idx]
-                content_lines = output_lines[idx+1:]
-                break
+        return parse_column_positions(sep_line, sep_char)
 
-        if not sep_line_found:
+    def _parse_show_table(self, output_lines, header_len=1, numeric=False):
+        table = ShowTable.parse(output_lines, header_len=header_len, numeric=numeric)
+        if not table.headers:
             logging.error('Failed to find separation line in the show command output')
-            return result
-
-        try:
-            positions = self._parse_column_positions(sep_line)
-        except Exception as e:
-            logging.error('Possibly bad command output, exception: {}'.format(repr(e)))
-            return result
+        return table
 
-        headers = []
-        for (left, right) in positions:
-            header = " ".join([header_line[left:right].strip().lower() for header_line in header_lines]).strip()
-            headers.append(header)
-
-        for content_line in content_lines:
-            # When an empty line is encountered while parsing the tabulate content, it is highly possible that the
-            # tabulate content has been drained. The empty line and rest of the lines should not be parsed.
-            if len(content_line) == 0:
-                break
-            item = {}
-            for idx, (left, right) in enumerate(positions):
-                k = headers[idx]
-                v = content_line[left:right].strip()
-                item[k] = v
-            result.append(item)
-
-        return result
+    def _parse_show(self, output_lines, header_len=1):
+        return self._parse_show_table(output_lines, header_len).to_dicts()
 
     def show_and_parse(self, show_cmd, header_len=1, **kwargs):
         """Run a show command and parse the output using a generic pattern.
@@ -1668,14 +1641,37 @@ Totals               6450                 6449
             corresponding to one content line under the header in the output. Keys of the dictionary are the column
             headers in lowercase.
         """
+        return self._parse_show(self._show_output_lines(show_cmd, **kwargs), header_len)
+
+    def show_and_parse_table(self, show_cmd, header_len=1, numeric=False, **kwargs):
+        """Run a show command and parse the output into a column oriented table.
+
+        The output format is the same as the one expected by show_and_parse. Instead of a list of dictionaries,
+        a ShowTable is returned, which keeps the values by columns and builds row dictionaries on demand.
+        This is much cheaper for wide outputs, e.g. 'show interfaces counters' on systems with many ports.
+
+        For example:
+            table = duthost.show_and_parse_table("show interfaces counters", numeric=True)
+            rx_ok = dict(zip(table["iface"], table["rx_ok"]))   # {"Ethernet0": 12345, ...}
+
+        Args:
+            show_cmd: The show command that will be executed.
+            numeric: Convert comma formatted counters to numbers, 'N/A' to None. True to convert all the columns
+                whose values are all numbers, or a list of the lowercase headers of the columns to convert.
+
+        Returns:
+            Return a ShowTable instance. Column values are accessed by their lowercase headers, rows by
+            ShowTable.rows() and ShowTable.to_dicts().
+        """
+        return self._parse_show_table(self._show_output_lines(show_cmd, **kwargs), header_len, numeric)
+
+    def _show_output_lines(self, show_cmd, **kwargs):
         start_line_index = kwargs.pop("start_line_index", 0)
         end_line_index = kwargs.pop("end_line_index", None)
         output = self.shell(show_cmd, **kwargs)["stdout_lines"]
         if end_line_index is None:
-            output = output[start_line_index:]
-        else:
-            output = output[start_line_index:end_line_index]
-        return self._parse_show(output, header_len)
+            return output[start_line_index:]
+        return output[start_line_index:end_line_index]
 
     @cached(name='mg_facts')
     def get_extended_minigraph_facts(self, tbinfo, namespace=DEFAULT_NAMESPACE):
@@ -159,14 +159,16 @@ def verify_and_report(tor_IO, verify, delay, allowed_disruption, allow_disruptio
 def run_test(
     duthosts, activehost, ptfhost, ptfadapter, vmhost, action,
     tbinfo, tor_vlan_port, send_interval, traffic_direction,
-    stop_after, cable_type=CableType.active_standby     # noqa F811
+    stop_after, cable_type=CableType.active_standby,    # noqa F811
+    io_analysis_options=None
 ):
     io_ready = threading.Event()
 
     peerhost = get_peerhost(duthosts, activehost)
     tor_IO = DualTorIO(
         activehost, peerhost, ptfhost, ptfadapter, vmhost, tbinfo,
-        io_ready, tor_vlan_port=tor_vlan_port, send_interval=send_interval, cable_type=cable_type
+        io_ready, tor_vlan_port=tor_vlan_port, send_interval=send_interval, cable_type=cable_type,
+        **(io_analysis_options or {})
     )
     tor_IO.generate_traffic(traffic_direction)
 
@@ -211,6 +213,20 @@ def cleanup(ptfadapter, duthosts_list):
         duthost.shell('sonic-clear arp')
 
 
+@pytest.fixture
+def io_analysis_options(pytestconfig):
+    """
+    Options of the packet analysis of DualTorIO.
+
+    With --io_streaming_analysis, the PTF sniffer tracks the disruptions as the packets
+    are captured and only its summary is fetched, the pcap is written only with --io_keep_pcap.
+    """
+    return {
+        "streaming_analysis": pytestconfig.getoption("io_streaming_analysis", False),
+        "keep_pcap": pytestconfig.getoption("io_keep_pcap", False)
+    }
+
+
 @pytest.fixture
 def save_pcap(request, pytestconfig):
     """Save pcap file to the log directory."""
@@ -236,7 +252,8 @@ def save_pcap(request, pytestconfig):
 
 
 @pytest.fixture
-def send_t1_to_server_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap):       # noqa F811
+def send_t1_to_server_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap,      # noqa F811
+                                  io_analysis_options):
     """
     Starts IO test from T1 router to server.
     As part of IO test the background thread sends and sniffs packets.
@@ -286,7 +303,7 @@ def send_t1_to_server_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_t
         tor_IO = run_test(duthosts, activehost, ptfhost, ptfadapter, vmhost,
                           action, tbinfo, tor_vlan_port, send_interval,
                           traffic_direction="t1_to_server", stop_after=stop_after,
-                          cable_type=cable_type)
+                          cable_type=cable_type, io_analysis_options=io_analysis_options)
 
         # If a delay is allowed but no numebr of allowed disruptions
         # is specified, default to 1 allowed disruption
@@ -301,7 +318,8 @@ def send_t1_to_server_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_t
 
 
 @pytest.fixture
-def send_server_to_t1_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap):   # noqa F811
+def send_server_to_t1_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap,  # noqa F811
+                                  io_analysis_options):
     """
     Starts IO test from server to T1 router.
     As part of IO test the background thread sends and sniffs packets.
@@ -351,7 +369,7 @@ def send_server_to_t1_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_t
         tor_IO = run_test(duthosts, activehost, ptfhost, ptfadapter, vmhost,
                           action, tbinfo, tor_vlan_port, send_interval,
                           traffic_direction="server_to_t1", stop_after=stop_after,
-                          cable_type=cable_type)
+                          cable_type=cable_type, io_analysis_options=io_analysis_options)
 
         # If a delay is allowed but no numebr of allowed disruptions
         # is specified, default to 1 allowed disruption
@@ -366,7 +384,8 @@ def send_server_to_t1_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_t
 
 
 @pytest.fixture
-def send_soc_to_t1_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap):      # noqa F811
+def send_soc_to_t1_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap,     # noqa F811
+                               io_analysis_options):
 
     arp_setup(ptfhost)
 
@@ -377,7 +396,7 @@ def send_soc_to_t1_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type
         tor_IO = run_test(duthosts, activehost, ptfhost, ptfadapter, vmhost,
                           action, tbinfo, tor_vlan_port, send_interval,
                           traffic_direction="soc_to_t1", stop_after=stop_after,
-                          cable_type=cable_type)
+                          cable_type=cable_type, io_analysis_options=io_analysis_options)
 
         if delay and not allowed_disruption:
             allowed_disruption = 1
@@ -390,7 +409,8 @@ def send_soc_to_t1_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type
 
 
 @pytest.fixture
-def send_t1_to_soc_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap):      # noqa F811
+def send_t1_to_soc_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap,     # noqa F811
+                               io_analysis_options):
 
     arp_setup(ptfhost)
 
@@ -401,7 +421,7 @@ def send_t1_to_soc_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type
         tor_IO = run_test(duthosts, activehost, ptfhost, ptfadapter, vmhost,
                           action, tbinfo, tor_vlan_port, send_interval,
                           traffic_direction="t1_to_soc", stop_after=stop_after,
-                          cable_type=cable_type)
+                          cable_type=cable_type, io_analysis_options=io_analysis_options)
 
         # If a delay is allowed but no numebr of allowed disruptions
         # is specified, default to 1 allowed disruption
@@ -432,7 +452,8 @@ def select_test_mux_ports(active_active_ports, active_standby_ports):
 
 
 @pytest.fixture
-def send_server_to_server_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap):   # noqa F811
+def send_server_to_server_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cable_type, vmhost, save_pcap,  # noqa F811
+                                      io_analysis_options):
 
     arp_setup(ptfhost)
 
@@ -442,7 +463,7 @@ def send_server_to_server_with_action(duthosts, ptfhost, ptfadapter, tbinfo, cab
         tor_IO = run_test(duthosts, activehost, ptfhost, ptfadapter, vmhost,
                           action, tbinfo, test_mux_ports, send_interval,
                           traffic_direction="server_to_server", stop_after=stop_after,
-                          cable_type=cable_type)
+                          cable_type=cable_type, io_analysis_options=io_analysis_options)
 
         # If a delay is allowed but no numebr of allowed disruptions
         # is specified, default to 1 allowed disruption
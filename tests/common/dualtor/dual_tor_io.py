@@ -38,7 +38,14 @@ class DualTorIO:
     """Class to conduct IO over ports in `active-standby` mode."""
 
     def __init__(self, activehost, standbyhost, ptfhost, ptfadapter, vmhost, tbinfo,
-                 io_ready, tor_vlan_port=None, send_interval=0.01, cable_type=CableType.active_standby):
+                 io_ready, tor_vlan_port=None, send_interval=0.01, cable_type=CableType.active_standby,
+                 streaming_analysis=False, keep_pcap=True):
+        """
+        Args:
+            streaming_analysis (bool): Analyze the disruptions on the PTF as the packets arrive and fetch only
+                the summary of each server, instead of fetching the pcap of all the packets and parsing it.
+            keep_pcap (bool): With streaming_analysis, also write the pcap of the captured packets as an artifact.
+        """
         self.tor_pc_intf = None
         self.tor_vlan_intf = tor_vlan_port
         self.duthost = activehost
@@ -59,6 +66,9 @@ class DualTorIO:
         self.test_results = dict()
         self.stop_early = False
         self.ptf_sniffer = "/root/dual_tor_sniffer.py"
+        self.streaming_analysis = streaming_analysis
+        self.keep_pcap = keep_pcap
+        self.capture_summary = None
 
         # Calculate valid range for T1 src/dst addresses
         mg_facts = self.duthost.get_extended_minigraph_facts(self.tbinfo)
@@ -127,12 +137,18 @@ class DualTorIO:
 
     def setup_ptf_sniffer(self):
         """Setup ptf sniffer supervisor config."""
-        ptf_sniffer_args = '-f "%s" -p %s -l %s -t %s' % (
+        ptf_sniffer_args = '-f "%s" -l %s -t %s' % (
             self.sniff_filter,
-            self.capture_pcap,
             self.capture_log,
             self.sniff_timeout
         )
+        if not self.streaming_analysis or self.keep_pcap:
+            ptf_sniffer_args += ' -p %s' % self.capture_pcap
+        if self.streaming_analysis:
+            server_field = 'dst' if self.traffic_direction in ('t1_to_server', 't1_to_soc') else 'src'
+            ptf_sniffer_args += ' -s %s --sport %s --dport %s --sent-dst-mac %s --received-src-macs %s ' \
+                '--server-field %s' % (self.capture_summary_file, self.tcp_sport, TCP_DST_PORT,
+                                       self.sent_pkt_dst_mac, ','.join(self.received_pkt_src_mac), server_field)
         templ = jinja2.Template(open(os.path.join(TEMPLATES_DIR, DUAL_TOR_SNIFFER_CONF_TEMPL)).read())
         self.ptfhost.copy(
             content=templ.render(ptf_sniffer=self.ptf_sniffer, ptf_sniffer_args=ptf_sniffer_args),
@@ -585,11 +601,13 @@ class DualTorIO:
 
         self.capture_pcap = '/tmp/capture.pcap'
         self.capture_log = '/tmp/capture.log'
+        self.capture_summary_file = '/tmp/capture_summary.json'
 
         # Do some cleanup first
-        self.ptfhost.file(path=self.capture_pcap, state="absent")
-        if os.path.exists(self.capture_pcap):
-            os.unlink(self.capture_pcap)
+        for capture_file in (self.capture_pcap, self.capture_summary_file):
+            self.ptfhost.file(path=capture_file, state="absent")
+            if os.path.exists(capture_file):
+                os.unlink(capture_file)
 
         self.setup_ptf_sniffer()
         self.start_ptf_sniffer()
@@ -612,11 +630,29 @@ class DualTorIO:
 
     def fetch_captured_packets(self):
         """Fetch the captured packet file generated by the ptf sniffer."""
+        if self.streaming_analysis:
+            self.fetch_capture_summary()
+            return
         logger.info('Fetching pcap file from ptf')
         self.ptfhost.fetch(src=self.capture_pcap, dest='/tmp/', flat=True, fail_on_missing=False)
         self.all_packets = scapyall.rdpcap(self.capture_pcap)
         logger.info("Number of all packets captured: {}".format(len(self.all_packets)))
 
+    def fetch_capture_summary(self):
+        """Fetch the disruption summary generated by the ptf sniffer, and the pcap file if it was kept."""
+        logger.info('Fetching capture summary from ptf')
+        self.ptfhost.fetch(src=self.capture_summary_file, dest='/tmp/', flat=True, fail_on_missing=False)
+        if self.keep_pcap:
+            self.ptfhost.fetch(src=self.capture_pcap, dest='/tmp/', flat=True, fail_on_missing=False)
+        if not os.path.exists(self.capture_summary_file):
+            logger.error("No capture summary fetched from ptf")
+            return
+        with open(self.capture_summary_file) as summary_file:
+            self.capture_summary = json.load(summary_file)
+        logger.info("Number of all packets captured: {}, packets of the test flows: {}, dropped by kernel: {}".format(
+            self.capture_summary['captured_packets'], self.capture_summary['matched_packets'],
+            self.capture_summary['kernel_drops']))
+
     def send_packets(self):
         """Send packets generated."""
         logger.info("Sender waiting to send {} packets".format(len(self.packets_list)))
@@ -679,6 +715,10 @@ class DualTorIO:
         examine_start = datetime.datetime.now()
         logger.info("Packet flow examine started {}".format(str(examine_start)))
 
+        if self.streaming_analysis:
+            self.examine_flow_summary()
+            return
+
         if not self.all_packets:
             logger.error("self.all_packets not defined.")
             return None
@@ -738,8 +778,6 @@ class DualTorIO:
         received_packet_list = list()
         duplicate_packet_list = list()
         disruption_ranges = list()
-        disruption_before_traffic = False
-        disruption_after_traffic = False
         duplicate_ranges = []
 
         for packet in packets:
@@ -780,9 +818,7 @@ class DualTorIO:
                 # for easier timing calculations later
                 received_packet_list.append((curr_payload, curr_time))
 
-        if len(received_packet_list) == 0:
-            logger.error("Sniffer failed to filter any traffic from DUT")
-        else:
+        if len(received_packet_list) > 0:
             # Find ranges of consecutive packets that have been duplicated
             # All packets within the same consecutive range will have the same
             # difference between the packet index and the sequence number
@@ -797,19 +833,60 @@ class DualTorIO:
                 }
                 duplicate_ranges.append(duplicate_dict)
 
+        return self._flow_result(
+            server_ip, num_sent_packets, len(received_packet_list),
+            received_packet_list[0][0] if received_packet_list else None,
+            received_packet_list[-1][0] if received_packet_list else None,
+            duplicate_ranges, disruption_ranges
+        )
+
+    def examine_flow_summary(self):
+        """
+        @summary: Build the test results from the disruption summary of the ptf sniffer,
+            which tracked the gaps and duplicates of the packets of each server as they arrived.
+        """
+        if not self.capture_summary:
+            logger.error("self.capture_summary not defined.")
+            return None
+
+        servers = self.capture_summary['servers']
+        if not servers:
+            logger.error("Sniffer failed to capture any traffic")
+
+        self.test_results = {}
+        for server_ip in natsorted(list(servers.keys())):
+            flow = servers[server_ip]
+            if flow['late_packets']:
+                logger.warning("Server {}: {} packets were received too late to be reordered".format(
+                    server_ip, flow['late_packets']))
+            result = self._flow_result(
+                server_ip, flow['sent_packets'], flow['received_packets'], flow['first_received_id'],
+                flow['last_received_id'], flow['duplications'], flow['disruptions']
+            )
+            logger.info("Server {} results:\n{}"
+                        .format(server_ip, json.dumps(result, indent=4)))
+            self.test_results[server_ip] = result
+
+    def _flow_result(self, server_ip, num_sent_packets, num_received_packets, first_received_id,
+                     last_received_id, duplicate_ranges, disruption_ranges):
+        disruption_before_traffic = False
+        disruption_after_traffic = False
+        if num_received_packets == 0:
+            logger.error("Sniffer failed to filter any traffic from DUT")
+        else:
             # If the first packet we received is not #0, some disruption started
             # before traffic started. Store the id of the first received packet
-            if received_packet_list[0][0] != 0:
-                disruption_before_traffic = received_packet_list[0][0]
+            if first_received_id != 0:
+                disruption_before_traffic = first_received_id
             # If the last packet we received does not match the number of packets
             # sent, some disruption continued after the traffic finished.
             # Store the id of the last received packet
-            if received_packet_list[-1][0] != self.packets_sent_per_server.get(server_ip) - 1:
-                disruption_after_traffic = received_packet_list[-1][0]
+            if last_received_id != self.packets_sent_per_server.get(server_ip) - 1:
+                disruption_after_traffic = last_received_id
 
         result = {
             'sent_packets': num_sent_packets,
-            'received_packets': len(received_packet_list),
+            'received_packets': num_received_packets,
             'disruption_before_traffic': disruption_before_traffic,
             'disruption_after_traffic': disruption_after_traffic,
             'duplications': duplicate_ranges,
@@ -817,11 +894,10 @@ class DualTorIO:
         }
 
         if num_sent_packets < self.packets_sent_per_server.get(server_ip):
-            server_addr = self.get_server_address(packet)
             logger.error('Not all sent packets were captured. '
                          'Something went wrong!')
             logger.error('Dumping server {} results and continuing:\n{}'
-                         .format(server_addr, json.dumps(result, indent=4)))
+                         .format(server_ip, json.dumps(result, indent=4)))
 
         return result
 
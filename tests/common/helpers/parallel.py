@@ -1,16 +1,22 @@
+import atexit
+import copy
 import datetime
+import functools
 import logging
 import math
+import multiprocessing
 import os
+import pickle
 import shutil
 import tempfile
 import signal
+import threading
 import traceback
 import time
 
-from multiprocessing import Process, Manager, Pipe, TimeoutError
+from multiprocessing import Process, Pipe, TimeoutError
+from multiprocessing.connection import wait
 from multiprocessing.pool import ThreadPool
-from psutil import wait_procs
 
 from tests.common.helpers.assertions import pytest_assert as pt_assert
 
@@ -24,35 +30,287 @@ class SonicProcess(Process):
 
     This exception (including backtrace) can be logged in test log
     to provide better info of why a particular Process failed.
+
+    The 'results' dict passed to the target in kwargs is sent back to the parent over the same pipe when the target
+    returns, it is available in the results property.
     """
     def __init__(self, *args, **kwargs):
         Process.__init__(self, *args, **kwargs)
         self._pconn, self._cconn = Pipe()
         self._exception = None
+        self._results = None
+        self._received = False
+
+    def start(self):
+        Process.start(self)
+        # Only the child writes to the pipe, the parent gets EOF if the child dies without sending anything
+        self._cconn.close()
 
     def run(self):
+        results = self._kwargs.get('results')
         try:
             Process.run(self)
-            self._cconn.send(None)
+            _send_result(self._cconn, None, results)
         except Exception as e:
             tb = traceback.format_exc()
-            self._cconn.send((e, tb))
+            _send_result(self._cconn, (e, tb), results)
             raise e
 
-    # for wait_procs
-    def wait(self, timeout):
-        return self.join(timeout=timeout)
+    # for _wait_workers, the pipe until the result is received, then the process sentinel
+    @property
+    def conn(self):
+        return self._pconn if not self._received else self.sentinel
+
+    def receive(self):
+        """Receive the result sent by the process, returns True when the process has exited."""
+        if not self._received:
+            try:
+                self._exception, self._results = self._pconn.recv()
+            except EOFError:
+                pass
+            self._received = True
+        self.join(0)
+        return self.exitcode is not None
 
-    # for wait_procs
-    def is_running(self):
-        return self.is_alive()
+    @property
+    def returncode(self):
+        return self.exitcode
 
     @property
     def exception(self):
-        if self._pconn.poll():
-            self._exception = self._pconn.recv()
+        if not self._received and self._pconn.poll():
+            self.receive()
         return self._exception
 
+    @property
+    def results(self):
+        return self._results
+
+
+def _send_result(conn, exception, results):
+    """Send the (exception, results) of a target to the parent, falls back to a plain exception if not picklable."""
+    results = dict(results) if results is not None else None
+    try:
+        conn.send((exception, results))
+    except Exception as e:
+        if exception is not None:
+            exception = (Exception(repr(exception[0])), exception[1])
+        else:
+            exception = (e, traceback.format_exc())
+        conn.send((exception, None))
+
+
+def _node_worker_loop(node, conn):
+    """Main loop of a NodeWorker process: run the targets received from the parent with the node."""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        target, args, kwargs, results = task
+        kwargs['node'] = node
+        kwargs['results'] = results
+        try:
+            target(*args, **kwargs)
+            _send_result(conn, None, results)
+        except Exception as e:
+            _send_result(conn, (e, traceback.format_exc()), results)
+
+
+class NodeWorker(object):
+    """
+    Long lived process forked for a node, running the targets of parallel_run sent to it over a pipe.
+
+    The process is forked from the pytest process the first time the node is used, so it runs with a snapshot of the
+    node object and of the state of the pytest process at that time, for the rest of the session. Changes made later
+    by the pytest process are not seen by the worker, and changes made by a target in the worker are not seen by the
+    pytest process or by the next forked processes. Only targets marked with worker_pool_target, which read the state
+    of the node without depending on or changing the state of the pytest process, are run on a worker.
+    """
+    def __init__(self, node):
+        self.node = node
+        self.name = "parallel-worker--{}".format(node)
+        self._pconn, cconn = Pipe()
+        self.process = multiprocessing.get_context('fork').Process(
+            name=self.name, target=_node_worker_loop, args=(node, cconn))
+        self.process.start()
+        cconn.close()
+        self.busy = False
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def submit(self, target, args, kwargs, results):
+        self.busy = True
+        self._pconn.send((target, args, dict(kwargs), results))
+
+    def receive(self):
+        return self._pconn.recv()
+
+    def stop(self):
+        try:
+            self._pconn.send(None)
+        except (OSError, EOFError):
+            pass
+        self._pconn.close()
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+    def kill(self):
+        self._pconn.close()
+        self.process.kill()
+        self.process.join()
+
+
+class PoolTask(object):
+    """
+    A target running on a NodeWorker, with the interface of SonicProcess used by parallel_run.
+    """
+    def __init__(self, pool, worker, name):
+        self.pool = pool
+        self.worker = worker
+        self.name = name
+        self.exitcode = None
+        self._exception = None
+        self._results = None
+        self._done = False
+
+    @property
+    def conn(self):
+        return self.worker._pconn
+
+    @property
+    def pid(self):
+        return self.worker.pid
+
+    @property
+    def returncode(self):
+        return self.exitcode
+
+    @property
+    def exception(self):
+        return self._exception
+
+    @property
+    def results(self):
+        return self._results
+
+    def receive(self):
+        """Receive the result sent by the worker, returns True when the target is done."""
+        try:
+            self._exception, self._results = self.worker.receive()
+            self.exitcode = 1 if self._exception else 0
+            self.pool.release(self.worker)
+        except (EOFError, OSError):
+            # The worker died while running the target
+            self.exitcode = self.worker.process.exitcode if self.worker.process.exitcode is not None else 1
+            self.pool.discard(self.worker)
+        self._done = True
+        return True
+
+    def is_alive(self):
+        return not self._done
+
+    def terminate(self):
+        self._done = True
+        self.pool.discard(self.worker)
+
+
+class WorkerPool(object):
+    """
+    Pool of long lived NodeWorker processes used by parallel_run instead of forking a process per node and call.
+
+    Only targets marked with worker_pool_target, defined at module level so that they and their arguments can be
+    pickled, are run on the pool. The node is not sent since the worker of the node already has it. Other calls fork
+    a process per node as before.
+    """
+    def __init__(self):
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.workers = []
+        atexit.register(self.shutdown)
+
+    def usable(self, target, args, kwargs):
+        if os.getpid() != self.pid or not getattr(target, 'worker_pool_target', False):
+            return False
+        try:
+            pickle.dumps((target, args, kwargs))
+        except Exception:
+            return False
+        return True
+
+    def acquire(self, node):
+        with self.lock:
+            for worker in self.workers:
+                if worker.node is node and not worker.busy and worker.is_alive():
+                    worker.busy = True
+                    return worker
+        worker = NodeWorker(node)
+        with self.lock:
+            self.workers.append(worker)
+        return worker
+
+    def release(self, worker):
+        worker.busy = False
+
+    def discard(self, worker):
+        with self.lock:
+            if worker in self.workers:
+                self.workers.remove(worker)
+        worker.kill()
+
+    def shutdown(self):
+        with self.lock:
+            workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.stop()
+
+
+def worker_pool_target(target):
+    """Decorator marking a parallel_run target as safe to run on the long lived worker of a WorkerPool.
+
+    The target must be defined at module level and only read the state of the node it is given, see NodeWorker.
+    """
+    target.worker_pool_target = True
+    return target
+
+
+_worker_pool = None
+
+
+def set_worker_pool(pool):
+    """Set the WorkerPool used by parallel_run, None to fork a process per node on every call."""
+    global _worker_pool
+    _worker_pool = pool
+
+
+def _wait_workers(workers, timeout):
+    """
+    Wait for the workers to be done, for at most timeout seconds, receiving the results they send over pipes.
+
+    Returns:
+        tuple: (gone, alive), the lists of workers done and still running.
+    """
+    deadline = time.time() + timeout if timeout is not None else None
+    pending = list(workers)
+    while pending:
+        remaining = deadline - time.time() if deadline is not None else None
+        if remaining is not None and remaining <= 0:
+            break
+        handles = dict((worker, worker.conn) for worker in pending)
+        ready = wait(list(handles.values()), remaining)
+        pending = [worker for worker in pending if handles[worker] not in ready or not worker.receive()]
+    gone = [worker for worker in workers if worker not in pending]
+    return gone, pending
+
 
 def parallel_run(
     target, args, kwargs, nodes_list, timeout=None, concurrent_tasks=24, init_result=None
@@ -63,20 +321,23 @@ def parallel_run(
         target (function): The target function to be executed in parallel.
         args (list of tuple): List of arguments for the target function.
         kwargs (dict): Keyword arguments for the target function. It will be extended with two keys: 'node' and
-            'results'. The 'node' key will hold an item of the nodes list. The 'result' key will hold an instance of
-            multiprocessing.Manager().dict(). It is a proxy of the shared dict that will be used by each process for
-            returning execution results.
+            'results'. The 'node' key will hold an item of the nodes list. The 'result' key will hold a dict used by
+            the process for returning execution results. It is sent back over a pipe when the target returns and
+            merged with the dicts of the other processes.
         nodes (list of nodes): List of nodes to be used by the target function
         timeout (int or float, optional): Total time allowed for the spawned multiple processes to run. Defaults to
             None. When timeout is specified, this function will wait at most 'timeout' seconds for the processes to
             run. When time is up, this function will try to terminate or even kill all the processes.
 
+    When a WorkerPool is set with set_worker_pool(), the target is marked with worker_pool_target and the target,
+    args and kwargs can be pickled, the target runs on the long lived worker process of each node instead of a process
+    forked for this call.
+
     Raises:
         flag.: In case any of the spawned process cannot be terminated, fail the test.
 
     Returns:
-        dict: An instance of multiprocessing.Manager().dict(). It is a proxy to the shared dict that is used by all the
-            spawned processes.
+        dict: The results of all the processes.
     """
     nodes = [node for node in nodes_list]
 
@@ -98,11 +359,14 @@ def parallel_run(
                 # set its failed to True.
                 if init_result:
                     init_result['failed'] = True
-                    results[list(results.keys())[0]] = init_result
+                    results[list(results.keys())[0]] = copy.deepcopy(init_result)
                 else:
                     results[p.name] = {'failed': True}
                 try:
-                    os.kill(p.pid, signal.SIGKILL)
+                    if isinstance(p, PoolTask):
+                        p.terminate()
+                    else:
+                        os.kill(p.pid, signal.SIGKILL)
                 except OSError as err:
                     logger.error("Unable to kill {}:{}, error:{}".format(
                         p.pid, p.name, err
@@ -115,7 +379,11 @@ def parallel_run(
                     )
 
     workers = []
-    results = Manager().dict()
+    results = {}
+    pool = _worker_pool
+    target_kwargs = {k: v for k, v in kwargs.items() if k not in ('node', 'results')}
+    if pool is not None and not pool.usable(target, args, target_kwargs):
+        pool = None
     start_time = datetime.datetime.now()
     tasks_done = 0
     total_tasks = len(nodes)
@@ -137,25 +405,36 @@ def parallel_run(
 
         while len(nodes) and tasks_running < concurrent_tasks:
             node = nodes.pop(0)
+            node_results = {}
             # For sanity check process, initial results in case of timeout.
             if init_result:
                 init_result["host"] = node.hostname
-                results[node.hostname] = init_result
-            kwargs['node'] = node
-            kwargs['results'] = results
+                results[node.hostname] = copy.deepcopy(init_result)
+                node_results[node.hostname] = copy.deepcopy(init_result)
             process_name = "{}--{}".format(target.__name__, node)
-            worker = SonicProcess(
-                        name=process_name, target=target, args=args,
-                        kwargs=kwargs
-                    )
-            worker.start()
+            if pool is not None:
+                node_worker = pool.acquire(node)
+                node_worker.submit(target, args, target_kwargs, node_results)
+                worker = PoolTask(pool, node_worker, process_name)
+            else:
+                kwargs['node'] = node
+                kwargs['results'] = node_results
+                worker = SonicProcess(
+                            name=process_name, target=target, args=args,
+                            kwargs=kwargs
+                        )
+                worker.start()
             tasks_running += 1
             logger.debug('Started process {} running target "{}"'.format(
                 worker.pid, process_name
             ))
             workers.append(worker)
 
-        gone, alive = wait_procs(workers, timeout=timeout, callback=on_terminate)
+        gone, alive = _wait_workers(workers, timeout)
+        for worker in gone:
+            on_terminate(worker)
+            if worker.results:
+                results.update(worker.results)
         workers = alive
 
         logger.debug("task completed {}, running {}".format(
@@ -172,9 +451,10 @@ def parallel_run(
             tasks_running -= len(gone)
             tasks_done += len(gone)
 
-        # check if we have any processes that failed - have exitcode non-zero
+        # check if we have any processes that failed - have exitcode non-zero, or sent an exception instead of
+        # the results, for example when the results could not be pickled
         for worker in gone:
-            if worker.exitcode != 0:
+            if worker.exitcode != 0 or worker.exception is not None:
                 failed_processes[worker.name] = {}
                 failed_processes[worker.name]['exit_code'] = worker.exitcode
                 failed_processes[worker.name]['exception'] = worker.exception
@@ -190,7 +470,7 @@ def parallel_run(
             # set its failed to True.
             if init_result:
                 init_result['failed'] = True
-                results[list(results.keys())[0]] = init_result
+                results[list(results.keys())[0]] = copy.deepcopy(init_result)
             else:
                 results[worker.name] = {'failed': True}
 
@@ -224,7 +504,7 @@ def parallel_run(
         )
     )
 
-    return dict(results)
+    return results
 
 
 def reset_ansible_local_tmp(target):
@@ -234,6 +514,8 @@ def reset_ansible_local_tmp(target):
         target (function): The function to be decorated.
     """
 
+    # functools.wraps keeps the qualified name of the target, the decorated function can be pickled for a WorkerPool
+    @functools.wraps(target)
     def wrapper(*args, **kwargs):
 
         # Reset the ansible default local tmp directory for the current subprocess
@@ -247,8 +529,6 @@ def reset_ansible_local_tmp(target):
             # User of tempfile.mkdtemp need to take care of cleaning up.
             shutil.rmtree(constants.DEFAULT_LOCAL_TMP)
 
-    wrapper.__name__ = target.__name__
-
     return wrapper
 
 
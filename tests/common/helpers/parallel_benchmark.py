@@ -0,0 +1,58 @@
+"""
+Benchmark of the overhead of parallel_run calls, forking a process per node and call or using a WorkerPool.
+
+Usage, from the root of the repository:
+    python -m tests.common.helpers.parallel_benchmark --nodes 1 8 32 --calls 20
+"""
+import argparse
+import os
+import time
+
+from tests.common.helpers.parallel import parallel_run, set_worker_pool, worker_pool_target, WorkerPool
+
+
+class BenchmarkNode(object):
+    def __init__(self, index):
+        self.hostname = "node{}".format(index)
+
+    def __str__(self):
+        return self.hostname
+
+
+@worker_pool_target
+def record_pid(node, results):
+    results[node.hostname] = os.getpid()
+
+
+def measure(nodes, calls):
+    start = time.time()
+    for _ in range(calls):
+        results = parallel_run(record_pid, (), {}, nodes, timeout=60, concurrent_tasks=len(nodes))
+        assert len(results) == len(nodes)
+    return (time.time() - start) * 1000 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of parallel_run call overhead")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    print("{:>6} {:>18} {:>18}".format("nodes", "fork per call ms", "worker pool ms"))
+    for count in args.nodes:
+        nodes = [BenchmarkNode(i) for i in range(count)]
+        set_worker_pool(None)
+        fork_ms = measure(nodes, args.calls)
+
+        pool = WorkerPool()
+        set_worker_pool(pool)
+        # The first call forks the workers of the nodes
+        measure(nodes, 1)
+        pool_ms = measure(nodes, args.calls)
+        set_worker_pool(None)
+        pool.shutdown()
+        print("{:>6} {:>18.1f} {:>18.1f}".format(count, fork_ms, pool_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Unit tests of parallel_run with and without a WorkerPool, they need no testbed:
+
+    python3 -m pytest --noconftest tests/common/helpers/parallel_unit_test.py
+"""
+import os
+import threading
+
+import pytest
+
+from tests.common.helpers.parallel import parallel_run, set_worker_pool, worker_pool_target, WorkerPool
+
+
+class FakeNode(object):
+
+    def __init__(self, hostname):
+        self.hostname = hostname
+
+    def __str__(self):
+        return self.hostname
+
+
+class FakeAsic(object):
+
+    def __init__(self, omem):
+        self.namespace = None
+        self.omem = omem
+
+    def run_redis_cli_cmd(self, cmd):
+        return {"stdout_lines": ["id=1 addr=127.0.0.1:6379 omem={} cmd=client".format(self.omem)]}
+
+
+class FakeDut(FakeNode):
+
+    def __init__(self, hostname, omem):
+        super(FakeDut, self).__init__(hostname)
+        self.asics = [FakeAsic(omem)]
+
+
+@worker_pool_target
+def record_pid(node, results):
+    results[node.hostname] = os.getpid()
+
+
+def record_lock(node, results):
+    results[node.hostname] = threading.Lock()
+
+
+@worker_pool_target
+def record_lock_on_pool(node, results):
+    record_lock(node, results)
+
+
+@pytest.fixture
+def worker_pool():
+    pool = WorkerPool()
+    set_worker_pool(pool)
+    yield pool
+    set_worker_pool(None)
+    pool.shutdown()
+
+
+def test_fork_per_call():
+    nodes = [FakeNode("node{}".format(index)) for index in range(3)]
+    results = parallel_run(record_pid, (), {}, nodes, timeout=60)
+    assert sorted(results.keys()) == ["node0", "node1", "node2"]
+    assert os.getpid() not in results.values()
+
+
+def test_worker_pool(worker_pool):
+    nodes = [FakeNode("node{}".format(index)) for index in range(3)]
+    first = parallel_run(record_pid, (), {}, nodes, timeout=60)
+    assert parallel_run(record_pid, (), {}, nodes, timeout=60) == first
+    assert len(set(first.values())) == 3 and len(worker_pool.workers) == 3
+
+
+def test_worker_pool_target_required(worker_pool):
+    def unmarked_target(node, results):
+        results[node.hostname] = os.getpid()
+
+    assert not worker_pool.usable(record_lock, (), {})
+    assert not worker_pool.usable(unmarked_target, (), {})
+    assert worker_pool.usable(record_pid, (), {})
+    parallel_run(unmarked_target, (), {}, [FakeNode("node0")], timeout=60)
+    assert not worker_pool.workers
+
+
+@pytest.mark.parametrize("use_pool", [False, True])
+def test_results_not_picklable(request, use_pool):
+    if use_pool:
+        request.getfixturevalue("worker_pool")
+    # The results cannot be sent back to the pytest process, the call fails instead of returning no results
+    with pytest.raises(pytest.fail.Exception, match="record_lock"):
+        parallel_run(record_lock_on_pool, (), {}, [FakeNode("node0")], timeout=60)
+
+
+def test_sanity_check_target(worker_pool):
+    from tests.common.plugins.sanity_check import checks
+
+    duts = [FakeDut("dut0", 0), FakeDut("dut1", checks.OMEM_THRESHOLD_BYTES + 1)]
+    init_result = {"failed": False, "check_item": "dbmemory"}
+    assert worker_pool.usable(checks._check_dbmemory_on_dut, (), {"stage": "pre_test"})
+    for _ in range(2):
+        results = parallel_run(checks._check_dbmemory_on_dut, (), {"stage": "pre_test"}, duts, timeout=60,
+                               init_result=init_result)
+        assert not results["dut0"]["failed"] and results["dut1"]["failed"]
+        assert results["dut1"]["total_omem"] == checks.OMEM_THRESHOLD_BYTES + 1
+    # Both calls ran on the workers of the DUTs
+    assert sorted(worker.node.hostname for worker in worker_pool.workers) == ["dut0", "dut1"]
@@ -0,0 +1,30 @@
+""" This module provides interface to run several platform API calls on the DUT
+    with one request """
+
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def batch_api(conn, calls):
+    """
+    Run platform API calls with one request.
+
+    Args:
+        conn: The HTTP connection to the platform API server.
+        calls: A list of (object path, API, arguments) tuples, e.g. ('chassis/sfp/0', 'get_presence', []),
+            the arguments may be None.
+
+    Returns:
+        The list of the results of the calls.
+    """
+    calls = [[path, name, args if args is not None else []] for path, name, args in calls]
+    conn.request('POST', '/platform_batch', json.dumps({'calls': calls}))
+    resp = conn.getresponse()
+    response = json.loads(resp.read())
+    failed = [(call, error) for call, error in zip(calls, response['errors']) if error is not None]
+    if failed:
+        raise RuntimeError('Platform API calls failed: {}'.format(failed))
+    logger.info('Executing {} platform APIs in batch, results: "{}"'.format(len(calls), response['res']))
+    return response['res']
@@ -4,6 +4,8 @@
 import json
 import logging
 
+from tests.common.helpers.platform_api.batch import batch_api
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,6 +18,12 @@ def fan_api(conn, index, name, args=None):
     logger.info('Executing fan API: "{}", index: {}, arguments: "{}", result: "{}"'.format(name, index, args, res))
     return res
 
+
+def fan_api_batch(conn, indices, name, args=None):
+    """ Runs the API on the fans of the indices with one request, returns the results by index """
+    calls = [('chassis/fan/{}'.format(index), name, args) for index in indices]
+    return dict(zip(indices, batch_api(conn, calls)))
+
 #
 # Methods inherited from DeviceBase class
 #
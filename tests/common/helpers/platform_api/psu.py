@@ -6,6 +6,8 @@ supply units of the DUT via platform API
 import json
 import logging
 
+from tests.common.helpers.platform_api.batch import batch_api
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +21,12 @@ def psu_api(conn, psu_id, name, args=None):
     return res
 
 
+def psu_api_batch(conn, indices, name, args=None):
+    """ Runs the API on the PSUs of the indices with one request, returns the results by index """
+    calls = [('chassis/psu/{}'.format(index), name, args) for index in indices]
+    return dict(zip(indices, batch_api(conn, calls)))
+
+
 #
 # Methods inherited from DeviceBase class
 #
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Measure the time taken by the platform API calls of the SFP tests, one request per call and in batch.
+
+platform_api_server.py is started locally against a mocked sonic_platform package, whose chassis has --sfps
+SFPs answering every API after --api-delay seconds, like an EEPROM read would. The calls of --apis are then
+made for every SFP one request at a time, on the single threaded server and on the threaded server, and with
+one batch request per API. The results of all the modes are checked to be the same:
+
+    python3 tests/common/helpers/platform_api/scripts/platform_api_bench.py --sfps 64 --api-delay 0.001
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, '..', '..', '..', '..', '..'))
+
+from tests.common.helpers.platform_api import sfp   # noqa: E402
+
+SERVER = os.path.join(SCRIPTS_DIR, 'platform_api_server.py')
+STARTUP_TIMEOUT = 10
+DEFAULT_APIS = ['get_presence', 'get_transceiver_info', 'get_transceiver_bulk_status',
+                'get_transceiver_threshold_info', 'get_rx_los', 'get_tx_fault', 'get_temperature']
+
+# Mocked sonic_platform package, the API delay and the number of SFPs are set by the environment
+MOCK_PLATFORM = '''
+import os
+import time
+
+API_DELAY = float(os.environ.get('MOCK_API_DELAY', '0'))
+NUM_SFPS = int(os.environ.get('MOCK_NUM_SFPS', '32'))
+
+
+class Sfp(object):
+
+    def __init__(self, index):
+        self.index = index
+
+    def _read(self, value):
+        time.sleep(API_DELAY)
+        return value
+
+    def get_name(self):
+        return self._read('Ethernet{}'.format(self.index * 4))
+
+    def get_presence(self):
+        return self._read(True)
+
+    def get_transceiver_info(self):
+        return self._read({
+            'type': 'QSFP28 or later', 'type_abbrv_name': 'QSFP28', 'vendor_rev': 'A0',
+            'serial': 'SN{:08d}'.format(self.index), 'manufacturer': 'MOCK', 'model': 'MOCK-100G-SR4',
+            'connector': 'MPO 1x12', 'encoding': '64B/66B', 'ext_identifier': 'Power Class 4 (3.5W Max)',
+            'ext_rateselect_compliance': 'QSFP+ Rate Select Version 1', 'cable_type': 'Length Cable Assembly(m)',
+            'cable_length': 50.0, 'nominal_bit_rate': 255, 'specification_compliance': '{}',
+            'vendor_date': '2020-01-01', 'vendor_oui': '00-00-00', 'application_advertisement': 'N/A'
+        })
+
+    def get_transceiver_bulk_status(self):
+        status = {'rx_los': False, 'tx_fault': False, 'reset_status': False, 'lp_mode': False,
+                  'temperature': 30.0 + self.index, 'voltage': 3.3}
+        for lane in range(1, 5):
+            for key in ('tx{}bias', 'rx{}power', 'tx{}power'):
+                status[key.format(lane)] = 1.0 * lane
+        return self._read(status)
+
+    def get_transceiver_threshold_info(self):
+        return self._read(dict((key, 1.0) for key in (
+            'temphighalarm', 'templowalarm', 'temphighwarning', 'templowwarning', 'vcchighalarm',
+            'vcclowalarm', 'vcchighwarning', 'vcclowwarning', 'rxpowerhighalarm', 'rxpowerlowalarm',
+            'txbiashighalarm', 'txbiaslowalarm', 'txpowerhighalarm', 'txpowerlowalarm')))
+
+    def get_rx_los(self):
+        return self._read([False] * 4)
+
+    def get_tx_fault(self):
+        return self._read([False] * 4)
+
+    def get_temperature(self):
+        return self._read(30.0 + self.index)
+
+
+class Chassis(object):
+
+    def __init__(self):
+        self._sfp_list = [Sfp(index) for index in range(NUM_SFPS)]
+
+    def get_num_sfps(self):
+        return len(self._sfp_list)
+
+    def get_sfp(self, index):
+        return self._sfp_list[index]
+
+
+class Platform(object):
+
+    def __init__(self):
+        self._chassis = Chassis()
+
+    def get_chassis(self):
+        return self._chassis
+'''
+
+
+def free_port():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def start_server(mock_dir, args, threaded):
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=mock_dir, MOCK_API_DELAY=str(args.api_delay), MOCK_NUM_SFPS=str(args.sfps))
+    cmd = [sys.executable, SERVER, '--port', str(port)] + (['--threaded'] if threaded else [])
+    server = subprocess.Popen(cmd, env=env, stderr=subprocess.DEVNULL)
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server, port
+        except socket.error:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError('platform_api_server.py did not start')
+
+
+def run_mode(mode, mock_dir, args):
+    server, port = start_server(mock_dir, args, threaded=mode != 'single')
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    indices = list(range(args.sfps))
+    results = {}
+    requests = 0
+    try:
+        start = time.time()
+        for api in args.apis:
+            if mode == 'batch':
+                results[api] = sfp.sfp_api_batch(conn, indices, api)
+                requests += 1
+            else:
+                results[api] = dict((index, sfp.sfp_api(conn, index, api)) for index in indices)
+                requests += len(indices)
+        elapsed = time.time() - start
+    finally:
+        conn.close()
+        server.terminate()
+        server.wait()
+    return results, {'requests': requests, 'elapsed': round(elapsed, 3),
+                     'calls_per_second': round(len(indices) * len(args.apis) / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the platform API calls of the SFP tests')
+    parser.add_argument('--sfps', type=int, default=64, help='Number of SFPs of the mocked chassis')
+    parser.add_argument('--api-delay', dest='api_delay', type=float, default=0.0,
+                        help='Seconds taken by every API of the mocked SFPs')
+    parser.add_argument('--apis', nargs='+', default=DEFAULT_APIS, help='SFP APIs called on every SFP')
+    parser.add_argument('--mode', choices=['single', 'threaded', 'batch', 'all'], default='all')
+    args = parser.parse_args()
+
+    mock_dir = tempfile.mkdtemp()
+    try:
+        os.mkdir(os.path.join(mock_dir, 'sonic_platform'))
+        with open(os.path.join(mock_dir, 'sonic_platform', '__init__.py'), 'w') as init_file:
+            init_file.write('from . import platform\n')
+        with open(os.path.join(mock_dir, 'sonic_platform', 'platform.py'), 'w') as platform_file:
+            platform_file.write(MOCK_PLATFORM)
+
+        modes = ['single', 'threaded', 'batch'] if args.mode == 'all' else [args.mode]
+        report = {}
+        expected = None
+        for mode in modes:
+            results, report[mode] = run_mode(mode, mock_dir, args)
+            if expected is None:
+                expected = results
+            elif results != expected:
+                raise RuntimeError('Results of mode {} differ from the ones of mode {}'.format(mode, modes[0]))
+            print('%-9s requests=%-6d elapsed=%-8.3f calls/s=%s' % (
+                mode, report[mode]['requests'], report[mode]['elapsed'], report[mode]['calls_per_second']))
+        print(json.dumps(report, indent=2, sort_keys=True))
+    finally:
+        shutil.rmtree(mock_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,8 +8,10 @@ import syslog
 # TODO: Clean this up once we no longer need to support Python 2
 if sys.version_info.major == 3:
     from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
 else:
     from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
 
 import sonic_platform
 
@@ -33,6 +35,38 @@ def obj_serialize(obj):
     return data
 
 
+def get_object(path):
+    ''' Returns the object of a path like "chassis/sfp/0", see PlatformAPITestService '''
+    path = list(reversed(path))
+    obj = platform
+    while path:
+        _dir = path.pop()
+
+        # TODO: Clean this up once we no longer need to support Python 2
+        if sys.version_info.major == 3:
+            args = inspect.getfullargspec(getattr(obj, 'get_' + _dir)).args
+        else:
+            args = inspect.getargspec(getattr(obj, 'get_' + _dir)).args
+
+        if 'index' in args:
+            _idx = int(path.pop())
+            obj = getattr(obj, 'get_' + _dir)(_idx)
+        else:
+            obj = getattr(obj, 'get_' + _dir)()
+    return obj
+
+
+def call_api(obj, api, args):
+    res = None
+
+    try:
+        res = getattr(obj, api)(*args)
+    except NotImplementedError:
+        syslog.syslog(syslog.LOG_WARNING, "API '{}' not implemented".format(api))
+
+    return res
+
+
 class PlatformAPITestService(BaseHTTPRequestHandler):
     ''' Handles HTTP POST requests and translated them into platform API call.
     The expected URL path format is the following:
@@ -51,64 +85,93 @@ class PlatformAPITestService(BaseHTTPRequestHandler):
     the get_<component_1> is a method of <component_0> object.
     If the <component_n> is a list accessed by index, it is assumed that get_<component_n>
     is a method of <compoment_n-1> object which accepts "index" as parameter.
+
+    Several API calls can be run with one POST request to /platform_batch. The JSON object in
+    body has a "calls" key, which contains a list of calls, each of them a list of the path of
+    the object (without "platform"), the API and the list of arguments:
+       e.g. {"calls": [["chassis/sfp/0", "get_presence", []], ["chassis/sfp/1", "get_presence", []]]}
+    The calls are run in order. The response is a JSON object with a "res" key that holds the
+    list of the results, and an "errors" key that holds the list of the errors, None for the
+    calls which succeeded, e.g. {"res": [true, false], "errors": [null, null]}.
     '''
 
+    # The headers and the body of a response are sent separately, don't let the body of a kept
+    # alive connection wait for the delayed ACK of the headers
+    disable_nagle_algorithm = True
+
     def do_POST(self):
         if self.path.startswith('/platform/'):
             self.do_platform_api()
+        elif self.path == '/platform_batch':
+            self.do_platform_api_batch()
         else:
             return
 
-    def do_platform_api(self):
+    def read_request(self):
         content_length = int(self.headers['Content-Length'])
         body = self.rfile.read(content_length)
 
-        request = json.loads(body)
+        return json.loads(body)
+
+    def send_result(self, result):
+        body = json.dumps(result, default=obj_serialize).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
 
-        path = list(reversed(self.path.strip('/').split('/')))
-        if path.pop() != 'platform':
+    def do_platform_api(self):
+        request = self.read_request()
+
+        path = self.path.strip('/').split('/')
+        if path[0] != 'platform':
             raise Exception("invalid path " + self.path)
 
-        obj = platform
-        while len(path) != 1:
-            _dir = path.pop()
+        obj = get_object(path[1:-1])
+        res = call_api(obj, path[-1], request['args'])
 
-            # TODO: Clean this up once we no longer need to support Python 2
-            if sys.version_info.major == 3:
-                args = inspect.getfullargspec(getattr(obj, 'get_' + _dir)).args
-            else:
-                args = inspect.getargspec(getattr(obj, 'get_' + _dir)).args
+        self.send_result({'res': res})
 
-            if 'index' in args:
-                _idx = int(path.pop())
-                obj = getattr(obj, 'get_' + _dir)(_idx)
-            else:
-                obj = getattr(obj, 'get_' + _dir)()
+    def do_platform_api_batch(self):
+        request = self.read_request()
 
-        api = path.pop()
-        args = request['args']
+        results = []
+        errors = []
+        for obj_path, api, args in request['calls']:
+            try:
+                obj = get_object(obj_path.strip('/').split('/'))
+                results.append(call_api(obj, api, args))
+                errors.append(None)
+            except Exception as e:
+                syslog.syslog(syslog.LOG_ERR, "API '{}' of '{}' failed: {}".format(api, obj_path, repr(e)))
+                results.append(None)
+                errors.append(repr(e))
 
-        res = None
+        self.send_result({'res': results, 'errors': errors})
 
-        try:
-            res = getattr(obj, api)(*args)
-        except NotImplementedError:
-            syslog.syslog(syslog.LOG_WARNING, "API '{}' not implemented".format(api))
 
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(json.dumps({'res': res}, default=obj_serialize).encode('utf-8'))
+class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
+    ''' Handles every connection in its own thread, the connections are kept alive '''
+    daemon_threads = True
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('-p', '--port', type=int, help='port to listen to', required=True)
+    parser.add_argument('-t', '--threaded', action='store_true',
+                        help='handle every connection in its own thread and keep the connections alive')
     args = parser.parse_args()
 
     syslog.openlog(SYSLOG_IDENTIFIER)
 
-    httpd = HTTPServer(('', args.port), PlatformAPITestService)
+    if args.threaded:
+        # Keep-alive needs HTTP/1.1, it would block the other clients of a single threaded server
+        PlatformAPITestService.protocol_version = 'HTTP/1.1'
+        httpd = ThreadedHTTPServer(('', args.port), PlatformAPITestService)
+    else:
+        httpd = HTTPServer(('', args.port), PlatformAPITestService)
     httpd.serve_forever()
 
     syslog.closelog()
@@ -6,6 +6,8 @@ transceivers connected to the DUT via platform API
 import json
 import logging
 
+from tests.common.helpers.platform_api.batch import batch_api
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,6 +21,12 @@ def sfp_api(conn, index, name, args=None):
     return res
 
 
+def sfp_api_batch(conn, indices, name, args=None):
+    """ Runs the API on the SFPs of the indices with one request, returns the results by index """
+    calls = [('chassis/sfp/{}'.format(index), name, args) for index in indices]
+    return dict(zip(indices, batch_api(conn, calls)))
+
+
 #
 # Methods inherited from DeviceBase class
 #
@@ -78,6 +86,22 @@ def get_transceiver_threshold_info(conn, index):
     return sfp_api(conn, index, 'get_transceiver_threshold_info')
 
 
+def get_presence_batch(conn, indices):
+    return sfp_api_batch(conn, indices, 'get_presence')
+
+
+def get_transceiver_info_batch(conn, indices):
+    return sfp_api_batch(conn, indices, 'get_transceiver_info')
+
+
+def get_transceiver_bulk_status_batch(conn, indices):
+    return sfp_api_batch(conn, indices, 'get_transceiver_bulk_status')
+
+
+def get_transceiver_threshold_info_batch(conn, indices):
+    return sfp_api_batch(conn, indices, 'get_transceiver_threshold_info')
+
+
 def get_reset_status(conn, index):
     return sfp_api(conn, index, 'get_reset_status')
 
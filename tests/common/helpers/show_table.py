@@ -0,0 +1,138 @@
+"""
+Column oriented parsing of the tabulated output of SONiC show commands.
+
+SonicHost._parse_show slices every column of every line into one dict per row. For wide outputs like
+'show interfaces counters' on systems with hundreds of ports, most tests only look at a few columns and convert
+the counters to numbers themselves. ShowTable slices each column for all the lines at once, can convert comma
+formatted counters to numbers, and only builds row dictionaries when they are asked for.
+"""
+import re
+
+SEP_LINE_PATTERN = re.compile(r"^( *-+ *)+$")
+NUMBER_PATTERN = re.compile(r"^-?\d{1,3}(,\d{3})*(\.\d+)?$|^-?\d+(\.\d+)?$")
+NOT_AVAILABLE = ("N/A", "")
+
+
+def parse_column_positions(sep_line, sep_char='-'):
+    """Parse the position of each columns in the command output
+
+    Args:
+        sep_line: The output line separating actual data and column headers
+        sep_char: The character used in separation line. Defaults to '-'.
+
+    Returns:
+        Returns a list. Each item is a tuple with two elements. The first element is start position of a column.
+        The second element is the end position of the column.
+    """
+    return [match.span() for match in re.finditer(re.escape(sep_char) + "+", sep_line)]
+
+
+def to_number(value):
+    """Convert a counter value like '1,234' or '12.5' to a number.
+
+    Args:
+        value: String value of the counter.
+
+    Returns:
+        int or float value of the counter. None for 'N/A' and empty values.
+
+    Raises:
+        ValueError: The value is not a number.
+    """
+    if value in NOT_AVAILABLE:
+        return None
+    if not NUMBER_PATTERN.match(value):
+        raise ValueError("Not a number: '{}'".format(value))
+    value = value.replace(",", "")
+    return float(value) if "." in value else int(value)
+
+
+def is_numeric_column(values):
+    """Check whether all the available values of a column are numbers."""
+    available = [value for value in values if value not in NOT_AVAILABLE]
+    return bool(available) and all(NUMBER_PATTERN.match(value) for value in available)
+
+
+class ShowTable(object):
+    """Parsed tabulated output of a show command, stored by columns.
+
+    The columns are accessed by their lowercase headers, e.g. table["rx_ok"] returns the list of the values of
+    the RX_OK column, one item per content line. Row dictionaries, the same as returned by
+    SonicHost.show_and_parse, are built on demand by rows() or to_dicts().
+    """
+
+    def __init__(self, headers, columns):
+        self.headers = headers
+        self.columns = dict(zip(headers, columns))
+        self._len = len(columns[0]) if columns else 0
+
+    @classmethod
+    def parse(cls, output_lines, header_len=1, numeric=False):
+        """Parse the tabulated output of a show command.
+
+        Args:
+            output_lines: Lines of the show command output.
+            header_len: Number of header lines above the separation line.
+            numeric: Convert numeric columns to numbers with to_number(). True to convert all the columns whose
+                values are all numbers or 'N/A', or a list of headers of the columns to convert.
+
+        Returns:
+            ShowTable instance. The table is empty if no separation line is found in the output.
+        """
+        for idx, line in enumerate(output_lines):
+            if SEP_LINE_PATTERN.match(line):
+                header_lines = output_lines[idx - header_len:idx]
+                sep_line = line
+                content_lines = output_lines[idx + 1:]
+                break
+        else:
+            return cls([], [])
+
+        # When an empty line is encountered while parsing the tabulate content, it is highly possible that the
+        # tabulate content has been drained. The empty line and rest of the lines should not be parsed.
+        for idx, line in enumerate(content_lines):
+            if len(line) == 0:
+                content_lines = content_lines[:idx]
+                break
+
+        positions = parse_column_positions(sep_line)
+        headers = [" ".join([header_line[left:right].strip().lower() for header_line in header_lines]).strip()
+                   for (left, right) in positions]
+        columns = [[line[left:right].strip() for line in content_lines] for (left, right) in positions]
+
+        if numeric:
+            for idx, header in enumerate(headers):
+                if numeric is True:
+                    convert = is_numeric_column(columns[idx])
+                else:
+                    convert = header in numeric
+                if convert:
+                    columns[idx] = [to_number(value) for value in columns[idx]]
+
+        return cls(headers, columns)
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, header):
+        return self.columns[header]
+
+    def __contains__(self, header):
+        return header in self.columns
+
+    def row(self, idx):
+        """Get one content line as a dictionary keyed by the column headers."""
+        return {header: self.columns[header][idx] for header in self.headers}
+
+    def rows(self):
+        """Iterate the content lines as dictionaries keyed by the column headers."""
+        for idx in range(self._len):
+            yield self.row(idx)
+
+    def to_dicts(self):
+        """Get all the content lines as a list of dictionaries keyed by the column headers."""
+        return list(self.rows())
+
+    def index(self, header):
+        """Get a dictionary mapping the values of a column, e.g. the interface names, to the rows."""
+        return {value: self.row(idx) for idx, value in enumerate(self.columns[header])}
@@ -0,0 +1,96 @@
+"""
+Benchmark of the parsing of 'show interfaces counters' outputs, row by row like SonicHost._parse_show did before
+ShowTable and by columns with ShowTable, both including the conversion of the RX_OK counters to numbers.
+
+Usage, from the root of the repository:
+    python -m tests.common.helpers.show_table_benchmark --ports 64 512 --calls 200
+"""
+import argparse
+import re
+import time
+
+from tests.common.helpers.show_table import ShowTable
+
+HEADERS = ["IFACE", "STATE", "RX_OK", "RX_BPS", "RX_UTIL", "RX_ERR", "RX_DRP", "RX_OVR",
+           "TX_OK", "TX_BPS", "TX_UTIL", "TX_ERR", "TX_DRP", "TX_OVR"]
+
+
+def interfaces_counters(ports):
+    """Output lines of 'show interfaces counters' for a number of ports"""
+    rows = []
+    for port in range(ports):
+        rx_ok = "{:,}".format(port * 1234567)
+        tx_ok = "{:,}".format(port * 7654321) if port % 16 else "N/A"
+        rows.append(["Ethernet{}".format(port * 4), "U", rx_ok, "12.34 KB/s", "0.00%", "0", "0", "0",
+                     tx_ok, "5.67 MB/s", "0.05%", "0", "1,024", "0"])
+    widths = [max(len(header), *(len(row[idx]) for row in rows)) for idx, header in enumerate(HEADERS)]
+    lines = ["  ".join(value.rjust(width) for value, width in zip(line, widths)) for line in [HEADERS] + rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return lines
+
+
+def legacy_parse_show(output_lines, header_len=1):
+    """SonicHost._parse_show before ShowTable, one dictionary per content line"""
+    result = []
+    for idx, line in enumerate(output_lines):
+        if re.match(r"^( *-+ *)+$", line):
+            header_lines = output_lines[idx - header_len:idx]
+            sep_line = line
+            content_lines = output_lines[idx + 1:]
+            break
+    else:
+        return result
+
+    prev = ' '
+    positions = []
+    for pos, char in enumerate(sep_line + ' '):
+        if char == '-':
+            if char != prev:
+                left = pos
+        else:
+            if char != prev:
+                positions.append((left, pos))
+        prev = char
+
+    headers = [" ".join([header_line[left:right].strip().lower() for header_line in header_lines]).strip()
+               for (left, right) in positions]
+    for content_line in content_lines:
+        if len(content_line) == 0:
+            break
+        result.append({headers[idx]: content_line[left:right].strip() for idx, (left, right) in enumerate(positions)})
+    return result
+
+
+def legacy_rx_ok(output_lines):
+    return {row["iface"]: int(row["rx_ok"].replace(",", "")) for row in legacy_parse_show(output_lines)}
+
+
+def table_rx_ok(output_lines):
+    table = ShowTable.parse(output_lines, numeric=["rx_ok"])
+    return dict(zip(table["iface"], table["rx_ok"]))
+
+
+def measure(function, output_lines, calls):
+    start = time.time()
+    for _ in range(calls):
+        function(output_lines)
+    return (time.time() - start) * 1000 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the parsing of show command tables")
+    parser.add_argument("--ports", type=int, nargs="+", default=[64, 512])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    print("{:>6} {:>16} {:>16}".format("ports", "row dicts ms", "show table ms"))
+    for ports in args.ports:
+        output_lines = interfaces_counters(ports)
+        assert ShowTable.parse(output_lines).to_dicts() == legacy_parse_show(output_lines)
+        assert table_rx_ok(output_lines) == legacy_rx_ok(output_lines)
+        print("{:>6} {:>16.3f} {:>16.3f}".format(ports, measure(legacy_rx_ok, output_lines, args.calls),
+                                                 measure(table_rx_ok, output_lines, args.calls)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,44 @@
 import logging
 import json
 import six
+from six.moves import shlex_quote
 from tests.common.helpers.constants import DEFAULT_NAMESPACE
 from tests.common.devices.sonic_asic import SonicAsic
 
 logger = logging.getLogger(__name__)
 
+# Lua script run by redis for SonicDbCli.batch. ARGV[1] is the JSON list of operations, the
+# results are returned in the same order as one JSON document. Missing HGET values are false.
+BATCH_SCRIPT = (
+    "local ops = cjson.decode(ARGV[1]) "
+    "local res = {} "
+    "for i, op in ipairs(ops) do "
+    "  local cmd = string.upper(op[1]) "
+    "  if cmd == 'HGET' then "
+    "    res[i] = redis.call('HGET', op[2], op[3]) "
+    "  elseif cmd == 'HGETALL' then "
+    "    local flat = redis.call('HGETALL', op[2]) "
+    "    local hash = {} "
+    "    for j = 1, #flat, 2 do hash[flat[j]] = flat[j + 1] end "
+    "    res[i] = hash "
+    "  elseif cmd == 'KEYS' then "
+    "    res[i] = redis.call('KEYS', op[2]) "
+    "  elseif cmd == 'SCAN' then "
+    "    local keys = {} "
+    "    local cursor = '0' "
+    "    repeat "
+    "      local reply = redis.call('SCAN', cursor, 'MATCH', op[2], 'COUNT', 1000) "
+    "      cursor = reply[1] "
+    "      for _, key in ipairs(reply[2]) do keys[#keys + 1] = key end "
+    "    until cursor == '0' "
+    "    res[i] = keys "
+    "  else "
+    "    return redis.error_reply('unsupported batch operation ' .. cmd) "
+    "  end "
+    "end "
+    "return cjson.encode(res)"
+)
+
 
 class SonicDbCli(object):
     """Base class for interface to SonicDb using sonic-db-cli command.
@@ -15,10 +48,16 @@ class SonicDbCli(object):
             database: database number.
         """
 
+    # maximum number of operations sent by batch() in one sonic-db-cli command
+    BATCH_SIZE = 500
+
     def __init__(self, host, database='APPL_DB'):
         """Initializes base class with defaults"""
         self.host = host
         self.database = database
+        # cache of table dumps and of the indexes built on them, dropped by refresh()
+        self.tables = {}
+        self.indexes = {}
 
     def _cli_prefix(self):
         """Builds opening of sonic-db-cli command for other methods."""
@@ -175,6 +214,111 @@ class SonicDbCli(object):
         parsed = json.loads(output["stdout"])
         return parsed
 
+    def batch(self, ops):
+        """
+        Runs a list of read operations in one sonic-db-cli command.
+
+        The operations are run by a Lua script on the redis server of the database, so a whole batch
+        costs one round trip to the DUT instead of one per key.
+
+        Args:
+            ops: list of operations, each one of:
+                ("HGET", key, field)
+                ("HGETALL", key)
+                ("KEYS", pattern)
+                ("SCAN", pattern)
+
+        Returns:
+            List with the result of each operation, in order. HGET gives the value or None when the key or
+            field is not present, HGETALL gives a dictionary, empty when the key is not present, KEYS and
+            SCAN give a list of keys.
+
+        """
+        results = []
+        for start in range(0, len(ops), self.BATCH_SIZE):
+            chunk = [list(op) for op in ops[start:start + self.BATCH_SIZE]]
+            cmd = self._cli_prefix() + "EVAL {} 0 {}".format(shlex_quote(BATCH_SCRIPT), shlex_quote(json.dumps(chunk)))
+            logger.debug("SONIC-DB-CLI: batch of %d operations", len(chunk))
+            result = self._run_and_raise(cmd)
+            replies = json.loads(result["stdout"])
+            # cjson encodes empty tables as objects
+            if replies == {}:
+                replies = []
+            for op, reply in zip(chunk, replies):
+                cmd = op[0].upper()
+                if cmd == "HGET":
+                    reply = reply if reply is not False else None
+                elif cmd in ["KEYS", "SCAN"]:
+                    reply = reply or []
+                results.append(reply)
+        return results
+
+    def hget_key_values(self, keys, field):
+        """
+        Gets the value of a hash field for a list of keys in one batch.
+
+        Args:
+            keys: list of full key names.
+            field: Name of the hash field to get.
+
+        Returns:
+            Dictionary of key to value.
+
+        Raises:
+            SonicDbKeyNotFound: If a key or field has no value or is not present.
+
+        """
+        keys = list(keys)
+        values = self.batch([("HGET", key, field) for key in keys])
+        missing = [key for key, value in zip(keys, values) if value is None]
+        if missing:
+            raise SonicDbKeyNotFound("Keys: %s, field: %s not found in %s" % (missing, field, self.database))
+        return dict(zip(keys, values))
+
+    def get_table(self, table, refresh=False):
+        """
+        Returns the dump of a table, from the cache unless refresh is True.
+
+        Args:
+            table: The table to dump.
+            refresh: If True, get a fresh copy from the DUT and drop the indexes built on the old one.
+
+        """
+        if refresh or table not in self.tables:
+            self.tables[table] = self.dump(table)
+            for index_key in [k for k in self.indexes if k[0] == table]:
+                del self.indexes[index_key]
+        return self.tables[table]
+
+    def get_index(self, table, name, key_func, refresh=False):
+        """
+        Returns a secondary index of a table dump, built once per dump.
+
+        Args:
+            table: The table to index.
+            name: Name of the index.
+            key_func: Function of (key, entry) returning the indexed value of a table entry, None to skip it.
+            refresh: If True, get a fresh dump of the table and rebuild the index.
+
+        Returns:
+            Dictionary of indexed value to table key.
+
+        """
+        entries = self.get_table(table, refresh)
+        if (table, name) not in self.indexes:
+            index = {}
+            for key, entry in entries.items():
+                value = key_func(key, entry)
+                if value is not None:
+                    index.setdefault(value, key)
+            self.indexes[(table, name)] = index
+        return self.indexes[(table, name)]
+
+    def refresh(self):
+        """Drops all the cached table dumps and indexes."""
+        self.tables = {}
+        self.indexes = {}
+
 
 class AsicDbCli(SonicDbCli):
     """
@@ -205,6 +349,15 @@ class AsicDbCli(SonicDbCli):
         self.port_key_list = []
         self.lagid_key_list = []
 
+    def refresh(self):
+        """Drops all the cached keys, table dumps and indexes."""
+        super(AsicDbCli, self).refresh()
+        self.hostif_portidlist = []
+        self.hostif_table = []
+        self.system_port_key_list = []
+        self.port_key_list = []
+        self.lagid_key_list = []
+
     def get_switch_key(self):
         """Returns a list of keys in the switch table"""
         cmd = self._cli_prefix() + "KEYS %s*" % AsicDbCli.ASIC_SWITCH_TABLE
@@ -309,7 +462,7 @@ class AsicDbCli(SonicDbCli):
         if self.hostif_table != [] and refresh is False:
             hostif_table = self.hostif_table
         else:
-            hostif_table = self.dump("%s:" % AsicDbCli.ASIC_HOSTIF_TABLE)
+            hostif_table = self.get_table("%s:" % AsicDbCli.ASIC_HOSTIF_TABLE, refresh=True)
             self.hostif_table = hostif_table
 
         return hostif_table
@@ -349,12 +502,11 @@ class AsicDbCli(SonicDbCli):
         Raises:
             SonicDbKeyNotFound: If no hostif exists with the portid provided.
         """
-        hostif_table = self.get_hostif_table(refresh)
-
-        for hostif_key in hostif_table:
-            hostif_portid = hostif_table[hostif_key]['value']['SAI_HOSTIF_ATTR_OBJ_ID']
-            if hostif_portid == portid:
-                return hostif_key
+        self.get_hostif_table(refresh)
+        hostif_by_portid = self.get_index("%s:" % AsicDbCli.ASIC_HOSTIF_TABLE, "portid",
+                                          lambda key, entry: entry['value']['SAI_HOSTIF_ATTR_OBJ_ID'])
+        if portid in hostif_by_portid:
+            return hostif_by_portid[portid]
 
         raise SonicDbKeyNotFound("Can't find hostif in asicdb with portid: %s", portid)
 
@@ -429,6 +429,200 @@ def find_longest_matches(nodeid, conditions):
     return longest_matches
 
 
+# Separators of the nodeid path segments, e.g. "acl/test_acl.py::TestBasicAcl::test_x"
+NODEID_SEP_PATTERN = re.compile('/|::')
+ISSUE_URL_PATTERN = re.compile('https?://[^ )]+')
+
+
+def split_nodeid(nodeid):
+    """Split a nodeid or a conditions entry name into path segments.
+
+    Each segment except the last one ends with its separator. The last segment is what is left after the last
+    separator, it may be a partial name like "test_decap[ttl=pipe" or an empty string.
+
+    Args:
+        nodeid (str): Full test case name or name of a conditions entry.
+
+    Returns:
+        tuple: (list of complete segments, rest of the string)
+    """
+    segments = []
+    start = 0
+    for match in NODEID_SEP_PATTERN.finditer(nodeid):
+        segments.append(nodeid[start:match.end()])
+        start = match.end()
+    return segments, nodeid[start:]
+
+
+class ConditionsTrie(object):
+    """Prefix trie of the conditions entries keyed by nodeid path segments.
+
+    find_longest_matches scans all the conditions entries for every collected test case. The trie only walks the
+    path segments of the nodeid and compares the entries stored along the path, so the lookup cost depends on the
+    depth of the nodeid instead of the number of conditions entries.
+    """
+
+    def __init__(self, conditions):
+        self.root = {'children': {}, 'entries': []}
+        for index, condition in enumerate(conditions):
+            # condition is a dict which has only one item, so we use condition.keys()[0] to get its key.
+            segments, rest = split_nodeid(list(condition.keys())[0])
+            node = self.root
+            for segment in segments:
+                node = node['children'].setdefault(segment, {'children': {}, 'entries': []})
+            node['entries'].append((rest, index, condition))
+
+    def find_matches(self, nodeid):
+        """Find the conditions entries matching the given test case name.
+
+        Returns the same entries, in the same order, as find_longest_matches.
+
+        Args:
+            nodeid (str): Full test case name
+
+        Returns:
+            list: Matched conditions entries
+        """
+        segments, rest = split_nodeid(nodeid)
+        matches = []
+        node = self.root
+        for depth in range(len(segments) + 1):
+            if node['entries']:
+                remaining = ''.join(segments[depth:]) + rest
+                matches.extend((index, condition) for prefix, index, condition in node['entries']
+                               if remaining.startswith(prefix))
+            if depth == len(segments):
+                break
+            node = node['children'].get(segments[depth])
+            if node is None:
+                break
+        return [condition for _, condition in sorted(matches, key=lambda match: match[0])]
+
+
+def entry_conditions(entry):
+    """Get all the condition strings of the marks in a conditions entry.
+
+    Args:
+        entry (dict): Conditions entry, a dict which has only one item.
+
+    Returns:
+        list: Condition strings, empty ones are not included.
+    """
+    results = []
+    for mark_details in list(entry.values())[0].values():
+        mark_conditions = mark_details.get('conditions', None) if mark_details else None
+        if not mark_conditions:
+            continue
+        if not isinstance(mark_conditions, list):
+            mark_conditions = [mark_conditions]
+        results.extend(c for c in mark_conditions if c is not None and c.strip() != '')
+    return results
+
+
+def check_issues_status(issues, session):
+    """Get active state of the issues, querying the ones which are not in the session cache in one parallel batch.
+
+    Args:
+        issues (list of str): List of issue URLs.
+        session (obj): Pytest session object, for getting cached data.
+
+    Returns:
+        dict: Key is issue URL, value is either True or False based on issue state.
+    """
+    issue_status_cache = session.config.cache.get('ISSUE_STATUS', {})
+    proxies = session.config.cache.get('PROXIES', {})
+
+    unknown_issues = sorted(set(issue_url for issue_url in issues if issue_url not in issue_status_cache))
+    if unknown_issues:
+        results = check_issues(unknown_issues, proxies=proxies)
+        issue_status_cache.update(results)
+        session.config.cache.set('ISSUE_STATUS', issue_status_cache)
+
+    return issue_status_cache
+
+
+def replace_issue_urls(condition_str, issue_status):
+    """Replace issue URLs in the condition string with 'True' or 'False' based on the issue state.
+
+    Args:
+        condition_str (str): Condition string that may contain issue URLs.
+        issue_status (dict): Key is issue URL, value is either True or False based on issue state.
+
+    Returns:
+        str: New condition string with issue URLs replaced with 'True' or 'False'.
+    """
+    for issue_url in ISSUE_URL_PATTERN.findall(condition_str):
+        # Consider the issue as active anyway if unable to get issue state
+        condition_str = condition_str.replace(issue_url, str(issue_status.get(issue_url, True)))
+    return condition_str
+
+
+class ConditionEvaluator(object):
+    """Evaluate condition strings against one snapshot of the basic facts.
+
+    Issue URLs of all the conditions are resolved in one batch by prepare(). Each condition string is compiled
+    once, and its result is memoized, as the same conditions are evaluated for many test cases.
+    """
+
+    def __init__(self, basic_facts, session):
+        self.basic_facts = basic_facts
+        self.session = session
+        self.issue_status = {}
+        self.compiled = {}
+        self.results = {}
+
+    def prepare(self, conditions):
+        """Resolve the issue URLs of the condition strings in one batch.
+
+        Args:
+            conditions (iterable of str): Condition strings which are going to be evaluated.
+        """
+        issues = set()
+        for condition in conditions:
+            issues.update(ISSUE_URL_PATTERN.findall(condition))
+        if issues:
+            self.issue_status = check_issues_status(issues, self.session)
+
+    def _compile(self, condition):
+        if condition not in self.compiled:
+            unknown_issues = [issue_url for issue_url in ISSUE_URL_PATTERN.findall(condition)
+                              if issue_url not in self.issue_status]
+            if unknown_issues:
+                self.issue_status = check_issues_status(unknown_issues, self.session)
+            condition_str = replace_issue_urls(condition, self.issue_status)
+            try:
+                code = compile(condition_str, '<condition>', 'eval')
+            except Exception:
+                logger.exception('Failed to compile condition, raw_condition={}, condition_str={}'.format(
+                    condition,
+                    condition_str))
+                code = None
+            self.compiled[condition] = (condition_str, code)
+        return self.compiled[condition]
+
+    def evaluate(self, condition):
+        """Evaluate a raw condition string.
+
+        Args:
+            condition (str): A raw condition string that may contain issue URLs.
+
+        Returns:
+            bool: True or False based on condition string evaluation result.
+        """
+        if condition not in self.results:
+            condition_str, code = self._compile(condition)
+            result = False
+            if code is not None:
+                try:
+                    result = bool(eval(code, self.basic_facts))
+                except Exception:
+                    logger.exception('Failed to evaluate condition, raw_condition={}, condition_str={}'.format(
+                        condition,
+                        condition_str))
+            self.results[condition] = result
+        return self.results[condition]
+
+
 def update_issue_status(condition_str, session):
     """Replace issue URL with 'True' or 'False' based on its active state.
 
@@ -444,32 +638,15 @@ def update_issue_status(condition_str, session):
     Returns:
         str: New condition string with issue URLs already replaced with 'True' or 'False'.
     """
-    issues = re.findall('https?://[^ )]+', condition_str)
+    issues = ISSUE_URL_PATTERN.findall(condition_str)
     if not issues:
         logger.debug('No issue specified in condition')
         return condition_str
 
-    issue_status_cache = session.config.cache.get('ISSUE_STATUS', {})
-    proxies = session.config.cache.get('PROXIES', {})
+    return replace_issue_urls(condition_str, check_issues_status(issues, session))
 
-    unknown_issues = [issue_url for issue_url in issues if issue_url not in issue_status_cache]
-    if unknown_issues:
-        results = check_issues(unknown_issues, proxies=proxies)
-        issue_status_cache.update(results)
-        session.config.cache.set('ISSUE_STATUS', issue_status_cache)
-
-    for issue_url in issues:
-        if issue_url in issue_status_cache:
-            replace_str = str(issue_status_cache[issue_url])
-        else:
-            # Consider the issue as active anyway if unable to get issue state
-            replace_str = 'True'
 
-        condition_str = condition_str.replace(issue_url, replace_str)
-    return condition_str
-
-
-def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basic_facts, session):
+def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basic_facts, session, evaluator=None):
     """Evaluate a condition string based on supplied basic facts.
 
     Args:
@@ -481,6 +658,7 @@ def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basi
         basic_facts (dict): A one level dict with basic facts. Keys of the dict can be used as variables in the
             condition string evaluation.
         session (obj): Pytest session object, for getting cached data.
+        evaluator (ConditionEvaluator): Optional evaluator of precompiled conditions with memoized results.
 
     Returns:
         bool: True or False based on condition string evaluation result.
@@ -488,6 +666,12 @@ def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basi
     if condition is None or condition.strip() == '':
         return True    # Empty condition item will be evaluated as True. Equivalent to be ignored.
 
+    if evaluator is not None:
+        condition_result = evaluator.evaluate(condition)
+        if condition_result and dynamic_update_skip_reason:
+            mark_details['reason'].append(condition)
+        return condition_result
+
     condition_str = update_issue_status(condition, session)
     try:
         condition_result = bool(eval(condition_str, basic_facts))
@@ -502,7 +686,7 @@ def evaluate_condition(dynamic_update_skip_reason, mark_details, condition, basi
 
 
 def evaluate_conditions(dynamic_update_skip_reason, mark_details, conditions, basic_facts,
-                        conditions_logical_operator, session):
+                        conditions_logical_operator, session, evaluator=None):
     """Evaluate all the condition strings.
 
     Evaluate a single condition or multiple conditions. If multiple conditions are supplied, apply AND or OR
@@ -517,6 +701,7 @@ def evaluate_conditions(dynamic_update_skip_reason, mark_details, conditions, ba
             condition string evaluation.
         conditions_logical_operator (str): logical operator which should be applied to conditions(by default 'AND')
         session (obj): Pytest session object, for getting cached data.
+        evaluator (ConditionEvaluator): Optional evaluator of precompiled conditions with memoized results.
 
     Returns:
         bool: True or False based on condition strings evaluation result.
@@ -526,15 +711,16 @@ def evaluate_conditions(dynamic_update_skip_reason, mark_details, conditions, ba
     if isinstance(conditions, list):
         # Apply 'AND' or 'OR' operation to list of conditions based on conditions_logical_operator(by default 'AND')
         if conditions_logical_operator == 'OR':
-            return any([evaluate_condition(dynamic_update_skip_reason, mark_details, c, basic_facts, session)
-                        for c in conditions])
+            return any([evaluate_condition(dynamic_update_skip_reason, mark_details, c, basic_facts, session,
+                                           evaluator) for c in conditions])
         else:
-            return all([evaluate_condition(dynamic_update_skip_reason, mark_details, c, basic_facts, session)
-                        for c in conditions])
+            return all([evaluate_condition(dynamic_update_skip_reason, mark_details, c, basic_facts, session,
+                                           evaluator) for c in conditions])
     else:
         if conditions is None or conditions.strip() == '':
             return True
-        return evaluate_condition(dynamic_update_skip_reason, mark_details, conditions, basic_facts, session)
+        return evaluate_condition(dynamic_update_skip_reason, mark_details, conditions, basic_facts, session,
+                                  evaluator)
 
 
 def pytest_collection(session):
@@ -581,9 +767,16 @@ def pytest_collection_modifyitems(session, config, items):
     logger.info('Available basic facts that can be used in conditional skip:\n{}'.format(
         json.dumps(basic_facts, indent=2)))
     dynamic_update_skip_reason = session.config.option.dynamic_update_skip_reason
-    for item in items:
-        longest_matches = find_longest_matches(item.nodeid, conditions)
 
+    conditions_trie = ConditionsTrie(conditions)
+    items_matches = [(item, conditions_trie.find_matches(item.nodeid)) for item in items]
+
+    # Resolve the issue URLs of all the conditions that are going to be evaluated in one batch
+    evaluator = ConditionEvaluator(basic_facts, session)
+    matched_entries = dict((id(match), match) for _, matches in items_matches for match in matches)
+    evaluator.prepare(set(condition for entry in matched_entries.values() for condition in entry_conditions(entry)))
+
+    for item, longest_matches in items_matches:
         if longest_matches:
             logger.debug('Found match "{}" for test case "{}"'.format(longest_matches, item.nodeid))
 
@@ -601,7 +794,8 @@ def pytest_collection_modifyitems(session, config, items):
                             add_mark = True
                         else:
                             add_mark = evaluate_conditions(dynamic_update_skip_reason, mark_details, mark_conditions,
-                                                           basic_facts, conditions_logical_operator, session)
+                                                           basic_facts, conditions_logical_operator, session,
+                                                           evaluator)
 
                     if add_mark:
                         reason = ''
@@ -1,13 +1,13 @@
 import json
 import logging
 import os
-import re
 import time
 import pprint
 
 from . import system_msg_handler
 
 from .system_msg_handler import AnsibleLogAnalyzer as ansible_loganalyzer
+from .regex_set import get_regex_set
 from os.path import join, split
 
 ANSIBLE_LOGANALYZER_MODULE = system_msg_handler.__file__.replace(r".pyc", ".py")
@@ -77,6 +77,8 @@ class LogAnalyzer:
         ansible_host.loganalyzer = self
         self.dut_run_dir = dut_run_dir
         self.extracted_syslog = os.path.join(self.dut_run_dir, "syslog")
+        # Position of the start markers in the log files, used by extract_log to seek directly to them
+        self.marker_index = os.path.join(self.dut_run_dir, "loganalyzer.index")
         self.marker_prefix = marker_prefix.replace(' ', '_')
         # use existing syslog msg as marker to search in logs instead of writing a new one
         self.start_marker = start_marker
@@ -295,8 +297,8 @@ class LogAnalyzer:
         Adds the marker to the log files
         """
         start_marker = ".".join((self.marker_prefix, time.strftime("%Y-%m-%d-%H:%M:%S", time.gmtime())))
-        cmd = "python {run_dir}/loganalyzer.py --action init --run_id {start_marker}"\
-            .format(run_dir=self.dut_run_dir, start_marker=start_marker)
+        cmd = "python {run_dir}/loganalyzer.py --action init --run_id {start_marker} --marker_index {marker_index}"\
+            .format(run_dir=self.dut_run_dir, start_marker=start_marker, marker_index=self.marker_index)
         if log_files:
             cmd += " --logs {}".format(','.join(log_files))
 
@@ -331,8 +333,11 @@ class LogAnalyzer:
 
         if not self.start_marker:
             start_string = 'start-LogAnalyzer-{}'.format(marker)
+            # Only the markers placed by init() are recorded in the marker index
+            marker_index = self.marker_index
         else:
             start_string = self.start_marker
+            marker_index = None
 
         with DisableLogrotateCronContext(self.ansible_host):
             # Add end marker into DUT syslog
@@ -340,16 +345,18 @@ class LogAnalyzer:
 
             # On DUT extract syslog files from /var/log/ and create one file by location - /tmp/syslog
             self.ansible_host.extract_log(directory='/var/log', file_prefix='syslog', start_string=start_string,
-                                          target_filename=self.extracted_syslog)
+                                          target_filename=self.extracted_syslog, marker_index=marker_index)
             for idx, path in enumerate(self.additional_files):
                 file_dir, file_name = split(path)
                 extracted_file_name = os.path.join(self.dut_run_dir, file_name)
                 if self.additional_start_str and self.additional_start_str[idx] != '':
                     start_str = self.additional_start_str[idx]
+                    start_index = None
                 else:
                     start_str = start_string
+                    start_index = marker_index
                 self.ansible_host.extract_log(directory=file_dir, file_prefix=file_name, start_string=start_str,
-                                              target_filename=extracted_file_name)
+                                              target_filename=extracted_file_name, marker_index=start_index)
 
         # Download extracted logs from the DUT to the temporal folder defined in SYSLOG_TMP_FOLDER
         self.save_extracted_log(dest=tmp_folder)
@@ -362,9 +369,9 @@ class LogAnalyzer:
             self.save_extracted_file(dest=tmp_folder, src=extracted_file_name)
             file_list.append(tmp_folder)
 
-        match_messages_regex = re.compile('|'.join(self.match_regex)) if len(self.match_regex) else None
-        ignore_messages_regex = re.compile('|'.join(self.ignore_regex)) if len(self.ignore_regex) else None
-        expect_messages_regex = re.compile('|'.join(self.expect_regex)) if len(self.expect_regex) else None
+        match_messages_regex = get_regex_set(self.match_regex)
+        ignore_messages_regex = get_regex_set(self.ignore_regex)
+        expect_messages_regex = get_regex_set(self.expect_regex)
 
         logging.debug("Analyze files {}".format(file_list))
         logging.debug('    match_regex="{}"'.format(match_messages_regex.pattern if match_messages_regex else ''))
@@ -379,8 +386,7 @@ class LogAnalyzer:
                 logging.debug("{} file content:\n\n{}".format(folder, fo.read()))
             os.remove(folder)
 
-        expected_lines_total = []
-        unused_regex_messages = []
+        used_expect_regex = set()
 
         for key, value in list(analyzer_parse_result.items()):
             matching_lines, expecting_lines = value
@@ -390,15 +396,11 @@ class LogAnalyzer:
                                                     "expected_match": len(expecting_lines)}
             analyzer_summary["match_messages"][key] = matching_lines
             analyzer_summary["expect_messages"][key] = expecting_lines
-            expected_lines_total.extend(expecting_lines)
+            for line in expecting_lines:
+                used_expect_regex.update(expect_messages_regex.findall(line))
 
         # Find unused regex matches
-        for regex in self.expect_regex:
-            for line in expected_lines_total:
-                if re.search(regex, line):
-                    break
-            else:
-                unused_regex_messages.append(regex)
+        unused_regex_messages = [regex for regex in self.expect_regex if regex not in used_expect_regex]
         analyzer_summary["total"]["expected_missing_match"] = len(unused_regex_messages)
         analyzer_summary["unused_expected_regexp"] = unused_regex_messages
         logging.debug("Analyzer summary: {}".format(pprint.pformat(analyzer_summary)))
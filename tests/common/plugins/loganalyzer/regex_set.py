@@ -0,0 +1,159 @@
+"""
+Matching of log lines against large sets of regular expressions.
+
+LogAnalyzer used to join all the match/ignore/expect regular expressions into three big alternations.
+With hundreds of ignore regular expressions every log line had to go through all of them.
+
+RegexSet extracts from each regular expression a literal string which must be present in any line matched by
+it. All the literals are searched in a line with a single scan, and only the regular expressions whose literal
+was found (plus the ones without a usable literal) are run against the line.
+"""
+import functools
+import re
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+
+# Literals shorter than this do not filter anything out, regular expressions with such literals are always run
+MIN_LITERAL_LENGTH = 3
+
+
+def _required_literals(parsed, literals):
+    """
+    @summary: Collect the literal strings which must be present in any string matched by a parsed regex.
+    @param parsed: Regular expression parsed by sre_parse.
+    @param literals: List to add the found literals to.
+    """
+    current = []
+    for op, av in parsed:
+        if op == sre_constants.LITERAL:
+            current.append(chr(av))
+            continue
+
+        if current:
+            literals.append("".join(current))
+            current = []
+
+        if op == sre_constants.SUBPATTERN:
+            add_flags, sub_pattern = av[1], av[3]
+            if not add_flags & re.IGNORECASE:
+                _required_literals(sub_pattern, literals)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            min_repeat, sub_pattern = av[0], av[2]
+            if min_repeat > 0:
+                _required_literals(sub_pattern, literals)
+
+    if current:
+        literals.append("".join(current))
+
+
+def extract_literal(regex):
+    """
+    @summary: Get the longest literal string which must be present in any string matched by the regex.
+    @param regex: Regular expression string.
+    @return: The literal string, None if the regex has no literal usable for prefiltering.
+    """
+    try:
+        parsed = sre_parse.parse(regex)
+    except (re.error, RecursionError):
+        return None
+
+    # Global flags are kept in "state" since Python 3.11 and in "pattern" before
+    state = getattr(parsed, "state", None) or parsed.pattern
+    if state.flags & re.IGNORECASE:
+        return None
+
+    literals = []
+    _required_literals(parsed, literals)
+    literal = max(literals, key=len) if literals else None
+    if literal is None or len(literal) < MIN_LITERAL_LENGTH:
+        return None
+
+    return literal
+
+
+class RegexSet(object):
+    """
+    Set of regular expressions matched against log lines with a literal prefilter.
+
+    Instances can be used in place of the regex objects compiled from the joined regular expressions:
+    findall() returns a non empty list if any of the regular expressions matches the line.
+    """
+
+    def __init__(self, regexes):
+        self.regexes = list(regexes)
+        self.pattern = "|".join(self.regexes)
+        self.compiled = [re.compile(regex) for regex in self.regexes]
+
+        # Indexes of the regexes which must be run against every line
+        self.unfiltered = []
+        # Literal -> indexes of the regexes having this literal
+        literal_regexes = {}
+        for index, regex in enumerate(self.regexes):
+            literal = extract_literal(regex)
+            if literal is None:
+                self.unfiltered.append(index)
+            else:
+                literal_regexes.setdefault(literal, []).append(index)
+
+        # The lookahead reports at most one literal per position, the longest one as the literals are
+        # sorted by length. Literals which are prefixes of the reported one are also present at this position.
+        literals = sorted(literal_regexes, key=len, reverse=True)
+        self.candidates = {}
+        for literal in literals:
+            self.candidates[literal] = [index for prefix in literals if literal.startswith(prefix)
+                                        for index in literal_regexes[prefix]]
+
+        if literals:
+            self.literals_regex = re.compile("(?=({}))".format("|".join(re.escape(literal) for literal in literals)))
+        else:
+            self.literals_regex = None
+
+    def __len__(self):
+        return len(self.regexes)
+
+    def candidate_indexes(self, line):
+        """
+        @summary: Get indexes of the regexes which may match the line, in the order of the regexes.
+        """
+        if self.literals_regex is None:
+            return self.unfiltered
+
+        indexes = set(self.unfiltered)
+        for literal in set(self.literals_regex.findall(line)):
+            indexes.update(self.candidates[literal])
+
+        return sorted(indexes)
+
+    def findall(self, line):
+        """
+        @summary: Find all the regexes matching the line.
+        @return: List of regex strings matching the line.
+        """
+        return [self.regexes[index] for index in self.candidate_indexes(line) if self.compiled[index].search(line)]
+
+
+@functools.lru_cache(maxsize=64)
+def _get_regex_set(regexes):
+    return RegexSet(regexes)
+
+
+def get_regex_set(regexes):
+    """
+    @summary: Get a RegexSet for the list of regex strings.
+
+    Compiled sets are cached, so the common regular expressions are compiled once per session
+    no matter how many tests and DUTs are analyzed.
+
+    @param regexes: List of regex strings.
+    @return: RegexSet instance, None if the list is empty.
+    """
+    if not regexes:
+        return None
+
+    return _get_regex_set(tuple(regexes))
@@ -1,7 +1,9 @@
 
 import logging
 import copy
+import functools
 import json
+import time
 
 import pytest
 
@@ -9,15 +11,21 @@ from collections import defaultdict
 
 from tests.common.plugins.sanity_check import constants
 from tests.common.plugins.sanity_check import checks
+from tests.common.plugins.sanity_check import snapshot
 from tests.common.plugins.sanity_check.checks import *      # noqa: F401, F403
 from tests.common.plugins.sanity_check.recover import recover
 from tests.common.plugins.sanity_check.constants import STAGE_PRE_TEST, STAGE_POST_TEST
 from tests.common.helpers.assertions import pytest_assert as pt_assert
+from tests.common.helpers.parallel import parallel_run_threaded
 
 logger = logging.getLogger(__name__)
 
 SUPPORTED_CHECKS = checks.CHECK_ITEMS
 
+SNAPSHOT_TIMEOUT = 600
+# The check fixtures time out their parallel_run after 600 or 1000 seconds
+CONCURRENT_CHECKS_TIMEOUT = 1800
+
 
 def pytest_sessionfinish(session, exitstatus):
 
@@ -106,16 +114,74 @@ def filter_check_items(tbinfo, check_items):
     return filtered_check_items
 
 
+def log_check_times(check_times):
+    """
+    @summary: Log the time spent by each check item, longest first.
+    @param check_times: A dictionary in which key is the check item and value is a tuple of the time spent in
+                        seconds and how the check item was evaluated.
+    """
+    for item, (check_time, mode) in sorted(list(check_times.items()), key=lambda x: x[1][0], reverse=True):
+        logger.info("Sanity check item {} took {:.2f} seconds ({})".format(item, check_time, mode))
+
+
+def do_snapshot_checks(request, check_items, *args, **kwargs):
+    """
+    @summary: Run the check items concurrently, evaluating the check items in snapshot.SNAPSHOT_CHECKS on one
+              health snapshot collected per DUT.
+    @return: A dictionary in which key is the check item and value is a tuple of its results, the time spent in
+             seconds and how it was evaluated.
+    """
+    duthosts = request.getfixturevalue("duthosts")
+    check_fixtures = dict((item, request.getfixturevalue(item)) for item in check_items)
+    snapshot_items = [item for item in check_items if item in snapshot.SNAPSHOT_CHECKS]
+
+    snapshots = {}
+    if snapshot_items:
+        start = time.time()
+        collect_functions = [functools.partial(snapshot.collect_snapshot, dut, snapshot_items) for dut in duthosts]
+        outputs = parallel_run_threaded(collect_functions, timeout=SNAPSHOT_TIMEOUT,
+                                        thread_count=len(collect_functions))
+        snapshots = dict((dut.hostname, output) for dut, output in zip(duthosts, outputs))
+        logger.info("Collected sanity check snapshots in {:.2f} seconds".format(time.time() - start))
+
+    def _run_check(item):
+        start = time.time()
+        results = None
+        mode = "snapshot"
+        if item in snapshot_items:
+            results = snapshot.evaluate_snapshot(item, duthosts, snapshots)
+        if results is None:
+            mode = "check"
+            results = check_fixtures[item](*args, **kwargs)
+        return results, time.time() - start, mode
+
+    check_functions = [functools.partial(_run_check, item) for item in check_items]
+    outputs = parallel_run_threaded(check_functions, timeout=CONCURRENT_CHECKS_TIMEOUT,
+                                    thread_count=len(check_functions))
+    return dict(zip(check_items, outputs))
+
+
 def do_checks(request, check_items, *args, **kwargs):
     check_results = []
+    check_times = {}
+    if request.config.option.sanity_snapshot and check_items:
+        item_outputs = do_snapshot_checks(request, check_items, *args, **kwargs)
+    else:
+        item_outputs = {}
+        for item in check_items:
+            start = time.time()
+            check_fixture = request.getfixturevalue(item)
+            item_outputs[item] = (check_fixture(*args, **kwargs), time.time() - start, "check")
+
     for item in check_items:
-        check_fixture = request.getfixturevalue(item)
-        results = check_fixture(*args, **kwargs)
+        results, check_time, mode = item_outputs[item]
+        check_times[item] = (check_time, mode)
         logger.debug("check results of each item {}".format(results))
         if results and isinstance(results, list):
             check_results.extend(results)
         elif results:
             check_results.append(results)
+    log_check_times(check_times)
     return check_results
 
 
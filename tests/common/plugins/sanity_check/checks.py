@@ -11,7 +11,7 @@ from tests.common.dualtor.constants import UPPER_TOR, LOWER_TOR, NIC
 from tests.common.dualtor.dual_tor_common import CableType, active_standby_ports                # noqa F401
 from tests.common.cache import FactsCache
 from tests.common.plugins.sanity_check.constants import STAGE_PRE_TEST, STAGE_POST_TEST
-from tests.common.helpers.parallel import parallel_run, reset_ansible_local_tmp
+from tests.common.helpers.parallel import parallel_run, reset_ansible_local_tmp, worker_pool_target
 from tests.common.dualtor.mux_simulator_control import _probe_mux_ports
 from tests.common.fixtures.duthost_utils import check_bgp_router_id
 
@@ -101,163 +101,170 @@ def _find_down_ports(dut, phy_interfaces, ip_interfaces):
     return down_ports
 
 
-@pytest.fixture(scope="module")
-def check_interfaces(duthosts):
-    init_result = {"failed": False, "check_item": "interfaces"}
+@worker_pool_target
+@reset_ansible_local_tmp
+def _check_interfaces_on_dut(*args, **kwargs):
+    dut = kwargs['node']
+    results = kwargs['results']
+    logger.info("Checking interfaces status on %s..." % dut.hostname)
 
-    def _check(*args, **kwargs):
-        result = parallel_run(_check_interfaces_on_dut, args, kwargs, duthosts.frontend_nodes,
-                              timeout=600, init_result=init_result)
-        return list(result.values())
+    networking_uptime = dut.get_networking_uptime().seconds
+    timeout = max((SYSTEM_STABILIZE_MAX_TIME - networking_uptime), 0)
+    interval = 20
+    logger.info("networking_uptime=%d seconds, timeout=%d seconds, interval=%d seconds" %
+                (networking_uptime, timeout, interval))
 
-    @reset_ansible_local_tmp
-    def _check_interfaces_on_dut(*args, **kwargs):
-        dut = kwargs['node']
-        results = kwargs['results']
-        logger.info("Checking interfaces status on %s..." % dut.hostname)
-
-        networking_uptime = dut.get_networking_uptime().seconds
-        timeout = max((SYSTEM_STABILIZE_MAX_TIME - networking_uptime), 0)
-        interval = 20
-        logger.info("networking_uptime=%d seconds, timeout=%d seconds, interval=%d seconds" %
-                    (networking_uptime, timeout, interval))
-
-        down_ports = []
-        check_result = {"failed": True, "check_item": "interfaces", "host": dut.hostname}
-        for asic in dut.asics:
-            ip_interfaces = []
-            cfg_facts = asic.config_facts(host=dut.hostname,
-                                          source="persistent", verbose=False)['ansible_facts']
-            phy_interfaces = [k for k, v in list(cfg_facts["PORT"].items()) if
-                              "admin_status" in v and v["admin_status"] == "up"]
-            if "PORTCHANNEL_INTERFACE" in cfg_facts:
-                ip_interfaces = list(cfg_facts["PORTCHANNEL_INTERFACE"].keys())
-            if "VLAN_INTERFACE" in cfg_facts:
-                ip_interfaces += list(cfg_facts["VLAN_INTERFACE"].keys())
-
-            logger.info(json.dumps(phy_interfaces, indent=4))
-            logger.info(json.dumps(ip_interfaces, indent=4))
-
-            if timeout == 0:  # Check interfaces status, do not retry.
-                down_ports += _find_down_ports(asic, phy_interfaces, ip_interfaces)
+    down_ports = []
+    check_result = {"failed": True, "check_item": "interfaces", "host": dut.hostname}
+    for asic in dut.asics:
+        ip_interfaces = []
+        cfg_facts = asic.config_facts(host=dut.hostname,
+                                      source="persistent", verbose=False)['ansible_facts']
+        phy_interfaces = [k for k, v in list(cfg_facts["PORT"].items()) if
+                          "admin_status" in v and v["admin_status"] == "up"]
+        if "PORTCHANNEL_INTERFACE" in cfg_facts:
+            ip_interfaces = list(cfg_facts["PORTCHANNEL_INTERFACE"].keys())
+        if "VLAN_INTERFACE" in cfg_facts:
+            ip_interfaces += list(cfg_facts["VLAN_INTERFACE"].keys())
+
+        logger.info(json.dumps(phy_interfaces, indent=4))
+        logger.info(json.dumps(ip_interfaces, indent=4))
+
+        if timeout == 0:  # Check interfaces status, do not retry.
+            down_ports += _find_down_ports(asic, phy_interfaces, ip_interfaces)
+            check_result["failed"] = True if len(down_ports) > 0 else False
+            check_result["down_ports"] = down_ports
+        else:  # Retry checking interface status
+            start = time.time()
+            elapsed = 0
+            while elapsed < timeout:
+                down_ports = _find_down_ports(asic, phy_interfaces, ip_interfaces)
                 check_result["failed"] = True if len(down_ports) > 0 else False
                 check_result["down_ports"] = down_ports
-            else:  # Retry checking interface status
-                start = time.time()
-                elapsed = 0
-                while elapsed < timeout:
-                    down_ports = _find_down_ports(asic, phy_interfaces, ip_interfaces)
-                    check_result["failed"] = True if len(down_ports) > 0 else False
-                    check_result["down_ports"] = down_ports
-
-                    if check_result["failed"]:
-                        wait(interval,
-                             msg="Found down ports, wait %d seconds to retry. Remaining time: %d, down_ports=%s" %
-                                 (interval, int(timeout - elapsed), str(check_result["down_ports"])))
-                        elapsed = time.time() - start
-                    else:
-                        break
 
-        logger.info("Done checking interfaces status on %s" % dut.hostname)
-        check_result["failed"] = True if len(down_ports) > 0 else False
-        check_result["down_ports"] = down_ports
-        results[dut.hostname] = check_result
-    return _check
+                if check_result["failed"]:
+                    wait(interval,
+                         msg="Found down ports, wait %d seconds to retry. Remaining time: %d, down_ports=%s" %
+                             (interval, int(timeout - elapsed), str(check_result["down_ports"])))
+                    elapsed = time.time() - start
+                else:
+                    break
+
+    logger.info("Done checking interfaces status on %s" % dut.hostname)
+    check_result["failed"] = True if len(down_ports) > 0 else False
+    check_result["down_ports"] = down_ports
+    results[dut.hostname] = check_result
 
 
 @pytest.fixture(scope="module")
-def check_bgp(duthosts, tbinfo):
-    init_result = {"failed": False, "check_item": "bgp"}
+def check_interfaces(duthosts):
+    init_result = {"failed": False, "check_item": "interfaces"}
 
     def _check(*args, **kwargs):
-        result = parallel_run(_check_bgp_on_dut, args, kwargs, duthosts.frontend_nodes,
+        result = parallel_run(_check_interfaces_on_dut, args, kwargs, duthosts.frontend_nodes,
                               timeout=600, init_result=init_result)
         return list(result.values())
 
-    @reset_ansible_local_tmp
-    def _check_bgp_on_dut(*args, **kwargs):
-        dut = kwargs['node']
-        results = kwargs['results']
+    return _check
+
 
-        def _check_bgp_status_helper():
-            asic_check_results = []
-            bgp_facts = dut.bgp_facts(asic_index='all')
-
-            # Conditions to fail BGP check
-            #   1. No BGP neighbor.
-            #   2. Any BGP neighbor down.
-            #   3. Failed to get BGP status (In theory, this should be protected by previous check,
-            #      but adding this check here will make BGP check more robust,
-            #      and it is necessary since many operations highly depends on the BGP status)
-
-            if len(bgp_facts) == 0:
-                logger.info("Failed to get BGP status on host %s ..." % dut.hostname)
-                asic_check_results.append(True)
-
-            for asic_index, a_asic_facts in enumerate(bgp_facts):
-                a_asic_result = False
-                a_asic_neighbors = a_asic_facts['ansible_facts']['bgp_neighbors']
-                if a_asic_neighbors is not None and len(a_asic_neighbors) > 0:
-                    down_neighbors = [k for k, v in list(a_asic_neighbors.items())
-                                      if v['state'] != 'established']
-                    if down_neighbors:
-                        if dut.facts['num_asic'] == 1:
-                            check_result['bgp'] = {'down_neighbors': down_neighbors}
-                        else:
-                            check_result['bgp' + str(asic_index)] = {'down_neighbors': down_neighbors}
-                        a_asic_result = True
+@worker_pool_target
+@reset_ansible_local_tmp
+def _check_bgp_on_dut(*args, **kwargs):
+    dut = kwargs['node']
+    results = kwargs['results']
+    tbinfo = kwargs['tbinfo']
+
+    def _check_bgp_status_helper():
+        asic_check_results = []
+        bgp_facts = dut.bgp_facts(asic_index='all')
+
+        # Conditions to fail BGP check
+        #   1. No BGP neighbor.
+        #   2. Any BGP neighbor down.
+        #   3. Failed to get BGP status (In theory, this should be protected by previous check,
+        #      but adding this check here will make BGP check more robust,
+        #      and it is necessary since many operations highly depends on the BGP status)
+
+        if len(bgp_facts) == 0:
+            logger.info("Failed to get BGP status on host %s ..." % dut.hostname)
+            asic_check_results.append(True)
+
+        for asic_index, a_asic_facts in enumerate(bgp_facts):
+            a_asic_result = False
+            a_asic_neighbors = a_asic_facts['ansible_facts']['bgp_neighbors']
+            if a_asic_neighbors is not None and len(a_asic_neighbors) > 0:
+                down_neighbors = [k for k, v in list(a_asic_neighbors.items())
+                                  if v['state'] != 'established']
+                if down_neighbors:
+                    if dut.facts['num_asic'] == 1:
+                        check_result['bgp'] = {'down_neighbors': down_neighbors}
                     else:
-                        a_asic_result = False
-                        if dut.facts['num_asic'] == 1:
-                            if 'bgp' in check_result:
-                                check_result['bgp'].pop('down_neighbors', None)
-                        else:
-                            if 'bgp' + str(asic_index) in check_result:
-                                check_result['bgp' + str(asic_index)].pop('down_neighbors', None)
-                else:
+                        check_result['bgp' + str(asic_index)] = {'down_neighbors': down_neighbors}
                     a_asic_result = True
+                else:
+                    a_asic_result = False
+                    if dut.facts['num_asic'] == 1:
+                        if 'bgp' in check_result:
+                            check_result['bgp'].pop('down_neighbors', None)
+                    else:
+                        if 'bgp' + str(asic_index) in check_result:
+                            check_result['bgp' + str(asic_index)].pop('down_neighbors', None)
+            else:
+                a_asic_result = True
 
-                asic_check_results.append(a_asic_result)
+            asic_check_results.append(a_asic_result)
 
-            if any(asic_check_results):
-                check_result['failed'] = True
-            else:
-                # Need this to cover case where there were down neighbors in one check and now they are all up
-                check_result['failed'] = False
-            return not check_result['failed']
-
-        logger.info("Checking bgp status on host %s ..." % dut.hostname)
-        check_result = {"failed": False, "check_item": "bgp", "host": dut.hostname}
-
-        networking_uptime = dut.get_networking_uptime().seconds
-        if SYSTEM_STABILIZE_MAX_TIME - networking_uptime + 480 > 500:
-            # If max_timeout is higher than 600, it will exceed parallel_run's timeout
-            # the check will be killed by parallel_run, we can't get expected results.
-            # 500 seconds is about 8 mins, bgp has enough to get up
-            max_timeout = 500
-        else:
-            max_timeout = SYSTEM_STABILIZE_MAX_TIME - networking_uptime + 480
-        timeout = max(max_timeout, 1)
-        interval = 20
-        wait_until(timeout, interval, 0, _check_bgp_status_helper)
-        if (check_result['failed']):
-            for a_result in list(check_result.keys()):
-                if a_result != 'failed':
-                    # Dealing with asic result
-                    if 'down_neighbors' in check_result[a_result]:
-                        logger.info('BGP neighbors down: %s on bgp instance %s on dut %s' % (
-                            check_result[a_result]['down_neighbors'], a_result, dut.hostname))
+        if any(asic_check_results):
+            check_result['failed'] = True
         else:
-            logger.info('No BGP neighbors are down on %s' % dut.hostname)
+            # Need this to cover case where there were down neighbors in one check and now they are all up
+            check_result['failed'] = False
+        return not check_result['failed']
+
+    logger.info("Checking bgp status on host %s ..." % dut.hostname)
+    check_result = {"failed": False, "check_item": "bgp", "host": dut.hostname}
+
+    networking_uptime = dut.get_networking_uptime().seconds
+    if SYSTEM_STABILIZE_MAX_TIME - networking_uptime + 480 > 500:
+        # If max_timeout is higher than 600, it will exceed parallel_run's timeout
+        # the check will be killed by parallel_run, we can't get expected results.
+        # 500 seconds is about 8 mins, bgp has enough to get up
+        max_timeout = 500
+    else:
+        max_timeout = SYSTEM_STABILIZE_MAX_TIME - networking_uptime + 480
+    timeout = max(max_timeout, 1)
+    interval = 20
+    wait_until(timeout, interval, 0, _check_bgp_status_helper)
+    if (check_result['failed']):
+        for a_result in list(check_result.keys()):
+            if a_result != 'failed':
+                # Dealing with asic result
+                if 'down_neighbors' in check_result[a_result]:
+                    logger.info('BGP neighbors down: %s on bgp instance %s on dut %s' % (
+                        check_result[a_result]['down_neighbors'], a_result, dut.hostname))
+    else:
+        logger.info('No BGP neighbors are down on %s' % dut.hostname)
+
+    mgFacts = dut.get_extended_minigraph_facts(tbinfo)
+    if dut.num_asics() == 1 and tbinfo['topo']['type'] != 't2' and \
+       not wait_until(timeout, interval, 0, check_bgp_router_id, dut, mgFacts):
+        check_result['failed'] = True
+        logger.info("Failed to verify BGP router identifier is Loopback0 address on %s" % dut.hostname)
+
+    logger.info("Done checking bgp status on %s" % dut.hostname)
+    results[dut.hostname] = check_result
 
-        mgFacts = dut.get_extended_minigraph_facts(tbinfo)
-        if dut.num_asics() == 1 and tbinfo['topo']['type'] != 't2' and \
-           not wait_until(timeout, interval, 0, check_bgp_router_id, dut, mgFacts):
-            check_result['failed'] = True
-            logger.info("Failed to verify BGP router identifier is Loopback0 address on %s" % dut.hostname)
 
-        logger.info("Done checking bgp status on %s" % dut.hostname)
-        results[dut.hostname] = check_result
+@pytest.fixture(scope="module")
+def check_bgp(duthosts, tbinfo):
+    init_result = {"failed": False, "check_item": "bgp"}
+
+    def _check(*args, **kwargs):
+        kwargs['tbinfo'] = tbinfo
+        result = parallel_run(_check_bgp_on_dut, args, kwargs, duthosts.frontend_nodes,
+                              timeout=600, init_result=init_result)
+        return list(result.values())
 
     return _check
 
@@ -280,6 +287,28 @@ def _is_db_omem_over_threshold(command_output):
     return result, total_omem
 
 
+@worker_pool_target
+@reset_ansible_local_tmp
+def _check_dbmemory_on_dut(*args, **kwargs):
+    dut = kwargs['node']
+    results = kwargs['results']
+
+    logger.info("Checking database memory on %s..." % dut.hostname)
+    redis_cmd = "client list"
+    check_result = {"failed": False, "check_item": "dbmemory", "host": dut.hostname}
+    # check the db memory on the redis instance running on each instance
+    for asic in dut.asics:
+        res = asic.run_redis_cli_cmd(redis_cmd)['stdout_lines']
+        result, total_omem = _is_db_omem_over_threshold(res)
+        check_result["total_omem"] = total_omem
+        if result:
+            check_result["failed"] = True
+            logging.info("{} db memory over the threshold ".format(str(asic.namespace or '')))
+            break
+    logger.info("Done checking database memory on %s" % dut.hostname)
+    results[dut.hostname] = check_result
+
+
 @pytest.fixture(scope="module")
 def check_dbmemory(duthosts):
     def _check(*args, **kwargs):
@@ -287,25 +316,6 @@ def check_dbmemory(duthosts):
         result = parallel_run(_check_dbmemory_on_dut, args, kwargs, duthosts, timeout=600, init_result=init_result)
         return list(result.values())
 
-    @reset_ansible_local_tmp
-    def _check_dbmemory_on_dut(*args, **kwargs):
-        dut = kwargs['node']
-        results = kwargs['results']
-
-        logger.info("Checking database memory on %s..." % dut.hostname)
-        redis_cmd = "client list"
-        check_result = {"failed": False, "check_item": "dbmemory", "host": dut.hostname}
-        # check the db memory on the redis instance running on each instance
-        for asic in dut.asics:
-            res = asic.run_redis_cli_cmd(redis_cmd)['stdout_lines']
-            result, total_omem = _is_db_omem_over_threshold(res)
-            check_result["total_omem"] = total_omem
-            if result:
-                check_result["failed"] = True
-                logging.info("{} db memory over the threshold ".format(str(asic.namespace or '')))
-                break
-        logger.info("Done checking database memory on %s" % dut.hostname)
-        results[dut.hostname] = check_result
     return _check
 
 
@@ -698,6 +708,65 @@ def check_mux_simulator(tbinfo, duthosts, duts_minigraph_facts, get_mux_status,
     return _check
 
 
+@worker_pool_target
+@reset_ansible_local_tmp
+def _check_monit_on_dut(*args, **kwargs):
+    dut = kwargs['node']
+    results = kwargs['results']
+
+    logger.info("Checking status of each Monit service...")
+    networking_uptime = dut.get_networking_uptime().seconds
+    timeout = max((MONIT_STABILIZE_MAX_TIME - networking_uptime), 0)
+    interval = 20
+    logger.info("networking_uptime = {} seconds, timeout = {} seconds, interval = {} seconds"
+                .format(networking_uptime, timeout, interval))
+
+    check_result = {"failed": False, "check_item": "monit", "host": dut.hostname}
+
+    if timeout == 0:
+        monit_services_status = dut.get_monit_services_status()
+        if not monit_services_status:
+            logger.info("Monit was not running.")
+            check_result["failed"] = True
+            check_result["failed_reason"] = "Monit was not running"
+            logger.info("Checking status of each Monit service was done!")
+            results[dut.hostname] = check_result
+            return
+
+        check_result = _check_monit_services_status(check_result, monit_services_status)
+    else:
+        start = time.time()
+        elapsed = 0
+        is_monit_running = False
+        while elapsed < timeout:
+            check_result["failed"] = False
+            monit_services_status = dut.get_monit_services_status()
+            if not monit_services_status:
+                wait(interval, msg="Monit was not started and wait {} seconds to retry. Remaining time: {}."
+                     .format(interval, timeout - elapsed))
+                elapsed = time.time() - start
+                continue
+
+            is_monit_running = True
+            check_result = _check_monit_services_status(check_result, monit_services_status)
+            if check_result["failed"]:
+                wait(interval,
+                     msg="Services were not monitored and wait {} seconds to retry. \
+                         Remaining time: {}. Services status: {}"
+                     .format(interval, timeout - elapsed, str(check_result["services_status"])))
+                elapsed = time.time() - start
+            else:
+                break
+
+        if not is_monit_running:
+            logger.info("Monit was not running.")
+            check_result["failed"] = True
+            check_result["failed_reason"] = "Monit was not running"
+
+    logger.info("Checking status of each Monit service was done on %s" % dut.hostname)
+    results[dut.hostname] = check_result
+
+
 @pytest.fixture(scope="module")
 def check_monit(duthosts):
     """
@@ -710,63 +779,59 @@ def check_monit(duthosts):
         result = parallel_run(_check_monit_on_dut, args, kwargs, duthosts, timeout=600, init_result=init_result)
         return list(result.values())
 
-    @reset_ansible_local_tmp
-    def _check_monit_on_dut(*args, **kwargs):
-        dut = kwargs['node']
-        results = kwargs['results']
+    return _check
 
-        logger.info("Checking status of each Monit service...")
-        networking_uptime = dut.get_networking_uptime().seconds
-        timeout = max((MONIT_STABILIZE_MAX_TIME - networking_uptime), 0)
-        interval = 20
-        logger.info("networking_uptime = {} seconds, timeout = {} seconds, interval = {} seconds"
-                    .format(networking_uptime, timeout, interval))
 
-        check_result = {"failed": False, "check_item": "monit", "host": dut.hostname}
+def _check_processes_status(check_result, processes_status):
+    """
+    @summary: Check whether the critical processes of each critical service were running or not.
+    @return: A dictionary contains the testing result (failed or not failed) and the status of each service.
+    """
+    check_result["processes_status"] = processes_status
+    check_result["services_status"] = {}
+    for k, v in list(processes_status.items()):
+        if v['status'] is False or len(v['exited_critical_process']) > 0:
+            check_result['failed'] = True
+        check_result["services_status"].update({k: v['status']})
 
-        if timeout == 0:
-            monit_services_status = dut.get_monit_services_status()
-            if not monit_services_status:
-                logger.info("Monit was not running.")
-                check_result["failed"] = True
-                check_result["failed_reason"] = "Monit was not running"
-                logger.info("Checking status of each Monit service was done!")
-                results[dut.hostname] = check_result
-                return
+    return check_result
 
-            check_result = _check_monit_services_status(check_result, monit_services_status)
-        else:
-            start = time.time()
-            elapsed = 0
-            is_monit_running = False
-            while elapsed < timeout:
-                check_result["failed"] = False
-                monit_services_status = dut.get_monit_services_status()
-                if not monit_services_status:
-                    wait(interval, msg="Monit was not started and wait {} seconds to retry. Remaining time: {}."
-                         .format(interval, timeout - elapsed))
-                    elapsed = time.time() - start
-                    continue
 
-                is_monit_running = True
-                check_result = _check_monit_services_status(check_result, monit_services_status)
-                if check_result["failed"]:
-                    wait(interval,
-                         msg="Services were not monitored and wait {} seconds to retry. \
-                             Remaining time: {}. Services status: {}"
-                         .format(interval, timeout - elapsed, str(check_result["services_status"])))
-                    elapsed = time.time() - start
-                else:
-                    break
+@worker_pool_target
+@reset_ansible_local_tmp
+def _check_processes_on_dut(*args, **kwargs):
+    dut = kwargs['node']
+    results = kwargs['results']
+    logger.info("Checking process status on %s..." % dut.hostname)
+
+    networking_uptime = dut.get_networking_uptime().seconds
+    timeout = max((SYSTEM_STABILIZE_MAX_TIME - networking_uptime), 0)
+    interval = 20
+    logger.info("networking_uptime=%d seconds, timeout=%d seconds, interval=%d seconds" %
+                (networking_uptime, timeout, interval))
+
+    check_result = {"failed": False, "check_item": "processes", "host": dut.hostname}
+    if timeout == 0:  # Check processes status, do not retry.
+        processes_status = dut.all_critical_process_status()
+        check_result = _check_processes_status(check_result, processes_status)
+    else:  # Retry checking processes status
+        start = time.time()
+        elapsed = 0
+        while elapsed < timeout:
+            check_result["failed"] = False
+            processes_status = dut.all_critical_process_status()
+            check_result = _check_processes_status(check_result, processes_status)
 
-            if not is_monit_running:
-                logger.info("Monit was not running.")
-                check_result["failed"] = True
-                check_result["failed_reason"] = "Monit was not running"
+            if check_result["failed"]:
+                wait(interval,
+                     msg="Not all processes are started, wait %d seconds to retry. Remaining time: %d %s" %
+                         (interval, int(timeout - elapsed), str(check_result["processes_status"])))
+                elapsed = time.time() - start
+            else:
+                break
 
-        logger.info("Checking status of each Monit service was done on %s" % dut.hostname)
-        results[dut.hostname] = check_result
-    return _check
+    logger.info("Done checking processes status on %s" % dut.hostname)
+    results[dut.hostname] = check_result
 
 
 @pytest.fixture(scope="module")
@@ -782,50 +847,6 @@ def check_processes(duthosts):
         result = parallel_run(_check_processes_on_dut, args, kwargs, duthosts, timeout=timeout, init_result=init_result)
         return list(result.values())
 
-    @reset_ansible_local_tmp
-    def _check_processes_on_dut(*args, **kwargs):
-        dut = kwargs['node']
-        results = kwargs['results']
-        logger.info("Checking process status on %s..." % dut.hostname)
-
-        networking_uptime = dut.get_networking_uptime().seconds
-        timeout = max((SYSTEM_STABILIZE_MAX_TIME - networking_uptime), 0)
-        interval = 20
-        logger.info("networking_uptime=%d seconds, timeout=%d seconds, interval=%d seconds" %
-                    (networking_uptime, timeout, interval))
-
-        check_result = {"failed": False, "check_item": "processes", "host": dut.hostname}
-        if timeout == 0:  # Check processes status, do not retry.
-            processes_status = dut.all_critical_process_status()
-            check_result["processes_status"] = processes_status
-            check_result["services_status"] = {}
-            for k, v in list(processes_status.items()):
-                if v['status'] is False or len(v['exited_critical_process']) > 0:
-                    check_result['failed'] = True
-                check_result["services_status"].update({k: v['status']})
-        else:  # Retry checking processes status
-            start = time.time()
-            elapsed = 0
-            while elapsed < timeout:
-                check_result["failed"] = False
-                processes_status = dut.all_critical_process_status()
-                check_result["processes_status"] = processes_status
-                check_result["services_status"] = {}
-                for k, v in list(processes_status.items()):
-                    if v['status'] is False or len(v['exited_critical_process']) > 0:
-                        check_result['failed'] = True
-                    check_result["services_status"].update({k: v['status']})
-
-                if check_result["failed"]:
-                    wait(interval,
-                         msg="Not all processes are started, wait %d seconds to retry. Remaining time: %d %s" %
-                             (interval, int(timeout - elapsed), str(check_result["processes_status"])))
-                    elapsed = time.time() - start
-                else:
-                    break
-
-        logger.info("Done checking processes status on %s" % dut.hostname)
-        results[dut.hostname] = check_result
     return _check
 
 
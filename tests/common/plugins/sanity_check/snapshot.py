@@ -0,0 +1,231 @@
+"""
+Health snapshot of the DUTs for the sanity check.
+
+By default every check item runs its own commands on every DUT, one check item after another. With
+--sanity_snapshot, the commands needed by the check items in SNAPSHOT_CHECKS are run by one script on each DUT,
+which returns all the outputs as one JSON document. These check items are then evaluated locally against the
+snapshot, while the other check items run their fixtures, all of them concurrently.
+
+A check item falls back to its fixture when the snapshot of a DUT misses an output it needs, or when it fails on
+the snapshot while the DUT is still stabilizing, so the retries done by the fixture are kept.
+"""
+import base64
+import json
+import logging
+import time
+
+from datetime import datetime
+
+from tests.common.helpers.constants import DEFAULT_NAMESPACE
+from tests.common.plugins.sanity_check.checks import SYSTEM_STABILIZE_MAX_TIME, MONIT_STABILIZE_MAX_TIME, \
+    _is_db_omem_over_threshold, _check_monit_services_status, _check_processes_status
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_COMMAND_TIMEOUT = 120
+
+# Run on the DUT: runs the commands concurrently and prints their outputs as one JSON document
+SNAPSHOT_SCRIPT = '''
+import json
+import subprocess
+import threading
+
+commands = json.loads(%r)
+outputs = {}
+
+
+def run(key, cmd):
+    try:
+        proc = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=%d)
+        outputs[key] = {"rc": proc.returncode, "stdout": proc.stdout.decode("utf-8", "replace")}
+    except subprocess.TimeoutExpired:
+        pass
+
+
+threads = [threading.Thread(target=run, args=(key, cmd)) for key, cmd in commands.items()]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+print(json.dumps(outputs))
+'''
+
+
+def _uptime_commands(dut):
+    return {
+        "networking_start": "systemctl -p ExecMainStartTimestamp show networking",
+        "now": 'date +"%Y-%m-%d %H:%M:%S"'
+    }
+
+
+def _networking_uptime(snapshot):
+    """
+    @summary: Get the seconds since networking service started, like dut.get_networking_uptime().seconds.
+    @return: The uptime in seconds, None if it is not in the snapshot.
+    """
+    try:
+        start_time = snapshot["networking_start"]["stdout"].strip().split("=")[1]
+        now = datetime.strptime(snapshot["now"]["stdout"].strip(), "%Y-%m-%d %H:%M:%S")
+        return (now - datetime.strptime(start_time, "%a %Y-%m-%d %H:%M:%S %Z")).seconds
+    except Exception as e:
+        logger.info("No networking uptime in snapshot: {}".format(repr(e)))
+        return None
+
+
+def _redis_client_list_key(asic):
+    return "redis_client_list:{}".format(asic.namespace or "")
+
+
+def _dbmemory_commands(dut):
+    commands = {}
+    for asic in dut.asics:
+        if asic.namespace != DEFAULT_NAMESPACE:
+            cmd = "sudo ip netns exec {} /usr/bin/redis-cli client list".format(asic.namespace)
+        else:
+            cmd = "/usr/bin/redis-cli client list"
+        commands[_redis_client_list_key(asic)] = cmd
+    return commands
+
+
+def _evaluate_dbmemory(dut, snapshot):
+    check_result = {"failed": False, "check_item": "dbmemory", "host": dut.hostname}
+    for asic in dut.asics:
+        output = snapshot.get(_redis_client_list_key(asic))
+        if output is None or output["rc"] != 0:
+            return None
+        result, total_omem = _is_db_omem_over_threshold(output["stdout"].splitlines())
+        check_result["total_omem"] = total_omem
+        if result:
+            check_result["failed"] = True
+            logger.info("{} db memory over the threshold ".format(str(asic.namespace or '')))
+            break
+    return check_result
+
+
+def _monit_commands(dut):
+    commands = _uptime_commands(dut)
+    commands["monit_status"] = "sudo monit status"
+    return commands
+
+
+def _evaluate_monit(dut, snapshot):
+    networking_uptime = _networking_uptime(snapshot)
+    output = snapshot.get("monit_status")
+    if networking_uptime is None or output is None:
+        return None
+
+    check_result = {"failed": False, "check_item": "monit", "host": dut.hostname}
+    monit_services_status = {}
+    if output["rc"] == 0:
+        monit_services_status = dut.sonichost.parse_monit_services_status(output["stdout"].splitlines())
+    if not monit_services_status:
+        check_result["failed"] = True
+        check_result["failed_reason"] = "Monit was not running"
+    else:
+        check_result = _check_monit_services_status(check_result, monit_services_status)
+
+    if check_result["failed"] and networking_uptime < MONIT_STABILIZE_MAX_TIME:
+        # Monit may still be starting the services, let the check fixture retry
+        return None
+    return check_result
+
+
+def _processes_commands(dut):
+    commands = _uptime_commands(dut)
+    for service in dut.critical_services:
+        commands["critical_processes:" + service] = \
+            'docker exec {} bash -c "[ -f /etc/supervisor/critical_processes ]' \
+            ' && cat /etc/supervisor/critical_processes"'.format(service)
+        commands["supervisorctl_status:" + service] = "docker exec {} supervisorctl status".format(service)
+    return commands
+
+
+def _evaluate_processes(dut, snapshot):
+    networking_uptime = _networking_uptime(snapshot)
+    if networking_uptime is None:
+        return None
+
+    processes_status = {}
+    for service in dut.critical_services:
+        file_output = snapshot.get("critical_processes:" + service)
+        status_output = snapshot.get("supervisorctl_status:" + service)
+        if file_output is None or status_output is None:
+            return None
+        if file_output["rc"] != 0:
+            processes_status[service] = {
+                'status': False,
+                'exited_critical_process': [],
+                'running_critical_process': []
+            }
+            continue
+        group_process = dut.sonichost.parse_critical_group_process(file_output["stdout"].splitlines())
+        processes_status[service] = dut.sonichost.parse_service_status_and_critical_process(
+            service_result={"stdout_lines": status_output["stdout"].splitlines()},
+            critical_group_list=group_process['groups'],
+            critical_process_list=group_process['processes']
+        )
+
+    check_result = {"failed": False, "check_item": "processes", "host": dut.hostname}
+    check_result = _check_processes_status(check_result, processes_status)
+    if check_result["failed"] and networking_uptime < SYSTEM_STABILIZE_MAX_TIME:
+        # The processes may still be starting, let the check fixture retry
+        return None
+    return check_result
+
+
+# Check items which can be evaluated on the snapshot: check item -> (commands, evaluate)
+SNAPSHOT_CHECKS = {
+    "check_dbmemory": (_dbmemory_commands, _evaluate_dbmemory),
+    "check_monit": (_monit_commands, _evaluate_monit),
+    "check_processes": (_processes_commands, _evaluate_processes),
+}
+
+
+def collect_snapshot(dut, check_items):
+    """
+    @summary: Run the commands needed by the check items on the DUT with one remote script.
+    @param dut: The DUT host object.
+    @param check_items: The check items in SNAPSHOT_CHECKS to collect the commands of.
+    @return: A dictionary in which key is the command key and values are the rc and stdout of the command.
+             Commands which timed out are missing. An empty dictionary if the script failed.
+    """
+    commands = {}
+    for item in check_items:
+        commands.update(SNAPSHOT_CHECKS[item][0](dut))
+    if not commands:
+        return {}
+
+    script = SNAPSHOT_SCRIPT % (json.dumps(commands), SNAPSHOT_COMMAND_TIMEOUT)
+    encoded_script = base64.b64encode(script.encode("utf-8")).decode("ascii")
+    start = time.time()
+    res = dut.shell("echo {} | base64 -d | python3".format(encoded_script), module_ignore_errors=True, verbose=False)
+    logger.info("Collected sanity check snapshot of {} commands on {} in {:.2f} seconds".format(
+        len(commands), dut.hostname, time.time() - start))
+    if res["rc"] != 0:
+        logger.warning("Failed to collect sanity check snapshot on {}: {}".format(dut.hostname, res["stderr"]))
+        return {}
+    try:
+        return json.loads(res["stdout"])
+    except ValueError as e:
+        logger.warning("Invalid sanity check snapshot on {}: {}".format(dut.hostname, repr(e)))
+        return {}
+
+
+def evaluate_snapshot(item, duthosts, snapshots):
+    """
+    @summary: Evaluate a check item on the snapshots of the DUTs.
+    @param item: A check item in SNAPSHOT_CHECKS.
+    @param duthosts: The DUT hosts the check item runs on.
+    @param snapshots: A dictionary in which key is the DUT hostname and value is the snapshot of the DUT.
+    @return: The list of the check results of the DUTs, None if the check fixture must run instead.
+    """
+    evaluate = SNAPSHOT_CHECKS[item][1]
+    check_results = []
+    for dut in duthosts:
+        check_result = evaluate(dut, snapshots.get(dut.hostname, {}))
+        if check_result is None:
+            logger.info("Check item {} cannot be evaluated on snapshot of {}, run the check".format(
+                item, dut.hostname))
+            return None
+        check_results.append(check_result)
+    return check_results
@@ -23,9 +23,10 @@ from tests.common.devices.k8s import K8sMasterHost
 from tests.common.devices.k8s import K8sMasterCluster
 from tests.common.devices.duthosts import DutHosts
 from tests.common.devices.vmhost import VMHost
-from tests.common.devices.base import NeighborDevice
+from tests.common.devices.base import AnsibleHostBase, NeighborDevice
+from tests.common.devices import persistent_ssh
 from tests.common.devices.cisco import CiscoHost
-from tests.common.helpers.parallel import parallel_run
+from tests.common.helpers.parallel import parallel_run, set_worker_pool, WorkerPool
 from tests.common.fixtures.duthost_utils import backup_and_restore_config_db_session    # noqa F401
 from tests.common.fixtures.ptfhost_utils import ptf_portmap_file                        # noqa F401
 from tests.common.fixtures.ptfhost_utils import ptf_test_port_map_active_active         # noqa F401
@@ -144,6 +145,9 @@ def pytest_addoption(parser):
                      help="Change (add|remove) post test check items based on pre test check items")
     parser.addoption("--recover_method", action="store", default="adaptive",
                      help="Set method to use for recover if sanity failed")
+    parser.addoption("--sanity_snapshot", action="store_true", default=False,
+                     help="Run sanity check items concurrently, evaluating the ones supporting it on one health "
+                          "snapshot collected per DUT")
 
     ########################
     #   pre-test options   #
@@ -183,6 +187,11 @@ def pytest_addoption(parser):
     #   collect logs option    #
     ############################
     parser.addoption("--collect_db_data", action="store_true", default=False, help="Collect db info if test failed")
+    parser.addoption("--ssh_fast_path", action="store_true", default=False,
+                     help="Run shell and command modules on a persistent SSH connection instead of Ansible")
+    parser.addoption("--parallel_worker_pool", action="store_true", default=False,
+                     help="Run the parallel_run targets marked with worker_pool_target on long lived worker processes "
+                          "instead of forking per call")
 
     ############################
     #   macsec options         #
@@ -200,6 +209,8 @@ def pytest_addoption(parser):
 
 
 def pytest_configure(config):
+    if config.getoption("ssh_fast_path"):
+        AnsibleHostBase.ssh_fast_path = True
     if config.getoption("enable_macsec"):
         topo = config.getoption("topology")
         if topo is not None and "t2" in topo:
@@ -208,6 +219,21 @@ def pytest_configure(config):
             config.pluginmanager.register(MacsecPluginT0())
 
 
+@pytest.fixture(scope="session", autouse=True)
+def parallel_worker_pool(request):
+    """
+    Session scoped pool of worker processes used by parallel_run, enabled by the --parallel_worker_pool option.
+    """
+    if not request.config.getoption("parallel_worker_pool"):
+        yield None
+        return
+    pool = WorkerPool()
+    set_worker_pool(pool)
+    yield pool
+    set_worker_pool(None)
+    pool.shutdown()
+
+
 @pytest.fixture(scope="session", autouse=True)
 def enhance_inventory(request):
     """
@@ -324,6 +350,8 @@ def get_specified_duts(request):
 
 
 def pytest_sessionfinish(session, exitstatus):
+    persistent_ssh.dump_latency_histograms()
+    persistent_ssh.close_ssh_sessions()
     if session.config.cache.get("duthosts_fixture_failed", None):
         session.config.cache.set("duthosts_fixture_failed", None)
         session.exitstatus = DUTHOSTS_FIXTURE_FAILED_RC
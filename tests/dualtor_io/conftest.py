@@ -1,6 +1,31 @@
 import pytest
 
 from tests.common.dualtor.data_plane_utils import save_pcap                 # noqa F401
+from tests.common.dualtor.data_plane_utils import io_analysis_options       # noqa F401
+
+
+def pytest_addoption(parser):
+    """
+    Adds pytest options that are used by dual ToR IO tests
+    """
+
+    dualtor_io_group = parser.getgroup("Dual ToR IO test suite options")
+
+    dualtor_io_group.addoption(
+        "--io_streaming_analysis",
+        action="store_true",
+        default=False,
+        help="Analyze the IO test packets on the PTF as they are captured and fetch only the disruption summary, "
+             "instead of fetching and parsing the pcap of all the packets"
+    )
+
+    dualtor_io_group.addoption(
+        "--io_keep_pcap",
+        action="store_true",
+        default=False,
+        help="With --io_streaming_analysis, also write the pcap of the captured packets and save it to the log "
+             "directory"
+    )
 
 
 def pytest_configure(config):
@@ -29,8 +29,8 @@ def start_platform_api_service(duthosts, enum_rand_one_per_hwsku_hostname, local
 
         supervisor_conf = [
             '[program:platform_api_server]',
-            'command=/usr/bin/python{} /opt/platform_api_server.py --port {}'.format('3' if py3_platform_api_available
-                                                                                     else '2', SERVER_PORT),
+            'command=/usr/bin/python{} /opt/platform_api_server.py --port {} --threaded'.format(
+                '3' if py3_platform_api_available else '2', SERVER_PORT),
             'autostart=True',
             'autorestart=True',
             'stdout_logfile=syslog',
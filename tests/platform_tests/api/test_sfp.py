@@ -373,8 +373,9 @@ class TestSfpApi(PlatformApiTestBase):
 
     def test_get_transceiver_info(self, duthosts, enum_rand_one_per_hwsku_hostname, localhost, platform_api_conn):
         # TODO: Do more sanity checking on transceiver info values
+        info_dicts = sfp.get_transceiver_info_batch(platform_api_conn, self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
-            info_dict = sfp.get_transceiver_info(platform_api_conn, i)
+            info_dict = info_dicts[i]
             if self.expect(info_dict is not None, "Unable to retrieve transceiver {} info".format(i)):
                 if self.expect(isinstance(info_dict, dict), "Transceiver {} info appears incorrect".format(i)):
                     actual_keys = list(info_dict.keys())
@@ -430,8 +431,10 @@ class TestSfpApi(PlatformApiTestBase):
         duthost = duthosts[enum_rand_one_per_hwsku_hostname]
         skip_release_for_platform(duthost, ["202012"], ["arista", "mlnx"])
 
+        bulk_status_dicts = sfp.get_transceiver_bulk_status_batch(platform_api_conn,
+                                                                  self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
-            bulk_status_dict = sfp.get_transceiver_bulk_status(platform_api_conn, i)
+            bulk_status_dict = bulk_status_dicts[i]
             if self.expect(bulk_status_dict is not None, "Unable to retrieve transceiver {} bulk status".format(i)):
                 if self.expect(isinstance(bulk_status_dict, dict),
                                "Transceiver {} bulk status appears incorrect".format(i)):
@@ -451,8 +454,9 @@ class TestSfpApi(PlatformApiTestBase):
         duthost = duthosts[enum_rand_one_per_hwsku_hostname]
         skip_release_for_platform(duthost, ["202012"], ["arista", "mlnx"])
 
+        info_dicts = sfp.get_transceiver_info_batch(platform_api_conn, self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
-            info_dict = sfp.get_transceiver_info(platform_api_conn, i)
+            info_dict = info_dicts[i]
 
             if not self.is_xcvr_optical(info_dict):
                 logger.info("test_get_transceiver_threshold_info: \
@@ -504,8 +508,9 @@ class TestSfpApi(PlatformApiTestBase):
         duthost = duthosts[enum_rand_one_per_hwsku_hostname]
         skip_release_for_platform(duthost, ["202012"], ["arista", "mlnx"])
 
+        info_dicts = sfp.get_transceiver_info_batch(platform_api_conn, self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
-            info_dict = sfp.get_transceiver_info(platform_api_conn, i)
+            info_dict = info_dicts[i]
 
             if not self.is_xcvr_optical(info_dict):
                 logger.info(
@@ -525,8 +530,9 @@ class TestSfpApi(PlatformApiTestBase):
         duthost = duthosts[enum_rand_one_per_hwsku_hostname]
         skip_release_for_platform(duthost, ["202012"], ["arista", "mlnx"])
 
+        info_dicts = sfp.get_transceiver_info_batch(platform_api_conn, self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
-            info_dict = sfp.get_transceiver_info(platform_api_conn, i)
+            info_dict = info_dicts[i]
 
             if not self.is_xcvr_optical(info_dict):
                 logger.info(
@@ -545,8 +551,9 @@ class TestSfpApi(PlatformApiTestBase):
         duthost = duthosts[enum_rand_one_per_hwsku_hostname]
         skip_release_for_platform(duthost, ["202012"], ["arista", "mlnx"])
 
+        info_dicts = sfp.get_transceiver_info_batch(platform_api_conn, self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
-            info_dict = sfp.get_transceiver_info(platform_api_conn, i)
+            info_dict = info_dicts[i]
 
             if not self.is_xcvr_optical(info_dict):
                 logger.info(
@@ -564,8 +571,9 @@ class TestSfpApi(PlatformApiTestBase):
         duthost = duthosts[enum_rand_one_per_hwsku_hostname]
         skip_release_for_platform(duthost, ["202012"], ["arista", "mlnx"])
 
+        info_dicts = sfp.get_transceiver_info_batch(platform_api_conn, self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
-            info_dict = sfp.get_transceiver_info(platform_api_conn, i)
+            info_dict = info_dicts[i]
 
             if not self.is_xcvr_optical(info_dict):
                 logger.info(
@@ -583,8 +591,9 @@ class TestSfpApi(PlatformApiTestBase):
         skip_release_for_platform(duthost, ["202012"], ["arista", "mlnx"])
 
         # TODO: Do more sanity checking on the data we retrieve
+        info_dicts = sfp.get_transceiver_info_batch(platform_api_conn, self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
-            info_dict = sfp.get_transceiver_info(platform_api_conn, i)
+            info_dict = info_dicts[i]
             # Determine whether the transceiver type supports TX Bias
             if not self.is_xcvr_optical(info_dict):
                 logger.warning(
@@ -604,9 +613,10 @@ class TestSfpApi(PlatformApiTestBase):
         # TODO: Do more sanity checking on the data we retrieve
         # TODO: Should we should expect get_rx_power() to return None or a list of "N/A" strings
         # if the transceiver is non-optical, e.g., DAC
+        info_dicts = sfp.get_transceiver_info_batch(platform_api_conn, self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
             # Determine whether the transceiver type supports RX power
-            info_dict = sfp.get_transceiver_info(platform_api_conn, i)
+            info_dict = info_dicts[i]
             if not self.expect(info_dict is not None, "Unable to retrieve transceiver {} info".format(i)):
                 continue
 
@@ -627,8 +637,9 @@ class TestSfpApi(PlatformApiTestBase):
         duthost = duthosts[enum_rand_one_per_hwsku_hostname]
         skip_release_for_platform(duthost, ["202012"], ["arista", "mlnx"])
 
+        info_dicts = sfp.get_transceiver_info_batch(platform_api_conn, self.sfp_setup["sfp_test_port_indices"])
         for i in self.sfp_setup["sfp_test_port_indices"]:
-            info_dict = sfp.get_transceiver_info(platform_api_conn, i)
+            info_dict = info_dicts[i]
 
             if not self.is_xcvr_optical(info_dict):
                 logger.info(
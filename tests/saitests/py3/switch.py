@@ -20,6 +20,8 @@ Thrift SAI interface basic tests
 import time
 import sys
 import os
+from collections import namedtuple
+from types import MappingProxyType
 
 from sai_base_test import interface_to_front_mapping
 from ptf.thriftutils import *       # noqa F403
@@ -84,10 +86,19 @@ rewrite_mac2 = '00:77:66:55:46:01'
 
 is_bmv2 = ('BMV2_TEST' in os.environ) and (int(os.environ['BMV2_TEST']) == 1)
 
+# Queue and ingress priority group OIDs of the ports, key is (client, port OID)
+port_qos_object_lists = {}
+
 # constants
 STOP_PORT_MAX_RATE = 1
 RELEASE_PORT_MAX_RATE = 0
 
+# Counters read for every port by sai_thrift_read_counters_snapshot() by default
+SNAPSHOT_QUEUE_COUNTER_IDS = (SAI_QUEUE_STAT_PACKETS, SAI_QUEUE_STAT_SHARED_WATERMARK_BYTES)
+SNAPSHOT_PG_COUNTER_IDS = (SAI_INGRESS_PRIORITY_GROUP_STAT_PACKETS, SAI_INGRESS_PRIORITY_GROUP_STAT_DROPPED_PACKETS,
+                           SAI_INGRESS_PRIORITY_GROUP_STAT_SHARED_WATERMARK_BYTES,
+                           SAI_INGRESS_PRIORITY_GROUP_STAT_XOFF_ROOM_WATERMARK_BYTES)
+
 
 def switch_init(clients):
     global switch_inited
@@ -722,14 +733,8 @@ def sai_thrift_create_pool_profile(client, pool_type, size, threshold_mode):
 
 def sai_thrift_clear_all_counters(client, target):
     for port in sai_port_list[target]:
-        queue_list = []
         client.sai_thrift_clear_port_all_stats(port)
-        port_attr_list = client.sai_thrift_get_port_attribute(port)
-        attr_list = port_attr_list.attr_list
-        for attribute in attr_list:
-            if attribute.id == SAI_PORT_ATTR_QOS_QUEUE_LIST:
-                for queue_id in attribute.value.objlist.object_id_list:
-                    queue_list.append(queue_id)
+        queue_list, _ = sai_thrift_get_port_qos_object_lists(client, port)
 
         cnt_ids = []
         cnt_ids.append(SAI_QUEUE_STAT_PACKETS)
@@ -773,7 +778,29 @@ def sai_thrift_port_tx_enable(client, asic_type, port_ids, target='dst'):
         client.sai_thrift_set_port_attribute(port_list[target][port_id], attr)
 
 
-def sai_thrift_read_port_counters(client, asic_type, port):
+def sai_thrift_get_port_qos_object_lists(client, port):
+    """
+    Returns the queue OIDs and the ingress priority group OIDs of a port.
+    They are read once per client and port, then served from port_qos_object_lists.
+    """
+    key = (client, port)
+    if key not in port_qos_object_lists:
+        queue_list = []
+        pg_list = []
+        port_attr_list = client.sai_thrift_get_port_attribute(port)
+        attr_list = port_attr_list.attr_list
+        for attribute in attr_list:
+            if attribute.id == SAI_PORT_ATTR_QOS_QUEUE_LIST:
+                for queue_id in attribute.value.objlist.object_id_list:
+                    queue_list.append(queue_id)
+            elif attribute.id == SAI_PORT_ATTR_INGRESS_PRIORITY_GROUP_LIST:
+                for pg_id in attribute.value.objlist.object_id_list:
+                    pg_list.append(pg_id)
+        port_qos_object_lists[key] = (tuple(queue_list), tuple(pg_list))
+    return port_qos_object_lists[key]
+
+
+def sai_thrift_read_port_stats(client, asic_type, port):
     port_cnt_ids = []
     port_cnt_ids.append(SAI_PORT_STAT_IF_OUT_DISCARDS)
     port_cnt_ids.append(SAI_PORT_STAT_IF_IN_DISCARDS)
@@ -800,14 +827,13 @@ def sai_thrift_read_port_counters(client, asic_type, port):
         port, port_cnt_ids, len(port_cnt_ids))
     if asic_type == 'mellanox':
         counters_results.append(0)
+    return counters_results
 
-    queue_list = []
-    port_attr_list = client.sai_thrift_get_port_attribute(port)
-    attr_list = port_attr_list.attr_list
-    for attribute in attr_list:
-        if attribute.id == SAI_PORT_ATTR_QOS_QUEUE_LIST:
-            for queue_id in attribute.value.objlist.object_id_list:
-                queue_list.append(queue_id)
+
+def sai_thrift_read_port_counters(client, asic_type, port):
+    counters_results = sai_thrift_read_port_stats(client, asic_type, port)
+
+    queue_list, _ = sai_thrift_get_port_qos_object_lists(client, port)
     cnt_ids = []
     thrift_results = []
     queue_counters_results = []
@@ -857,17 +883,7 @@ def sai_thrift_read_port_watermarks(client, port):
     pg_wm_ids.append(SAI_INGRESS_PRIORITY_GROUP_STAT_XOFF_ROOM_WATERMARK_BYTES)
     pg_wm_ids.append(SAI_INGRESS_PRIORITY_GROUP_STAT_SHARED_WATERMARK_BYTES)
 
-    queue_list = []
-    pg_list = []
-    port_attr_list = client.sai_thrift_get_port_attribute(port)
-    attr_list = port_attr_list.attr_list
-    for attribute in attr_list:
-        if attribute.id == SAI_PORT_ATTR_QOS_QUEUE_LIST:
-            for queue_id in attribute.value.objlist.object_id_list:
-                queue_list.append(queue_id)
-        elif attribute.id == SAI_PORT_ATTR_INGRESS_PRIORITY_GROUP_LIST:
-            for pg_id in attribute.value.objlist.object_id_list:
-                pg_list.append(pg_id)
+    queue_list, pg_list = sai_thrift_get_port_qos_object_lists(client, port)
 
     thrift_results = []
     queue_res = []
@@ -895,13 +911,7 @@ def sai_thrift_read_pg_counters(client, port_id):
     ]
 
     # fetch pg ids under port id
-    pg_ids = []
-    port_attrs = client.sai_thrift_get_port_attribute(port_id)
-    attrs = port_attrs.attr_list
-    for attr in attrs:
-        if attr.id == SAI_PORT_ATTR_INGRESS_PRIORITY_GROUP_LIST:
-            for pg_id in attr.value.objlist.object_id_list:
-                pg_ids.append(pg_id)
+    _, pg_ids = sai_thrift_get_port_qos_object_lists(client, port_id)
 
     # get counter values of counter ids of interest under each pg
     pg_cntrs = []
@@ -919,13 +929,7 @@ def sai_thrift_read_pg_occupancy(client, port_id):
     ]
 
     # fetch pg ids under port id
-    pg_ids = []
-    port_attrs = client.sai_thrift_get_port_attribute(port_id)
-    attrs = port_attrs.attr_list
-    for attr in attrs:
-        if attr.id == SAI_PORT_ATTR_INGRESS_PRIORITY_GROUP_LIST:
-            for pg_id in attr.value.objlist.object_id_list:
-                pg_ids.append(pg_id)
+    _, pg_ids = sai_thrift_get_port_qos_object_lists(client, port_id)
 
     # get counter values of counter ids of interest under each pg
     pg_cntrs = []
@@ -943,13 +947,7 @@ def sai_thrift_read_pg_drop_counters(client, port_id):
     ]
 
     # fetch pg ids under port id
-    pg_ids = []
-    port_attrs = client.sai_thrift_get_port_attribute(port_id)
-    attrs = port_attrs.attr_list
-    for attr in attrs:
-        if attr.id == SAI_PORT_ATTR_INGRESS_PRIORITY_GROUP_LIST:
-            for pg_id in attr.value.objlist.object_id_list:
-                pg_ids.append(pg_id)
+    _, pg_ids = sai_thrift_get_port_qos_object_lists(client, port_id)
 
     # get counter values of counter ids of interest under each pg
     pg_cntrs = []
@@ -965,13 +963,7 @@ def sai_thrift_read_pg_shared_watermark(client, asic_type, port_id):
     pg_cntr_ids = [SAI_INGRESS_PRIORITY_GROUP_STAT_SHARED_WATERMARK_BYTES]
 
     # fetch pg ids under port id
-    pg_ids = []
-    port_attrs = client.sai_thrift_get_port_attribute(port_id)
-    attrs = port_attrs.attr_list
-    for attr in attrs:
-        if attr.id == SAI_PORT_ATTR_INGRESS_PRIORITY_GROUP_LIST:
-            for pg_id in attr.value.objlist.object_id_list:
-                pg_ids.append(pg_id)
+    _, pg_ids = sai_thrift_get_port_qos_object_lists(client, port_id)
 
     # get counter values of counter ids of interest under each pg
     pg_cntrs = []
@@ -1012,13 +1004,7 @@ def sai_thrift_read_headroom_pool_watermark(client, buffer_pool_id):
 
 
 def sai_thrift_read_queue_occupancy(client, target, port_id):
-    queue_list = []
-    port_attr_list = client.sai_thrift_get_port_attribute(port_list[target][port_id])
-    attr_list = port_attr_list.attr_list
-    for attribute in attr_list:
-        if attribute.id == SAI_PORT_ATTR_QOS_QUEUE_LIST:
-            for queue_id in attribute.value.objlist.object_id_list:
-                queue_list.append(queue_id)
+    queue_list, _ = sai_thrift_get_port_qos_object_lists(client, port_list[target][port_id])
     cnt_ids = [SAI_QUEUE_STAT_CURR_OCCUPANCY_BYTES]
     queue_counters_results = []
     queue1 = 0
@@ -1031,6 +1017,72 @@ def sai_thrift_read_queue_occupancy(client, target, port_id):
     return queue_counters_results
 
 
+class PortCounters(namedtuple('PortCounters', ['port', 'queues', 'pgs'])):
+    """
+    Counters of a port in a CounterSnapshot.
+    port: the port counters, in the order of sai_thrift_read_port_counters()
+    queues: mapping of a queue counter id to the tuple of its values on the first 8 queues of the port
+    pgs: mapping of a priority group counter id to the tuple of its values on the priority groups of the port
+    """
+
+    def __sub__(self, other):
+        return PortCounters(
+            port=tuple(value - base for value, base in zip(self.port, other.port)),
+            queues=MappingProxyType({cnt_id: tuple(value - base for value, base in zip(values, other.queues[cnt_id]))
+                                     for cnt_id, values in self.queues.items()}),
+            pgs=MappingProxyType({cnt_id: tuple(value - base for value, base in zip(values, other.pgs[cnt_id]))
+                                  for cnt_id, values in self.pgs.items()}))
+
+
+class CounterSnapshot(namedtuple('CounterSnapshot', ['timestamp', 'duration', 'ports'])):
+    """
+    Counters of several ports read in one pass by sai_thrift_read_counters_snapshot().
+    timestamp: time.time() when the reading started
+    duration: seconds the reading took
+    ports: mapping of a port OID to its PortCounters
+    """
+
+    def diff(self, base):
+        """
+        Returns the mapping of a port OID to the PortCounters of the increase of every counter since base,
+        watermarks included, for the ports of both snapshots
+        """
+        return {port: counters - base.ports[port] for port, counters in self.ports.items() if port in base.ports}
+
+
+def sai_thrift_read_counters_snapshot(client, asic_type, ports, queue_cnt_ids=SNAPSHOT_QUEUE_COUNTER_IDS,
+                                      pg_cnt_ids=SNAPSHOT_PG_COUNTER_IDS):
+    """
+    Reads the port, queue and priority group counters of the ports in one pass, and returns them as a
+    CounterSnapshot. The queue and priority group OIDs are cached, and all the counters of a queue or a
+    priority group are read with one call. Only the first 8 queues (unicast) of a port are read.
+    """
+    start = time.time()
+    snapshot = {}
+    for port in ports:
+        queue_list, pg_list = sai_thrift_get_port_qos_object_lists(client, port)
+        port_counters = sai_thrift_read_port_stats(client, asic_type, port)
+
+        queue_results = []
+        if queue_cnt_ids:
+            for queue in queue_list[:8]:
+                queue_results.append(client.sai_thrift_get_queue_stats(queue, list(queue_cnt_ids),
+                                                                       len(queue_cnt_ids)))
+        pg_results = []
+        if pg_cnt_ids:
+            for pg in pg_list:
+                pg_results.append(client.sai_thrift_get_pg_stats(pg, list(pg_cnt_ids), len(pg_cnt_ids)))
+
+        snapshot[port] = PortCounters(
+            port=tuple(port_counters),
+            queues=MappingProxyType({cnt_id: tuple(results[idx] for results in queue_results)
+                                     for idx, cnt_id in enumerate(queue_cnt_ids)}),
+            pgs=MappingProxyType({cnt_id: tuple(results[idx] for results in pg_results)
+                                  for idx, cnt_id in enumerate(pg_cnt_ids)}))
+
+    return CounterSnapshot(timestamp=start, duration=time.time() - start, ports=MappingProxyType(snapshot))
+
+
 def sai_thrift_create_vlan_member(client, vlan_id, port_id, tagging_mode):
     vlan_member_attr_list = []
     attribute_value = sai_thrift_attribute_value_t(s32=vlan_id)
@@ -1,7 +1,11 @@
 import binascii
+import ctypes
 import json
 import argparse
 import os.path
+import selectors
+import socket
+import struct
 from collections import defaultdict
 import logging
 import scapy.all as scapy
@@ -84,12 +88,197 @@ class ARPResponder(object):
         return neigh_adv_pkt
 
 
+ETH_P_ALL = 0x0003
+ETH_TYPE_ARP = 0x0806
+ETH_TYPE_IPV6 = 0x86dd
+ETH_TYPE_VLAN = 0x8100
+IP_PROTO_ICMPV6 = 58
+ICMPV6_ND_NS = 135
+ND_OPT_SRC_LLADDR = 1
+SO_ATTACH_FILTER = 26
+RECV_BUFFER_SIZE = 4 * 1024 * 1024
+MAX_FRAME_SIZE = 65535
+
+# Classic BPF program of "arp or (ip6 and icmp6[0] == 135)": (code, jt, jf, k)
+ARP_NS_BPF_FILTER = [
+    (0x28, 0, 0, 12),                   # ldh [12]          ethertype
+    (0x15, 5, 0, ETH_TYPE_ARP),         # jeq #0x806        accept
+    (0x15, 0, 5, ETH_TYPE_IPV6),        # jeq #0x86dd       else drop
+    (0x30, 0, 0, 20),                   # ldb [20]          IPv6 next header
+    (0x15, 0, 3, IP_PROTO_ICMPV6),      # jeq #58           else drop
+    (0x30, 0, 0, 54),                   # ldb [54]          ICMPv6 type
+    (0x15, 0, 1, ICMPV6_ND_NS),         # jeq #135          else drop
+    (0x06, 0, 0, MAX_FRAME_SIZE),       # ret #65535        accept
+    (0x06, 0, 0, 0),                    # ret #0            drop
+]
+
+
+def checksum_add(total, data):
+    """One's complement sum of data, an even number of bytes, added to total."""
+    total += sum(struct.unpack('!%dH' % (len(data) // 2), data))
+    while total >> 16:
+        total = (total & 0xffff) + (total >> 16)
+    return total
+
+
+class RawARPResponder(object):
+    """
+    Replies to ARP requests and neighbor solicitations without scapy in the packet path.
+
+    One AF_PACKET socket is opened per interface, with a kernel BPF filter letting only ARP and
+    neighbor solicitations through, and the sockets are multiplexed with a selector. The requests
+    are parsed at fixed offsets, and the replies are copied from byte templates built once with
+    scapy for every (interface, target IP), in which only the fields of the requester are patched.
+    """
+
+    ARP_OP_REQUEST = 1
+
+    def __init__(self, ip_sets):
+        # arp_replies[(interface, target IPv4 bytes)] = [reply template per VLAN]
+        self.arp_replies = {}
+        # ndp_replies[(interface, target IPv6 bytes)] = (reply template, partial ICMPv6 checksum)
+        self.ndp_replies = {}
+        for interface, ip_set in ip_sets.items():
+            vlan_list = [struct.unpack('!H', vlan)[0] for vlan in ip_set.get('vlan', [])] or [None]
+            for ip, mac in ip_set.items():
+                if ip == 'vlan':
+                    continue
+                if isinstance(mac, bytes):
+                    mac = scapy.str2mac(mac)
+                if ':' in ip:
+                    self.ndp_replies[(interface, socket.inet_pton(socket.AF_INET6, ip))] = \
+                        self.build_ndp_template(mac, ip)
+                else:
+                    self.arp_replies[(interface, socket.inet_aton(ip))] = [
+                        self.build_arp_template(mac, ip, vlan_id) for vlan_id in vlan_list
+                    ]
+        self.sockets = {}
+        self.replies = 0
+
+    @staticmethod
+    def build_arp_template(local_mac, local_ip, vlan_id):
+        """ARP reply to 00:00:00:00:00:00 0.0.0.0, the requester goes to [0:6], [-10:-4] and [-4:]."""
+        return bytes(ARPResponder.generate_arp_reply(local_mac, '00:00:00:00:00:00', local_ip, '0.0.0.0', vlan_id))
+
+    @staticmethod
+    def build_ndp_template(local_mac, target_ip):
+        """
+        Neighbor advertisement to 00:00:00:00:00:00 ::, the requester goes to [0:6] and [38:54].
+        Returns the template with a zero checksum, and the checksum of the template without the requester IP.
+        """
+        template = bytearray(bytes(ARPResponder.generate_neigh_adv(local_mac, '00:00:00:00:00:00', target_ip, '::')))
+        template[56:58] = b'\x00\x00'
+        icmpv6 = bytes(template[54:])
+        pseudo_header = bytes(template[22:38]) + struct.pack('!IxxxB', len(icmpv6), IP_PROTO_ICMPV6)
+        return bytes(template), checksum_add(checksum_add(0, pseudo_header), icmpv6)
+
+    @staticmethod
+    def open_socket(interface):
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_SIZE)
+        bpf = ctypes.create_string_buffer(b''.join(struct.pack('HBBI', *insn) for insn in ARP_NS_BPF_FILTER))
+        sock.setsockopt(socket.SOL_SOCKET, SO_ATTACH_FILTER,
+                        struct.pack('HL', len(ARP_NS_BPF_FILTER), ctypes.addressof(bpf)))
+        sock.bind((interface, ETH_P_ALL))
+        # Drop what was received before the filter was attached
+        sock.setblocking(False)
+        try:
+            while True:
+                sock.recv(MAX_FRAME_SIZE)
+        except BlockingIOError:
+            pass
+        return sock
+
+    def handle(self, interface, frame):
+        """Returns the replies to a frame received on interface."""
+        offset = 14
+        eth_type = struct.unpack_from('!H', frame, 12)[0]
+        if eth_type == ETH_TYPE_VLAN:
+            eth_type = struct.unpack_from('!H', frame, 16)[0]
+            offset += 4
+        if eth_type == ETH_TYPE_ARP:
+            return self.reply_to_arp(interface, frame, offset)
+        if eth_type == ETH_TYPE_IPV6:
+            return self.reply_to_ndp(interface, frame, offset)
+        return []
+
+    def reply_to_arp(self, interface, frame, offset):
+        if len(frame) < offset + 28 or struct.unpack_from('!H', frame, offset + 6)[0] != self.ARP_OP_REQUEST:
+            return []
+        templates = self.arp_replies.get((interface, frame[offset + 24:offset + 28]))
+        if templates is None:
+            return []
+        remote_mac = frame[offset + 8:offset + 14]
+        remote_ip = frame[offset + 14:offset + 18]
+        replies = []
+        for template in templates:
+            reply = bytearray(template)
+            reply[0:6] = remote_mac
+            reply[-10:-4] = remote_mac
+            reply[-4:] = remote_ip
+            replies.append(bytes(reply))
+        return replies
+
+    def reply_to_ndp(self, interface, frame, offset):
+        icmpv6 = offset + 40
+        if len(frame) < icmpv6 + 24 or frame[offset + 6] != IP_PROTO_ICMPV6 or frame[icmpv6] != ICMPV6_ND_NS:
+            return []
+        template = self.ndp_replies.get((interface, frame[icmpv6 + 8:icmpv6 + 24]))
+        if template is None:
+            return []
+        # The replies go to the link layer address of the source link layer address option
+        remote_mac = None
+        option = icmpv6 + 24
+        while option + 8 <= len(frame) and frame[option + 1]:
+            if frame[option] == ND_OPT_SRC_LLADDR:
+                remote_mac = frame[option + 2:option + 8]
+                break
+            option += frame[option + 1] * 8
+        if remote_mac is None:
+            return []
+        template, partial_checksum = template
+        remote_ip = frame[offset + 8:offset + 24]
+        reply = bytearray(template)
+        reply[0:6] = remote_mac
+        reply[38:54] = remote_ip
+        reply[56:58] = struct.pack('!H', ~checksum_add(partial_checksum, remote_ip) & 0xffff)
+        return [bytes(reply)]
+
+    def serve(self):
+        selector = selectors.DefaultSelector()
+        for interface in set(key[0] for key in list(self.arp_replies) + list(self.ndp_replies)):
+            sock = self.open_socket(interface)
+            self.sockets[interface] = sock
+            selector.register(sock, selectors.EVENT_READ, interface)
+        while True:
+            for key, _ in selector.select():
+                sock, interface = key.fileobj, key.data
+                # Drain the socket, a storm of requests wakes the selector up once
+                while True:
+                    try:
+                        frame, address = sock.recvfrom(MAX_FRAME_SIZE)
+                    except BlockingIOError:
+                        break
+                    if address[2] == socket.PACKET_OUTGOING:
+                        continue
+                    for reply in self.handle(interface, frame):
+                        try:
+                            sock.send(reply)
+                        except BlockingIOError:
+                            # The transmit queue is full, the requester will retry
+                            continue
+                        self.replies += 1
+
+
 def parse_args():
     parser = argparse.ArgumentParser(description='ARP autoresponder')
     parser.add_argument('--conf', '-c', type=str, dest='conf',
                         default='/tmp/from_t1.json', help='path to json file with configuration')
     parser.add_argument('--extended', '-e', action='store_true',
                         dest='extended', default=False, help='enable extended mode')
+    parser.add_argument('--engine', type=str, dest='engine', choices=['scapy', 'raw'], default='scapy',
+                        help='scapy: sniff and reply with scapy, '
+                             'raw: reply from precomputed templates on AF_PACKET sockets')
     args = parser.parse_args()
 
     return args
@@ -127,6 +316,10 @@ def main():
 
     ARPResponder.ip_sets = ip_sets
 
+    if args.engine == 'raw':
+        RawARPResponder(ip_sets).serve()
+        return
+
     scapy.sniff(prn=ARPResponder.action, filter="arp or icmp6", iface=list(ip_sets.keys()), store=False)
 
 
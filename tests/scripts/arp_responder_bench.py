@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Measure the replies per second of arp_responder.py under a storm of ARP requests and neighbor solicitations.
+
+A veth pair is created, arp_responder.py is started with each engine on one end, and the requests of all the
+hosts are replayed on the other end as fast as possible (or at --rate requests per second), while the replies are
+counted. Needs root, scapy and the veth pair names to be free, the veth pair is removed at the end:
+
+    sudo python3 tests/scripts/arp_responder_bench.py --hosts 500 --rounds 20
+"""
+import argparse
+import json
+import os
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import scapy.all as scapy
+
+ARP_RESPONDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'arp_responder.py')
+ETH_P_ALL = 0x0003
+STARTUP_TIMEOUT = 60
+IDLE_TIMEOUT = 2
+REQUESTER_MAC = '02:00:00:00:00:01'
+
+
+def host_ips(hosts, ipv6):
+    ips = ['192.168.%d.%d' % (index // 250, index % 250 + 2) for index in range(hosts)]
+    if ipv6:
+        ips += ['fc02:1000::%x' % (index + 2) for index in range(hosts)]
+    return ips
+
+
+def build_request(ip):
+    if ':' in ip:
+        return bytes(scapy.Ether(src=REQUESTER_MAC, dst='33:33:ff:00:00:01') /
+                     scapy.IPv6(src='fc02:1000::1', dst='ff02::1:ff00:1') /
+                     scapy.ICMPv6ND_NS(tgt=ip) / scapy.ICMPv6NDOptSrcLLAddr(lladdr=REQUESTER_MAC))
+    return bytes(scapy.Ether(src=REQUESTER_MAC, dst='ff:ff:ff:ff:ff:ff') /
+                 scapy.ARP(op=1, hwsrc=REQUESTER_MAC, psrc='192.168.255.1', pdst=ip))
+
+
+def is_reply(frame):
+    eth_type = struct.unpack_from('!H', frame, 12)[0]
+    if eth_type == 0x0806:
+        return struct.unpack_from('!H', frame, 20)[0] == 2
+    # ICMPv6 neighbor advertisement
+    return eth_type == 0x86dd and frame[20] == 58 and frame[54] == 136
+
+
+class ReplyCounter(threading.Thread):
+
+    def __init__(self, sock):
+        super(ReplyCounter, self).__init__()
+        self.daemon = True
+        self.sock = sock
+        self.replies = 0
+        self.last_reply = None
+        self.stopped = False
+
+    def run(self):
+        self.sock.settimeout(0.2)
+        while not self.stopped:
+            try:
+                frame, address = self.sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            if address[2] != socket.PACKET_OUTGOING and is_reply(frame):
+                self.replies += 1
+                self.last_reply = time.time()
+
+
+def wait_responder(sock, counter, probe):
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        sock.send(probe)
+        time.sleep(0.2)
+        if counter.replies:
+            return True
+    return False
+
+
+def bench(engine, args, requests, conf_path):
+    sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+    sock.bind((args.requester_iface, ETH_P_ALL))
+    counter = ReplyCounter(sock)
+    counter.start()
+    responder = subprocess.Popen([sys.executable, ARP_RESPONDER, '-c', conf_path, '--engine', engine])
+    try:
+        if not wait_responder(sock, counter, requests[0]):
+            raise RuntimeError('arp_responder.py with engine %s did not reply' % engine)
+        time.sleep(IDLE_TIMEOUT)
+        counter.replies = 0
+
+        interval = 1.0 / args.rate if args.rate else 0
+        start = time.time()
+        for round_index in range(args.rounds):
+            for index, request in enumerate(requests):
+                if interval:
+                    delay = start + (round_index * len(requests) + index) * interval - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                sock.send(request)
+        send_time = time.time() - start
+
+        # Wait until no reply arrives anymore
+        while time.time() - (counter.last_reply or start) < IDLE_TIMEOUT:
+            time.sleep(0.1)
+        duration = (counter.last_reply or time.time()) - start
+        sent = len(requests) * args.rounds
+        return {
+            'requests': sent,
+            'replies': counter.replies,
+            'answered': round(float(counter.replies) / sent, 4),
+            'send_time': round(send_time, 3),
+            'duration': round(duration, 3),
+            'replies_per_second': round(counter.replies / duration, 1) if duration > 0 else None
+        }
+    finally:
+        counter.stopped = True
+        responder.terminate()
+        responder.wait()
+        counter.join()
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the replies per second of arp_responder.py')
+    parser.add_argument('--hosts', type=int, default=200, help='Number of hosts answered by the responder')
+    parser.add_argument('--rounds', type=int, default=10, help='Number of requests sent to each host')
+    parser.add_argument('--rate', type=int, default=0, help='Requests per second, 0 sends as fast as possible')
+    parser.add_argument('--ipv6', action='store_true', help='Also send neighbor solicitations')
+    parser.add_argument('--engine', choices=['scapy', 'raw', 'both'], default='both')
+    parser.add_argument('--responder-iface', dest='responder_iface', default='arpb0')
+    parser.add_argument('--requester-iface', dest='requester_iface', default='arpb1')
+    args = parser.parse_args()
+
+    if os.geteuid() != 0:
+        parser.error('run as root')
+
+    ips = host_ips(args.hosts, args.ipv6)
+    requests = [build_request(ip) for ip in ips]
+    subprocess.check_call(['ip', 'link', 'add', args.responder_iface, 'type', 'veth',
+                           'peer', 'name', args.requester_iface])
+    conf = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
+    try:
+        for iface in (args.responder_iface, args.requester_iface):
+            subprocess.check_call(['ip', 'link', 'set', iface, 'up'])
+        json.dump({args.responder_iface: ips}, conf)
+        conf.close()
+
+        engines = ['scapy', 'raw'] if args.engine == 'both' else [args.engine]
+        report = {}
+        for engine in engines:
+            report[engine] = bench(engine, args, requests, conf.name)
+            print('%-6s requests=%-8d replies=%-8d answered=%-7.2f%% duration=%-8.3f replies/s=%s' % (
+                engine, report[engine]['requests'], report[engine]['replies'], report[engine]['answered'] * 100,
+                report[engine]['duration'], report[engine]['replies_per_second']))
+        print(json.dumps(report, indent=2, sort_keys=True))
+    finally:
+        os.unlink(conf.name)
+        subprocess.call(['ip', 'link', 'del', args.responder_iface])
+
+
+if __name__ == '__main__':
+    main()
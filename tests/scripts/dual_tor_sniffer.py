@@ -1,7 +1,30 @@
 import argparse
+import binascii
+import fcntl
+import heapq
+import json
 import logging
+import select
+import socket
+import struct
+import time
 
 import scapy.all as scapyall
+from scapy.arch.linux import attach_filter
+
+ETH_HEADER_LEN = 14
+ETH_P_ALL = 0x0003
+ETH_TYPE_IPV4 = 0x0800
+ETH_TYPE_VLAN = 0x8100
+IP_PROTO_TCP = 6
+SIOCGSTAMP = 0x8906
+SOL_PACKET = 263
+PACKET_STATISTICS = 6
+RECV_BUFFER_SIZE = 10 * 1024 * 1024
+MAX_FRAME_SIZE = 65535
+# Received packets are tracked in payload id order, packets received out of order
+# are reordered as long as they are at most this number of packets late
+REORDER_WINDOW = 1024
 
 
 class Sniffer(object):
@@ -31,6 +54,221 @@ class Sniffer(object):
         logging.debug("Pcap file dumped to {}".format(pcap_path))
 
 
+class FlowTracker(object):
+    """Online gaps and duplicates of the packets received for one server."""
+
+    def __init__(self):
+        self.sent_packets = 0
+        self.received_packets = 0
+        self.late_packets = 0
+        self.first_id = None
+        self.last = None
+        self.duplications = []
+        self.disruptions = []
+        self.reorder_heap = []
+
+    def add_received(self, payload_id, timestamp):
+        heapq.heappush(self.reorder_heap, (payload_id, timestamp))
+        if len(self.reorder_heap) > REORDER_WINDOW:
+            self._track(*heapq.heappop(self.reorder_heap))
+
+    def _track(self, payload_id, timestamp):
+        self.received_packets += 1
+        if self.last is None:
+            self.first_id = payload_id
+        else:
+            prev_id, prev_time = self.last
+            if payload_id < prev_id:
+                # Later than the reorder window, it cannot be placed anymore
+                self.late_packets += 1
+                return
+            if payload_id == prev_id:
+                # Consecutive duplicated packets are one duplication
+                if self.duplications and self.duplications[-1]['end_id'] + 1 == payload_id:
+                    self.duplications[-1]['end_id'] = payload_id
+                    self.duplications[-1]['end_time'] = timestamp
+                else:
+                    self.duplications.append({
+                        'start_time': timestamp,
+                        'end_time': timestamp,
+                        'start_id': payload_id,
+                        'end_id': payload_id
+                    })
+            elif prev_id + 1 < payload_id:
+                self.disruptions.append({
+                    'start_time': prev_time,
+                    'end_time': timestamp,
+                    'start_id': prev_id,
+                    'end_id': payload_id
+                })
+        self.last = (payload_id, timestamp)
+
+    def summary(self):
+        while self.reorder_heap:
+            self._track(*heapq.heappop(self.reorder_heap))
+        return {
+            'sent_packets': self.sent_packets,
+            'received_packets': self.received_packets,
+            'late_packets': self.late_packets,
+            'first_received_id': self.first_id,
+            'last_received_id': self.last[0] if self.last else None,
+            'duplications': self.duplications,
+            'disruptions': self.disruptions
+        }
+
+
+class StreamAnalyzer(object):
+    """
+    Tracks the disruptions of the dual ToR IO test flows from the raw frames, decoding only
+    the Ethernet addresses, the IPv4 addresses, the TCP ports and the TCP payload.
+
+    The sent packets are the ones sent to sent_dst_mac, the received packets the ones sent from
+    one of received_src_macs. The packets of a server are the ones with the server address as
+    IPv4 source or destination address, as set by server_field. The TCP payload of the packets
+    is the packet id followed by padding 'X'.
+    """
+
+    def __init__(self, sport, dport, sent_dst_mac, received_src_macs, server_field):
+        self.ports = struct.pack('!HH', sport, dport)
+        self.sent_dst_mac = self.mac_to_bytes(sent_dst_mac)
+        self.received_src_macs = set(self.mac_to_bytes(mac) for mac in received_src_macs)
+        # Offset of the server address in the IPv4 header
+        self.server_offset = 12 if server_field == 'src' else 16
+        self.flows = {}
+        self.captured_packets = 0
+        self.matched_packets = 0
+
+    @staticmethod
+    def mac_to_bytes(mac):
+        return binascii.unhexlify(mac.replace(':', '').replace('-', '').lower())
+
+    def process(self, frame, timestamp):
+        self.captured_packets += 1
+        if len(frame) < ETH_HEADER_LEN + 4:
+            return
+        offset = ETH_HEADER_LEN
+        eth_type = struct.unpack_from('!H', frame, 12)[0]
+        if eth_type == ETH_TYPE_VLAN:
+            eth_type = struct.unpack_from('!H', frame, 16)[0]
+            offset += 4
+        if eth_type != ETH_TYPE_IPV4 or len(frame) < offset + 20:
+            return
+        version_ihl, total_len = struct.unpack_from('!BxH', frame, offset)
+        if version_ihl >> 4 != 4 or struct.unpack_from('!B', frame, offset + 9)[0] != IP_PROTO_TCP:
+            return
+        tcp_offset = offset + (version_ihl & 0x0f) * 4
+        if len(frame) < tcp_offset + 20 or frame[tcp_offset:tcp_offset + 4] != self.ports:
+            return
+
+        sent = frame[0:6] == self.sent_dst_mac
+        if not sent and frame[6:12] not in self.received_src_macs:
+            return
+        payload_offset = tcp_offset + (struct.unpack_from('!B', frame, tcp_offset + 12)[0] >> 4) * 4
+        try:
+            payload_id = int(frame[payload_offset:offset + total_len].rstrip(b'X'))
+        except ValueError:
+            return
+
+        self.matched_packets += 1
+        server = socket.inet_ntoa(frame[offset + self.server_offset:offset + self.server_offset + 4])
+        flow = self.flows.get(server)
+        if flow is None:
+            flow = self.flows[server] = FlowTracker()
+        if sent:
+            flow.sent_packets += 1
+        else:
+            flow.add_received(payload_id, timestamp)
+
+    def summary(self):
+        return {
+            'captured_packets': self.captured_packets,
+            'matched_packets': self.matched_packets,
+            'servers': dict((server, flow.summary()) for server, flow in self.flows.items())
+        }
+
+
+class PcapWriter(object):
+    """Writes raw Ethernet frames to a pcap file as they are captured."""
+
+    def __init__(self, pcap_path):
+        self.file = open(pcap_path, 'wb')
+        self.file.write(struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, MAX_FRAME_SIZE, 1))
+
+    def write(self, frame, timestamp):
+        sec = int(timestamp)
+        self.file.write(struct.pack('<IIII', sec, int((timestamp - sec) * 1000000), len(frame), len(frame)))
+        self.file.write(frame)
+
+    def close(self):
+        self.file.close()
+
+
+class StreamSniffer(object):
+    """
+    Sniffs the frames on all the interfaces and feeds them to a StreamAnalyzer as they arrive,
+    without dissecting them with scapy. The frames are written to a pcap file only if pcap_path is set.
+    """
+
+    def __init__(self, analyzer, filter=None, timeout=60, pcap_path=None):
+        self.analyzer = analyzer
+        self.filter = filter
+        self.timeout = timeout
+        self.pcap_path = pcap_path
+        self.kernel_drops = None
+
+    @staticmethod
+    def get_timestamp(sock):
+        try:
+            sec, usec = struct.unpack('@ll', fcntl.ioctl(sock, SIOCGSTAMP, struct.pack('@ll', 0, 0)))
+            return sec + usec / 1000000.0
+        except (IOError, OSError):
+            return time.time()
+
+    def sniff(self):
+        logging.debug("stream sniffer started: filter={}, timeout={}".format(self.filter, self.timeout))
+        # Not bound to an interface, to capture on all the interfaces like scapy.sniff
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_SIZE)
+        if self.filter:
+            attach_filter(sock, self.filter, None)
+        pcap_writer = PcapWriter(self.pcap_path) if self.pcap_path else None
+        deadline = time.time() + self.timeout
+        try:
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                if not select.select([sock], [], [], remaining)[0]:
+                    continue
+                frame = sock.recv(MAX_FRAME_SIZE)
+                timestamp = self.get_timestamp(sock)
+                self.analyzer.process(frame, timestamp)
+                if pcap_writer:
+                    pcap_writer.write(frame, timestamp)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                # struct tpacket_stats: packets, drops
+                self.kernel_drops = struct.unpack('II', sock.getsockopt(SOL_PACKET, PACKET_STATISTICS, 8))[1]
+            except (IOError, OSError):
+                pass
+            sock.close()
+            if pcap_writer:
+                pcap_writer.close()
+                logging.debug("Pcap file dumped to {}".format(self.pcap_path))
+        logging.debug("Stream sniffer ended")
+
+    def save_summary(self, summary_path):
+        summary = self.analyzer.summary()
+        summary['kernel_drops'] = self.kernel_drops
+        if not summary['matched_packets']:
+            logging.warning("No packets of the test flows were captured")
+        with open(summary_path, 'w') as summary_file:
+            json.dump(summary, summary_file)
+        logging.debug("Summary of {} captured packets dumped to {}".format(summary['captured_packets'], summary_path))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='''
@@ -52,8 +290,9 @@ def main():
     parser.add_argument('-p', '--pcap',
                         type=str,
                         dest='pcap',
-                        default='/tmp/capture.pcap',
-                        help='Dump captured packets to the specified pcap file.'
+                        default=None,
+                        help='Dump captured packets to the specified pcap file, '
+                             'default is /tmp/capture.pcap unless --summary is set.'
                         )
     parser.add_argument('-l', '--log',
                         type=str,
@@ -61,6 +300,21 @@ def main():
                         default='/tmp/capture.log',
                         help='Save log to the specified log file'
                         )
+    parser.add_argument('-s', '--summary',
+                        type=str,
+                        dest='summary',
+                        default=None,
+                        help='Analyze the test flows as packets arrive and save the disruption summary '
+                             'to the specified json file, instead of keeping all the packets.'
+                        )
+    parser.add_argument('--sport', type=int, default=1234, help='TCP source port of the test flows.')
+    parser.add_argument('--dport', type=int, default=5000, help='TCP destination port of the test flows.')
+    parser.add_argument('--sent-dst-mac', dest='sent_dst_mac', type=str,
+                        help='Destination MAC address of the sent packets.')
+    parser.add_argument('--received-src-macs', dest='received_src_macs', type=str,
+                        help='Comma separated source MAC addresses of the received packets.')
+    parser.add_argument('--server-field', dest='server_field', choices=['src', 'dst'], default='dst',
+                        help='IP address field holding the server address.')
 
     args = parser.parse_args()
 
@@ -71,11 +325,21 @@ def main():
         level=logging.DEBUG
     )
 
+    if args.summary:
+        if not args.sent_dst_mac or not args.received_src_macs:
+            parser.error('--sent-dst-mac and --received-src-macs are required with --summary')
+        analyzer = StreamAnalyzer(args.sport, args.dport, args.sent_dst_mac,
+                                  args.received_src_macs.split(','), args.server_field)
+        sniffer = StreamSniffer(analyzer, filter=args.filter, timeout=args.timeout, pcap_path=args.pcap)
+        sniffer.sniff()
+        sniffer.save_summary(args.summary)
+        return
+
     sniffer = Sniffer(filter=args.filter, timeout=args.timeout)
     sniffer.sniff()
     if sniffer.socket:
         sniffer.socket.close()
-    sniffer.save_pcap(args.pcap)
+    sniffer.save_pcap(args.pcap or '/tmp/capture.pcap')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Time the analysis of a syslog by loganalyzer.py and measure its peak memory, reading the file backwards in blocks
+and reading it as a whole like before with reversed(readlines()).
+
+A synthetic syslog of --lines lines is generated in a temporary folder, the last --range percent of them being
+between the start and end markers of the run, with errors inside and outside of the range. It is then analyzed with
+the common match, ignore and expect files of the loganalyzer. Both paths must report the same lines:
+
+    python3 tests/scripts/loganalyzer_bench.py --lines 2000000 --range 5
+"""
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+LOGANALYZER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'ansible', 'roles', 'test',
+                               'files', 'tools', 'loganalyzer')
+sys.path.insert(0, LOGANALYZER_DIR)
+
+import loganalyzer   # noqa: E402
+
+RUN_ID = 'bench'
+LINE = 'Oct 18 04:00:{:02d}.{:06d} vlab-01 {} swss#orchagent: :- doTask: bench message {}\n'
+
+
+def generate_log(path, lines, range_percent):
+    analyzer = loganalyzer.AnsibleLogAnalyzer(RUN_ID, False)
+    start = lines - lines * range_percent // 100
+    with open(path, 'w') as f:
+        for index in range(lines):
+            if index == start:
+                f.write(LINE.format(0, 0, 'INFO', analyzer.create_start_marker()))
+            level = 'ERR' if index % 10007 == 0 else 'INFO'
+            f.write(LINE.format(index // 1000000 % 60, index % 1000000, level, index))
+        f.write(LINE.format(59, 999999, 'INFO', analyzer.create_end_marker()))
+
+
+def full_read(log_file, block_size=None):
+    """Lines of the file read as a whole, like analyze_file() did before reverse_readlines()"""
+    return reversed(io.TextIOWrapper(log_file).readlines())
+
+
+def analyze(path, reader, trace_memory):
+    analyzer = loganalyzer.AnsibleLogAnalyzer(RUN_ID, False)
+    files = [os.path.join(LOGANALYZER_DIR, 'loganalyzer_common_{}.txt'.format(kind))
+             for kind in ('match', 'ignore', 'expect')]
+    match_regex, ignore_regex, expect_regex = [analyzer.create_msg_regex([f])[0] for f in files]
+    loganalyzer.reverse_readlines, original = reader, loganalyzer.reverse_readlines
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        start = time.time()
+        result = analyzer.analyze_file(path, match_regex, ignore_regex, expect_regex)
+        duration = round(time.time() - start, 3)
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 1024.0 / 1024, 1) if trace_memory else None
+    finally:
+        tracemalloc.stop()
+        loganalyzer.reverse_readlines = original
+    return result, duration, peak_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the analysis of a syslog by loganalyzer.py')
+    parser.add_argument('--lines', type=int, default=2000000, help='Number of lines of the syslog')
+    parser.add_argument('--range', type=int, default=5, help='Percent of the lines between the markers')
+    args = parser.parse_args()
+
+    path = tempfile.mkdtemp()
+    try:
+        log_path = os.path.join(path, 'syslog')
+        generate_log(log_path, args.lines, args.range)
+        report = {'lines': args.lines, 'size_mb': round(os.path.getsize(log_path) / 1024.0 / 1024, 1)}
+        expected = None
+        for mode, reader in (('blocks', loganalyzer.reverse_readlines), ('full_read', full_read)):
+            result, report[mode], _ = analyze(log_path, reader, False)
+            # Memory is traced in a separate run, tracing slows the analysis down
+            _, _, report[mode + '_peak_mb'] = analyze(log_path, reader, True)
+            if expected is None:
+                expected = result
+                report['matches'] = len(result[0])
+            elif result != expected:
+                raise RuntimeError('Lines reported with {} differ from the lines read in blocks'.format(mode))
+        print(json.dumps(report, indent=2, sort_keys=True))
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()